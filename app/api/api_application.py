@@ -1,3 +1,6 @@
+import asyncio
+import logging
+import time
 from contextlib import asynccontextmanager
 
 from fastapi import APIRouter, FastAPI
@@ -8,13 +11,58 @@ from .common.error_handlers import add_error_handlers
 from .common.routers.health_check_routers import add_health_check_router
 from .middlewares.configure_middlewares import configure_middlewares
 
+logger = logging.getLogger(__name__)
+
+
+async def _warmup(app: FastAPI, settings: ApiSettings):
+    """
+    Aquece as integrações antes de servir a primeira requisição, limitado por `startup_warmup_timeout_seconds`.
+    Se o aquecimento falhar ou exceder o tempo limite, ele é refeito sob demanda no primeiro uso.
+    """
+    container = getattr(app, "container", None)
+    if container is None:
+        return
+
+    started_at = time.perf_counter()
+    await container.keycloak_admin_client().open()
+    await container.rabbitmq_publisher().start()
+    await container.webhook_service().open()
+    container.webhook_dispatcher().start()
+    container.outbox_relay().start()
+    container.redis_adapter().start_client_cache()
+    keycloak_adapter = container.keycloak_adapter()
+    try:
+        await asyncio.wait_for(keycloak_adapter.discover(), timeout=settings.startup_warmup_timeout_seconds)
+    except Exception:
+        logger.warning("Falha ao aquecer a descoberta OIDC na inicialização; será feita sob demanda.", exc_info=True)
+    keycloak_adapter.start_background_refresh()
+
+    app.state.startup_duration_ms = (time.perf_counter() - started_at) * 1000
+    logger.info(f"Aplicação pronta para receber requisições em {app.state.startup_duration_ms:.2f}ms")
+
+
+async def _shutdown(app: FastAPI):
+    container = getattr(app, "container", None)
+    if container is None:
+        return
+
+    await container.keycloak_adapter().stop_background_refresh()
+    await container.outbox_relay().stop()
+    await container.redis_adapter().stop_client_cache()
+    await container.webhook_dispatcher().stop()
+    await container.webhook_service().aclose()
+    await container.rabbitmq_publisher().stop()
+    await container.keycloak_admin_client().aclose()
+
 
 def create_app(settings: ApiSettings, router: APIRouter) -> FastAPI:
     @asynccontextmanager
     async def _lifespan(_app: FastAPI):
+        await _warmup(_app, settings)
+
         yield
 
-        ...
+        await _shutdown(_app)
 
     app = FastAPI(
         lifespan=_lifespan,
@@ -4,6 +4,7 @@
 
 from typing import TYPE_CHECKING, Annotated
 
+from asgi_correlation_id import correlation_id
 from dependency_injector.wiring import Provide, inject
 from fastapi import Depends, Request
 from fastapi.security import OAuth2PasswordBearer
@@ -68,7 +69,7 @@ async def get_current_user_info(
             name=info_token.get("sub"),
             server=info_token.get("iss"),
         ),
-        trace_id=getattr(request.state, 'trace_id', None),
+        trace_id=getattr(request.state, 'trace_id', None) or correlation_id.get(),
         sellers=UserAuthInfo.to_sellers(info_token.get("sellers")),
         info_token=info_token
     )
@@ -135,7 +136,7 @@ async def do_auth(
             name=info_token.get("sub"),
             server=info_token.get("iss"),
         ),
-        trace_id=getattr(request.state, 'trace_id', None),
+        trace_id=getattr(request.state, 'trace_id', None) or correlation_id.get(),
         sellers=UserAuthInfo.to_sellers(info_token.get("sellers")),
         info_token=info_token
     )
@@ -0,0 +1,75 @@
+"""
+Token opaco e assinado da paginação por cursor (`_cursor`).
+
+O token carrega os valores da chave de ordenação do último registro da página (ex.: `created_at` e `seller_id`)
+em JSON, codificado em base64 url-safe e assinado com HMAC-SHA256, para que o cliente não consiga alterá-lo.
+"""
+
+import base64
+import binascii
+import hashlib
+import hmac
+import json
+from datetime import datetime
+from typing import Any
+
+DATETIME_TAG = "$dt"
+SIGNATURE_SIZE = 16
+MSG_CURSOR_INVALIDO = "O _cursor informado é inválido."
+
+
+class InvalidCursorError(ValueError):
+    pass
+
+
+def _b64encode(data: bytes) -> str:
+    return base64.urlsafe_b64encode(data).rstrip(b"=").decode("ascii")
+
+
+def _b64decode(data: str) -> bytes:
+    return base64.urlsafe_b64decode(data + "=" * (-len(data) % 4))
+
+
+def _json_default(obj: Any) -> dict:
+    if isinstance(obj, datetime):
+        return {DATETIME_TAG: obj.isoformat()}
+    raise TypeError(f"Tipo não suportado no cursor: {type(obj).__name__}")
+
+
+def _json_object_hook(obj: dict) -> Any:
+    if obj.keys() == {DATETIME_TAG}:
+        return datetime.fromisoformat(obj[DATETIME_TAG])
+    return obj
+
+
+def _sign(payload: bytes, secret: str) -> bytes:
+    return hmac.new(secret.encode("utf-8"), payload, hashlib.sha256).digest()[:SIGNATURE_SIZE]
+
+
+def encode_cursor(values: list[Any], secret: str) -> str:
+    payload = json.dumps(values, default=_json_default, separators=(",", ":")).encode("utf-8")
+    return f"{_b64encode(payload)}.{_b64encode(_sign(payload, secret))}"
+
+
+def decode_cursor(token: str, secret: str) -> list[Any]:
+    """
+    Valida a assinatura e retorna os valores da chave de ordenação. Levanta `InvalidCursorError`
+    para tokens malformados ou alterados.
+    """
+    try:
+        encoded_payload, encoded_signature = token.split(".")
+        payload = _b64decode(encoded_payload)
+        signature = _b64decode(encoded_signature)
+    except (ValueError, binascii.Error) as e:
+        raise InvalidCursorError(MSG_CURSOR_INVALIDO) from e
+
+    if not hmac.compare_digest(signature, _sign(payload, secret)):
+        raise InvalidCursorError(MSG_CURSOR_INVALIDO)
+
+    try:
+        values = json.loads(payload, object_hook=_json_object_hook)
+    except ValueError as e:
+        raise InvalidCursorError(MSG_CURSOR_INVALIDO) from e
+    if not isinstance(values, list):
+        raise InvalidCursorError(MSG_CURSOR_INVALIDO)
+    return values
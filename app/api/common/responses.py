@@ -0,0 +1,128 @@
+"""
+Respostas JSON de alto desempenho, selecionáveis por router em `app/api/router.py` (`default_response_class`).
+
+Nas rotas com `response_model`, o FastAPI valida o retorno no modelo de resposta, converte o modelo validado em
+dicionários (`dump_python`) e só então a resposta os serializa com `json.dumps`. Com `ModelResponseRoute` e uma
+resposta `ModelJSONResponse`, o modelo validado é entregue à resposta, que o serializa direto em bytes
+(pydantic-core `to_json` ou orjson). A validação, o status code e os cabeçalhos da rota não mudam.
+"""
+
+import importlib.util
+from typing import Any, Callable, Coroutine, NamedTuple
+
+from fastapi import Request, Response
+from fastapi._compat import ModelField
+from fastapi.datastructures import DefaultPlaceholder
+from fastapi.responses import JSONResponse
+from fastapi.routing import APIRoute
+from pydantic import BaseModel, TypeAdapter
+from pydantic_core import to_json
+
+ORJSON_AVAILABLE = importlib.util.find_spec("orjson") is not None
+
+if ORJSON_AVAILABLE:
+    import orjson
+
+
+class ValidatedContent(NamedTuple):
+    """Retorno da rota já validado no `response_model`, com o adaptador do tipo declarado."""
+
+    value: Any
+    type_adapter: TypeAdapter
+
+
+class ModelJSONResponse(JSONResponse):
+    """
+    Resposta JSON que aceita modelos pydantic como conteúdo. `include` restringe os campos serializados
+    (mesmo formato do `model_dump`). Conteúdo `ValidatedContent` é serializado pelo tipo declarado na rota,
+    como o FastAPI faria (apenas os campos do `response_model`, mesmo que o valor seja de uma subclasse).
+    """
+
+    def __init__(self, content: Any, *args, include: Any = None, **kwargs):
+        self.include = include
+        super().__init__(content, *args, **kwargs)
+
+
+class PydanticJSONResponse(ModelJSONResponse):
+    """
+    Serializa com o pydantic-core (`to_json`), no mesmo formato do `model_dump_json` (aliases, datas em ISO 8601).
+    """
+
+    def render(self, content: Any) -> bytes:
+        if isinstance(content, ValidatedContent):
+            return content.type_adapter.dump_json(content.value, by_alias=True, include=self.include)
+        return to_json(content, by_alias=True, include=self.include)
+
+
+class ORJSONResponse(ModelJSONResponse):
+    """
+    Serializa com o orjson (opcional). Modelos pydantic são convertidos com `model_dump(mode="json")`, para manter
+    o mesmo formato das demais respostas.
+    """
+
+    def __init__(self, content: Any, *args, **kwargs):
+        if not ORJSON_AVAILABLE:
+            raise RuntimeError("ORJSONResponse requer o pacote orjson instalado")
+        super().__init__(content, *args, **kwargs)
+
+    def render(self, content: Any) -> bytes:
+        if isinstance(content, ValidatedContent):
+            content = content.type_adapter.dump_python(content.value, mode="json", by_alias=True, include=self.include)
+        elif isinstance(content, BaseModel):
+            content = content.model_dump(mode="json", by_alias=True, include=self.include)
+        return orjson.dumps(content, default=_orjson_default)
+
+
+def _orjson_default(obj: Any) -> Any:
+    if isinstance(obj, BaseModel):
+        return obj.model_dump(mode="json", by_alias=True)
+    raise TypeError(f"Tipo não serializável em JSON: {type(obj).__name__}")
+
+
+class _ValidatedModelField(ModelField):
+    """
+    Campo de resposta que entrega o valor já validado à resposta, sem convertê-lo em dicionários.
+    Com opções de serialização do `response_model` (include, exclude, ...), mantém a conversão do FastAPI.
+    """
+
+    def serialize(
+        self,
+        value: Any,
+        *,
+        include=None,
+        exclude=None,
+        exclude_unset=False,
+        exclude_defaults=False,
+        exclude_none=False,
+        **kwargs,
+    ) -> Any:
+        if include or exclude or exclude_unset or exclude_defaults or exclude_none:
+            return super().serialize(
+                value,
+                include=include,
+                exclude=exclude,
+                exclude_unset=exclude_unset,
+                exclude_defaults=exclude_defaults,
+                exclude_none=exclude_none,
+                **kwargs,
+            )
+        return ValidatedContent(value, self._type_adapter)
+
+
+class ModelResponseRoute(APIRoute):
+    """
+    Rota que, quando a classe de resposta é uma `ModelJSONResponse`, repassa o modelo de resposta validado à
+    resposta para ser serializado direto em bytes. Com outras classes de resposta, se comporta como a `APIRoute`.
+    Usada como `route_class` dos routers; a classe de resposta é escolhida ao incluí-los.
+    """
+
+    def get_route_handler(self) -> Callable[[Request], Coroutine[Any, Any, Response]]:
+        response_class = self.response_class
+        if isinstance(response_class, DefaultPlaceholder):
+            response_class = response_class.value
+        field = self.secure_cloned_response_field
+        if field is not None and isinstance(response_class, type) and issubclass(response_class, ModelJSONResponse):
+            self.secure_cloned_response_field = _ValidatedModelField(
+                field_info=field.field_info, name=field.name, mode=field.mode
+            )
+        return super().get_route_handler()
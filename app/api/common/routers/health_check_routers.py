@@ -1,9 +1,11 @@
 from typing import TYPE_CHECKING
 
 from dependency_injector.wiring import Provide, inject
-from fastapi import APIRouter, Depends, FastAPI
+from fastapi import APIRouter, Depends, FastAPI, Request, Response
+from prometheus_client.exposition import choose_encoder
 from starlette import status
 
+from app.common.metrics import REGISTRY, RUNTIME_COLLECTOR
 from app.container import Container
 
 if TYPE_CHECKING:
@@ -48,3 +50,24 @@ def add_health_check_router(app: FastAPI, prefix: str = "/api") -> None:
         return {"version": "0.0.2"}
 
     app.include_router(health_router)
+
+    @app.get(
+        "/metrics",
+        operation_id="get_metrics",
+        name="Métricas da aplicação",
+        description="Métricas no formato Prometheus/OpenMetrics",
+        include_in_schema=False,
+        tags=["Saúde da Aplicação"],
+    )
+    async def metrics(request: Request):
+        container = getattr(request.app, "container", None)
+        if container is not None:
+            RUNTIME_COLLECTOR.bind(
+                keycloak_adapter=container.keycloak_adapter(),
+                webhook_dispatcher=container.webhook_dispatcher(),
+                webhook_service=container.webhook_service(),
+                seller_cache=container.seller_cache() if container.config.SELLER_CACHE_ENABLED() else None,
+                redis_client_cache=container.redis_adapter().client_cache,
+            )
+        encoder, content_type = choose_encoder(request.headers.get("accept", ""))
+        return Response(encoder(REGISTRY), media_type=content_type)
@@ -36,6 +36,26 @@ class NavigationLinks(BaseModel):
             current=f"{request_path}?_offset={offset}&_limit={limit}{query_params}",
         )
 
+    @classmethod
+    def build_cursor(
+        cls,
+        request_path: str | None,
+        cursor: str | None,
+        next_cursor: str | None,
+        limit: int,
+        filters: str | None = None,
+    ):
+        """
+        Links da paginação por cursor. Sem como voltar uma página, `previous` aponta para a primeira página.
+        """
+        filters = f"&{filters}" if filters else ""
+        request_path = request_path or ""
+        return cls(
+            previous=f"{request_path}?_cursor=&_limit={limit}{filters}",
+            next=(f"{request_path}?_cursor={next_cursor}&_limit={limit}{filters}" if next_cursor else None),
+            current=f"{request_path}?_cursor={cursor or ''}&_limit={limit}{filters}",
+        )
+
 
 __all__ = [
     "NavigationLinks",
@@ -5,6 +5,7 @@ from fastapi import Query
 from pydantic import BaseModel, Field
 from starlette.requests import Request
 
+from app.api.common.cursor import MSG_CURSOR_INVALIDO, InvalidCursorError, decode_cursor, encode_cursor
 from app.settings import api_settings
 
 from .navigation_links import NavigationLinks
@@ -13,6 +14,11 @@ from .response import ListResponse, PageResponse, get_list_response
 PAGE_DEFAULT_LIMIT = api_settings.pagination.default_limit
 PAGE_MAX_LIMIT = api_settings.pagination.max_limit
 
+# Chave de ordenação da paginação por cursor: do mais recente para o mais antigo, com o `seller_id` como
+# desempate. Acompanha o índice `status_1_created_at_-1_seller_id_-1`.
+KEYSET_SORT: tuple[tuple[str, int], ...] = (("created_at", -1), ("seller_id", -1))
+MSG_CURSOR_COM_OFFSET_OU_SORT = "O _cursor não pode ser combinado com _offset ou _sort."
+
 
 class Paginator(BaseModel):
     request_path: str = Field(...)
@@ -23,6 +29,34 @@ class Paginator(BaseModel):
     )
     offset: int = Field(default=0, ge=0)
     sort: str | None = None
+    cursor: str | None = None
+
+    @property
+    def is_cursor_mode(self) -> bool:
+        """
+        Paginação por cursor (keyset): `_cursor` informado, vazio na primeira página.
+        """
+        return self.cursor is not None
+
+    def get_keyset_sort(self) -> list[tuple[str, int]]:
+        return list(KEYSET_SORT)
+
+    def get_keyset_after(self) -> list | None:
+        """
+        Valores da chave de ordenação do último registro da página anterior, ou `None` na primeira página.
+        """
+        # Import local: app.common.exceptions depende deste pacote
+        from app.common.exceptions import BadRequestException
+
+        if not self.cursor:
+            return None
+        try:
+            values = decode_cursor(self.cursor, api_settings.pagination_cursor_secret)
+        except InvalidCursorError as e:
+            raise BadRequestException(message=str(e)) from e
+        if len(values) != len(KEYSET_SORT):
+            raise BadRequestException(message=MSG_CURSOR_INVALIDO)
+        return values
 
     def get_sort_order(self) -> dict[str, int] | None:
         if not self.sort:
@@ -45,17 +79,9 @@ class Paginator(BaseModel):
         count = len(results) if results else 0
         results = results if results else []
         has_next = count >= self.limit
-        filters_str = (
-            urlencode(
-                {
-                    attr: value
-                    for attr, value in filters.items()
-                    if attr not in ("limit", "offset") and value is not None
-                }
-            )
-            if filters
-            else ""
-        )
+        if self.is_cursor_mode:
+            return self._paginate_by_cursor(results, count, has_next, filters)
+        filters_str = self._filters_query(filters)
 
         return get_list_response(
             results=results,
@@ -74,6 +100,41 @@ class Paginator(BaseModel):
             ),
         )
 
+    def _paginate_by_cursor(
+        self, results: Sequence[BaseModel], count: int, has_next: bool, filters: dict | None
+    ) -> ListResponse:
+        next_cursor = None
+        if has_next:
+            last = results[-1]
+            next_cursor = encode_cursor(
+                [getattr(last, field) for field, _ in KEYSET_SORT], api_settings.pagination_cursor_secret
+            )
+        return get_list_response(
+            results=results,
+            page=PageResponse(limit=self.limit, offset=None, count=count),
+            links=NavigationLinks.build_cursor(
+                request_path=self.request_path,
+                cursor=self.cursor,
+                next_cursor=next_cursor,
+                limit=self.limit,
+                filters=self._filters_query(filters),
+            ),
+        )
+
+    @staticmethod
+    def _filters_query(filters: dict | None) -> str:
+        return (
+            urlencode(
+                {
+                    attr: value
+                    for attr, value in filters.items()
+                    if attr not in ("limit", "offset", "cursor") and value is not None
+                }
+            )
+            if filters
+            else ""
+        )
+
 
 def get_request_pagination(
     request: Request,
@@ -100,5 +161,18 @@ def get_request_pagination(
         ),
         alias="_sort"
     ),
+    cursor: str | None = Query(
+        default=None,
+        description=(
+            "Paginação por cursor: informe vazio (`_cursor=`) na primeira página e, nas seguintes, o valor"
+            " retornado no link `next`. Mais eficiente que `_offset` em páginas distantes; ordena do seller"
+            " mais recente para o mais antigo e não pode ser combinado com `_offset` ou `_sort`."
+        ),
+        alias="_cursor"
+    ),
 ):
-    return Paginator(request_path=request.url.path, limit=limit, offset=offset, sort=sort)
+    if cursor is not None and (offset or sort):
+        from app.common.exceptions import BadRequestException
+
+        raise BadRequestException(message=MSG_CURSOR_COM_OFFSET_OU_SORT)
+    return Paginator(request_path=request.url.path, limit=limit, offset=offset, sort=sort, cursor=cursor)
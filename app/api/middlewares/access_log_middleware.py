@@ -0,0 +1,84 @@
+import logging
+import time
+from typing import Iterable
+
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+logger = logging.getLogger(__name__)
+
+OBFUSCATED_VALUE = "***"
+
+
+class AccessLogMiddleware:
+    """
+    Middleware ASGI puro que mede a duração de cada requisição HTTP e emite uma única linha de log de acesso.
+
+    Diferente do `BaseHTTPMiddleware`, não cria tarefas nem reempacota o corpo da resposta. Além da mensagem,
+    o registro de log carrega os campos `http_method`, `http_path`, `http_status`, `duration_ms` e
+    `http_headers` (em `extra`), para formatadores estruturados.
+    """
+
+    def __init__(
+        self,
+        app: ASGIApp,
+        ignored_urls: Iterable[str] | None = None,
+        headers_to_log: Iterable[str] | None = None,
+        headers_to_obfuscate: Iterable[str] | None = None,
+    ):
+        self.app = app
+        self.ignored_urls = frozenset(ignored_urls or ())
+        self.headers_to_log = frozenset(h.lower().encode("latin-1") for h in headers_to_log or ())
+        self.headers_to_obfuscate = frozenset(h.lower().encode("latin-1") for h in headers_to_obfuscate or ())
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http" or scope["path"] in self.ignored_urls or not logger.isEnabledFor(logging.INFO):
+            await self.app(scope, receive, send)
+            return
+
+        status_code = 500
+        started_at = time.perf_counter_ns()
+
+        async def send_wrapper(message: Message) -> None:
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            duration_ms = (time.perf_counter_ns() - started_at) / 1_000_000
+            self._log(scope, status_code, duration_ms)
+
+    def _log(self, scope: Scope, status_code: int, duration_ms: float) -> None:
+        method = scope["method"]
+        path = scope["path"].replace("\n", "").replace("\r", "")
+        headers = self._headers(scope) if self.headers_to_log else None
+        extra = {
+            "http_method": method,
+            "http_path": path,
+            "http_status": status_code,
+            "duration_ms": round(duration_ms, 2),
+            "http_headers": headers,
+        }
+        if headers:
+            logger.info(
+                "%s %s - Status: %d - Duração: %.2fms - Headers: %s",
+                method,
+                path,
+                status_code,
+                duration_ms,
+                headers,
+                extra=extra,
+            )
+        else:
+            logger.info("%s %s - Status: %d - Duração: %.2fms", method, path, status_code, duration_ms, extra=extra)
+
+    def _headers(self, scope: Scope) -> dict[str, str]:
+        headers = {}
+        for name, value in scope["headers"]:
+            if name in self.headers_to_log:
+                headers[name.decode("latin-1")] = (
+                    OBFUSCATED_VALUE if name in self.headers_to_obfuscate else value.decode("latin-1")
+                )
+        return headers
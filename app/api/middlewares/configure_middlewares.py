@@ -6,6 +6,9 @@ from fastapi.middleware.gzip import GZipMiddleware
 from app.api.common.trace import get_trace_id
 
 from ...settings import ApiSettings
+from .access_log_middleware import AccessLogMiddleware
+from .metrics_middleware import MetricsMiddleware
+from .tracing_middleware import TracingMiddleware
 
 HEADER_X_REQUEST_ID = "X-Request-ID"
 
@@ -19,6 +22,8 @@ def configure_middlewares(app: FastAPI, settings: ApiSettings) -> None:
         allow_headers=["*"],
         expose_headers=[HEADER_X_REQUEST_ID],
     )
+    # Dentro do CorrelationIdMiddleware, para que o span da requisição receba o X-Request-ID
+    app.add_middleware(TracingMiddleware)  # type: ignore[arg-type]
     app.add_middleware(
         CorrelationIdMiddleware,
         header_name=HEADER_X_REQUEST_ID,
@@ -27,3 +32,13 @@ def configure_middlewares(app: FastAPI, settings: ApiSettings) -> None:
     )
 
     app.add_middleware(GZipMiddleware, minimum_size=1000)
+
+    app.add_middleware(MetricsMiddleware)  # type: ignore[arg-type]
+
+    # Adicionado por último para ser o mais externo e medir a requisição inteira
+    app.add_middleware(
+        AccessLogMiddleware,  # type: ignore[arg-type]
+        ignored_urls=settings.access_log_ignored_urls,
+        headers_to_log=settings.access_log_headers_to_log,
+        headers_to_obfuscate=settings.access_log_headers_to_obfuscate,
+    )
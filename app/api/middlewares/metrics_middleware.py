@@ -0,0 +1,45 @@
+import time
+
+from prometheus_client import Histogram
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.common.metrics import HTTP_SERVER_REQUEST_DURATION
+
+UNMATCHED_ROUTE = "<unmatched>"
+
+
+class MetricsMiddleware:
+    """
+    Middleware ASGI puro que registra a duração de cada requisição HTTP no histograma por rota.
+
+    A rota é o template do path (ex.: `/seller/v1/sellers/{seller_id}`), para manter a cardinalidade limitada;
+    requisições que não casam com nenhuma rota são agrupadas em `<unmatched>`.
+    """
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+        self._children: dict[tuple[str, str, int], Histogram] = {}
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        status_code = 500
+        started_at = time.perf_counter()
+
+        async def send_wrapper(message: Message) -> None:
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            route = scope.get("route")
+            key = (scope["method"], route.path if route is not None else UNMATCHED_ROUTE, status_code)
+            child = self._children.get(key)
+            if child is None:
+                child = self._children[key] = HTTP_SERVER_REQUEST_DURATION.labels(key[0], key[1], str(status_code))
+            child.observe(time.perf_counter() - started_at)
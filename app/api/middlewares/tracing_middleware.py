@@ -0,0 +1,43 @@
+from asgi_correlation_id import correlation_id
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.common.tracing import start_span, tracing_enabled
+
+
+class TracingMiddleware:
+    """
+    Middleware ASGI puro que cria o span de servidor de cada requisição HTTP, continuando o trace informado
+    no cabeçalho `traceparent`. O span é nomeado pelo template da rota e recebe o `X-Request-ID` da requisição,
+    por isso deve ficar dentro do `CorrelationIdMiddleware`. Sem o rastreamento habilitado, apenas repassa a requisição.
+    """
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http" or not tracing_enabled():
+            await self.app(scope, receive, send)
+            return
+
+        method = scope["method"]
+        carrier = {name.decode("latin-1"): value.decode("latin-1") for name, value in scope["headers"]}
+        attributes = {"http.request.method": method, "url.path": scope["path"]}
+        if request_id := correlation_id.get():
+            attributes["app.request_id"] = request_id
+        status_code = 500
+
+        async def send_wrapper(message: Message) -> None:
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            await send(message)
+
+        with start_span(method, "server", attributes, carrier=carrier) as span:
+            try:
+                await self.app(scope, receive, send_wrapper)
+            finally:
+                route = scope.get("route")
+                if route is not None:
+                    span.update_name(f"{method} {route.path}")
+                    span.set_attribute("http.route", route.path)
+                span.set_attribute("http.response.status_code", status_code)
@@ -1,5 +1,6 @@
 from fastapi import APIRouter
 
+from app.api.common.responses import PydanticJSONResponse
 from app.api.v1.routers.seller_router import router as seller_router
 from app.api.v1.routers.user_router import router as user_router
 from app.api.v1.routers.gemini_router import router as gemini_router
@@ -9,7 +10,8 @@ routes = APIRouter()
 
 v1_router = APIRouter(prefix="/seller/v1")
 
-v1_router.include_router(seller_router, prefix="/sellers")
+# Respostas serializadas direto em bytes pelo pydantic-core (ver app.api.common.responses)
+v1_router.include_router(seller_router, prefix="/sellers", default_response_class=PydanticJSONResponse)
 v1_router.include_router(user_router)
 v1_router.include_router(gemini_router, prefix="/gemini")
 
@@ -2,11 +2,16 @@ from typing import TYPE_CHECKING, Optional
 
 from dependency_injector.wiring import Provide, inject
 from fastapi import APIRouter, Depends, HTTPException, Query, status
+from fastapi.responses import Response
+from pydantic import BaseModel
 
 from app.api.common.auth_handler import get_current_user_info, require_seller_permission, UserAuthInfo
+from app.api.common.responses import ModelResponseRoute, PydanticJSONResponse
 from app.api.common.schemas import ListResponse, Paginator, get_request_pagination
+from app.common.exceptions import BadRequestException
 from app.models.seller_model import Seller
 from app.models.seller_patch_model import SellerPatch
+from app.settings import api_settings
 
 from ..schemas.seller_schema import SellerCreate, SellerReplace, SellerResponse, SellerUpdate
 
@@ -16,9 +21,38 @@ if TYPE_CHECKING:
     from app.services import SellerService
 
 
-router = APIRouter(tags=["Sellers"])
+router = APIRouter(tags=["Sellers"], route_class=ModelResponseRoute)
 
 SELLER_NOT_FOUND_OR_ACCESS_DENIED = "Seller não encontrado ou acesso não permitido"
+MSG_CAMPOS_INVALIDOS = "Campos inválidos em _fields: {fields}"
+SELLER_RESPONSE_FIELDS = frozenset(SellerResponse.model_fields)
+
+
+def _parse_fields(fields: str | None) -> list[str] | None:
+    """Campos pedidos em `_fields` (separados por vírgula), validados contra o `SellerResponse`."""
+    if not fields:
+        return None
+    requested = list(dict.fromkeys(field.strip() for field in fields.split(",") if field.strip()))
+    invalid = [field for field in requested if field not in SellerResponse.model_fields]
+    if invalid:
+        raise BadRequestException(message=MSG_CAMPOS_INVALIDOS.format(fields=", ".join(invalid)))
+    return requested or None
+
+
+def _json_response(content: BaseModel, include: dict | frozenset | None = None) -> Response:
+    """Serializa o modelo direto em JSON (pydantic-core), sem passar pelo `response_model` da rota."""
+    return PydanticJSONResponse(content, include=include)
+
+
+def _seller_response(seller: "Seller | None"):
+    """
+    Leituras confiáveis (`seller_trusted_reads`): o seller lido do banco é serializado com os campos do
+    `SellerResponse`, sem ser revalidado nele. A validação do documento no `Seller`, feita pelo repositório,
+    continua acontecendo.
+    """
+    if api_settings.seller_trusted_reads and isinstance(seller, BaseModel):
+        return _json_response(seller, include=SELLER_RESPONSE_FIELDS)
+    return seller
 
 
 async def _find_seller_by_id_with_access_check(seller_id: str, user_info: "UserAuthInfo", seller_service) -> "Seller":
@@ -55,13 +89,30 @@ async def _find_seller_by_cnpj_with_access_check(cnpj: str, user_info: "UserAuth
 @inject
 async def get(
     paginator: Paginator = Depends(get_request_pagination),
+    fields: str | None = Query(
+        default=None,
+        description=(
+            "Campos a serem retornados, separados por vírgula (ex.: seller_id,trade_name)."
+            " Apenas esses campos são lidos do banco e serializados."
+        ),
+        alias="_fields",
+    ),
     seller_service: "SellerService" = Depends(Provide["seller_service"]),
 ):
     """
     Retorna todos os sellers cadastrados no sistema
     """
-    results = await seller_service.find(paginator=paginator, filters={})
-    return paginator.paginate(results=results)
+    requested_fields = _parse_fields(fields)
+    if requested_fields is None:
+        results = await seller_service.find(paginator=paginator, filters={})
+        response = paginator.paginate(results=results)
+        if api_settings.seller_trusted_reads:
+            return _json_response(response, include={"meta": True, "results": {"__all__": SELLER_RESPONSE_FIELDS}})
+        return response
+
+    # Resultados parciais não passam pela validação do `SellerResponse` (response_model)
+    results = await seller_service.find(paginator=paginator, filters={}, fields=requested_fields)
+    return _json_response(paginator.paginate(results=results, filters={"_fields": ",".join(requested_fields)}))
 
 
 @router.get(
@@ -93,15 +144,15 @@ async def get_by_id_or_cnpj(
             seller = await _find_seller_by_id_with_access_check(seller_id, auth_info, seller_service)
             if seller.cnpj != cnpj:
                 raise HTTPException(status_code=404, detail="Seller não encontrado com os critérios fornecidos")
-            return seller
         elif seller_id:
-            return await _find_seller_by_id_with_access_check(seller_id, auth_info, seller_service)
+            seller = await _find_seller_by_id_with_access_check(seller_id, auth_info, seller_service)
         else:
-            return await _find_seller_by_cnpj_with_access_check(cnpj, auth_info, seller_service)
+            seller = await _find_seller_by_cnpj_with_access_check(cnpj, auth_info, seller_service)
     except Exception as e:
         if "não tem permissão" in str(e) or "acesso não permitido" in str(e):
             raise HTTPException(status_code=404, detail=SELLER_NOT_FOUND_OR_ACCESS_DENIED)
         raise
+    return _seller_response(seller)
 
 
 @router.get(
@@ -122,7 +173,7 @@ async def get_by_id(
     Retorna os dados de um seller específico.
     O usuário autenticado precisa ter permissão para o seller_id informado.
     """
-    return await seller_service.find_by_id(seller_id)
+    return _seller_response(await seller_service.find_by_id(seller_id))
 
 
 @router.post(
@@ -1,10 +1,10 @@
 import os
 import sys
 import logging
-import time
 import dotenv
-from fastapi import FastAPI, Request
-from starlette.middleware.base import BaseHTTPMiddleware
+from fastapi import FastAPI
+from app.common.log_sampling import configure_log_sampling
+from app.common.tracing import configure_tracing
 from app.container import Container
 from app.settings import api_settings
 from pclogging import LoggingBuilder
@@ -30,28 +30,23 @@ else:
     logger.setLevel(logging.INFO)
 
 
-async def log_requests_middleware(request: Request, call_next):
-    start_time = time.time()
-    safe_path = request.url.path.replace('\n', '').replace('\r', '')
-    logger.info(f"Requisição recebida: {request.method} {safe_path}")
-    response = await call_next(request)
-    process_time = (time.time() - start_time) * 1000
-    formatted_process_time = f"{process_time:.2f}ms"
-    logger.info(
-        f"Requisição finalizada: {request.method} {safe_path} - Status: {response.status_code} - Duração: {formatted_process_time}"
-    )
-    return response
-
-
 def init() -> FastAPI:
     from app.api.api_application import create_app
     from app.api.router import routes as api_routes
 
+    configure_log_sampling(api_settings.LOG_SAMPLING_EVERY_N, api_settings.LOG_SAMPLED_LOGGERS)
+    if api_settings.TRACING_ENABLED:
+        configure_tracing(
+            api_settings.TRACING_SERVICE_NAME,
+            exporter=api_settings.TRACING_EXPORTER,
+            file_path=api_settings.TRACING_FILE_PATH,
+            sample_ratio=api_settings.TRACING_SAMPLE_RATIO,
+        )
+
     container = Container()
     container.config.from_pydantic(api_settings)
     app_api = create_app(api_settings, api_routes)
     app_api.container = container  # type: ignore[attr-defined]
-    app_api.add_middleware(BaseHTTPMiddleware, dispatch=log_requests_middleware)
     container.wire(modules=[
         "app.api.common.routers.health_check_routers",
         "app.api.v1.routers.seller_router",
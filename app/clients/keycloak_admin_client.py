@@ -1,45 +1,135 @@
+import asyncio
+import importlib.util
+import time
+from contextlib import asynccontextmanager, nullcontext
+from typing import TYPE_CHECKING
+
 import httpx
 from fastapi import HTTPException, status
+from redis.exceptions import LockError
 
 from app.common.exceptions.bad_request_exception import BadRequestException
+from app.common.metrics import InstrumentedTransport
 from app.settings.app import settings
 import logging
 from typing import List
 from app.messages import  MSG_KEYCLOAK_LOCATION_MISSING
 
+if TYPE_CHECKING:
+    from app.integrations.kv_db.redis_asyncio_adapter import RedisAsyncioAdapter
+
 logger = logging.getLogger(__name__)
 
 JSON = "application/json"
 
+# HTTP/2 só é habilitado quando o pacote `h2` está instalado (httpx[http2])
+HTTP2_AVAILABLE = importlib.util.find_spec("h2") is not None
+# O token de admin é renovado com essa antecedência em relação ao seu `expires_in`
+ADMIN_TOKEN_EXPIRY_MARGIN_SECONDS = 10
+DEFAULT_ADMIN_TOKEN_EXPIRES_IN_SECONDS = 60
+HTTP_POOL_LIMITS = httpx.Limits(max_connections=50, max_keepalive_connections=20, keepalive_expiry=30)
+
+SELLERS_ADD = "add"
+SELLERS_REMOVE = "remove"
+SELLERS_UPDATE_MAX_ATTEMPTS = 3
+SELLERS_UPDATE_RETRY_BACKOFF_SECONDS = 0.1
+SELLERS_LOCK_TIMEOUT_SECONDS = 10
+
 
 class KeycloakAdminClient:
-    def __init__(self):
+    def __init__(self, inmemory_adapter: "RedisAsyncioAdapter | None" = None):
         self.settings = settings
+        # Usado para serializar, entre processos, as alterações de atributos de um mesmo usuário
+        self.inmemory_adapter = inmemory_adapter
         self.base_url = f"{self.settings.KEYCLOAK_URL}/admin/realms/{self.settings.KEYCLOAK_REALM_NAME}"
         self.token_url = (
             f"{self.settings.KEYCLOAK_URL}/realms/{self.settings.KEYCLOAK_REALM_NAME}/protocol/openid-connect/token"
         )
+        self._client: httpx.AsyncClient | None = None
+        self._admin_token: str | None = None
+        self._admin_token_expires_at = 0.0
+        self._admin_token_lock = asyncio.Lock()
+        self._pending_sellers_changes: dict[str, list[tuple[tuple[str, str], asyncio.Future]]] = {}
+        self._sellers_flushes: dict[str, asyncio.Task] = {}
+
+    async def open(self):
+        """
+        Abre o cliente HTTP compartilhado (pool de conexões, HTTP/2 quando disponível).
+        Deve ser chamado no lifespan da aplicação.
+        """
+        if self._client is None:
+            self._client = httpx.AsyncClient(
+                transport=InstrumentedTransport(
+                    "keycloak_admin", httpx.AsyncHTTPTransport(http2=HTTP2_AVAILABLE, limits=HTTP_POOL_LIMITS)
+                ),
+                event_hooks={"response": [self._invalidate_token_on_unauthorized]},
+            )
+
+    async def aclose(self):
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+
+    @asynccontextmanager
+    async def _http_client(self):
+        """
+        Usa o cliente HTTP compartilhado quando aberto; caso contrário (ex.: scripts), um cliente temporário.
+        """
+        if self._client is not None:
+            yield self._client
+            return
+        async with httpx.AsyncClient(
+            transport=InstrumentedTransport("keycloak_admin"),
+            event_hooks={"response": [self._invalidate_token_on_unauthorized]},
+        ) as client:
+            yield client
 
     async def _get_admin_token(self) -> str:
         """
         Obtém um token de acesso com permissões de administrador.
+
+        O token é mantido em cache até pouco antes do seu `expires_in` e requisições concorrentes
+        compartilham uma única renovação.
         """
-        logger.info("Obtendo token de administrador do Keycloak para operação interna.")
-        token_data = {
-            "grant_type": "password",
-            "client_id": self.settings.KEYCLOAK_ADMIN_CLIENT_ID,
-            "username": self.settings.KEYCLOAK_ADMIN_USER,
-            "password": self.settings.KEYCLOAK_ADMIN_PASSWORD,
-        }
-        async with httpx.AsyncClient() as client:
-            try:
-                response = await client.post(self.token_url, data=token_data)
-                response.raise_for_status()
-                return response.json()["access_token"]
-            except httpx.HTTPStatusError as e:
-                logger.error(f"Erro ao obter token de admin: {e.response.text}")
-                raise HTTPException(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-                                    detail="Falha ao autenticar com o Keycloak.")
+        if self._admin_token is not None and time.monotonic() < self._admin_token_expires_at:
+            return self._admin_token
+
+        async with self._admin_token_lock:
+            if self._admin_token is not None and time.monotonic() < self._admin_token_expires_at:
+                return self._admin_token
+
+            logger.info("Obtendo token de administrador do Keycloak para operação interna.")
+            token_data = {
+                "grant_type": "password",
+                "client_id": self.settings.KEYCLOAK_ADMIN_CLIENT_ID,
+                "username": self.settings.KEYCLOAK_ADMIN_USER,
+                "password": self.settings.KEYCLOAK_ADMIN_PASSWORD,
+            }
+            async with self._http_client() as client:
+                try:
+                    response = await client.post(self.token_url, data=token_data)
+                    response.raise_for_status()
+                    token_response = response.json()
+                except httpx.HTTPStatusError as e:
+                    logger.error(f"Erro ao obter token de admin: {e.response.text}")
+                    raise HTTPException(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+                                        detail="Falha ao autenticar com o Keycloak.")
+
+            expires_in = token_response.get("expires_in", DEFAULT_ADMIN_TOKEN_EXPIRES_IN_SECONDS)
+            admin_token: str = token_response["access_token"]
+            self._admin_token = admin_token
+            self._admin_token_expires_at = time.monotonic() + expires_in - ADMIN_TOKEN_EXPIRY_MARGIN_SECONDS
+            return admin_token
+
+    def invalidate_admin_token(self):
+        """Descarta o token de admin em cache, forçando uma nova autenticação na próxima chamada."""
+        self._admin_token = None
+        self._admin_token_expires_at = 0.0
+
+    async def _invalidate_token_on_unauthorized(self, response: httpx.Response):
+        if response.status_code == status.HTTP_401_UNAUTHORIZED and str(response.request.url) != self.token_url:
+            logger.warning("Token de admin rejeitado pelo Keycloak; será renovado na próxima chamada.")
+            self.invalidate_admin_token()
 
     async def create_user(
             self, username: str, email: str, password: str, first_name: str | None, last_name: str | None,
@@ -63,7 +153,7 @@ class KeycloakAdminClient:
         }
 
         users_url = f"{self.base_url}/users"
-        async with httpx.AsyncClient() as client:
+        async with self._http_client() as client:
             try:
                 response = await client.post(users_url, headers=headers, json=user_payload)
                 if response.status_code == 409:
@@ -82,7 +172,7 @@ class KeycloakAdminClient:
         admin_token = await self._get_admin_token()
         headers = {"Authorization": f"Bearer {admin_token}"}
         user_url = f"{self.base_url}/users/{user_id}"
-        async with httpx.AsyncClient() as client:
+        async with self._http_client() as client:
             response = await client.get(user_url, headers=headers)
             if response.status_code == 404:
                 return None
@@ -94,7 +184,7 @@ class KeycloakAdminClient:
         admin_token = await self._get_admin_token()
         headers = {"Authorization": f"Bearer {admin_token}"}
         users_url = f"{self.base_url}/users"
-        async with httpx.AsyncClient() as client:
+        async with self._http_client() as client:
             response = await client.get(users_url, headers=headers)
             response.raise_for_status()
             return response.json()
@@ -104,7 +194,7 @@ class KeycloakAdminClient:
         admin_token = await self._get_admin_token()
         headers = {"Authorization": f"Bearer {admin_token}", "Content-Type": JSON}
         user_url = f"{self.base_url}/users/{user_id}"
-        async with httpx.AsyncClient() as client:
+        async with self._http_client() as client:
             try:
                 current_user_response = await client.get(user_url, headers=headers)
                 current_user_response.raise_for_status()
@@ -132,7 +222,7 @@ class KeycloakAdminClient:
         admin_token = await self._get_admin_token()
         headers = {"Authorization": f"Bearer {admin_token}"}
         user_url = f"{self.base_url}/users/{user_id}"
-        async with httpx.AsyncClient() as client:
+        async with self._http_client() as client:
             response = await client.delete(user_url, headers=headers)
             if response.status_code == 404:
                 return False
@@ -148,7 +238,7 @@ class KeycloakAdminClient:
         headers = {"Authorization": f"Bearer {admin_token}", "Content-Type": JSON}
         user_url = f"{self.base_url}/users/{user_id}"
 
-        async with httpx.AsyncClient() as client:
+        async with self._http_client() as client:
             try:
                 current_user_response = await client.get(user_url, headers=headers)
                 current_user_response.raise_for_status()
@@ -187,66 +277,117 @@ class KeycloakAdminClient:
             "value": password,
         }
 
-        async with httpx.AsyncClient() as client:
+        async with self._http_client() as client:
             response = await client.put(password_reset_url, headers=headers, json=password_payload)
             response.raise_for_status()
             logger.info(f"Senha do usuário {user_id} redefinida com sucesso.")
 
     async def add_seller_to_user(self, user_id: str, seller_to_add: str):
         """
-        Busca um usuário, adiciona um novo seller à sua lista de atributos 'sellers'
-        e salva o usuário de volta no Keycloak.
+        Adiciona um novo seller à lista de atributos 'sellers' do usuário no Keycloak.
         """
         logger.info(f"Adicionando seller '{seller_to_add}' ao usuário Keycloak ID: {user_id}")
-
-        user_data = await self.get_user(user_id)
-        if not user_data:
-            logger.error(f"Usuário não encontrado no Keycloak: {user_id}")
-            raise Exception(f"Falha ao adicionar seller: usuário {user_id} não existe.")
-
-        current_attributes = user_data.get("attributes", {})
-        current_sellers = current_attributes.get("sellers", [])
-
-        if isinstance(current_sellers, str):
-            current_sellers = [current_sellers]
-
-        if seller_to_add not in current_sellers:
-            current_sellers.append(seller_to_add)
-            current_attributes["sellers"] = current_sellers
-
-            user_data["attributes"] = current_attributes
-
-            await self._update_user_representation(user_id, user_data)
-            logger.info(f"Seller '{seller_to_add}' adicionado com sucesso ao usuário '{user_id}'.")
-        else:
-            logger.warning(f"O seller '{seller_to_add}' já estava associado ao usuário '{user_id}'.")
+        await self._enqueue_sellers_change(user_id, SELLERS_ADD, seller_to_add)
 
     async def remove_seller_from_user(self, user_id: str, seller_to_remove: str):
         """
-        Busca um usuário, remove um seller de sua lista de atributos 'sellers'
-        e salva o usuário de volta no Keycloak.
+        Remove um seller da lista de atributos 'sellers' do usuário no Keycloak.
         """
         logger.info(f"Removendo o seller '{seller_to_remove}' do usuário Keycloak ID: {user_id}")
+        await self._enqueue_sellers_change(user_id, SELLERS_REMOVE, seller_to_remove)
 
-        user_data = await self.get_user(user_id)
-        if not user_data:
-            logger.warning(f"Tentativa de remover seller de um usuário inexistente: {user_id}")
-            return
-
-        current_attributes = user_data.get("attributes", {})
-        current_sellers = current_attributes.get("sellers", [])
-
-        if isinstance(current_sellers, str):
-            current_sellers = [current_sellers]
+    async def _enqueue_sellers_change(self, user_id: str, operation: str, seller_id: str):
+        """
+        Enfileira uma alteração no atributo 'sellers' do usuário e aguarda a sua gravação.
 
-        if seller_to_remove in current_sellers:
-            updated_sellers = [s for s in current_sellers if s != seller_to_remove]
-            current_attributes["sellers"] = updated_sellers
+        As alterações de um mesmo usuário são gravadas por uma única tarefa por processo: as que chegam
+        enquanto uma gravação está em andamento são agrupadas em uma única escrita seguinte.
+        """
+        future: asyncio.Future = asyncio.get_running_loop().create_future()
+        self._pending_sellers_changes.setdefault(user_id, []).append(((operation, seller_id), future))
+        if user_id not in self._sellers_flushes:
+            self._sellers_flushes[user_id] = asyncio.create_task(self._flush_sellers_changes(user_id))
+        await future
+
+    async def _flush_sellers_changes(self, user_id: str):
+        try:
+            # Permite que alterações disparadas no mesmo ciclo do event loop entrem no mesmo lote
+            await asyncio.sleep(0)
+            while pending := self._pending_sellers_changes.pop(user_id, None):
+                try:
+                    await self._write_sellers_changes(user_id, [change for change, _ in pending])
+                except Exception as e:
+                    for _, future in pending:
+                        if not future.done():
+                            future.set_exception(e)
+                else:
+                    for _, future in pending:
+                        if not future.done():
+                            future.set_result(None)
+        finally:
+            self._sellers_flushes.pop(user_id, None)
+
+    async def _write_sellers_changes(self, user_id: str, changes: list[tuple[str, str]]):
+        """
+        Aplica um lote de alterações no atributo 'sellers' com uma única leitura e uma única escrita.
 
-            await self._update_user_representation(user_id, user_data)
-            logger.info(f"Seller '{seller_to_remove}' removido com sucesso do usuário '{user_id}'.")
-        else:
-            logger.warning(f"O seller '{seller_to_remove}' não foi encontrado nos atributos do usuário '{user_id}'.")
+        A leitura e a escrita são serializadas entre processos por um lock no Redis (quando disponível),
+        evitando que alterações concorrentes do mesmo usuário se sobrescrevam. Conflitos são re-tentados.
+        """
+        for attempt in range(1, SELLERS_UPDATE_MAX_ATTEMPTS + 1):
+            try:
+                async with self._user_lock(user_id):
+                    user_data = await self.get_user(user_id)
+                    if not user_data:
+                        if any(operation == SELLERS_ADD for operation, _ in changes):
+                            logger.error(f"Usuário não encontrado no Keycloak: {user_id}")
+                            raise Exception(f"Falha ao adicionar seller: usuário {user_id} não existe.")
+                        logger.warning(f"Tentativa de remover seller de um usuário inexistente: {user_id}")
+                        return
+
+                    current_attributes = user_data.get("attributes") or {}
+                    current_sellers = current_attributes.get("sellers", [])
+                    if isinstance(current_sellers, str):
+                        current_sellers = [current_sellers]
+
+                    updated_sellers = self._apply_sellers_changes(current_sellers, changes)
+                    if updated_sellers == current_sellers:
+                        logger.warning(f"Nenhuma alteração nos sellers do usuário '{user_id}': {changes}")
+                        return
+
+                    current_attributes["sellers"] = updated_sellers
+                    user_data["attributes"] = current_attributes
+                    await self._update_user_representation(user_id, user_data)
+                    logger.info(f"Sellers do usuário '{user_id}' atualizados com sucesso: {changes}")
+                    return
+            except (httpx.HTTPStatusError, LockError) as e:
+                is_conflict = isinstance(e, LockError) or e.response.status_code == status.HTTP_409_CONFLICT
+                if not is_conflict or attempt == SELLERS_UPDATE_MAX_ATTEMPTS:
+                    raise
+                logger.warning(
+                    f"Conflito ao atualizar os sellers do usuário '{user_id}' "
+                    f"(tentativa {attempt}/{SELLERS_UPDATE_MAX_ATTEMPTS}); tentando novamente."
+                )
+                await asyncio.sleep(SELLERS_UPDATE_RETRY_BACKOFF_SECONDS * attempt)
+
+    @staticmethod
+    def _apply_sellers_changes(current_sellers: list[str], changes: list[tuple[str, str]]) -> list[str]:
+        updated_sellers = list(current_sellers)
+        for operation, seller_id in changes:
+            if operation == SELLERS_ADD and seller_id not in updated_sellers:
+                updated_sellers.append(seller_id)
+            elif operation == SELLERS_REMOVE:
+                updated_sellers = [s for s in updated_sellers if s != seller_id]
+        return updated_sellers
+
+    def _user_lock(self, user_id: str):
+        if self.inmemory_adapter is None:
+            return nullcontext()
+        return self.inmemory_adapter.locks(
+            f"keycloak:user_sellers:{user_id}",
+            timeout_in_seconds=SELLERS_LOCK_TIMEOUT_SECONDS,
+            blocking_timeout_in_seconds=SELLERS_LOCK_TIMEOUT_SECONDS,
+        )
 
     async def _update_user_representation(self, user_id: str, user_data: dict):
         """
@@ -255,7 +396,7 @@ class KeycloakAdminClient:
         admin_token = await self._get_admin_token()
         headers = {"Authorization": f"Bearer {admin_token}", "Content-Type": JSON}
         user_url = f"{self.base_url}/users/{user_id}"
-        async with httpx.AsyncClient() as client:
+        async with self._http_client() as client:
             response = await client.put(user_url, headers=headers, json=user_data)
             response.raise_for_status()
 
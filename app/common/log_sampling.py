@@ -0,0 +1,41 @@
+import logging
+from collections import defaultdict
+from typing import Iterable
+
+
+class SamplingFilter(logging.Filter):
+    """
+    Filtro de amostragem para logs de alta frequência: de cada mensagem abaixo de `max_level`, apenas
+    1 a cada `every_n` ocorrências é emitida. Avisos e erros (a partir de `max_level`) nunca são descartados.
+
+    As ocorrências são agrupadas pelo template da mensagem (`record.msg`), por isso os logs amostrados
+    devem usar argumentos no estilo `%` (`logger.info("Seller '%s' criado", seller_id)`), e não f-strings.
+    """
+
+    def __init__(self, every_n: int, max_level: int = logging.WARNING):
+        super().__init__()
+        if every_n < 1:
+            raise ValueError("every_n deve ser maior que zero")
+        self.every_n = every_n
+        self.max_level = max_level
+        self._counters: defaultdict[tuple[str, object], int] = defaultdict(int)
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        if self.every_n == 1 or record.levelno >= self.max_level:
+            return True
+        key = (record.name, record.msg)
+        count = self._counters[key]
+        self._counters[key] = count + 1
+        return count % self.every_n == 0
+
+
+def configure_log_sampling(every_n: int, logger_names: Iterable[str]) -> SamplingFilter | None:
+    """
+    Aplica a amostragem aos loggers informados. Com `every_n` igual a 1, nenhum filtro é instalado.
+    """
+    if every_n <= 1:
+        return None
+    sampling_filter = SamplingFilter(every_n)
+    for name in logger_names:
+        logging.getLogger(name).addFilter(sampling_filter)
+    return sampling_filter
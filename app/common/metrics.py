@@ -0,0 +1,254 @@
+"""
+Métricas da aplicação no formato Prometheus/OpenMetrics, expostas em `/metrics`.
+
+As séries (filhos dos histogramas) são pré-alocadas por componente e operação, para que o caminho
+da requisição apenas meça o tempo e chame `observe`. Estatísticas que já existem nos componentes
+(cache de tokens, filas em memória, circuit breaker) são lidas somente no momento da coleta.
+"""
+
+import functools
+import time
+from typing import TYPE_CHECKING, Any, Iterable
+
+import httpx
+from prometheus_client import CollectorRegistry, Gauge, Histogram
+from prometheus_client.core import CounterMetricFamily, GaugeMetricFamily
+from prometheus_client.registry import Collector
+
+from app.common.tracing import current_trace_context, start_span
+
+if TYPE_CHECKING:
+    from app.integrations.auth.keycloak_adapter import KeycloakAdapter
+    from app.integrations.kv_db.client_side_cache import ClientSideCache
+    from app.repositories.cached_seller_repository import CachedSellerRepository
+    from app.services.webhook_dispatcher import WebhookDispatcher
+    from app.services.webhook_service import WebhookService
+
+REGISTRY = CollectorRegistry(auto_describe=True)
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+HTTP_SERVER_REQUEST_DURATION = Histogram(
+    "http_server_request_duration_seconds",
+    "Duração das requisições HTTP recebidas, por rota",
+    ["method", "route", "status"],
+    buckets=LATENCY_BUCKETS,
+    registry=REGISTRY,
+)
+
+REPOSITORY_OPERATION_DURATION = Histogram(
+    "repository_operation_duration_seconds",
+    "Duração das operações dos repositórios (MongoDB)",
+    ["repository", "operation"],
+    buckets=LATENCY_BUCKETS,
+    registry=REGISTRY,
+)
+
+INTEGRATION_OPERATION_DURATION = Histogram(
+    "integration_operation_duration_seconds",
+    "Duração das operações em integrações que não são HTTP (Redis, RabbitMQ)",
+    ["integration", "operation"],
+    buckets=LATENCY_BUCKETS,
+    registry=REGISTRY,
+)
+
+HTTP_CLIENT_REQUEST_DURATION = Histogram(
+    "http_client_request_duration_seconds",
+    "Duração das requisições HTTP de saída até o recebimento dos cabeçalhos, por integração",
+    ["integration", "outcome"],
+    buckets=LATENCY_BUCKETS,
+    registry=REGISTRY,
+)
+
+HTTP_CLIENT_REQUESTS_IN_FLIGHT = Gauge(
+    "http_client_requests_in_flight",
+    "Requisições HTTP de saída em andamento (uso do pool de conexões), por integração",
+    ["integration"],
+    registry=REGISTRY,
+)
+
+HTTP_OUTCOMES = ("1xx", "2xx", "3xx", "4xx", "5xx", "error")
+
+
+class OperationTimers:
+    """
+    Séries de um histograma pré-alocadas por operação para um mesmo componente (repositório ou integração).
+    Operações não informadas na criação são alocadas no primeiro uso.
+    """
+
+    __slots__ = ("_histogram", "_component", "_children")
+
+    def __init__(self, histogram: Histogram, component: str, operations: Iterable[str] = ()):
+        self._histogram = histogram
+        self._component = component
+        self._children = {operation: histogram.labels(component, operation) for operation in operations}
+
+    def __getitem__(self, operation: str):
+        child = self._children.get(operation)
+        if child is None:
+            child = self._children[operation] = self._histogram.labels(self._component, operation)
+        return child
+
+
+def timed(operation: str):
+    """
+    Mede a duração de um método assíncrono em `self._operation_timers[operation]`.
+    """
+
+    def decorator(func):
+        @functools.wraps(func)
+        async def wrapper(self, *args, **kwargs):
+            child = self._operation_timers[operation]
+            started_at = time.perf_counter()
+            try:
+                return await func(self, *args, **kwargs)
+            finally:
+                child.observe(time.perf_counter() - started_at)
+
+        return wrapper
+
+    return decorator
+
+
+class InstrumentedTransport(httpx.AsyncBaseTransport):
+    """
+    Transporte do httpx que mede as requisições de saída de uma integração e o número de requisições em
+    andamento. Também propaga o contexto da requisição atual (`traceparent` e `X-Request-ID`) e, com o
+    rastreamento habilitado, cria um span de cliente por requisição.
+    """
+
+    def __init__(self, integration: str, transport: httpx.AsyncBaseTransport | None = None):
+        self._transport = transport or httpx.AsyncHTTPTransport()
+        self._integration = integration
+        self._children = {
+            outcome: HTTP_CLIENT_REQUEST_DURATION.labels(integration, outcome) for outcome in HTTP_OUTCOMES
+        }
+        self._in_flight = HTTP_CLIENT_REQUESTS_IN_FLIGHT.labels(integration)
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        attributes = {
+            "http.request.method": request.method,
+            "server.address": request.url.host,
+            "url.path": request.url.path,
+            "peer.service": self._integration,
+        }
+        with start_span(f"{request.method} {self._integration}", "client", attributes) as span:
+            if (context := current_trace_context()) is not None:
+                request.headers.update(context)
+            outcome = "error"
+            self._in_flight.inc()
+            started_at = time.perf_counter()
+            try:
+                response = await self._transport.handle_async_request(request)
+                outcome = HTTP_OUTCOMES[min(response.status_code // 100, len(HTTP_OUTCOMES)) - 1]
+                if span is not None:
+                    span.set_attribute("http.response.status_code", response.status_code)
+                return response
+            finally:
+                self._children[outcome].observe(time.perf_counter() - started_at)
+                self._in_flight.dec()
+
+    async def aclose(self) -> None:
+        await self._transport.aclose()
+
+
+class RuntimeMetricsCollector(Collector):
+    """
+    Lê, no momento da coleta, as estatísticas mantidas pelos componentes da aplicação.
+    Os componentes são informados em `bind` (pelo endpoint `/metrics`).
+    """
+
+    def __init__(self):
+        self.keycloak_adapter: "KeycloakAdapter | None" = None
+        self.webhook_dispatcher: "WebhookDispatcher | None" = None
+        self.webhook_service: "WebhookService | None" = None
+        self.seller_cache: "CachedSellerRepository | None" = None
+        self.redis_client_cache: "ClientSideCache | None" = None
+
+    def bind(self, **components: Any):
+        for name, component in components.items():
+            setattr(self, name, component)
+
+    def describe(self):
+        return []
+
+    def collect(self):
+        if self.keycloak_adapter is not None:
+            yield from self._token_cache_metrics(self.keycloak_adapter.token_cache_stats)
+        if self.webhook_dispatcher is not None:
+            yield from self._webhook_dispatcher_metrics(self.webhook_dispatcher.stats())
+        if self.webhook_service is not None:
+            yield GaugeMetricFamily(
+                "webhook_circuit_open",
+                "1 quando o circuit breaker do webhook está recusando envios",
+                value=int(self.webhook_service.circuit_breaker.state == "open"),
+            )
+        if self.seller_cache is not None:
+            yield from self._seller_cache_metrics(self.seller_cache.stats)
+        if self.redis_client_cache is not None:
+            yield from self._redis_client_cache_metrics(self.redis_client_cache.stats)
+
+    @staticmethod
+    def _token_cache_metrics(stats: dict):
+        yield CounterMetricFamily(
+            "keycloak_token_cache_hits", "Tokens encontrados no cache de validação", stats["hits"]
+        )
+        yield CounterMetricFamily(
+            "keycloak_token_cache_misses", "Tokens não encontrados no cache de validação", stats["misses"]
+        )
+        yield GaugeMetricFamily("keycloak_token_cache_size", "Tokens no cache de validação", stats["size"])
+        yield GaugeMetricFamily("keycloak_token_cache_max_size", "Capacidade do cache de validação", stats["max_size"])
+
+    @staticmethod
+    def _seller_cache_metrics(stats: dict):
+        hits = CounterMetricFamily("seller_cache_hits", "Sellers encontrados no cache, por camada", labels=["layer"])
+        hits.add_metric(["local"], stats["local_hits"])
+        hits.add_metric(["redis"], stats["redis_hits"])
+        yield hits
+        yield CounterMetricFamily(
+            "seller_cache_misses", "Sellers lidos do Mongo por não estarem no cache", stats["misses"]
+        )
+        yield GaugeMetricFamily(
+            "seller_cache_hit_ratio", "Fração das buscas de seller atendidas pelo cache", stats["hit_ratio"]
+        )
+        yield GaugeMetricFamily(
+            "seller_cache_local_size", "Entradas no cache de sellers do processo", stats["local_size"]
+        )
+
+    @staticmethod
+    def _redis_client_cache_metrics(stats: dict):
+        yield CounterMetricFamily(
+            "redis_client_cache_hits", "Leituras do Redis atendidas pela memória do processo", stats["hits"]
+        )
+        yield CounterMetricFamily(
+            "redis_client_cache_misses", "Leituras do Redis fora do cache do lado do cliente", stats["misses"]
+        )
+        yield CounterMetricFamily(
+            "redis_client_cache_invalidations", "Invalidações do cache do lado do cliente", stats["invalidations"]
+        )
+        yield GaugeMetricFamily("redis_client_cache_size", "Chaves no cache do lado do cliente", stats["size"])
+        yield GaugeMetricFamily(
+            "redis_client_cache_active",
+            "1 enquanto o cache do lado do cliente recebe as invalidações",
+            int(stats["active"]),
+        )
+
+    @staticmethod
+    def _webhook_dispatcher_metrics(stats: dict):
+        yield GaugeMetricFamily("webhook_queue_depth", "Notificações aguardando envio ao webhook", stats["queue_depth"])
+        yield GaugeMetricFamily("webhook_queue_max_size", "Capacidade da fila do webhook", stats["queue_max_size"])
+        yield CounterMetricFamily("webhook_notifications_enqueued", "Notificações enfileiradas", stats["enqueued"])
+        yield CounterMetricFamily(
+            "webhook_notifications_dropped", "Notificações descartadas com a fila cheia", stats["dropped"]
+        )
+        yield CounterMetricFamily(
+            "webhook_notifications_coalesced", "Notificações agrupadas com outras do mesmo seller", stats["coalesced"]
+        )
+        yield CounterMetricFamily("webhook_messages_sent", "Mensagens enviadas ao webhook", stats["sent_messages"])
+        yield CounterMetricFamily(
+            "webhook_messages_failed", "Mensagens não enviadas ao webhook", stats["failed_messages"]
+        )
+
+
+RUNTIME_COLLECTOR = RuntimeMetricsCollector()
+REGISTRY.register(RUNTIME_COLLECTOR)
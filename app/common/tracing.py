@@ -0,0 +1,207 @@
+"""
+Rastreamento distribuído (OpenTelemetry), opcional.
+
+Os pacotes do OpenTelemetry (`requirements/tracing.txt`) não são obrigatórios: sem eles, ou enquanto
+`configure_tracing` não for chamado, os helpers deste módulo não criam spans e o custo no caminho da
+requisição é o de uma verificação. O contexto do trace (W3C `traceparent`) e o `X-Request-ID` da requisição
+são propagados nos cabeçalhos HTTP de saída e nos cabeçalhos das mensagens do RabbitMQ.
+"""
+
+import functools
+import importlib.util
+import logging
+import os
+import threading
+from contextlib import contextmanager
+from typing import Any, Iterator, Mapping
+
+from asgi_correlation_id import correlation_id
+
+logger = logging.getLogger(__name__)
+
+OTEL_AVAILABLE = (
+    importlib.util.find_spec("opentelemetry") is not None and importlib.util.find_spec("opentelemetry.sdk") is not None
+)
+
+HEADER_X_REQUEST_ID = "X-Request-ID"
+EXPORTER_FILE = "file"
+EXPORTER_OTLP = "otlp"
+EXPORTER_CONSOLE = "console"
+DEFAULT_TRACES_FILE_PATH = "traces.jsonl"
+
+if OTEL_AVAILABLE:
+    from opentelemetry import propagate, trace
+    from opentelemetry.sdk.resources import Resource
+    from opentelemetry.sdk.trace import TracerProvider
+    from opentelemetry.sdk.trace.export import BatchSpanProcessor, SpanExporter, SpanExportResult
+    from opentelemetry.sdk.trace.sampling import ParentBased, TraceIdRatioBased
+    from opentelemetry.trace import SpanKind
+
+    class OTLPJsonFileSpanExporter(SpanExporter):
+        """
+        Exportador que grava os spans no formato OTLP/JSON (uma `ExportTraceServiceRequest` por linha),
+        o mesmo aceito pelo receptor de arquivos do OpenTelemetry Collector. Usado em desenvolvimento e nos testes.
+        """
+
+        def __init__(self, path: str):
+            from google.protobuf.json_format import MessageToJson
+            from opentelemetry.exporter.otlp.proto.common.trace_encoder import encode_spans
+
+            self.path = path
+            self._encode_spans = encode_spans
+            self._to_json = MessageToJson
+            self._lock = threading.Lock()
+
+        def export(self, spans) -> "SpanExportResult":
+            line = self._to_json(self._encode_spans(spans), indent=None)
+            try:
+                with self._lock, open(self.path, "a", encoding="utf-8") as file:
+                    file.write(line + "\n")
+            except OSError:
+                logger.exception("Falha ao gravar os spans em '%s'", self.path)
+                return SpanExportResult.FAILURE
+            return SpanExportResult.SUCCESS
+
+        def shutdown(self) -> None:
+            pass
+
+        def force_flush(self, timeout_millis: int = 30000) -> bool:
+            return True
+
+
+_provider: "TracerProvider | None" = None
+_tracer: "trace.Tracer | None" = None
+
+
+def tracing_enabled() -> bool:
+    return _tracer is not None
+
+
+def configure_tracing(
+    service_name: str,
+    exporter: str = EXPORTER_FILE,
+    file_path: str = DEFAULT_TRACES_FILE_PATH,
+    sample_ratio: float = 1.0,
+    span_exporter: "SpanExporter | None" = None,
+) -> "TracerProvider | None":
+    """
+    Habilita o rastreamento no processo. `exporter` escolhe o destino dos spans: `file` (OTLP/JSON em
+    `file_path`), `otlp` (OTLP/HTTP, configurado pelas variáveis `OTEL_EXPORTER_OTLP_*`) ou `console`.
+    Traces iniciados em outro serviço respeitam a decisão de amostragem de origem.
+    """
+    global _provider, _tracer
+    if not OTEL_AVAILABLE:
+        logger.warning("Rastreamento habilitado, mas os pacotes do OpenTelemetry não estão instalados")
+        return None
+
+    shutdown_tracing()
+    _provider = TracerProvider(
+        resource=Resource.create({"service.name": service_name}),
+        sampler=ParentBased(TraceIdRatioBased(sample_ratio)),
+    )
+    _provider.add_span_processor(BatchSpanProcessor(span_exporter or _build_exporter(exporter, file_path)))
+    _tracer = _provider.get_tracer("app")
+    logger.info("Rastreamento habilitado: serviço '%s', exportador '%s'", service_name, exporter)
+    return _provider
+
+
+def configure_tracing_from_env(service_name: str) -> "TracerProvider | None":
+    """
+    Habilita o rastreamento a partir das variáveis `TRACING_*` (usado pelos consumers, fora da API).
+    """
+    if os.getenv("TRACING_ENABLED", "false").lower() not in ("1", "true", "yes"):
+        return None
+    return configure_tracing(
+        service_name,
+        exporter=os.getenv("TRACING_EXPORTER", EXPORTER_FILE),
+        file_path=os.getenv("TRACING_FILE_PATH", DEFAULT_TRACES_FILE_PATH),
+        sample_ratio=float(os.getenv("TRACING_SAMPLE_RATIO", "1.0")),
+    )
+
+
+def shutdown_tracing():
+    """
+    Exporta os spans pendentes e desabilita o rastreamento.
+    """
+    global _provider, _tracer
+    if _provider is not None:
+        _provider.shutdown()
+    _provider = None
+    _tracer = None
+
+
+def _build_exporter(exporter: str, file_path: str) -> "SpanExporter":
+    if exporter == EXPORTER_FILE:
+        return OTLPJsonFileSpanExporter(file_path)
+    if exporter == EXPORTER_OTLP:
+        from opentelemetry.exporter.otlp.proto.http.trace_exporter import OTLPSpanExporter
+
+        return OTLPSpanExporter()
+    if exporter == EXPORTER_CONSOLE:
+        from opentelemetry.sdk.trace.export import ConsoleSpanExporter
+
+        return ConsoleSpanExporter()
+    raise ValueError(f"Exportador de spans desconhecido: {exporter}")
+
+
+@contextmanager
+def start_span(
+    name: str,
+    kind: str = "internal",
+    attributes: Mapping[str, Any] | None = None,
+    carrier: Mapping[str, Any] | None = None,
+) -> Iterator[Any]:
+    """
+    Inicia um span filho do span atual ou, quando `carrier` é informado, do contexto propagado nele
+    (cabeçalhos HTTP ou AMQP). Exceções são registradas no span. Retorna `None` com o rastreamento desabilitado.
+    """
+    if _tracer is None:
+        yield None
+        return
+    context = propagate.extract(carrier) if carrier is not None else None
+    with _tracer.start_as_current_span(
+        name, context=context, kind=SpanKind[kind.upper()], attributes=attributes
+    ) as span:
+        yield span
+
+
+def traced(name: str | None = None, kind: str = "internal"):
+    """
+    Envolve um método assíncrono em um span (por padrão, `<Classe>.<método>`). Atributos fixos do componente
+    são lidos de `self._span_attributes`, quando existir.
+    """
+
+    def decorator(func):
+        @functools.wraps(func)
+        async def wrapper(self, *args, **kwargs):
+            if _tracer is None:
+                return await func(self, *args, **kwargs)
+            span_name = name or f"{type(self).__name__}.{func.__name__}"
+            with start_span(span_name, kind, getattr(self, "_span_attributes", None)):
+                return await func(self, *args, **kwargs)
+
+        return wrapper
+
+    return decorator
+
+
+def current_trace_context() -> dict[str, str] | None:
+    """
+    Contexto da requisição atual a ser propagado (cabeçalhos `traceparent` e `X-Request-ID`), ou `None`.
+    """
+    carrier: dict[str, str] = {}
+    if _tracer is not None:
+        propagate.inject(carrier)
+    if request_id := correlation_id.get():
+        carrier[HEADER_X_REQUEST_ID] = request_id
+    return carrier or None
+
+
+def inject_trace_context(headers: Mapping[str, Any] | None = None) -> dict[str, Any] | None:
+    """
+    Retorna `headers` acrescido do contexto atual (ver `current_trace_context`).
+    """
+    context = current_trace_context()
+    if context is None:
+        return dict(headers) if headers is not None else None
+    return {**(headers or {}), **context}
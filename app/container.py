@@ -4,7 +4,10 @@ from app.clients.keycloak_admin_client import KeycloakAdminClient
 from app.integrations.auth.keycloak_adapter import KeycloakAdapter
 from app.integrations.kv_db.redis_asyncio_adapter import RedisAsyncioAdapter
 from app.integrations.database.mongo_client import MongoClient
-from app.repositories import SellerRepository
+from app.repositories import CachedSellerRepository, SellerRepository
+from app.services.outbox_relay import OutboxRelay
+from app.services.publisher import AsyncRabbitMQPublisher
+from app.services.webhook_dispatcher import WebhookDispatcher
 from app.services import HealthCheckService, SellerService, UserService, GeminiService, WebhookService
 from app.settings.app import AppSettings
 from app.settings.app import settings as settings_instance
@@ -29,25 +32,61 @@ class Container(containers.DeclarativeContainer):
     redis_adapter = providers.Singleton(
         RedisAsyncioAdapter,
         redis_url=config.REDIS_URL,
+        max_connections=config.REDIS_MAX_CONNECTIONS,
+        pool_timeout_seconds=config.REDIS_POOL_TIMEOUT_SECONDS,
+        socket_timeout_seconds=config.REDIS_SOCKET_TIMEOUT_SECONDS,
+        socket_connect_timeout_seconds=config.REDIS_SOCKET_CONNECT_TIMEOUT_SECONDS,
+        serializer=config.REDIS_SERIALIZER,
+        client_cache_prefixes=providers.Callable(
+            lambda enabled, prefixes: prefixes if enabled else None,
+            config.REDIS_CLIENT_CACHE_ENABLED,
+            config.REDIS_CLIENT_CACHE_PREFIXES,
+        ),
+        client_cache_mode=config.REDIS_CLIENT_CACHE_MODE,
+        client_cache_max_size=config.REDIS_CLIENT_CACHE_MAX_SIZE,
+        client_cache_poll_interval_seconds=config.REDIS_CLIENT_CACHE_POLL_INTERVAL_SECONDS,
+    )
+
+    seller_cache = providers.Singleton(
+        CachedSellerRepository,
+        repository=seller_repository,
+        inmemory_adapter=redis_adapter,
+        ttl_seconds=config.SELLER_CACHE_TTL_SECONDS,
+        local_ttl_seconds=config.SELLER_CACHE_LOCAL_TTL_SECONDS,
+        local_max_size=config.SELLER_CACHE_LOCAL_MAX_SIZE,
+    )
+
+    # Repositório usado pelo SellerService: com o cache habilitado, as leituras por id e CNPJ passam pelo cache
+    seller_service_repository = providers.Selector(
+        config.SELLER_CACHE_ENABLED.as_(lambda enabled: "cached" if enabled else "mongo"),
+        cached=seller_cache,
+        mongo=seller_repository,
     )
 
     keycloak_admin_client = providers.Singleton(
         KeycloakAdminClient,
+        inmemory_adapter=redis_adapter,
     )
 
     keycloak_adapter = providers.Singleton(
         KeycloakAdapter,
         well_known_url=config.KEYCLOAK_WELL_KNOWN_URL,
         inmemory_adapter=redis_adapter,
+        token_cache_max_size=config.KEYCLOAK_TOKEN_CACHE_MAX_SIZE,
     )
 
     health_check_service = providers.Singleton(
         HealthCheckService, checkers=config.health_check_checkers, settings=settings
     )
 
+    rabbitmq_publisher = providers.Singleton(
+        AsyncRabbitMQPublisher,
+        channel_pool_size=config.RABBITMQ_CHANNEL_POOL_SIZE,
+    )
+
     seller_service = providers.Singleton(
         SellerService,
-        repository=seller_repository,
+        repository=seller_service_repository,
         keycloak_client=keycloak_admin_client,
     )
 
@@ -64,4 +103,28 @@ class Container(containers.DeclarativeContainer):
 
     webhook_service = providers.Singleton(
         WebhookService,
+        inmemory_adapter=redis_adapter,
+        rate_limit_per_second=config.WEBHOOK_RATE_LIMIT_PER_SECOND,
+        rate_limit_burst=config.WEBHOOK_RATE_LIMIT_BURST,
+        circuit_failure_threshold=config.WEBHOOK_CIRCUIT_FAILURE_THRESHOLD,
+        circuit_recovery_timeout_seconds=config.WEBHOOK_CIRCUIT_RECOVERY_TIMEOUT_SECONDS,
+    )
+
+    webhook_dispatcher = providers.Singleton(
+        WebhookDispatcher,
+        webhook_service=webhook_service,
+        queue_max_size=config.WEBHOOK_QUEUE_MAX_SIZE,
+        coalesce_window_seconds=config.WEBHOOK_COALESCE_WINDOW_SECONDS,
+        max_batch_size=config.WEBHOOK_MAX_BATCH_SIZE,
+    )
+
+    outbox_relay = providers.Singleton(
+        OutboxRelay,
+        repository=seller_repository,
+        publisher=rabbitmq_publisher,
+        webhook_service=webhook_service,
+        inmemory_adapter=redis_adapter,
+        webhook_dispatcher=webhook_dispatcher,
+        batch_size=config.OUTBOX_BATCH_SIZE,
+        poll_interval_seconds=config.OUTBOX_POLL_INTERVAL_SECONDS,
     )
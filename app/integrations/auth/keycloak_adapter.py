@@ -1,13 +1,37 @@
+import asyncio
+import time
+
 import httpx
 import jwt
 import logging
 from typing import TYPE_CHECKING
 
+from redis.exceptions import LockError
+
+from app.common.hash_utils import generate_hash
+from app.common.metrics import InstrumentedTransport
+from app.integrations.cache import TTLLRUCache
+
 if TYPE_CHECKING:
     from app.integrations.kv_db.redis_asyncio_adapter import RedisAsyncioAdapter
 
 logger = logging.getLogger(__name__)
 
+DEFAULT_TOKEN_CACHE_MAX_SIZE = 10_000
+WELL_KNOWN_CACHE_TTL_SECONDS = 24 * 3600
+JWKS_CACHE_TTL_SECONDS = 3600
+# O JWKS é renovado no Keycloak quando faltar menos que essa margem para expirar no Redis
+JWKS_REFRESH_MARGIN_SECONDS = 600
+# Intervalo em que cada processo verifica (e, se necessário, renova) o JWKS em segundo plano
+JWKS_REFRESH_INTERVAL_SECONDS = 300
+# Intervalo mínimo entre duas buscas do JWKS no Keycloak, considerando todos os processos
+JWKS_MIN_REFRESH_INTERVAL_SECONDS = 30
+JWKS_LOCK_TIMEOUT_SECONDS = 10
+UNKNOWN_KID_CACHE_TTL_SECONDS = 60
+# Intervalo mínimo, neste processo, entre duas renovações do JWKS disparadas por chaves desconhecidas
+UNKNOWN_KEY_REFRESH_MIN_INTERVAL_SECONDS = 10
+UNKNOWN_KID_CACHE_MAX_SIZE = 1024
+
 # ----- Exceções -----
 
 
@@ -24,36 +48,109 @@ class InvalidTokenException(OAuthException):
 
 
 class KeycloakAdapter:
-    def __init__(self, well_known_url: str, inmemory_adapter: "RedisAsyncioAdapter"):
+    def __init__(
+        self,
+        well_known_url: str,
+        inmemory_adapter: "RedisAsyncioAdapter",
+        token_cache_max_size: int = DEFAULT_TOKEN_CACHE_MAX_SIZE,
+    ):
         self.well_known_url = str(well_known_url)
-        self.jwks_client = jwt.PyJWKClient(self._get_jwks_uri())
         self.inmemory_adapter = inmemory_adapter
+        self.well_known_cache_key = f"keycloak:well_known:{self.well_known_url}"
         self.public_keys_cache_key = f"keycloak:public_keys:{self.well_known_url}"
+        # Preenchido na descoberta OIDC (lifespan da aplicação ou primeiro uso)
+        self.jwks_client: jwt.PyJWKClient | None = None
+        self._discovery_lock = asyncio.Lock()
+        # Chaves públicas indexadas pelo `kid`, montadas a partir do JWKS
+        self.signing_keys: dict[str, jwt.PyJWK] = {}
+        # Tokens já validados, indexados pelo hash do token e válidos até o `exp` do próprio token
+        self.token_cache: TTLLRUCache[str, dict] = TTLLRUCache(max_size=token_cache_max_size)
+        # Cache negativo de `kid` inexistentes no JWKS, evitando novas buscas para chaves inválidas
+        self.unknown_kids: TTLLRUCache[str, bool] = TTLLRUCache(max_size=UNKNOWN_KID_CACHE_MAX_SIZE)
+        # Busca do JWKS em andamento neste processo, compartilhada entre requisições concorrentes
+        self._keys_refresh: asyncio.Task | None = None
+        # Instante (monotônico) da última renovação disparada por uma chave desconhecida
+        self._last_unknown_key_refresh = float("-inf")
+        self._background_refresh: asyncio.Task | None = None
 
-    def _get_jwks_uri(self) -> str:
-        """Busca o .well-known de forma síncrona no construtor."""
-        with httpx.Client() as http_client:
-            response = http_client.get(self.well_known_url)
-            response.raise_for_status()
-            return response.json()["jwks_uri"]
+    async def discover(self):
+        """
+        Realiza a descoberta OIDC (.well-known) e carrega as chaves públicas, sem bloquear o event loop.
 
-    async def validate_token(self, token: str) -> dict:
-        try:
+        O documento .well-known e o JWKS são lidos do Redis quando disponíveis, de modo que novos
+        workers iniciam sem contatar o Keycloak. A chamada é idempotente e segura para concorrência.
+        """
+        if self.jwks_client is not None:
+            return
+
+        async with self._discovery_lock:
+            if self.jwks_client is not None:
+                return
+
+            started_at = time.perf_counter()
+            well_known = await self._get_well_known()
+            self.jwks_client = jwt.PyJWKClient(well_known["jwks_uri"])
             try:
-                signing_key = self.jwks_client.get_signing_key_from_jwt(token)
-            except jwt.exceptions.PyJWKClientError:
-                logger.info("Chave não encontrada no cache local, buscando no Redis/HTTP...")
                 await self._fetch_and_cache_keys()
-                signing_key = self.jwks_client.get_signing_key_from_jwt(token)
+            except Exception:
+                # As chaves serão buscadas sob demanda na validação do primeiro token
+                logger.warning("Falha ao carregar as chaves públicas durante a descoberta OIDC.", exc_info=True)
+            logger.info(
+                f"Descoberta OIDC concluída em {(time.perf_counter() - started_at) * 1000:.2f}ms "
+                f"({len(self.signing_keys)} chaves carregadas)."
+            )
+
+    async def _get_well_known(self) -> dict:
+        """Busca o documento .well-known no Redis ou, em último caso, no Keycloak."""
+        try:
+            cached_well_known = await self.inmemory_adapter.get_json(self.well_known_cache_key)
+        except Exception:
+            logger.warning("Falha ao ler o .well-known do cache Redis.", exc_info=True)
+            cached_well_known = None
+
+        if isinstance(cached_well_known, dict) and cached_well_known:
+            logger.debug("Documento .well-known carregado do cache Redis.")
+            return cached_well_known
+
+        async with httpx.AsyncClient(transport=InstrumentedTransport("keycloak_oidc")) as client:
+            response = await client.get(self.well_known_url)
+            response.raise_for_status()
+            well_known: dict = response.json()
+
+        try:
+            await self.inmemory_adapter.set_json(
+                self.well_known_cache_key, well_known, expires_in_seconds=WELL_KNOWN_CACHE_TTL_SECONDS
+            )
+        except Exception:
+            logger.warning("Falha ao salvar o .well-known no cache Redis.", exc_info=True)
+        return well_known
+
+    @property
+    def token_cache_stats(self) -> dict:
+        """Estatísticas (hits/misses) do cache de tokens validados."""
+        return self.token_cache.stats
+
+    async def validate_token(self, token: str) -> dict:
+        token_hash = generate_hash(token)
+        cached_info_token = self.token_cache.get(token_hash)
+        if cached_info_token is not None:
+            return cached_info_token
 
+        try:
+            await self.discover()
             unverified_header = jwt.get_unverified_header(token)
+            algorithm = unverified_header.get("alg")
+            if not isinstance(algorithm, str):
+                raise jwt.InvalidTokenError("Token sem algoritmo de assinatura")
+            signing_key = await self._get_signing_key(unverified_header.get("kid"))
             info_token = jwt.decode(
                 token,
                 signing_key.key,
-                algorithms=[unverified_header.get("alg")],
+                algorithms=[algorithm],
                 options={"verify_aud": False},
             )
             logger.info(f"Token validado com sucesso para o usuário sub: {info_token.get('sub')}")
+            self._cache_validated_token(token_hash, info_token)
             return info_token
         except jwt.ExpiredSignatureError as e:
             raise TokenExpiredException("Token expirou") from e
@@ -63,20 +160,159 @@ class KeycloakAdapter:
             logger.error("Falha inesperada ao validar o token", exc_info=True)
             raise OAuthException("Falha inesperada ao validar o token") from e
 
-    async def _fetch_and_cache_keys(self):
-        """Busca chaves no Redis ou, em último caso, no Keycloak e as salva no cache."""
-        cached_keys = await self.inmemory_adapter.get_json(self.public_keys_cache_key)
-        if cached_keys:
-            logger.debug("Chaves públicas carregadas do cache Redis.")
-            self.jwks_client.jwk_set = cached_keys
+    async def _get_signing_key(self, kid: str | None) -> jwt.PyJWK:
+        """Resolve a chave de assinatura pelo `kid`, recorrendo ao JWKS apenas quando ela ainda não é conhecida."""
+        if kid is not None:
+            if (signing_key := self.signing_keys.get(kid)) is not None:
+                return signing_key
+            if kid in self.unknown_kids:
+                raise jwt.InvalidTokenError(f"Chave de assinatura desconhecida: {kid}")
+
+            logger.info("Chave não encontrada no cache local, buscando no Redis/HTTP...")
+            if not await self._refresh_for_unknown_key():
+                # Renovação recente: a chave não é marcada como inexistente, pois pode ter acabado de ser publicada
+                raise jwt.InvalidTokenError(f"Chave de assinatura desconhecida: {kid}")
+            if (signing_key := self.signing_keys.get(kid)) is not None:
+                return signing_key
+
+            self.unknown_kids.set(kid, True, expires_at=time.time() + UNKNOWN_KID_CACHE_TTL_SECONDS)
+            raise jwt.InvalidTokenError(f"Chave de assinatura desconhecida: {kid}")
+
+        # Tokens sem `kid` só são aceitos quando o JWKS tem uma única chave de assinatura
+        if not self.signing_keys:
+            logger.info("Nenhuma chave no cache local, buscando no Redis/HTTP...")
+            await self._refresh_for_unknown_key()
+        if len(self.signing_keys) == 1:
+            return next(iter(self.signing_keys.values()))
+        raise jwt.InvalidTokenError(f"Token sem `kid` e {len(self.signing_keys)} chaves de assinatura no JWKS")
+
+    def _discovered_jwks_client(self) -> jwt.PyJWKClient:
+        """Cliente do JWKS, criado na descoberta OIDC."""
+        if self.jwks_client is None:
+            raise OAuthException("Descoberta OIDC não realizada")
+        return self.jwks_client
+
+    async def _refresh_for_unknown_key(self) -> bool:
+        """
+        Renova o JWKS por causa de uma chave desconhecida, no máximo uma vez a cada
+        `UNKNOWN_KEY_REFRESH_MIN_INTERVAL_SECONDS`, qualquer que seja o `kid`: tokens com `kid` inventados
+        não geram tráfego de lock, Redis e Keycloak a cada requisição. Uma renovação em andamento é aguardada.
+        Retorna False se a renovação foi suprimida.
+        """
+        if self._keys_refresh is None or self._keys_refresh.done():
+            now = time.monotonic()
+            if now - self._last_unknown_key_refresh < UNKNOWN_KEY_REFRESH_MIN_INTERVAL_SECONDS:
+                logger.debug("Renovação do JWKS por chave desconhecida suprimida (renovado há pouco).")
+                return False
+            self._last_unknown_key_refresh = now
+        await self._refresh_signing_keys()
+        return True
+
+    async def _refresh_signing_keys(self):
+        """
+        Força a renovação do JWKS. Requisições concorrentes compartilham a mesma busca (single-flight)
+        e o cancelamento de uma delas não interrompe a busca das demais.
+        """
+        if self._keys_refresh is None or self._keys_refresh.done():
+            self._keys_refresh = asyncio.create_task(self._fetch_and_cache_keys(force_refresh=True))
+        await asyncio.shield(self._keys_refresh)
+
+    async def refresh_keys(self):
+        """Renova o JWKS no Keycloak se estiver perto de expirar no Redis; caso contrário, recarrega do Redis."""
+        await self.discover()
+        remaining_ttl = await self.inmemory_adapter.ttl(self.public_keys_cache_key)
+        if remaining_ttl > JWKS_REFRESH_MARGIN_SECONDS:
+            await self._fetch_and_cache_keys()
+        else:
+            await self._refresh_signing_keys()
+
+    def start_background_refresh(self):
+        """Inicia a renovação periódica do JWKS em segundo plano."""
+        if self._background_refresh is None or self._background_refresh.done():
+            self._background_refresh = asyncio.create_task(self._background_refresh_loop())
+
+    async def stop_background_refresh(self):
+        """Interrompe a renovação periódica do JWKS."""
+        if self._background_refresh is None:
             return
+        self._background_refresh.cancel()
+        try:
+            await self._background_refresh
+        except asyncio.CancelledError:
+            pass
+        self._background_refresh = None
+
+    async def _background_refresh_loop(self):
+        while True:
+            await asyncio.sleep(JWKS_REFRESH_INTERVAL_SECONDS)
+            try:
+                await self.refresh_keys()
+            except Exception:
+                logger.warning("Falha ao renovar as chaves públicas em segundo plano.", exc_info=True)
 
-        # Se não estiver no Redis, busca no Keycloak
-        logger.warning("Cache Redis vazio. Buscando chaves públicas diretamente do Keycloak.")
-        async with httpx.AsyncClient() as client:
-            response = await client.get(self.jwks_client.uri)
+    def _cache_validated_token(self, token_hash: str, info_token: dict):
+        """Guarda o token validado até o seu `exp`. Tokens sem `exp` não são cacheados."""
+        exp = info_token.get("exp")
+        if isinstance(exp, (int, float)) and exp > time.time():
+            self.token_cache.set(token_hash, info_token, expires_at=exp)
+
+    def _load_signing_keys(self, jwk_set: dict):
+        """Monta o mapa `kid` -> chave a partir de um JWKS, ignorando chaves não suportadas."""
+        signing_keys = {}
+        for jwk_data in jwk_set.get("keys", []):
+            if jwk_data.get("use", "sig") != "sig" or not jwk_data.get("kid"):
+                continue
+            try:
+                signing_keys[jwk_data["kid"]] = jwt.PyJWK(jwk_data)
+            except jwt.exceptions.PyJWTError:
+                logger.debug(f"Chave '{jwk_data.get('kid')}' do JWKS ignorada por não ser suportada.")
+        self.signing_keys = signing_keys
+        # Apenas os `kid` que passaram a existir saem do cache negativo; os demais continuam recusados
+        for kid in signing_keys:
+            self.unknown_kids.delete(kid)
+
+    async def _fetch_and_cache_keys(self, force_refresh: bool = False):
+        """
+        Busca chaves no Redis ou, em último caso (ou quando `force_refresh`), no Keycloak e as salva no cache.
+
+        A busca no Keycloak é serializada entre processos por um lock no Redis e não é repetida se outro
+        processo renovou as chaves há menos de `JWKS_MIN_REFRESH_INTERVAL_SECONDS`.
+        """
+        if not force_refresh and await self._load_keys_from_redis():
+            return
+
+        try:
+            async with self.inmemory_adapter.locks(
+                self.public_keys_cache_key,
+                timeout_in_seconds=JWKS_LOCK_TIMEOUT_SECONDS,
+                blocking_timeout_in_seconds=JWKS_LOCK_TIMEOUT_SECONDS,
+            ):
+                # Outro processo pode ter renovado as chaves enquanto aguardávamos o lock
+                remaining_ttl = await self.inmemory_adapter.ttl(self.public_keys_cache_key)
+                recently_refreshed = remaining_ttl > JWKS_CACHE_TTL_SECONDS - JWKS_MIN_REFRESH_INTERVAL_SECONDS
+                if recently_refreshed and await self._load_keys_from_redis():
+                    return
+                await self._fetch_keys_from_keycloak()
+        except LockError:
+            logger.warning("Lock de renovação das chaves públicas não obtido; usando as chaves do Redis.")
+            await self._load_keys_from_redis()
+
+    async def _load_keys_from_redis(self) -> bool:
+        cached_keys = await self.inmemory_adapter.get_json(self.public_keys_cache_key)
+        if not isinstance(cached_keys, dict) or not cached_keys:
+            return False
+        logger.debug("Chaves públicas carregadas do cache Redis.")
+        self._load_signing_keys(cached_keys)
+        return True
+
+    async def _fetch_keys_from_keycloak(self):
+        logger.warning("Buscando chaves públicas diretamente do Keycloak.")
+        async with httpx.AsyncClient(transport=InstrumentedTransport("keycloak_oidc")) as client:
+            response = await client.get(self._discovered_jwks_client().uri)
             response.raise_for_status()
-            jwk_set = response.json()
+            jwk_set: dict = response.json()
             # Salva no cache Redis com uma expiração (1 hora por enquanto, definir regra de negocio)
-            await self.inmemory_adapter.set_json(self.public_keys_cache_key, jwk_set, expires_in_seconds=3600)
-            self.jwks_client.jwk_set = jwk_set
+            await self.inmemory_adapter.set_json(
+                self.public_keys_cache_key, jwk_set, expires_in_seconds=JWKS_CACHE_TTL_SECONDS
+            )
+            self._load_signing_keys(jwk_set)
@@ -0,0 +1,3 @@
+from .lru_cache import TTLLRUCache
+
+__all__ = ["TTLLRUCache"]
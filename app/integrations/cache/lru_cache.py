@@ -0,0 +1,77 @@
+import time
+from collections import OrderedDict
+from typing import Callable, Generic, Hashable, TypeVar
+
+K = TypeVar("K", bound=Hashable)
+V = TypeVar("V")
+
+
+class TTLLRUCache(Generic[K, V]):
+    """
+    Cache LRU em memória (por processo), limitado em quantidade de itens e com expiração por item.
+
+    Cada item pode ter o seu próprio instante de expiração (timestamp epoch em segundos).
+    Os contadores `hits` e `misses` permitem acompanhar a eficiência do cache.
+    """
+
+    def __init__(self, max_size: int = 1024, clock: Callable[[], float] = time.time):
+        if max_size < 1:
+            raise ValueError("max_size deve ser maior que zero")
+        self.max_size = max_size
+        self._clock = clock
+        self._data: OrderedDict[K, tuple[V, float | None]] = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key: K, default: V | None = None) -> V | None:
+        entry = self._data.get(key)
+        if entry is None:
+            self.misses += 1
+            return default
+
+        value, expires_at = entry
+        if expires_at is not None and expires_at <= self._clock():
+            del self._data[key]
+            self.misses += 1
+            return default
+
+        self._data.move_to_end(key)
+        self.hits += 1
+        return value
+
+    def set(self, key: K, value: V, expires_at: float | None = None):
+        self._data[key] = (value, expires_at)
+        self._data.move_to_end(key)
+        while len(self._data) > self.max_size:
+            self._data.popitem(last=False)
+
+    def delete(self, key: K):
+        self._data.pop(key, None)
+
+    def clear(self):
+        self._data.clear()
+
+    def keys(self) -> list[K]:
+        """Chaves guardadas, da menos para a mais recentemente usada (incluindo as já expiradas)."""
+        return list(self._data)
+
+    def __contains__(self, key: K) -> bool:
+        entry = self._data.get(key)
+        if entry is None:
+            return False
+        _, expires_at = entry
+        return expires_at is None or expires_at > self._clock()
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    @property
+    def stats(self) -> dict:
+        total = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "size": len(self._data),
+            "max_size": self.max_size,
+            "hit_ratio": (self.hits / total) if total else 0.0,
+        }
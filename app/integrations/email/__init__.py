@@ -0,0 +1,3 @@
+from .smtp_connection_pool import SMTPConnectionPool
+
+__all__ = ["SMTPConnectionPool"]
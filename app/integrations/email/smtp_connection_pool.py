@@ -0,0 +1,93 @@
+import logging
+import queue
+import smtplib
+import threading
+from contextlib import contextmanager
+from typing import Callable, Iterator
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_ACQUIRE_TIMEOUT_SECONDS = 30
+# Erros em que o servidor respondeu normalmente (ex.: destinatário recusado): a sessão continua utilizável
+REUSABLE_SESSION_ERRORS = (smtplib.SMTPRecipientsRefused, smtplib.SMTPResponseException)
+
+
+class SMTPConnectionPool:
+    """
+    Pool thread-safe de sessões SMTP já autenticadas (STARTTLS + login), reutilizadas entre mensagens.
+
+    As sessões são abertas sob demanda até `max_size`; acima disso, quem pede uma sessão aguarda
+    a devolução de outra. Sessões que falharem durante o uso são descartadas e não voltam ao pool.
+    """
+
+    def __init__(
+        self,
+        factory: Callable[[], smtplib.SMTP],
+        max_size: int = 4,
+        acquire_timeout_seconds: float = DEFAULT_ACQUIRE_TIMEOUT_SECONDS,
+    ):
+        if max_size < 1:
+            raise ValueError("max_size deve ser maior que zero")
+        self._factory = factory
+        self.max_size = max_size
+        self.acquire_timeout_seconds = acquire_timeout_seconds
+        self._idle: queue.LifoQueue[smtplib.SMTP] = queue.LifoQueue()
+        self._opened = 0
+        self._lock = threading.Lock()
+
+    @property
+    def opened(self) -> int:
+        return self._opened
+
+    @contextmanager
+    def session(self) -> Iterator[smtplib.SMTP]:
+        smtp = self._acquire()
+        try:
+            yield smtp
+        except REUSABLE_SESSION_ERRORS:
+            self._idle.put(smtp)
+            raise
+        except Exception:
+            self._discard(smtp)
+            raise
+        else:
+            self._idle.put(smtp)
+
+    def close(self):
+        while True:
+            try:
+                smtp = self._idle.get_nowait()
+            except queue.Empty:
+                return
+            self._discard(smtp)
+
+    def _acquire(self) -> smtplib.SMTP:
+        try:
+            return self._idle.get_nowait()
+        except queue.Empty:
+            pass
+
+        with self._lock:
+            can_open = self._opened < self.max_size
+            if can_open:
+                self._opened += 1
+        if can_open:
+            try:
+                return self._factory()
+            except Exception:
+                with self._lock:
+                    self._opened -= 1
+                raise
+
+        try:
+            return self._idle.get(timeout=self.acquire_timeout_seconds)
+        except queue.Empty:
+            raise TimeoutError("Nenhuma sessão SMTP disponível no pool") from None
+
+    def _discard(self, smtp: smtplib.SMTP):
+        with self._lock:
+            self._opened -= 1
+        try:
+            smtp.quit()
+        except Exception:
+            logger.debug("Falha ao encerrar sessão SMTP descartada", exc_info=True)
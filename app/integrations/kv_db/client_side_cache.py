@@ -0,0 +1,257 @@
+"""
+Cache do lado do cliente (client-side caching) para as chaves "quentes" do Redis, lidas muito mais do que alteradas.
+
+No modo `tracking`, o processo assina o canal `__redis__:invalidate` e ativa, em uma conexão dedicada,
+`CLIENT TRACKING ON REDIRECT <id> BCAST PREFIX ...`: o Redis avisa cada alteração (ou expiração) das chaves com os
+prefixos configurados, feita por qualquer processo, e a entrada local é removida no mesmo instante. Servidores
+sem suporte a `CLIENT TRACKING` (anteriores ao Redis 6, junto com o RESP3, ou com o comando bloqueado) caem no modo
+`polling`, em que as entradas locais são conferidas com um único MGET a cada `poll_interval_seconds`.
+
+Enquanto o acompanhamento das invalidações não está ativo (antes de `start`, durante uma reconexão), as leituras
+seguem direto para o Redis. Ao perder a conexão de invalidações, o cache local é esvaziado.
+"""
+
+import asyncio
+import logging
+from typing import Callable, Iterable
+
+from redis.asyncio import Redis
+from redis.exceptions import RedisError, ResponseError
+
+from app.integrations.cache import TTLLRUCache
+
+logger = logging.getLogger(__name__)
+
+INVALIDATE_CHANNEL = "__redis__:invalidate"
+CLIENT_CACHE_MODES = ("tracking", "polling")
+DEFAULT_CLIENT_CACHE_MAX_SIZE = 10_000
+DEFAULT_CLIENT_CACHE_POLL_INTERVAL_SECONDS = 1.0
+# Intervalo da conferência de que o redirecionamento das invalidações continua ativo
+TRACKING_KEEPALIVE_SECONDS = 5.0
+TRACKING_RECONNECT_DELAY_SECONDS = 1.0
+POLL_BATCH_SIZE = 500
+
+
+class ClientSideCache:
+    """
+    Valores (em bytes) das chaves do Redis com os prefixos informados, guardados em memória no processo.
+
+    Leituras feitas enquanto a chave é invalidada não são guardadas (ver `begin_read`/`finish_read`), para que um
+    valor antigo não fique no cache depois do aviso de alteração.
+    """
+
+    def __init__(
+        self,
+        redis_client: Redis,
+        connect_tracking_client: Callable[[], Redis],
+        prefixes: Iterable[str],
+        mode: str = "tracking",
+        max_size: int = DEFAULT_CLIENT_CACHE_MAX_SIZE,
+        poll_interval_seconds: float = DEFAULT_CLIENT_CACHE_POLL_INTERVAL_SECONDS,
+    ):
+        """
+        :param connect_tracking_client: Cria o cliente de conexão única que mantém o `CLIENT TRACKING` ativo.
+        :param mode: `tracking` (invalidação pelo Redis, com queda para `polling` se não houver suporte) ou
+            `polling` (conferência periódica das entradas).
+        """
+        self.prefixes = tuple(prefixes)
+        if not self.prefixes:
+            raise ValueError("Informe ao menos um prefixo de chave para o cache do lado do cliente")
+        if mode not in CLIENT_CACHE_MODES:
+            raise ValueError(f"Modo desconhecido: {mode}. Use um de: {', '.join(CLIENT_CACHE_MODES)}")
+        self.redis_client = redis_client
+        self._connect_tracking_client = connect_tracking_client
+        self.mode = mode
+        self.poll_interval_seconds = poll_interval_seconds
+        self.local_cache: TTLLRUCache[str, bytes] = TTLLRUCache(max_size=max_size)
+        # Verdadeiro enquanto as alterações feitas por outros processos chegam a este cache
+        self.active = False
+        self._task: asyncio.Task | None = None
+        # Sequência das invalidações; uma leitura só é guardada se a chave não foi invalidada depois do seu início
+        self._sequence = 0
+        self._cleared_at = 0
+        self._reading: dict[str, int] = {}
+        self._invalidated_at: dict[str, int] = {}
+        self.hits = 0
+        self.misses = 0
+        self.invalidations = 0
+
+    @property
+    def stats(self) -> dict:
+        total = self.hits + self.misses
+        return {
+            "mode": self.mode,
+            "active": self.active,
+            "hits": self.hits,
+            "misses": self.misses,
+            "invalidations": self.invalidations,
+            "size": len(self.local_cache),
+            "max_size": self.local_cache.max_size,
+            "hit_ratio": (self.hits / total) if total else 0.0,
+        }
+
+    def serves(self, key: str) -> bool:
+        """Indica se a leitura da chave passa pelo cache local."""
+        return self.active and key.startswith(self.prefixes)
+
+    def get(self, key: str) -> bytes | None:
+        value = self.local_cache.get(key)
+        if value is None:
+            self.misses += 1
+        else:
+            self.hits += 1
+        return value
+
+    def begin_read(self, keys: Iterable[str]) -> int:
+        """Registra a leitura das chaves no Redis; o valor devolvido é informado em `finish_read`."""
+        for key in keys:
+            self._reading[key] = self._reading.get(key, 0) + 1
+        return self._sequence
+
+    def finish_read(self, keys: list[str], started_at: int, values: list[bytes | None] | None):
+        """
+        Guarda os valores lidos das chaves que não foram invalidadas durante a leitura. Com `values` None
+        (leitura com falha), apenas encerra o registro da leitura.
+        """
+        for index, key in enumerate(keys):
+            invalidated = self._cleared_at > started_at or self._invalidated_at.get(key, 0) > started_at
+            remaining = self._reading.get(key, 1) - 1
+            if remaining > 0:
+                self._reading[key] = remaining
+            else:
+                self._reading.pop(key, None)
+                self._invalidated_at.pop(key, None)
+            if invalidated or values is None:
+                continue
+            value = values[index]
+            if value is None:
+                self.local_cache.delete(key)
+            else:
+                self.local_cache.set(key, value)
+
+    def invalidate(self, keys: Iterable[str] | None):
+        """Remove as chaves do cache local; None remove todas (FLUSHDB/FLUSHALL ou perda das invalidações)."""
+        self._sequence += 1
+        self.invalidations += 1
+        if keys is None:
+            self._cleared_at = self._sequence
+            self.local_cache.clear()
+            return
+        for key in keys:
+            self.local_cache.delete(key)
+            if key in self._reading:
+                self._invalidated_at[key] = self._sequence
+
+    def start(self):
+        """Inicia o acompanhamento das invalidações em segundo plano."""
+        if self._task is None or self._task.done():
+            loop = self._tracking_loop if self.mode == "tracking" else self._polling_loop
+            self._task = asyncio.create_task(loop())
+
+    async def stop(self):
+        """Interrompe o acompanhamento das invalidações; as leituras seguintes vão direto ao Redis."""
+        self._deactivate()
+        if self._task is None:
+            return
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+        self._task = None
+
+    def _deactivate(self):
+        self.active = False
+        self.invalidate(None)
+
+    async def _tracking_loop(self):
+        while True:
+            try:
+                await self._track()
+            except asyncio.CancelledError:
+                raise
+            except ResponseError:
+                logger.warning(
+                    "O Redis não aceitou o CLIENT TRACKING; o cache do lado do cliente passa a conferir as chaves "
+                    "a cada %ss.",
+                    self.poll_interval_seconds,
+                    exc_info=True,
+                )
+                self._deactivate()
+                self.mode = "polling"
+                await self._polling_loop()
+                return
+            except Exception:
+                logger.warning("Conexão de invalidações do Redis perdida; reconectando.", exc_info=True)
+            self._deactivate()
+            await asyncio.sleep(TRACKING_RECONNECT_DELAY_SECONDS)
+
+    async def _track(self):
+        pubsub = self.redis_client.pubsub()
+        tracking_client = self._connect_tracking_client()
+        try:
+            await pubsub.execute_command("CLIENT", "ID")
+            client_id = await pubsub.parse_response(block=True)
+            await pubsub.subscribe(INVALIDATE_CHANNEL)
+            await tracking_client.client_tracking_on(clientid=client_id, prefix=list(self.prefixes), bcast=True)
+            self.active = True
+            logger.info("Cache do lado do cliente do Redis ativo, com invalidação por CLIENT TRACKING.")
+            while True:
+                message = await pubsub.get_message(timeout=TRACKING_KEEPALIVE_SECONDS)
+                if message is None:
+                    await self._check_tracking(tracking_client)
+                elif message["type"] == "message":
+                    keys = message["data"]
+                    self.invalidate(None if keys is None else [_decode(key) for key in keys])
+        finally:
+            self.active = False
+            await asyncio.shield(self._close(pubsub, tracking_client))
+
+    @staticmethod
+    async def _check_tracking(tracking_client: Redis):
+        """
+        O `CLIENT TRACKING` é desfeito se a conexão dedicada cair, e o redirecionamento se perde se a conexão
+        das invalidações for refeita; nos dois casos, a conexão é recriada.
+        """
+        info = await tracking_client.client_trackinginfo()
+        if isinstance(info, dict):
+            flags = info.get("flags", [])
+        else:
+            flags = info[info.index("flags") + 1] if "flags" in info else []
+        flags = {_decode(flag) for flag in flags}
+        if "on" not in flags or "broken_redirect" in flags:
+            raise RedisError(f"CLIENT TRACKING inativo no Redis (flags: {sorted(flags)})")
+
+    @staticmethod
+    async def _close(pubsub, tracking_client: Redis):
+        for close in (pubsub.aclose, tracking_client.aclose):
+            try:
+                await close()
+            except Exception:
+                logger.debug("Falha ao fechar conexão do cache do lado do cliente.", exc_info=True)
+
+    async def _polling_loop(self):
+        self.active = True
+        while True:
+            await asyncio.sleep(self.poll_interval_seconds)
+            try:
+                await self.poll()
+            except RedisError:
+                logger.warning("Falha ao conferir as chaves do cache do lado do cliente; esvaziando.", exc_info=True)
+                self.invalidate(None)
+
+    async def poll(self):
+        """Relê, com MGET, as chaves guardadas, atualizando as alteradas e removendo as que não existem mais."""
+        keys = self.local_cache.keys()
+        for start in range(0, len(keys), POLL_BATCH_SIZE):
+            batch = keys[start : start + POLL_BATCH_SIZE]
+            started_at = self.begin_read(batch)
+            values = None
+            try:
+                values = await self.redis_client.mget(batch)
+            finally:
+                self.finish_read(batch, started_at, values)
+
+
+def _decode(value: str | bytes) -> str:
+    return value.decode() if isinstance(value, bytes) else value
@@ -1,45 +1,206 @@
-import json
+import time
 from contextlib import asynccontextmanager
+from typing import Any, AsyncIterator, Callable, cast
 
 from pydantic import RedisDsn
-from redis.asyncio import Redis
+from redis.asyncio import BlockingConnectionPool, Redis
+from redis.asyncio.client import Pipeline
+from redis.commands.core import AsyncScript
+
+from app.common.metrics import INTEGRATION_OPERATION_DURATION, OperationTimers, timed
+
+from .client_side_cache import (
+    DEFAULT_CLIENT_CACHE_MAX_SIZE,
+    DEFAULT_CLIENT_CACHE_POLL_INTERVAL_SECONDS,
+    ClientSideCache,
+)
+from .serializers import Serializer, get_serializer
+
+REDIS_OPERATIONS = ("exists", "ttl", "get", "set", "delete", "eval_script", "mget", "mset", "pipeline")
+
+
+class RedisPipeline:
+    """
+    Comandos enfileirados em um pipeline do Redis (ver `RedisAsyncioAdapter.pipeline`). Os comandos são enviados
+    juntos, em uma única ida ao Redis, ao sair do bloco; as respostas ficam em `results`, na ordem dos comandos.
+    """
+
+    def __init__(self, pipeline: Pipeline, serializer: Serializer):
+        self._pipeline = pipeline
+        self._serializer = serializer
+        self._decoders: list[Callable[[Any], Any] | None] = []
+        self.results: list = []
+        # Chaves alteradas pelo pipeline, removidas do cache do lado do cliente ao final
+        self.written_keys: list[str] = []
+
+    def __len__(self) -> int:
+        return len(self._decoders)
+
+    def get_str(self, key: str):
+        self._pipeline.get(key)
+        self._decoders.append(lambda v: v.decode() if v is not None else None)
+
+    def get_json(self, key: str):
+        self._pipeline.get(key)
+        self._decoders.append(lambda v: self._serializer.loads(v) if v is not None else None)
+
+    def set_str(self, k: str, v: str | bytes, expires_in_seconds: int | None = None):
+        self._pipeline.set(k, v, expires_in_seconds)
+        self._decoders.append(None)
+        self.written_keys.append(k)
+
+    def set_json(self, key: str, v: Any, expires_in_seconds: int | None = None):
+        if v is None:
+            self.delete(key)
+        else:
+            self.set_str(key, self._serializer.dumps(v), expires_in_seconds)
+
+    def delete(self, key: str):
+        self._pipeline.delete(key)
+        self._decoders.append(None)
+        self.written_keys.append(key)
+
+    async def execute(self) -> list:
+        responses = await self._pipeline.execute()
+        self.results = [
+            decoder(response) if decoder is not None else response
+            for decoder, response in zip(self._decoders, responses)
+        ]
+        self._decoders = []
+        return self.results
 
 
 class RedisAsyncioAdapter:
 
-    def __init__(self, redis_url: RedisDsn):
+    def __init__(
+        self,
+        redis_url: RedisDsn,
+        max_connections: int | None = None,
+        pool_timeout_seconds: float | None = None,
+        socket_timeout_seconds: float | None = None,
+        socket_connect_timeout_seconds: float | None = None,
+        serializer: "str | Serializer" = "json",
+        client_cache_prefixes: list[str] | None = None,
+        client_cache_mode: str = "tracking",
+        client_cache_max_size: int = DEFAULT_CLIENT_CACHE_MAX_SIZE,
+        client_cache_poll_interval_seconds: float = DEFAULT_CLIENT_CACHE_POLL_INTERVAL_SECONDS,
+    ):
+        """
+        :param max_connections: Limite de conexões do pool. Com o limite atingido, os comandos aguardam uma
+            conexão livre por até `pool_timeout_seconds`. None mantém o pool sem limite do redis-py.
+        :param socket_timeout_seconds: Tempo máximo de espera pela resposta de um comando.
+        :param socket_connect_timeout_seconds: Tempo máximo para abrir uma conexão.
+        :param serializer: Serializador dos métodos `*_json` (`json`, `orjson`, `msgpack` ou uma instância).
+        :param client_cache_prefixes: Prefixos das chaves servidas da memória do processo pelo cache do lado do
+            cliente (ver `ClientSideCache`), ativo entre `start_client_cache` e `stop_client_cache`. Vazio desativa.
+        :param client_cache_mode: `tracking` (invalidação por CLIENT TRACKING) ou `polling`.
+        """
         self.redis_url = str(redis_url)
-        self.redis_client = Redis.from_url(self.redis_url)
+        connection_options: dict[str, Any] = {
+            option: value
+            for option, value in (
+                ("socket_timeout", socket_timeout_seconds),
+                ("socket_connect_timeout", socket_connect_timeout_seconds),
+            )
+            if value is not None
+        }
+        if max_connections is None:
+            self.redis_client = Redis.from_url(self.redis_url, **connection_options)
+        else:
+            pool = BlockingConnectionPool.from_url(
+                self.redis_url, max_connections=max_connections, timeout=pool_timeout_seconds, **connection_options
+            )
+            self.redis_client = Redis.from_pool(pool)
+        self.serializer: Serializer = get_serializer(serializer) if isinstance(serializer, str) else serializer
+        self.client_cache: ClientSideCache | None = None
+        if client_cache_prefixes:
+            self.client_cache = ClientSideCache(
+                self.redis_client,
+                lambda: Redis.from_url(self.redis_url, single_connection_client=True, **connection_options),
+                client_cache_prefixes,
+                mode=client_cache_mode,
+                max_size=client_cache_max_size,
+                poll_interval_seconds=client_cache_poll_interval_seconds,
+            )
+        self._scripts: dict[str, AsyncScript] = {}
+        self._operation_timers = OperationTimers(INTEGRATION_OPERATION_DURATION, "redis", REDIS_OPERATIONS)
+
+    def start_client_cache(self):
+        """Passa a servir da memória as chaves com os prefixos do cache do lado do cliente (se configurado)."""
+        if self.client_cache is not None:
+            self.client_cache.start()
+
+    async def stop_client_cache(self):
+        if self.client_cache is not None:
+            await self.client_cache.stop()
 
     async def aclose(self):
+        await self.stop_client_cache()
         await self.redis_client.aclose()
 
+    @timed("exists")
     async def exists(self, k: str) -> bool:
         count = await self.redis_client.exists(k)
         ok = count > 0
         return ok
 
-    async def get_str(self, key: str) -> str:
-        v = await self.redis_client.get(key)
-        if v is not None:
-            v = v.decode()
-        return v
+    @timed("ttl")
+    async def ttl(self, k: str) -> int:
+        """Tempo de vida restante da chave em segundos (-1 sem expiração, -2 inexistente)."""
+        return await self.redis_client.ttl(k)
 
+    @timed("get")
+    async def get_str(self, key: str) -> str | None:
+        raw = await self._get(key)
+        if raw is None:
+            return None
+        return raw.decode()
+
+    @timed("set")
     async def set_str(self, k: str, v: any, expires_in_seconds: int | None = None):
         if v is None:
             await self.delete(k)
             return
 
-        if not isinstance(v, str):
+        if not isinstance(v, (str, bytes)):
             v = str(v)
 
-        await self.redis_client.set(k, v, expires_in_seconds)
+        try:
+            await self.redis_client.set(k, v, expires_in_seconds)
+        finally:
+            self._invalidate_local([k])
 
-    async def get_json(self, key: str) -> dict | list | int | None:
-        v = await self.get_str(key)
+    @timed("get")
+    async def get_bytes(self, key: str) -> bytes | None:
+        return await self._get(key)
+
+    async def _get(self, key: str) -> bytes | None:
+        cache = self.client_cache
+        if cache is None or not cache.serves(key):
+            return await self._redis_get(key)
+        v = cache.get(key)
         if v is not None:
-            v = json.loads(v)
-        return v
+            return v
+        started_at = cache.begin_read([key])
+        v = None
+        try:
+            v = await self._redis_get(key)
+            return v
+        finally:
+            cache.finish_read([key], started_at, [v])
+
+    # O cliente é criado sem `decode_responses`: as leituras devolvem bytes
+    async def _redis_get(self, key: str) -> bytes | None:
+        return cast(bytes | None, await self.redis_client.get(key))
+
+    async def _redis_mget(self, keys: list[str]) -> list[bytes | None]:
+        return cast(list[bytes | None], await self.redis_client.mget(keys))
+
+    async def get_json(self, key: str) -> dict | list | int | None:
+        raw = await self.get_bytes(key)
+        if raw is None:
+            return None
+        return self.serializer.loads(raw)
 
     async def set_json(
         self,
@@ -47,12 +208,110 @@ class RedisAsyncioAdapter:
         v: dict | list | int | None,
         expires_in_seconds: int | None = None,
     ):
-        if v is not None:
-            v = json.dumps(v)
-        await self.set_str(key, v, expires_in_seconds)
+        payload = self.serializer.dumps(v) if v is not None else None
+        await self.set_str(key, payload, expires_in_seconds)
+
+    @timed("mget")
+    async def mget_json(self, keys: list[str]) -> list[Any]:
+        """Lê várias chaves em um único comando (MGET). Chaves inexistentes resultam em None, na mesma posição."""
+        if not keys:
+            return []
+        values = await self._mget(keys)
+        return [self.serializer.loads(v) if v is not None else None for v in values]
+
+    async def _mget(self, keys: list[str]) -> list[bytes | None]:
+        """MGET apenas das chaves que não estão no cache do lado do cliente."""
+        cache = self.client_cache
+        if cache is None or not cache.active:
+            return await self._redis_mget(keys)
+        values = [cache.get(key) if cache.serves(key) else None for key in keys]
+        missing = [index for index, v in enumerate(values) if v is None]
+        if not missing:
+            return values
+        missing_keys = [keys[index] for index in missing]
+        cached_keys = [key for key in missing_keys if cache.serves(key)]
+        started_at = cache.begin_read(cached_keys)
+        fetched = None
+        try:
+            fetched = await self._redis_mget(missing_keys)
+        finally:
+            if fetched is None:
+                cache.finish_read(cached_keys, started_at, None)
+            else:
+                by_key = dict(zip(missing_keys, fetched))
+                cache.finish_read(cached_keys, started_at, [by_key[key] for key in cached_keys])
+        for index, v in zip(missing, fetched):
+            values[index] = v
+        return values
 
+    @timed("mset")
+    async def mset_json(self, values: dict[str, Any], expires_in_seconds: int | None = None):
+        """
+        Grava várias chaves em uma única ida ao Redis (pipeline), todas com o mesmo tempo de expiração.
+        Chaves com valor None são removidas, como no `set_json`.
+        """
+        if not values:
+            return
+        async with self._pipeline(transaction=False) as pipeline:
+            for key, v in values.items():
+                pipeline.set_json(key, v, expires_in_seconds)
+
+    @asynccontextmanager
+    async def pipeline(self, transaction: bool = False) -> AsyncIterator[RedisPipeline]:
+        """
+        Enfileira os comandos do bloco e os envia juntos, em uma única ida ao Redis, ao sair dele
+        (com `transaction`, dentro de um MULTI/EXEC). As respostas ficam em `pipeline.results`.
+        """
+        child = self._operation_timers["pipeline"]
+        started_at = time.perf_counter()
+        try:
+            async with self._pipeline(transaction) as pipeline:
+                yield pipeline
+        finally:
+            child.observe(time.perf_counter() - started_at)
+
+    @asynccontextmanager
+    async def _pipeline(self, transaction: bool) -> AsyncIterator[RedisPipeline]:
+        async with self.redis_client.pipeline(transaction=transaction) as pipe:
+            pipeline = RedisPipeline(pipe, self.serializer)
+            try:
+                yield pipeline
+                if len(pipeline):
+                    await pipeline.execute()
+            finally:
+                if pipeline.written_keys:
+                    self._invalidate_local(pipeline.written_keys)
+
+    @timed("delete")
     async def delete(self, key: str):
-        await self.redis_client.delete(key)
+        try:
+            await self.redis_client.delete(key)
+        finally:
+            self._invalidate_local([key])
+
+    def _invalidate_local(self, keys: list[str]):
+        """
+        Remove do cache do lado do cliente as chaves gravadas por este processo, sem esperar o aviso do Redis
+        (no modo `polling`, não há aviso).
+        """
+        cache = self.client_cache
+        if cache is None:
+            return
+        keys = [key for key in keys if key.startswith(cache.prefixes)]
+        if keys:
+            cache.invalidate(keys)
+
+    @timed("eval_script")
+    async def eval_script(self, script: str, keys: list[str], args: list) -> any:
+        """Executa um script Lua (via EVALSHA, carregando o script no primeiro uso)."""
+        registered = self._scripts.get(script)
+        if registered is None:
+            registered = self._scripts[script] = self.redis_client.register_script(script)
+        try:
+            return await registered(keys=keys, args=args)
+        finally:
+            if keys:
+                self._invalidate_local(list(keys))
 
     @asynccontextmanager
     async def locks(
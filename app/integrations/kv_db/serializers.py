@@ -0,0 +1,73 @@
+"""
+Serializadores dos valores gravados no Redis pelos métodos `*_json` do `RedisAsyncioAdapter`.
+
+O `json` da biblioteca padrão é o padrão. `orjson` grava o mesmo JSON (compacto) com menos CPU e `msgpack`
+grava um formato binário menor; ambos são opcionais e escolhidos em `REDIS_SERIALIZER`. Valores gravados
+com `msgpack` só podem ser lidos por processos que usem o mesmo serializador.
+"""
+
+import importlib.util
+import json
+from typing import Any, Protocol
+
+ORJSON_AVAILABLE = importlib.util.find_spec("orjson") is not None
+MSGPACK_AVAILABLE = importlib.util.find_spec("msgpack") is not None
+
+if ORJSON_AVAILABLE:
+    import orjson
+
+if MSGPACK_AVAILABLE:
+    import msgpack
+
+
+class Serializer(Protocol):
+    def dumps(self, value: Any) -> str | bytes: ...
+
+    def loads(self, data: str | bytes) -> Any: ...
+
+
+class JsonSerializer:
+    def dumps(self, value: Any) -> str:
+        return json.dumps(value)
+
+    def loads(self, data: str | bytes) -> Any:
+        return json.loads(data)
+
+
+class OrjsonSerializer:
+    def __init__(self):
+        if not ORJSON_AVAILABLE:
+            raise RuntimeError("O serializador orjson requer o pacote orjson instalado")
+
+    def dumps(self, value: Any) -> bytes:
+        return orjson.dumps(value)
+
+    def loads(self, data: str | bytes) -> Any:
+        return orjson.loads(data)
+
+
+class MsgpackSerializer:
+    def __init__(self):
+        if not MSGPACK_AVAILABLE:
+            raise RuntimeError("O serializador msgpack requer o pacote msgpack instalado")
+
+    def dumps(self, value: Any) -> bytes:
+        return msgpack.packb(value, use_bin_type=True)
+
+    def loads(self, data: str | bytes) -> Any:
+        return msgpack.unpackb(data, raw=False)
+
+
+SERIALIZERS: dict[str, type[Serializer]] = {
+    "json": JsonSerializer,
+    "orjson": OrjsonSerializer,
+    "msgpack": MsgpackSerializer,
+}
+
+
+def get_serializer(name: str) -> Serializer:
+    """Serializador pelo nome (`json`, `orjson` ou `msgpack`)."""
+    serializer_class = SERIALIZERS.get(name.lower())
+    if serializer_class is None:
+        raise ValueError(f"Serializador desconhecido: {name}. Use um de: {', '.join(SERIALIZERS)}")
+    return serializer_class()
@@ -0,0 +1,4 @@
+from .circuit_breaker import CircuitBreaker, CircuitState
+from .rate_limiter import TokenBucketRateLimiter
+
+__all__ = ["CircuitBreaker", "CircuitState", "TokenBucketRateLimiter"]
@@ -0,0 +1,94 @@
+import logging
+import time
+from enum import StrEnum
+from typing import Callable
+
+logger = logging.getLogger(__name__)
+
+
+class CircuitState(StrEnum):
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+
+class CircuitBreaker:
+    """
+    Circuit breaker (por processo) para chamadas a um serviço externo.
+
+    Abre após `failure_threshold` falhas consecutivas e, enquanto aberto, recusa as chamadas sem tentar
+    o serviço. Após `recovery_timeout_seconds`, entra em meio-aberto e libera uma única chamada de teste:
+    sucesso fecha o circuito, falha o abre novamente.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        failure_threshold: int = 5,
+        recovery_timeout_seconds: float = 30.0,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        if failure_threshold < 1:
+            raise ValueError("failure_threshold deve ser maior que zero")
+        self.name = name
+        self.failure_threshold = failure_threshold
+        self.recovery_timeout_seconds = recovery_timeout_seconds
+        self._clock = clock
+        self._state = CircuitState.CLOSED
+        self._consecutive_failures = 0
+        self._opened_until = 0.0
+        self._probe_in_flight = False
+        self.rejected = 0
+
+    @property
+    def state(self) -> CircuitState:
+        if self._state == CircuitState.OPEN and self._clock() >= self._opened_until:
+            return CircuitState.HALF_OPEN
+        return self._state
+
+    def allow_request(self) -> bool:
+        """
+        Indica se a chamada pode ser feita. No estado meio-aberto, apenas uma chamada de teste é liberada por vez.
+        """
+        state = self.state
+        if state == CircuitState.CLOSED:
+            return True
+        if state == CircuitState.HALF_OPEN and not self._probe_in_flight:
+            self._state = CircuitState.HALF_OPEN
+            self._probe_in_flight = True
+            return True
+        self.rejected += 1
+        return False
+
+    def release_probe(self):
+        """
+        Devolve a chamada de teste liberada por `allow_request` quando ela não chegou a ser feita.
+        """
+        self._probe_in_flight = False
+
+    def record_success(self):
+        if self._state != CircuitState.CLOSED:
+            logger.info("Circuito '%s' fechado: serviço respondeu novamente", self.name)
+        self._state = CircuitState.CLOSED
+        self._consecutive_failures = 0
+        self._probe_in_flight = False
+
+    def record_failure(self):
+        self._consecutive_failures += 1
+        if self._state == CircuitState.HALF_OPEN or self._consecutive_failures >= self.failure_threshold:
+            self.trip(self.recovery_timeout_seconds)
+
+    def trip(self, open_for_seconds: float):
+        """
+        Abre o circuito por `open_for_seconds` (ex.: o `Retry-After` informado pelo serviço).
+        """
+        if self._state != CircuitState.OPEN:
+            logger.warning(
+                "Circuito '%s' aberto por %.1fs após %d falhas consecutivas",
+                self.name,
+                open_for_seconds,
+                self._consecutive_failures,
+            )
+        self._state = CircuitState.OPEN
+        self._opened_until = self._clock() + open_for_seconds
+        self._probe_in_flight = False
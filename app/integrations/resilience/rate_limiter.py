@@ -0,0 +1,102 @@
+import asyncio
+import logging
+import time
+from typing import TYPE_CHECKING, Callable
+
+from redis.exceptions import RedisError
+
+if TYPE_CHECKING:
+    from app.integrations.kv_db.redis_asyncio_adapter import RedisAsyncioAdapter
+
+logger = logging.getLogger(__name__)
+
+# Reserva `requested` fichas do balde e retorna, em segundos, quanto tempo esperar até que estejam disponíveis
+# (0 quando reservadas). Usa o relógio do Redis para que todas as instâncias compartilhem a mesma referência.
+TOKEN_BUCKET_SCRIPT = """
+local rate = tonumber(ARGV[1])
+local capacity = tonumber(ARGV[2])
+local requested = tonumber(ARGV[3])
+local now_parts = redis.call('TIME')
+local now = tonumber(now_parts[1]) + tonumber(now_parts[2]) / 1000000
+local state = redis.call('HMGET', KEYS[1], 'tokens', 'updated_at')
+local tokens = tonumber(state[1]) or capacity
+local updated_at = tonumber(state[2]) or now
+tokens = math.min(capacity, tokens + math.max(0, now - updated_at) * rate)
+local wait = 0
+if tokens >= requested then
+    tokens = tokens - requested
+else
+    wait = (requested - tokens) / rate
+end
+redis.call('HSET', KEYS[1], 'tokens', tostring(tokens), 'updated_at', tostring(now))
+redis.call('EXPIRE', KEYS[1], math.ceil(capacity / rate) + 1)
+return tostring(wait)
+"""
+
+
+class TokenBucketRateLimiter:
+    """
+    Limitador de taxa por balde de fichas: `rate_per_second` fichas por segundo, com rajadas de até `capacity`.
+
+    Com `inmemory_adapter`, o balde fica no Redis e é compartilhado entre os workers e instâncias
+    da aplicação; se o Redis falhar, o limite passa a ser aplicado apenas no processo.
+    """
+
+    def __init__(
+        self,
+        key: str,
+        rate_per_second: float,
+        capacity: int = 1,
+        inmemory_adapter: "RedisAsyncioAdapter | None" = None,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        if rate_per_second <= 0:
+            raise ValueError("rate_per_second deve ser maior que zero")
+        if capacity < 1:
+            raise ValueError("capacity deve ser maior que zero")
+        self.key = key
+        self.rate_per_second = rate_per_second
+        self.capacity = capacity
+        self.inmemory_adapter = inmemory_adapter
+        self._clock = clock
+        self._tokens = float(capacity)
+        self._updated_at = clock()
+        self._lock = asyncio.Lock()
+
+    async def acquire(self, max_wait_seconds: float = 0.0) -> bool:
+        """
+        Obtém uma ficha, aguardando até `max_wait_seconds`. Retorna False se não houver ficha nesse intervalo.
+        """
+        async with self._lock:
+            waited = 0.0
+            while True:
+                wait = await self._reserve()
+                if wait <= 0:
+                    return True
+                if waited + wait > max_wait_seconds:
+                    return False
+                await asyncio.sleep(wait)
+                waited += wait
+
+    async def _reserve(self) -> float:
+        if self.inmemory_adapter is not None:
+            try:
+                return float(
+                    await self.inmemory_adapter.eval_script(
+                        TOKEN_BUCKET_SCRIPT,
+                        keys=[f"rate_limit:{self.key}"],
+                        args=[self.rate_per_second, self.capacity, 1],
+                    )
+                )
+            except RedisError:
+                logger.warning("Falha ao consultar o limite de taxa '%s' no Redis; usando o limite local.", self.key)
+        return self._reserve_local()
+
+    def _reserve_local(self) -> float:
+        now = self._clock()
+        self._tokens = min(self.capacity, self._tokens + (now - self._updated_at) * self.rate_per_second)
+        self._updated_at = now
+        if self._tokens >= 1:
+            self._tokens -= 1
+            return 0.0
+        return (1 - self._tokens) / self.rate_per_second
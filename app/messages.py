@@ -22,6 +22,7 @@ DESCRIPTION_DETAILS = "Detalhes do erro"
 
 MSG_SELLER_ID_JA_CADASTRADO = "O seller_id informado já está cadastrado. Escolha outro."
 MSG_NOME_FANTASIA_JA_CADASTRADO = "O nome_fantasia informado já está cadastrado. Escolha outro."
+MSG_SELLER_JA_CADASTRADO = "Já existe um seller cadastrado com os dados informados."
 MSG_SELLER_NAO_ENCONTRADO = "Seller com ID '{entity_id}' não encontrado."
 MSG_SELLER_CNPJ_NAO_ENCONTRADO = "Nenhum Seller com CNPJ '{cnpj}' encontrado."
 
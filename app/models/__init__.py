@@ -2,6 +2,7 @@ from .base import AuditModel, PersistableEntity, UuidModel, UuidType
 from .query_model import QueryModel
 from .seller_model import Seller
 from .gemini_model import ChatMessage
+from .outbox_event_model import OutboxDestination, OutboxEvent
 
 __all__ = [
     "AuditModel", 
@@ -10,5 +11,7 @@ __all__ = [
     "UuidType", 
     "Seller", 
     "QueryModel",
-    "ChatMessage"
+    "ChatMessage",
+    "OutboxDestination",
+    "OutboxEvent",
 ]
@@ -0,0 +1,28 @@
+from datetime import datetime
+from enum import Enum
+
+from pydantic import BaseModel, Field
+from uuid_extensions import uuid7
+
+from app.common.datetime import utcnow
+from app.common.tracing import current_trace_context
+
+
+class OutboxDestination(str, Enum):
+    RABBITMQ = "rabbitmq"
+    WEBHOOK = "webhook"
+
+
+class OutboxEvent(BaseModel):
+    """
+    Evento pendente de entrega, gravado na mesma operação do Mongo que altera o documento de origem.
+    """
+
+    event_id: str = Field(default_factory=lambda: str(uuid7()), description="Identificador do evento")
+    destination: OutboxDestination = Field(..., description="Destino do evento")
+    payload: dict = Field(..., description="Conteúdo a ser entregue ao destino")
+    created_at: datetime = Field(default_factory=utcnow, description="Data e hora da criação do evento")
+    trace_context: dict[str, str] | None = Field(
+        default_factory=current_trace_context,
+        description="Contexto da requisição de origem (traceparent, X-Request-ID), propagado na entrega",
+    )
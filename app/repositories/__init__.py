@@ -1,4 +1,5 @@
-from .base import AsyncCrudRepository
+from .base import AsyncCrudRepository, DuplicateKeyException
+from .cached_seller_repository import CachedSellerRepository
 from .seller_repository import SellerRepository
 
-__all__ = ["SellerRepository", "AsyncCrudRepository"]
+__all__ = ["SellerRepository", "CachedSellerRepository", "AsyncCrudRepository", "DuplicateKeyException"]
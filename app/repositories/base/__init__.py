@@ -1,4 +1,5 @@
 from .async_crud_repository import AsyncCrudRepository
+from .exceptions import DuplicateKeyException
 from .memory_repository import AsyncMemoryRepository
 
-__all__ = ["AsyncMemoryRepository", "AsyncCrudRepository"]
+__all__ = ["AsyncMemoryRepository", "AsyncCrudRepository", "DuplicateKeyException"]
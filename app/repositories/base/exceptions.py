@@ -0,0 +1,12 @@
+from typing import Optional
+
+
+class DuplicateKeyException(Exception):
+    """
+    Gravação recusada por um índice único do Mongo (`DuplicateKeyError`). `field` é o campo do índice em
+    conflito (ex.: `seller_id`, `trade_name`), ou None quando não foi possível identificá-lo.
+    """
+
+    def __init__(self, field: Optional[str] = None):
+        self.field = field
+        super().__init__(f"Valor duplicado para o índice único de '{field}'")
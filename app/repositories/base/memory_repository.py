@@ -1,15 +1,21 @@
-from typing import Any, Generic, List, Optional, Type, TypeVar
+from typing import Any, Generic, List, Optional, Sequence, Type, TypeVar
 from uuid import UUID
 from datetime import date, datetime
 from enum import Enum
 
-from pydantic import BaseModel
+from pydantic import BaseModel, create_model
+from pydantic.fields import FieldInfo
+from pymongo.errors import DuplicateKeyError
 
 from app.common.datetime import utcnow
+from app.common.metrics import REPOSITORY_OPERATION_DURATION, OperationTimers, timed
+from app.common.tracing import traced
 from app.integrations.database.mongo_client import MongoClient
+from app.models.outbox_event_model import OutboxEvent
 from app.models.query_model import QueryModel
 
 from .async_crud_repository import AsyncCrudRepository
+from .exceptions import DuplicateKeyException
 
 T = TypeVar("T", bound=BaseModel)
 ID = TypeVar("ID", bound=UUID)
@@ -17,6 +23,26 @@ Q = TypeVar("Q", bound=QueryModel)
 
 DEFAULT_USER = "system"
 
+# Campo do documento que guarda os eventos ainda não entregues (transactional outbox)
+OUTBOX_FIELD = "_outbox"
+# Tentativas de entrega que falharam e data a partir da qual o outbox do documento volta a ser drenado
+OUTBOX_ATTEMPTS_FIELD = "_outbox_attempts"
+OUTBOX_NEXT_ATTEMPT_FIELD = "_outbox_next_attempt_at"
+
+REPOSITORY_OPERATIONS = (
+    "create",
+    "find_by_id",
+    "find",
+    "find_after",
+    "update",
+    "delete_by_id",
+    "patch",
+    "release_outbox",
+    "find_pending_outbox",
+    "ack_outbox_events",
+    "schedule_outbox_retry",
+)
+
 
 def convert_for_mongo(obj):
     """
@@ -48,8 +74,25 @@ class AsyncMemoryRepository(AsyncCrudRepository[T], Generic[T]):
         database = client.get_database(db_name)
         self.collection = database[collection_name]
         self.model_class = model_class
+        self._operation_timers = OperationTimers(REPOSITORY_OPERATION_DURATION, collection_name, REPOSITORY_OPERATIONS)
+        self._span_attributes = {"db.system": "mongodb", "db.namespace": db_name, "db.collection.name": collection_name}
+        self._projection_models: dict[tuple[tuple[str, ...], tuple[str, ...]], Type[BaseModel]] = {}
+
+    @traced()
+    @timed("create")
+    async def create(
+        self,
+        entity: T,
+        outbox_events: Optional[List[OutboxEvent]] = None,
+        hold_outbox_until: Optional[datetime] = None,
+    ) -> T:
+        """
+        Insere o documento sem leitura prévia: a unicidade é garantida pelos índices únicos da coleção, e um
+        valor duplicado levanta `DuplicateKeyException` com o campo em conflito.
 
-    async def create(self, entity: T) -> T:
+        Com `hold_outbox_until`, os eventos são gravados junto com o documento, mas o relay só os entrega a partir
+        desse instante ou depois de `release_outbox`.
+        """
         now = utcnow()
         entity_dict = entity.model_dump(by_alias=True)
         entity_dict.setdefault("created_at", now)
@@ -61,47 +104,246 @@ class AsyncMemoryRepository(AsyncCrudRepository[T], Generic[T]):
         
         # Converte tipos não serializáveis pelo MongoDB
         entity_dict = convert_for_mongo(entity_dict)
-        
-        await self.collection.insert_one(entity_dict)
-        return self.model_class(**entity_dict)
+        if outbox_events:
+            entity_dict[OUTBOX_FIELD] = self._dump_outbox_events(outbox_events)
+            if hold_outbox_until is not None:
+                entity_dict[OUTBOX_NEXT_ATTEMPT_FIELD] = hold_outbox_until
 
+        try:
+            await self.collection.insert_one(entity_dict)
+        except DuplicateKeyError as e:
+            raise DuplicateKeyException(self._duplicate_key_field(e)) from e
+        return self.model_class.model_validate(entity_dict)
+
+    @traced()
+    @timed("find_by_id")
     async def find_by_id(self, seller_id: Any) -> Optional[T]:
         result = await self.collection.find_one({"seller_id": str(seller_id)})
         if result:
-            return self.model_class(**result)
+            return self.model_class.model_validate(result)
         return None
 
-    async def find(self, filters: dict, limit: int = 10, offset: int = 0, sort: Optional[dict] = None) -> List[T]:
-        cursor = self.collection.find(filters)
+    @traced()
+    @timed("find")
+    async def find(
+        self,
+        filters: dict,
+        limit: int = 10,
+        offset: int = 0,
+        sort: Optional[dict] = None,
+        fields: Optional[Sequence[str]] = None,
+    ) -> List[T]:
+        """
+        Com `fields`, apenas esses campos são lidos do Mongo (projeção) e os resultados são instâncias de um
+        modelo reduzido, com somente esses campos (ver `projection_model`).
+        """
+        projection, model = self._projection(fields)
+        cursor = self.collection.find(filters, projection) if projection else self.collection.find(filters)
         if sort:
             cursor = cursor.sort(list(sort.items()))
         cursor = cursor.skip(offset).limit(limit)
-        results = []
+        # Com `fields`, os itens são do modelo reduzido, e não do `model_class`
+        results: List[Any] = []
+        async for doc in cursor:
+            results.append(model.model_validate(doc))
+        return results
+
+    @traced()
+    @timed("find_after")
+    async def find_after(
+        self,
+        filters: dict,
+        sort: List[tuple[str, int]],
+        after: Optional[list] = None,
+        limit: int = 10,
+        fields: Optional[Sequence[str]] = None,
+    ) -> List[T]:
+        """
+        Paginação por keyset: retorna os `limit` documentos seguintes a `after` (valores da chave de ordenação
+        do último documento da página anterior) na ordem `sort`, sem percorrer e descartar as páginas anteriores
+        como o `skip`. A ordenação deve ser única (terminar em um campo único) e coberta por um índice.
+        Com `fields`, os campos da ordenação também são lidos (para o próximo cursor), mas não serializados.
+        """
+        query = filters
+        if after is not None:
+            query = {"$and": [filters, self._keyset_filter(sort, after)]}
+        projection, model = self._projection(fields, hidden=[field for field, _ in sort])
+        cursor = self.collection.find(query, projection) if projection else self.collection.find(query)
+        cursor = cursor.sort(sort).limit(limit)
+        results: List[Any] = []
         async for doc in cursor:
-            results.append(self.model_class(**doc))
+            results.append(model.model_validate(doc))
         return results
 
-    async def update(self, seller_id: str, entity: Any) -> Optional[T]:
+    @traced()
+    @timed("update")
+    async def update(
+        self, seller_id: str, entity: Any, outbox_events: Optional[List[OutboxEvent]] = None
+    ) -> Optional[T]:
         # PUT: substitui todos os campos (menos _id)
         entity_dict = entity.model_dump(by_alias=True, exclude={"identity"})
         entity_dict = convert_for_mongo(entity_dict)
-        result = await self.collection.find_one_and_update(
-            {"seller_id": str(seller_id)}, {"$set": entity_dict}, return_document=True
-        )
+        try:
+            result = await self.collection.find_one_and_update(
+                {"seller_id": str(seller_id)}, self._update_document(entity_dict, outbox_events), return_document=True
+            )
+        except DuplicateKeyError as e:
+            raise DuplicateKeyException(self._duplicate_key_field(e)) from e
         if result:
-            return self.model_class(**result)
+            return self.model_class.model_validate(result)
         return None
 
+    @traced()
+    @timed("delete_by_id")
     async def delete_by_id(self, seller_id: str) -> bool:
         result = await self.collection.delete_one({"seller_id": str(seller_id)})
         return result.deleted_count > 0
 
-    async def patch(self, seller_id: str, update_fields: dict) -> Optional[T]:
+    @traced()
+    @timed("patch")
+    async def patch(
+        self, seller_id: str, update_fields: dict, outbox_events: Optional[List[OutboxEvent]] = None
+    ) -> Optional[T]:
         # PATCH: atualiza só os campos enviados
         update_fields = convert_for_mongo(update_fields)
-        result = await self.collection.find_one_and_update(
-            {"seller_id": str(seller_id)}, {"$set": update_fields}, return_document=True
-        )
+        try:
+            result = await self.collection.find_one_and_update(
+                {"seller_id": str(seller_id)}, self._update_document(update_fields, outbox_events), return_document=True
+            )
+        except DuplicateKeyError as e:
+            raise DuplicateKeyException(self._duplicate_key_field(e)) from e
         if result:
-            return self.model_class(**result)
+            return self.model_class.model_validate(result)
         return None
+
+    @traced()
+    @timed("release_outbox")
+    async def release_outbox(self, seller_id: str):
+        """
+        Libera para entrega imediata os eventos retidos por `create(..., hold_outbox_until=...)`.
+        """
+        await self.collection.update_one(
+            {"seller_id": str(seller_id)}, {"$unset": {OUTBOX_ATTEMPTS_FIELD: "", OUTBOX_NEXT_ATTEMPT_FIELD: ""}}
+        )
+
+    @traced()
+    @timed("find_pending_outbox")
+    async def find_pending_outbox(self, limit: int = 100) -> List[dict]:
+        """
+        Retorna até `limit` documentos com eventos pendentes e fora do intervalo de espera entre tentativas, dos
+        eventos mais antigos para os mais novos (apenas `seller_id`, os eventos do outbox e as tentativas já feitas).
+        """
+        cursor = (
+            self.collection.find(
+                {
+                    f"{OUTBOX_FIELD}.event_id": {"$exists": True},
+                    "$or": [
+                        {OUTBOX_NEXT_ATTEMPT_FIELD: {"$exists": False}},
+                        {OUTBOX_NEXT_ATTEMPT_FIELD: {"$lte": utcnow()}},
+                    ],
+                },
+                projection={"_id": 0, "seller_id": 1, OUTBOX_FIELD: 1, OUTBOX_ATTEMPTS_FIELD: 1},
+            )
+            .sort(f"{OUTBOX_FIELD}.created_at", 1)
+            .limit(limit)
+        )
+        return [doc async for doc in cursor]
+
+    @traced()
+    @timed("ack_outbox_events")
+    async def ack_outbox_events(self, seller_id: str, event_ids: List[str]):
+        """
+        Remove do outbox do documento os eventos já entregues e zera as tentativas de entrega.
+        """
+        await self.collection.update_one(
+            {"seller_id": str(seller_id)},
+            {
+                "$pull": {OUTBOX_FIELD: {"event_id": {"$in": event_ids}}},
+                "$unset": {OUTBOX_ATTEMPTS_FIELD: "", OUTBOX_NEXT_ATTEMPT_FIELD: ""},
+            },
+        )
+
+    @traced()
+    @timed("schedule_outbox_retry")
+    async def schedule_outbox_retry(self, seller_id: str, attempts: int, next_attempt_at: datetime):
+        """
+        Registra a falha na entrega do outbox do documento, que só volta a ser drenado a partir de `next_attempt_at`.
+        """
+        await self.collection.update_one(
+            {"seller_id": str(seller_id)},
+            {"$set": {OUTBOX_ATTEMPTS_FIELD: attempts, OUTBOX_NEXT_ATTEMPT_FIELD: next_attempt_at}},
+        )
+
+    def _update_document(self, fields: dict, outbox_events: Optional[List[OutboxEvent]]) -> dict:
+        update = {"$set": fields}
+        if outbox_events:
+            update["$push"] = {OUTBOX_FIELD: {"$each": self._dump_outbox_events(outbox_events)}}
+        return update
+
+    def projection_model(self, fields: Sequence[str], hidden: Sequence[str] = ()) -> Type[BaseModel]:
+        """
+        Modelo com apenas os campos `fields` do `model_class` (mesmos tipos e padrões), para que a validação
+        custe proporcionalmente aos campos pedidos. Os campos `hidden` são lidos, mas excluídos da serialização.
+        Os modelos são criados uma vez por combinação de campos.
+        """
+        hidden = tuple(field for field in hidden if field not in fields)
+        key = (tuple(fields), hidden)
+        model = self._projection_models.get(key)
+        if model is None:
+            unknown = [field for field in (*fields, *hidden) if field not in self.model_class.model_fields]
+            if unknown:
+                raise ValueError(f"Campos inexistentes em {self.model_class.__name__}: {', '.join(unknown)}")
+            definitions: dict[str, Any] = {}
+            for field in (*fields, *hidden):
+                info = self.model_class.model_fields[field]
+                if field in hidden:
+                    info = FieldInfo.merge_field_infos(info, exclude=True)
+                definitions[field] = (info.annotation, info)
+            model = self._projection_models[key] = create_model(
+                f"{self.model_class.__name__}Projection", **definitions
+            )
+        return model
+
+    def _projection(
+        self, fields: Optional[Sequence[str]], hidden: Sequence[str] = ()
+    ) -> tuple[Optional[dict], Type[BaseModel]]:
+        if not fields:
+            return None, self.model_class
+        model = self.projection_model(fields, hidden)
+        projection = dict.fromkeys(model.model_fields, 1)
+        projection["_id"] = 0
+        return projection, model
+
+    @staticmethod
+    def _keyset_filter(sort: List[tuple[str, int]], after: list) -> dict:
+        """
+        Documentos posteriores a `after` na ordem `sort`. Para (a desc, b desc):
+        `{"$or": [{"a": {"$lt": va}}, {"a": va, "b": {"$lt": vb}}]}`.
+        """
+        clauses = []
+        for position, (field, direction) in enumerate(sort):
+            clause = {previous_field: after[index] for index, (previous_field, _) in enumerate(sort[:position])}
+            clause[field] = {"$lt" if direction < 0 else "$gt": after[position]}
+            clauses.append(clause)
+        return {"$or": clauses}
+
+    @staticmethod
+    def _duplicate_key_field(error: DuplicateKeyError) -> Optional[str]:
+        """
+        Campo do índice único violado: `keyPattern` nos servidores atuais ou, nos antigos, o nome do índice
+        na mensagem de erro (`index: trade_name_1 dup key: ...`).
+        """
+        details = error.details or {}
+        key_pattern = details.get("keyPattern")
+        if key_pattern:
+            return next(iter(key_pattern))
+        message = details.get("errmsg") or str(error)
+        _, found, rest = message.partition("index: ")
+        if not found:
+            return None
+        index_name = rest.split(" ", 1)[0]
+        return index_name.rsplit("_", 1)[0] or None
+
+    @staticmethod
+    def _dump_outbox_events(outbox_events: List[OutboxEvent]) -> List[dict]:
+        return [convert_for_mongo(event.model_dump()) for event in outbox_events]
@@ -0,0 +1,275 @@
+import asyncio
+import logging
+import random
+import time
+from typing import TYPE_CHECKING, Any, Callable, Coroutine, Optional
+
+from pydantic import ValidationError
+from redis.exceptions import RedisError
+
+from app.common.metrics import REPOSITORY_OPERATION_DURATION, OperationTimers, timed
+from app.common.tracing import traced
+from app.integrations.cache import TTLLRUCache
+
+from ..models import Seller
+from .seller_repository import SellerRepository
+
+if TYPE_CHECKING:
+    from app.integrations.kv_db.redis_asyncio_adapter import RedisAsyncioAdapter
+
+logger = logging.getLogger(__name__)
+
+SELLER_CACHE_KEY_PREFIX = "seller_cache"
+DEFAULT_SELLER_CACHE_TTL_SECONDS = 60
+DEFAULT_SELLER_CACHE_LOCAL_TTL_SECONDS = 5.0
+DEFAULT_SELLER_CACHE_LOCAL_MAX_SIZE = 1_000
+# Fração máxima somada ao TTL no Redis, para que entradas gravadas juntas não expirem ao mesmo tempo
+SELLER_CACHE_TTL_JITTER = 0.1
+# Tempo em que uma invalidação impede, em todos os processos, a gravação no Redis de leituras anteriores a ela.
+# Leituras do Mongo mais longas que isso não são gravadas no cache.
+SELLER_CACHE_TOMBSTONE_TTL_SECONDS = 30
+
+# Grava o seller (e a referência por CNPJ, se houver) apenas se ele não foi invalidado há pouco
+STORE_SCRIPT = """
+if redis.call('EXISTS', KEYS[2]) == 1 then
+    return 0
+end
+redis.call('SET', KEYS[1], ARGV[1], 'EX', ARGV[2])
+if KEYS[3] then
+    redis.call('SET', KEYS[3], ARGV[3], 'EX', ARGV[2])
+end
+return 1
+"""
+
+# Remove o seller do cache e marca a invalidação (tombstone) por SELLER_CACHE_TOMBSTONE_TTL_SECONDS
+INVALIDATE_SCRIPT = """
+redis.call('DEL', KEYS[1])
+redis.call('SET', KEYS[2], '1', 'EX', ARGV[1])
+return 1
+"""
+
+CACHED_OPERATIONS = ("find_by_id", "find_by_cnpj")
+
+
+class CachedSellerRepository:
+    """
+    Cache de leitura (read-through) das buscas de seller por id e por CNPJ, em volta do `SellerRepository`.
+
+    O seller é lido, nesta ordem, de um LRU em memória do processo (TTL curto), do Redis (JSON do seller) e,
+    por fim, do Mongo, preenchendo as camadas anteriores. A busca por CNPJ guarda apenas o `seller_id`
+    e reaproveita a entrada do seller, conferindo o CNPJ ao lê-la. Buscas concorrentes pela mesma chave
+    compartilham uma única leitura (proteção contra stampede).
+
+    `patch`, `update` e `delete_by_id` invalidam a entrada do seller no processo e no Redis. A invalidação deixa
+    no Redis uma marca (tombstone) que impede, por `SELLER_CACHE_TOMBSTONE_TTL_SECONDS`, que qualquer processo
+    grave um seller lido do Mongo antes dela. Os LRUs dos demais processos expiram em até `local_ttl_seconds`.
+    Os sellers devolvidos são compartilhados entre as requisições e não devem ser alterados. Falhas do Redis não
+    interrompem as leituras, que seguem para o Mongo. Os demais métodos são repassados ao repositório.
+    """
+
+    def __init__(
+        self,
+        repository: SellerRepository,
+        inmemory_adapter: "RedisAsyncioAdapter",
+        ttl_seconds: int = DEFAULT_SELLER_CACHE_TTL_SECONDS,
+        local_ttl_seconds: float = DEFAULT_SELLER_CACHE_LOCAL_TTL_SECONDS,
+        local_max_size: int = DEFAULT_SELLER_CACHE_LOCAL_MAX_SIZE,
+        clock: Callable[[], float] = time.time,
+    ):
+        if ttl_seconds < 1:
+            raise ValueError("ttl_seconds deve ser maior que zero")
+        self.repository = repository
+        self.inmemory_adapter = inmemory_adapter
+        self.ttl_seconds = ttl_seconds
+        # Com local_ttl_seconds = 0, o LRU do processo não é usado (apenas o Redis)
+        self.local_ttl_seconds = local_ttl_seconds
+        self.local_cache: TTLLRUCache[str, Any] = TTLLRUCache(max_size=local_max_size, clock=clock)
+        self._clock = clock
+        # Leitura em andamento por chave, compartilhada entre as buscas concorrentes
+        self._loads: dict[str, asyncio.Task] = {}
+        # Incrementado a cada invalidação: leituras iniciadas antes dela não gravam no cache
+        self._invalidations = 0
+        self.local_hits = 0
+        self.redis_hits = 0
+        self.misses = 0
+        self._operation_timers = OperationTimers(REPOSITORY_OPERATION_DURATION, "sellers_cache", CACHED_OPERATIONS)
+        self._span_attributes = {"db.system": "redis", "db.collection.name": SellerRepository.COLLECTION_NAME}
+
+    def __getattr__(self, name: str) -> Any:
+        if name == "repository":
+            raise AttributeError(name)
+        return getattr(self.repository, name)
+
+    @property
+    def stats(self) -> dict:
+        """Acertos por camada, leituras no Mongo e taxa de acerto do cache."""
+        hits = self.local_hits + self.redis_hits
+        total = hits + self.misses
+        return {
+            "local_hits": self.local_hits,
+            "redis_hits": self.redis_hits,
+            "misses": self.misses,
+            "local_size": len(self.local_cache),
+            "local_max_size": self.local_cache.max_size,
+            "hit_ratio": (hits / total) if total else 0.0,
+        }
+
+    @traced()
+    @timed("find_by_id")
+    async def find_by_id(self, seller_id: Any) -> Optional[Seller]:
+        return await self._get_seller(str(seller_id))
+
+    @traced()
+    @timed("find_by_cnpj")
+    async def find_by_cnpj(self, cnpj: str) -> Optional[Seller]:
+        key = self._cnpj_key(cnpj)
+        seller_id = self.local_cache.get(key) if self.local_ttl_seconds > 0 else None
+        if seller_id is None:
+            seller_id = await self._redis_get(key)
+        if seller_id is not None:
+            seller = await self._get_seller(seller_id)
+            # O CNPJ do seller pode ter mudado desde que a referência foi gravada
+            if seller is not None and seller.cnpj == cnpj:
+                self._set_local(key, seller_id)
+                return seller
+        return await self._load_once(key, lambda: self._load_by_cnpj(cnpj))
+
+    async def patch(self, seller_id: str, *args, **kwargs) -> Optional[Seller]:
+        try:
+            return await self.repository.patch(seller_id, *args, **kwargs)
+        finally:
+            await self.invalidate(seller_id)
+
+    async def update(self, seller_id: str, *args, **kwargs) -> Optional[Seller]:
+        try:
+            return await self.repository.update(seller_id, *args, **kwargs)
+        finally:
+            await self.invalidate(seller_id)
+
+    async def delete_by_id(self, seller_id: str) -> bool:
+        try:
+            return await self.repository.delete_by_id(seller_id)
+        finally:
+            await self.invalidate(seller_id)
+
+    async def invalidate(self, seller_id: str):
+        """Remove o seller do cache do processo e do Redis. As referências por CNPJ são conferidas na leitura."""
+        key = self._id_key(str(seller_id))
+        self._invalidations += 1
+        self._loads.pop(key, None)
+        self.local_cache.delete(key)
+        try:
+            await self.inmemory_adapter.eval_script(
+                INVALIDATE_SCRIPT,
+                keys=[key, self._tombstone_key(str(seller_id))],
+                args=[SELLER_CACHE_TOMBSTONE_TTL_SECONDS],
+            )
+        except RedisError:
+            logger.warning("Falha ao invalidar o seller '%s' no cache Redis.", seller_id, exc_info=True)
+
+    async def _get_seller(self, seller_id: str) -> Optional[Seller]:
+        key = self._id_key(seller_id)
+        if self.local_ttl_seconds > 0:
+            seller = self.local_cache.get(key)
+            if seller is not None:
+                self.local_hits += 1
+                return seller
+        return await self._load_once(key, lambda: self._load_by_id(seller_id))
+
+    async def _load_by_id(self, seller_id: str) -> Optional[Seller]:
+        key = self._id_key(seller_id)
+        invalidations = self._invalidations
+        started_at = self._clock()
+        cached = await self._redis_get(key)
+        if cached is not None:
+            try:
+                seller = Seller.model_validate_json(cached)
+            except ValidationError:
+                logger.warning("Entrada inválida do seller '%s' no cache Redis; lendo do Mongo.", seller_id)
+            else:
+                self.redis_hits += 1
+                if invalidations == self._invalidations:
+                    self._set_local(key, seller)
+                return seller
+
+        self.misses += 1
+        seller = await self.repository.find_by_id(seller_id)
+        if seller is not None and invalidations == self._invalidations:
+            await self._store(seller, started_at)
+        return seller
+
+    async def _load_by_cnpj(self, cnpj: str) -> Optional[Seller]:
+        invalidations = self._invalidations
+        started_at = self._clock()
+        self.misses += 1
+        seller = await self.repository.find_by_cnpj(cnpj)
+        if seller is not None and invalidations == self._invalidations:
+            await self._store(seller, started_at, cnpj_key=self._cnpj_key(cnpj))
+        return seller
+
+    async def _load_once(self, key: str, load: Callable[[], Coroutine[Any, Any, Optional[Seller]]]) -> Optional[Seller]:
+        """
+        Executa `load` uma única vez para as buscas concorrentes da mesma chave. O cancelamento de uma
+        das buscas não interrompe a leitura das demais.
+        """
+        task = self._loads.get(key)
+        if task is None:
+            task = self._loads[key] = asyncio.create_task(load())
+            task.add_done_callback(lambda done: self._loads.pop(key) if self._loads.get(key) is done else None)
+        return await asyncio.shield(task)
+
+    async def _store(self, seller: Seller, started_at: float, cnpj_key: Optional[str] = None):
+        """
+        Grava o seller lido do Mongo em `started_at` no processo e, se não foi invalidado desde então por
+        nenhum processo (tombstone), no Redis.
+        """
+        key = self._id_key(seller.seller_id)
+        if self._clock() - started_at >= SELLER_CACHE_TOMBSTONE_TTL_SECONDS:
+            # O tombstone de uma invalidação ocorrida durante a leitura pode já ter expirado
+            logger.warning("Leitura lenta do seller '%s' não gravada no cache.", seller.seller_id)
+            return
+        self._set_local(key, seller)
+        if cnpj_key is not None:
+            self._set_local(cnpj_key, seller.seller_id)
+        ttl = self.ttl_seconds + random.randint(0, int(self.ttl_seconds * SELLER_CACHE_TTL_JITTER))
+        keys = [key, self._tombstone_key(seller.seller_id)]
+        args: list[Any] = [seller.model_dump_json(), ttl]
+        if cnpj_key is not None:
+            keys.append(cnpj_key)
+            args.append(seller.seller_id)
+        try:
+            stored = await self.inmemory_adapter.eval_script(STORE_SCRIPT, keys=keys, args=args)
+        except RedisError:
+            logger.warning("Falha ao gravar o seller '%s' no cache Redis.", seller.seller_id, exc_info=True)
+            return
+        if not stored:
+            # Invalidado por outro processo durante a leitura: a cópia local também pode estar desatualizada
+            self.local_cache.delete(key)
+            if cnpj_key is not None:
+                self.local_cache.delete(cnpj_key)
+
+    async def _redis_get(self, key: str) -> Optional[str]:
+        try:
+            return await self.inmemory_adapter.get_str(key)
+        except RedisError:
+            logger.warning("Falha ao ler a chave '%s' do cache Redis; lendo do Mongo.", key, exc_info=True)
+            return None
+
+    def _set_local(self, key: str, value: Any):
+        if self.local_ttl_seconds > 0:
+            self.local_cache.set(key, value, expires_at=self._clock() + self.local_ttl_seconds)
+
+    @staticmethod
+    def _id_key(seller_id: str) -> str:
+        return f"{SELLER_CACHE_KEY_PREFIX}:id:{seller_id}"
+
+    @staticmethod
+    def _tombstone_key(seller_id: str) -> str:
+        return f"{SELLER_CACHE_KEY_PREFIX}:invalidated:{seller_id}"
+
+    @staticmethod
+    def _cnpj_key(cnpj: str) -> str:
+        return f"{SELLER_CACHE_KEY_PREFIX}:cnpj:{cnpj}"
+
+
+__all__ = ["CachedSellerRepository"]
@@ -1,5 +1,7 @@
 from typing import Optional
 
+from app.common.metrics import timed
+from app.common.tracing import traced
 from app.integrations.database.mongo_client import MongoClient
 
 from ..models import Seller
@@ -13,24 +15,30 @@ class SellerRepository(AsyncMemoryRepository[Seller]):
     def __init__(self, client: "MongoClient", db_name: str):
         super().__init__(client=client, db_name=db_name, collection_name=self.COLLECTION_NAME, model_class=Seller)
 
+    @traced()
+    @timed("find_by_nome_fantasia")
     async def find_by_nome_fantasia(self, nome_fantasia: str) -> Optional[Seller]:
         """Método legado - mantido para compatibilidade"""
         result = await self.collection.find_one({"nome_fantasia": nome_fantasia})
         if result:
-            return self.model_class(**result)
+            return self.model_class.model_validate(result)
         return None
 
+    @traced()
+    @timed("find_by_trade_name")
     async def find_by_trade_name(self, trade_name: str) -> Optional[Seller]:
         """Busca seller por trade_name (nome fantasia)"""
         result = await self.collection.find_one({"trade_name": trade_name})
         if result:
-            return self.model_class(**result)
+            return self.model_class.model_validate(result)
         return None
 
+    @traced()
+    @timed("find_by_cnpj")
     async def find_by_cnpj(self, cnpj: str) -> Optional[Seller]:
         result = await self.collection.find_one({"cnpj": cnpj})
         if result:
-            return self.model_class(**result)
+            return self.model_class.model_validate(result)
         return None
 
 
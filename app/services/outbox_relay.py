@@ -0,0 +1,182 @@
+import asyncio
+import logging
+from datetime import timedelta
+from typing import TYPE_CHECKING
+
+from redis.exceptions import LockError
+
+from app.common.datetime import utcnow
+from app.common.tracing import start_span
+from app.models.outbox_event_model import OutboxDestination
+from app.repositories.base.memory_repository import OUTBOX_ATTEMPTS_FIELD, OUTBOX_FIELD, AsyncMemoryRepository
+from app.services.publisher import AsyncRabbitMQPublisher, publish_seller_message
+from app.services.webhook_dispatcher import WebhookDispatcher
+from app.services.webhook_service import WebhookService
+
+if TYPE_CHECKING:
+    from redis.asyncio.lock import Lock
+
+    from app.integrations.kv_db.redis_asyncio_adapter import RedisAsyncioAdapter
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_OUTBOX_BATCH_SIZE = 100
+DEFAULT_OUTBOX_POLL_INTERVAL_SECONDS = 1.0
+OUTBOX_LOCK_KEY = "outbox_relay"
+# Renovada a cada documento do lote e após o envio dos webhooks do lote; cobre cada etapa, não o lote inteiro
+OUTBOX_LOCK_TIMEOUT_SECONDS = 60
+OUTBOX_LOCK_BLOCKING_TIMEOUT_SECONDS = 0.1
+# Espera antes de drenar novamente um documento cuja entrega falhou: dobra a cada falha, até o máximo
+OUTBOX_RETRY_BASE_DELAY_SECONDS = 1.0
+OUTBOX_RETRY_MAX_DELAY_SECONDS = 300.0
+
+
+class OutboxRelay:
+    """
+    Entrega, em segundo plano e em lotes, os eventos gravados no outbox dos documentos
+    (RabbitMQ e webhook) e os remove do documento após a entrega.
+
+    A entrega é "ao menos uma vez": um evento só sai do outbox depois de confirmado pelo destino.
+    Com o `webhook_dispatcher` iniciado, os eventos de webhook do lote são enfileirados no dispatcher,
+    que os agrupa em poucas mensagens, e só são confirmados depois do envio dessas mensagens.
+    Com o Redis disponível, apenas uma instância da aplicação drena o outbox por vez.
+    Documentos com eventos não entregues só voltam a ser drenados após uma espera crescente, para que um
+    evento que sempre falha não ocupe os lotes seguintes.
+    """
+
+    def __init__(
+        self,
+        repository: AsyncMemoryRepository,
+        publisher: AsyncRabbitMQPublisher,
+        webhook_service: WebhookService | None = None,
+        inmemory_adapter: "RedisAsyncioAdapter | None" = None,
+        webhook_dispatcher: WebhookDispatcher | None = None,
+        batch_size: int = DEFAULT_OUTBOX_BATCH_SIZE,
+        poll_interval_seconds: float = DEFAULT_OUTBOX_POLL_INTERVAL_SECONDS,
+    ):
+        self.repository = repository
+        self.publisher = publisher
+        self.webhook_service = webhook_service or WebhookService()
+        self.inmemory_adapter = inmemory_adapter
+        self.webhook_dispatcher = webhook_dispatcher
+        self.batch_size = batch_size
+        self.poll_interval_seconds = poll_interval_seconds
+        self._task: asyncio.Task | None = None
+
+    def start(self):
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._relay_loop())
+
+    async def stop(self):
+        if self._task is None:
+            return
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+        self._task = None
+
+    async def drain_once(self) -> int:
+        """
+        Entrega um lote de eventos pendentes. Retorna a quantidade de eventos entregues.
+        """
+        if self.inmemory_adapter is None:
+            return await self._drain_batch()
+        try:
+            async with self.inmemory_adapter.locks(
+                OUTBOX_LOCK_KEY,
+                timeout_in_seconds=OUTBOX_LOCK_TIMEOUT_SECONDS,
+                blocking_timeout_in_seconds=OUTBOX_LOCK_BLOCKING_TIMEOUT_SECONDS,
+            ) as lock:
+                return await self._drain_batch(lock)
+        except LockError:
+            # Também ocorre se a trava expirou durante a entrega e foi obtida por outra instância
+            logger.debug("Outbox sendo drenado por outra instância; aguardando o próximo ciclo.")
+            return 0
+
+    async def _drain_batch(self, lock: "Lock | None" = None) -> int:
+        outcomes = []
+        for document in await self.repository.find_pending_outbox(limit=self.batch_size):
+            if lock is not None:
+                # Interrompe o lote (LockNotOwnedError) se a trava já não pertence a esta instância
+                await lock.reacquire()
+            results = [(event["event_id"], await self._deliver(event)) for event in document.get(OUTBOX_FIELD, [])]
+            outcomes.append((document, results))
+
+        # Os webhooks enfileirados no dispatcher só são confirmados depois do envio, aguardado uma única vez
+        # para o lote inteiro para que o dispatcher os agrupe
+        pending = [result for _, results in outcomes for _, result in results if isinstance(result, asyncio.Future)]
+        if pending:
+            await asyncio.wait(pending)
+            if lock is not None:
+                await lock.reacquire()
+
+        delivered = 0
+        for document, results in outcomes:
+            delivered_ids = []
+            failed = False
+            for event_id, result in results:
+                if isinstance(result, asyncio.Future):
+                    result = result.result()
+                if result:
+                    delivered_ids.append(event_id)
+                else:
+                    failed = True
+            if delivered_ids:
+                await self.repository.ack_outbox_events(document["seller_id"], delivered_ids)
+                delivered += len(delivered_ids)
+            if failed:
+                await self._schedule_retry(document)
+        return delivered
+
+    async def _schedule_retry(self, document: dict):
+        attempts = document.get(OUTBOX_ATTEMPTS_FIELD, 0) + 1
+        delay = min(OUTBOX_RETRY_BASE_DELAY_SECONDS * 2 ** min(attempts - 1, 16), OUTBOX_RETRY_MAX_DELAY_SECONDS)
+        logger.warning(
+            "Eventos do outbox do seller '%s' não entregues (tentativa %s); nova tentativa em %ss.",
+            document["seller_id"],
+            attempts,
+            delay,
+        )
+        await self.repository.schedule_outbox_retry(
+            document["seller_id"], attempts, utcnow() + timedelta(seconds=delay)
+        )
+
+    async def _deliver(self, event: dict) -> "bool | asyncio.Future[bool]":
+        # O span continua o trace da requisição que gravou o evento
+        trace_context = event.get("trace_context")
+        with start_span(f"outbox deliver {event['destination']}", carrier=trace_context):
+            return await self._deliver_event(event, trace_context)
+
+    async def _deliver_event(self, event: dict, trace_context: dict | None) -> "bool | asyncio.Future[bool]":
+        try:
+            if event["destination"] == OutboxDestination.RABBITMQ:
+                if self.publisher.started:
+                    await self.publisher.publish_message(event["payload"], headers=trace_context)
+                else:
+                    await asyncio.to_thread(publish_seller_message, event["payload"], trace_context)
+                return True
+            if event["destination"] == OutboxDestination.WEBHOOK:
+                if self.webhook_dispatcher is not None and self.webhook_dispatcher.started:
+                    # Futuro resolvido com False se a fila estiver cheia ou o envio falhar: o evento permanece
+                    # no outbox e é reagendado
+                    return self.webhook_dispatcher.dispatch_nowait(**event["payload"])
+                return await self.webhook_service.send_update_message(**event["payload"])
+            logger.error(f"Destino de outbox desconhecido no evento '{event['event_id']}': {event['destination']}")
+        except Exception as e:
+            logger.error(f"Falha ao entregar o evento de outbox '{event['event_id']}': {str(e)}")
+        return False
+
+    async def _relay_loop(self):
+        while True:
+            try:
+                delivered = await self.drain_once()
+            except asyncio.CancelledError:
+                raise
+            except Exception:
+                logger.exception("Falha ao drenar o outbox")
+                delivered = 0
+            # Lote cheio indica que há mais eventos pendentes: drena novamente sem esperar
+            if delivered < self.batch_size:
+                await asyncio.sleep(self.poll_interval_seconds)
@@ -1,9 +1,20 @@
+import asyncio
 import pika
 import json
 import os
 import logging
 from typing import Dict
 
+import aio_pika
+from aio_pika.abc import AbstractChannel, AbstractRobustConnection
+from aio_pika.pool import Pool
+
+from app.common.metrics import INTEGRATION_OPERATION_DURATION, OperationTimers, timed
+from app.common.tracing import inject_trace_context, traced
+
+DEFAULT_CHANNEL_POOL_SIZE = 10
+PUBLISH_CONFIRM_TIMEOUT_SECONDS = 10
+
 class RabbitMQPublisher:
     def __init__(self) -> None:
         self.logger = logging.getLogger(__name__)
@@ -28,7 +39,7 @@ class RabbitMQPublisher:
         channel = connection.channel()
         return connection, channel
 
-    def send_message(self, body: Dict):
+    def send_message(self, body: Dict, headers: Dict | None = None):
         connection = None
         try:
             connection, channel = self.__create_channel()
@@ -42,7 +53,8 @@ class RabbitMQPublisher:
                 body=message_body,
                 properties=pika.BasicProperties(
                     delivery_mode=2,
-                    content_type='application/json'
+                    content_type='application/json',
+                    headers=inject_trace_context(headers)
                 )
             )
             
@@ -54,19 +66,123 @@ class RabbitMQPublisher:
                 connection.close()
 
     def _json_serializer(self, obj):
-        """Serializer customizado para tipos especiais"""
-        if hasattr(obj, 'isoformat'):
-            return obj.isoformat()
-        elif hasattr(obj, 'value'):
-            return obj.value
-        elif hasattr(obj, '__dict__'): 
-            return obj.__dict__
-        return str(obj)
+        return _json_serializer(obj)
+
+
+class AsyncRabbitMQPublisher:
+    """
+    Publisher assíncrono do RabbitMQ com conexão persistente (reconexão automática) e pool de canais
+    com confirmação de publicação (publisher confirms).
+
+    As mensagens são publicadas pelo relay do outbox (`OutboxRelay`), que cuida das novas tentativas.
+    Deve ser iniciado e encerrado no lifespan da aplicação.
+    """
+
+    def __init__(self, channel_pool_size: int = DEFAULT_CHANNEL_POOL_SIZE) -> None:
+        self.logger = logging.getLogger(__name__)
+        self.host = os.getenv("RABBITMQ_HOST") or "localhost"
+        self.port = int(os.getenv("RABBITMQ_PORT") or 5672)
+        self.username = os.getenv("RABBITMQ_USERNAME") or "guest"
+        self.password = os.getenv("RABBITMQ_PASSWORD") or "guest"
+        self.exchange = os.getenv("RABBITMQ_EXCHANGE") or ""
+        self.routing_key = os.getenv("RABBITMQ_ROUTING_KEY") or ""
+        self.channel_pool_size = channel_pool_size
+
+        self._connection: AbstractRobustConnection | None = None
+        self._connection_lock = asyncio.Lock()
+        self._channel_pool: Pool[AbstractChannel] | None = None
+        self._operation_timers = OperationTimers(INTEGRATION_OPERATION_DURATION, "rabbitmq", ("publish",))
+        self._span_attributes = {
+            "messaging.system": "rabbitmq",
+            "messaging.destination.name": self.exchange,
+            "messaging.rabbitmq.destination.routing_key": self.routing_key,
+        }
+
+    @property
+    def started(self) -> bool:
+        return self._channel_pool is not None
+
+    async def start(self):
+        """
+        Cria o pool de canais. A conexão com o broker é aberta sob demanda na primeira publicação,
+        para que a indisponibilidade do RabbitMQ não impeça a subida da aplicação.
+        """
+        if self.started:
+            return
+        self._channel_pool = Pool(self._create_channel, max_size=self.channel_pool_size)
+
+    async def stop(self):
+        """
+        Fecha canais e conexão.
+        """
+        if self._channel_pool is None:
+            return
+        channel_pool, self._channel_pool = self._channel_pool, None
+        await channel_pool.close()
+        if self._connection is not None and not self._connection.is_closed:
+            await self._connection.close()
+        self._connection = None
+
+    async def publish_message(self, body: Dict, headers: Dict | None = None):
+        """
+        Publica a mensagem, aguardando a confirmação do broker.
+        """
+        await self.publish(self._serialize(body), headers=headers)
+
+    @traced("rabbitmq publish", kind="producer")
+    @timed("publish")
+    async def publish(self, message_body: bytes, headers: Dict | None = None):
+        """
+        Publica a mensagem e aguarda a confirmação do broker. O contexto da requisição atual
+        (`traceparent`, `X-Request-ID`) é acrescentado aos cabeçalhos da mensagem.
+        """
+        if self._channel_pool is None:
+            raise RuntimeError("O publisher do RabbitMQ não foi iniciado")
+        async with self._channel_pool.acquire() as channel:
+            exchange = (
+                await channel.get_exchange(self.exchange, ensure=False) if self.exchange else channel.default_exchange
+            )
+            await exchange.publish(
+                aio_pika.Message(
+                    body=message_body,
+                    delivery_mode=aio_pika.DeliveryMode.PERSISTENT,
+                    content_type="application/json",
+                    headers=inject_trace_context(headers),
+                ),
+                routing_key=self.routing_key,
+                timeout=PUBLISH_CONFIRM_TIMEOUT_SECONDS,
+            )
+
+    async def _get_connection(self) -> AbstractRobustConnection:
+        async with self._connection_lock:
+            if self._connection is None or self._connection.is_closed:
+                self._connection = await aio_pika.connect_robust(
+                    host=self.host, port=self.port, login=self.username, password=self.password
+                )
+            return self._connection
+
+    async def _create_channel(self) -> AbstractChannel:
+        connection = await self._get_connection()
+        return await connection.channel(publisher_confirms=True)
+
+    def _serialize(self, body: Dict) -> bytes:
+        return json.dumps(body, default=_json_serializer, ensure_ascii=False).encode("utf-8")
+
+
+def _json_serializer(obj):
+    """Serializer customizado para tipos especiais"""
+    if hasattr(obj, 'isoformat'):
+        return obj.isoformat()
+    elif hasattr(obj, 'value'):
+        return obj.value
+    elif hasattr(obj, '__dict__'):
+        return obj.__dict__
+    return str(obj)
 
 
-def publish_seller_message(seller_data: Dict):
+def publish_seller_message(seller_data: Dict, headers: Dict | None = None):
     """
     Função para publicar mensagem do seller no RabbitMQ
     """
     publisher = RabbitMQPublisher()
-    publisher.send_message(seller_data)
+    publisher.send_message(seller_data, headers=headers)
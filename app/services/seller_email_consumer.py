@@ -1,7 +1,12 @@
+import functools
 import pika
 import json
 import os
+import sys
 import logging
+from concurrent.futures import ThreadPoolExecutor
+
+from app.common.tracing import HEADER_X_REQUEST_ID, configure_tracing_from_env, start_span
 from app.services.email_service import EmailService
 
 logger = logging.getLogger(__name__)
@@ -12,16 +17,63 @@ if not logger.hasHandlers():
     logger.addHandler(handler)
     logger.setLevel(logging.INFO)
 
+DEFAULT_CONSUMER_WORKERS = 4
+DEFAULT_MAX_ATTEMPTS = 5
+DEFAULT_RETRY_BASE_DELAY_SECONDS = 5
+MAX_RETRY_DELAY_SECONDS = 15 * 60
+ATTEMPTS_HEADER = "x-attempts"
+LAST_ERROR_HEADER = "x-last-error"
+
+
+class _ThreadSafeChannel:
+    """
+    Encaminha o ack/nack feito pelas threads de trabalho para a thread da conexão (o pika não é thread-safe).
+    """
+
+    def __init__(self, connection, channel):
+        self._connection = connection
+        self._channel = channel
+
+    def basic_ack(self, delivery_tag):
+        self._connection.add_callback_threadsafe(functools.partial(self._channel.basic_ack, delivery_tag=delivery_tag))
+
+    def basic_nack(self, delivery_tag, requeue=True):
+        self._connection.add_callback_threadsafe(
+            functools.partial(self._channel.basic_nack, delivery_tag=delivery_tag, requeue=requeue)
+        )
+
+    def basic_publish(self, exchange, routing_key, body, properties=None):
+        self._connection.add_callback_threadsafe(
+            functools.partial(
+                self._channel.basic_publish,
+                exchange=exchange,
+                routing_key=routing_key,
+                body=body,
+                properties=properties,
+            )
+        )
+
 
 class SellerEmailConsumer:
-    def __init__(self):
+    def __init__(self, workers: int | None = None, prefetch_count: int | None = None):
         self.logger = logging.getLogger(__name__)
         self.__host = os.getenv("RABBITMQ_HOST")
         self.__port = os.getenv("RABBITMQ_PORT")
         self.__username = os.getenv("RABBITMQ_USERNAME")
         self.__password = os.getenv("RABBITMQ_PASSWORD")
         self.__queue = os.getenv("RABBITMQ_QUEUE")
-        self.email_service = EmailService()
+        # Quantidade de mensagens processadas em paralelo e de mensagens não confirmadas entregues pelo broker
+        self.workers = workers or int(os.getenv("RABBITMQ_CONSUMER_WORKERS") or DEFAULT_CONSUMER_WORKERS)
+        self.prefetch_count = prefetch_count or int(os.getenv("RABBITMQ_PREFETCH_COUNT") or self.workers * 2)
+        # Mensagens com falha voltam após um atraso exponencial (filas de retry com TTL) e,
+        # após `max_attempts` tentativas, vão para a fila de mensagens mortas (DLQ)
+        self.max_attempts = int(os.getenv("RABBITMQ_MAX_ATTEMPTS") or DEFAULT_MAX_ATTEMPTS)
+        self.retry_base_delay_seconds = int(
+            os.getenv("RABBITMQ_RETRY_BASE_DELAY_SECONDS") or DEFAULT_RETRY_BASE_DELAY_SECONDS
+        )
+        self.email_service = EmailService(pool_size=self.workers)
+        self._executor = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="seller-email")
+        self._connection = None
 
     def __create_channel(self):
         connection_parameters = pika.ConnectionParameters(
@@ -41,20 +93,58 @@ class SellerEmailConsumer:
             queue=self.__queue,
             durable=True
         )
+
+        # Filas de retry: ao expirar o TTL, a mensagem volta para a fila principal
+        for attempt in range(1, self.max_attempts):
+            channel.queue_declare(
+                queue=self.retry_queue_name(attempt),
+                durable=True,
+                arguments={
+                    "x-message-ttl": self.retry_delay_seconds(attempt) * 1000,
+                    "x-dead-letter-exchange": "",
+                    "x-dead-letter-routing-key": self.__queue,
+                },
+            )
+        channel.queue_declare(queue=self.dead_letter_queue_name, durable=True)
         
+        # Limitar as mensagens entregues e ainda não confirmadas
+        channel.basic_qos(prefetch_count=self.prefetch_count)
+
         # Configurar consumer
         channel.basic_consume(
             queue=self.__queue,
             auto_ack=False,  # Mudado para False para controle manual
-            on_message_callback=self.__process_seller_message
+            on_message_callback=self.__dispatch_message
         )
 
+        self._connection = connection
         return connection, channel
 
+    def __dispatch_message(self, ch, method, properties, body):
+        """
+        Entrega a mensagem para uma das threads de trabalho, liberando a thread da conexão
+        """
+        self._executor.submit(
+            self.__process_seller_message, _ThreadSafeChannel(self._connection, ch), method, properties, body
+        )
+
     def __process_seller_message(self, ch, method, properties, body):
         """
-        Processa mensagem recebida do RabbitMQ e envia email de boas-vindas
+        Processa mensagem recebida do RabbitMQ e envia email de boas-vindas, continuando o trace de quem a publicou
         """
+        headers = getattr(properties, "headers", None)
+        carrier = headers if isinstance(headers, dict) else {}
+        attributes = {
+            "messaging.system": "rabbitmq",
+            "messaging.destination.name": self.__queue,
+            "messaging.rabbitmq.attempts": self.__attempts(properties),
+        }
+        if request_id := carrier.get(HEADER_X_REQUEST_ID):
+            attributes["app.request_id"] = str(request_id)
+        with start_span(f"{self.__queue} process", "consumer", attributes, carrier=carrier):
+            self.__handle_seller_message(ch, method, properties, body)
+
+    def __handle_seller_message(self, ch, method, properties, body):
         try:
             # Decodificar mensagem JSON
             message_str = body.decode('utf-8')
@@ -65,7 +155,7 @@ class SellerEmailConsumer:
             # Verificar se é uma mensagem de seller válida
             if not self.__is_valid_seller_message(seller_data):
                 self.logger.warning("Mensagem recebida não contém dados válidos de seller")
-                ch.basic_ack(delivery_tag=method.delivery_tag)
+                self.__dead_letter(ch, method, properties, body, "Mensagem sem dados válidos de seller")
                 return
 
             # Enviar email de boas-vindas
@@ -78,17 +168,70 @@ class SellerEmailConsumer:
                 # Confirmar processamento da mensagem
                 ch.basic_ack(delivery_tag=method.delivery_tag)
             else:
-                self.logger.error("Falha ao enviar email. Rejeitando mensagem.")
-                # Rejeitar mensagem (volta para a fila)
-                ch.basic_nack(delivery_tag=method.delivery_tag, requeue=True)
+                self.logger.error("Falha ao enviar email. Reagendando mensagem.")
+                self.__retry_or_dead_letter(ch, method, properties, body, "Falha ao enviar email")
 
-        except json.JSONDecodeError as e:
+        except (json.JSONDecodeError, UnicodeDecodeError) as e:
             self.logger.error(f"Erro ao decodificar JSON: {str(e)}")
-            ch.basic_ack(delivery_tag=method.delivery_tag)  # Descartar mensagem inválida
-            
+            # Mensagem inválida nunca será processada: vai direto para a DLQ
+            self.__dead_letter(ch, method, properties, body, f"JSON inválido: {str(e)}")
+
         except Exception as e:
             self.logger.error(f"Erro inesperado ao processar mensagem: {str(e)}")
-            ch.basic_nack(delivery_tag=method.delivery_tag, requeue=True)
+            self.__retry_or_dead_letter(ch, method, properties, body, str(e))
+
+    def retry_queue_name(self, attempt: int) -> str:
+        return f"{self.__queue}.retry.{attempt}"
+
+    @property
+    def dead_letter_queue_name(self) -> str:
+        return f"{self.__queue}.dlq"
+
+    def retry_delay_seconds(self, attempt: int) -> int:
+        return min(self.retry_base_delay_seconds * 2 ** (attempt - 1), MAX_RETRY_DELAY_SECONDS)
+
+    def __retry_or_dead_letter(self, ch, method, properties, body, reason: str):
+        """
+        Republica a mensagem na fila de retry da próxima tentativa (ou na DLQ, se esgotadas) e confirma a original.
+        A mensagem nunca volta imediatamente para o início da fila principal.
+        """
+        attempts = self.__attempts(properties) + 1
+        if attempts >= self.max_attempts:
+            self.logger.error(f"Mensagem descartada para a DLQ após {attempts} tentativas: {reason}")
+            self.__dead_letter(ch, method, properties, body, reason)
+            return
+
+        self.logger.warning(
+            f"Tentativa {attempts}/{self.max_attempts} falhou; nova tentativa em {self.retry_delay_seconds(attempts)}s"
+        )
+        self.__republish(ch, method, properties, body, self.retry_queue_name(attempts), attempts, reason)
+
+    def __dead_letter(self, ch, method, properties, body, reason: str):
+        attempts = self.__attempts(properties) + 1
+        self.__republish(ch, method, properties, body, self.dead_letter_queue_name, attempts, reason)
+
+    def __republish(self, ch, method, properties, body, queue: str, attempts: int, reason: str):
+        headers = dict(getattr(properties, "headers", None) or {})
+        headers[ATTEMPTS_HEADER] = attempts
+        headers[LAST_ERROR_HEADER] = reason[:255]
+        ch.basic_publish(
+            exchange="",
+            routing_key=queue,
+            body=body,
+            properties=pika.BasicProperties(delivery_mode=2, content_type="application/json", headers=headers),
+        )
+        # O ack só é enviado depois da publicação (mesma ordem na thread da conexão)
+        ch.basic_ack(delivery_tag=method.delivery_tag)
+
+    @staticmethod
+    def __attempts(properties) -> int:
+        headers = getattr(properties, "headers", None)
+        if not isinstance(headers, dict):
+            return 0
+        try:
+            return int(headers.get(ATTEMPTS_HEADER, 0))
+        except (TypeError, ValueError):
+            return 0
 
     def __is_valid_seller_message(self, data):
         """
@@ -104,7 +247,7 @@ class SellerEmailConsumer:
         try:
             self.logger.info("Iniciando consumer de email para sellers...")
             self.logger.info(f"Conectando em {self.__host}:{self.__port}")
-            self.logger.info(f"Fila: {self.__queue}")
+            self.logger.info(f"Fila: {self.__queue} | workers: {self.workers} | prefetch: {self.prefetch_count}")
             
             connection, channel = self.__create_channel()
             
@@ -114,12 +257,22 @@ class SellerEmailConsumer:
         except KeyboardInterrupt:
             self.logger.info("Interrompido pelo usuário")
             channel.stop_consuming()
-            connection.close()
+            self.stop(connection)
             
         except Exception as e:
             self.logger.error(f"Erro ao iniciar consumer: {str(e)}")
             raise
 
+    def stop(self, connection):
+        """
+        Aguarda as mensagens em processamento, envia os acks pendentes e fecha as conexões
+        """
+        self._executor.shutdown(wait=True)
+        if connection.is_open:
+            connection.process_data_events(time_limit=0)
+            connection.close()
+        self.email_service.close()
+
 
 def main():
     """
@@ -137,6 +290,8 @@ def main():
         logger.error(f"Variáveis de ambiente faltando: {', '.join(missing_vars)}")
         return
 
+    configure_tracing_from_env("seller-email-consumer")
+
     # Iniciar consumer
     consumer = SellerEmailConsumer()
     consumer.start_consuming()
@@ -1,36 +1,42 @@
-import os
-
 import logging
+from datetime import timedelta
 
-from fastapi import HTTPException, status
-from pydantic import ValidationError
+from fastapi.encoders import jsonable_encoder
 
 from app.api.common.auth_handler import UserAuthInfo
 from app.clients.keycloak_admin_client import KeycloakAdminClient
 from app.common.datetime import utcnow
 from app.common.exceptions import BadRequestException, NotFoundException
+from app.common.tracing import traced
 from app.messages import (
     MSG_NOME_FANTASIA_JA_CADASTRADO,
     MSG_SELLER_CNPJ_NAO_ENCONTRADO,
     MSG_SELLER_ID_JA_CADASTRADO,
+    MSG_SELLER_JA_CADASTRADO,
     MSG_SELLER_NAO_ENCONTRADO,
 )
-from app.models.seller_model import Seller
-from app.models.seller_patch_model import SellerPatch
-from app.repositories.seller_repository import SellerRepository
-from app.services.publisher import publish_seller_message
-from app.services.webhook_service import WebhookService
-from ..api.v1.schemas.seller_schema import SellerResponse
 from app.models.enums import SellerStatus
+from app.models.outbox_event_model import OutboxDestination, OutboxEvent
+from app.models.seller_patch_model import SellerPatch
+from app.repositories.base import DuplicateKeyException
 
 from ..models import Seller
 from ..repositories import SellerRepository
 from .base import CrudService
 
 DEFAULT_USER = "system"
+# Retenção dos eventos de criação no outbox enquanto o seller é associado ao usuário no Keycloak. Se o processo
+# cair antes da liberação, os eventos do seller já gravado são entregues ao fim da retenção.
+SELLER_CREATED_OUTBOX_HOLD_SECONDS = 600
 
-logger = logging.getLogger(__name__)
+# Mensagem de erro por campo único em conflito (índices únicos da coleção, ver DuplicateKeyException);
+# os demais índices únicos usam MSG_SELLER_JA_CADASTRADO
+CONFLICT_MESSAGES = {
+    "seller_id": MSG_SELLER_ID_JA_CADASTRADO,
+    "trade_name": MSG_NOME_FANTASIA_JA_CADASTRADO,
+}
 
+logger = logging.getLogger(__name__)
 
 
 class SellerService(CrudService[Seller, str]):
@@ -38,20 +44,10 @@ class SellerService(CrudService[Seller, str]):
         super().__init__(repository)
         self.repository: SellerRepository = repository
         self.keycloak_client: KeycloakAdminClient = keycloak_client
-        self.webhook_service = WebhookService()
 
+    @traced()
     async def create(self, data: Seller, auth_info: UserAuthInfo) -> Seller:
-        logger.info(f"Iniciando processo de criação para o seller_id: {data.seller_id}")
-        # Verifica se seller_id já existe
-        if await self.repository.find_by_id(data.seller_id):
-            logger.warning(f"Tentativa de criar seller com ID duplicado: {data.seller_id}")
-            raise BadRequestException(message=MSG_SELLER_ID_JA_CADASTRADO)
-
-        # Verifica se trade_name já existe
-        if await self.repository.find_by_trade_name(data.trade_name):
-            logger.warning(f"Tentativa de criar seller com trade_name duplicado: {data.seller_id}")
-            raise BadRequestException(message=MSG_NOME_FANTASIA_JA_CADASTRADO)
-
+        logger.info("Iniciando processo de criação para o seller_id: %s", data.seller_id)
         user_identifier = f"{auth_info.user.server}:{auth_info.user.name}"
 
         now = utcnow()
@@ -86,56 +82,98 @@ class SellerService(CrudService[Seller, str]):
             audit_updated_at=now,
         )
 
+        # Mensagem do RabbitMQ e notificação webhook gravadas no outbox na mesma operação que o seller, mas retidas
+        # até a associação no Keycloak: um seller removido por falha na associação nunca é anunciado como criado.
+        outbox_events = [
+            OutboxEvent(destination=OutboxDestination.RABBITMQ, payload=seller_to_create.model_dump(mode="json")),
+            self._webhook_event(
+                message=f"Seller '{data.seller_id}' foi criado",
+                changes={"operation": "created", "seller_id": data.seller_id},
+            ),
+        ]
+
+        # Sem verificação prévia: os índices únicos de seller_id e trade_name recusam duplicados, inclusive
+        # em criações concorrentes. O seller é gravado antes da associação no Keycloak, para que um seller_id
+        # duplicado nunca seja associado ao usuário.
+        logger.debug("Salvando o seller '%s' no repositório.", data.seller_id)
+        try:
+            created_seller = await self.repository.create(
+                seller_to_create,
+                outbox_events=outbox_events,
+                hold_outbox_until=now + timedelta(seconds=SELLER_CREATED_OUTBOX_HOLD_SECONDS),
+            )
+        except DuplicateKeyException as e:
+            logger.warning("Tentativa de criar seller '%s' com %s duplicado", data.seller_id, e.field)
+            raise self._conflict_exception(e) from e
+
         user_keycloak_id = auth_info.user.name
-        logger.debug(f"Tentando associar o novo seller '{data.seller_id}' ao usuário '{user_keycloak_id}' no Keycloak.")
-        await self.keycloak_client.add_seller_to_user(
-            user_id=user_keycloak_id,
-            seller_to_add=data.seller_id
+        logger.debug(
+            "Tentando associar o novo seller '%s' ao usuário '%s' no Keycloak.", data.seller_id, user_keycloak_id
         )
-        logger.info("Associação no Keycloak bem-sucedida.")
-
-        logger.debug(f"Salvando o seller '{data.seller_id}' no repositório.")
-        created_seller = await self.repository.create(seller_to_create)
-        logger.info(f"Seller '{data.seller_id}' e associação de usuário criados com sucesso.")
-
         try:
-            seller_dict = created_seller.model_dump()
-            logger.debug(f"Dados do seller para publicação: {seller_dict}")
-            publish_seller_message(seller_dict)
-            logger.info(f"Mensagem do seller '{data.seller_id}' publicada com sucesso no RabbitMQ.")
-        except Exception as e:
-            logger.error(f"Falha ao publicar mensagem do seller '{data.seller_id}' no RabbitMQ: {str(e)}")
-            # Não falha a operação principal, apenas loga o erro
-
-        # Enviar notificação webhook
+            await self.keycloak_client.add_seller_to_user(
+                user_id=user_keycloak_id,
+                seller_to_add=data.seller_id
+            )
+        except Exception:
+            # Sem a associação o seller ficaria inacessível: desfaz a criação
+            logger.error(
+                "Falha ao associar o seller '%s' ao usuário '%s' no Keycloak. Removendo o seller criado.",
+                data.seller_id,
+                user_keycloak_id,
+                exc_info=True,
+            )
+            # A remoção do seller leva junto os eventos retidos
+            await self.repository.delete_by_id(data.seller_id)
+            raise
+
         try:
-            await self.webhook_service.send_update_message(
-                message=f"Seller '{data.seller_id}' foi criado",
-                changes={"operation": "created", "seller_id": data.seller_id}
+            await self.repository.release_outbox(data.seller_id)
+        except Exception:
+            # O seller já está criado e associado: os eventos são entregues ao fim da retenção
+            logger.warning(
+                "Falha ao liberar os eventos de criação do seller '%s'; entrega após %ss.",
+                data.seller_id,
+                SELLER_CREATED_OUTBOX_HOLD_SECONDS,
+                exc_info=True,
             )
-        except Exception as e:
-            logger.error(f"Falha ao enviar notificação webhook para seller criado '{data.seller_id}': {str(e)}")
+        logger.info("Seller '%s' e associação de usuário criados com sucesso.", data.seller_id)
 
         return created_seller
 
-    async def find(self, paginator, filters: dict) -> list[Seller]:
+    @traced()
+    async def find(self, paginator, filters: dict, fields: list[str] | None = None) -> list[Seller]:
         """
-                Busca sellers, adicionando um filtro padrão para retornar apenas os ativos.
+        Busca sellers, adicionando um filtro padrão para retornar apenas os ativos.
+        Com `fields`, retorna apenas esses campos (projeção no Mongo).
         """
         # Adiciona o filtro de status 'Ativo' por padrão
         if 'status' not in filters:
             filters['status'] = SellerStatus.ACTIVE
 
+        if paginator.is_cursor_mode:
+            return await self.repository.find_after(
+                filters=filters,
+                sort=paginator.get_keyset_sort(),
+                after=paginator.get_keyset_after(),
+                limit=paginator.limit,
+                fields=fields,
+            )
         return await self.repository.find(
-            filters=filters, limit=paginator.limit, offset=paginator.offset, sort=paginator.get_sort_order()
+            filters=filters,
+            limit=paginator.limit,
+            offset=paginator.offset,
+            sort=paginator.get_sort_order(),
+            fields=fields,
         )
 
+    @traced()
     async def delete_by_id(self, entity_id: str, auth_info: UserAuthInfo) -> Seller:
         """
         Realiza um 'soft delete' alterando o status do seller para 'Inativo'.
         """
         user_identifier = f"{auth_info.user.server}:{auth_info.user.name}"
-        logger.info(f"Usuário '{user_identifier}' iniciando exclusão lógica para o seller_id: {entity_id}")
+        logger.info("Usuário '%s' iniciando exclusão lógica para o seller_id: %s", user_identifier, entity_id)
 
         current_seller = await self.repository.find_by_id(entity_id)
         if not current_seller or current_seller.status == SellerStatus.INACTIVE:
@@ -149,16 +187,12 @@ class SellerService(CrudService[Seller, str]):
             "audit_updated_at": now,
         }
 
-        updated_seller = await self.repository.patch(entity_id, update_data)
-        logger.info(f"Seller '{entity_id}' marcado como 'Inativo' com sucesso pelo usuário '{user_identifier}'.")
-
-        try:
-            await self.webhook_service.send_update_message(
-                message=f"Seller '{entity_id}' foi marcado como inativo",
-                changes={"operation": "deleted", "seller_id": entity_id}
-            )
-        except Exception as e:
-            logger.error(f"Falha ao enviar notificação webhook para seller excluído '{entity_id}': {str(e)}")
+        webhook_event = self._webhook_event(
+            message=f"Seller '{entity_id}' foi marcado como inativo",
+            changes={"operation": "deleted", "seller_id": entity_id},
+        )
+        updated_seller = await self.repository.patch(entity_id, update_data, outbox_events=[webhook_event])
+        logger.info("Seller '%s' marcado como 'Inativo' com sucesso pelo usuário '%s'.", entity_id, user_identifier)
 
         try:
             user_keycloak_id = auth_info.user.name  # 'name' é o 'sub' (ID do usuário)
@@ -169,81 +203,78 @@ class SellerService(CrudService[Seller, str]):
         except Exception:
             # Se a atualização do Keycloak falhar, o seller já foi inativado.
             logger.error(
-                f"ALERTA: O seller '{entity_id}' foi inativado no banco, mas a remoção "
-                f"do atributo no Keycloak para o usuário '{user_identifier}' FALHOU. "
+                "ALERTA: O seller '%s' foi inativado no banco, mas a remoção "
+                "do atributo no Keycloak para o usuário '%s' FALHOU. "
                 "O acesso pode precisar ser revogado manualmente.",
+                entity_id,
+                user_identifier,
                 exc_info=True
             )
 
         return updated_seller
 
+    @traced()
     async def find_by_cnpj(self, cnpj: str) -> Seller:
         seller = await self.repository.find_by_cnpj(cnpj)
         if not seller:
             raise NotFoundException(message=MSG_SELLER_CNPJ_NAO_ENCONTRADO.format(cnpj=cnpj))
         return seller
 
+    @traced()
     async def update(self, entity_id: str, data: SellerPatch, auth_info: UserAuthInfo) -> Seller:
         user_identifier = f"{auth_info.user.server}:{auth_info.user.name}"
-        logger.info(f"Usuário '{user_identifier}' iniciando atualização (PATCH) para o seller_id: {entity_id}")
-        current = await self.repository.find_by_id(entity_id)
-        if not current:
-            logger.warning(f"Usuário '{user_identifier}' tentou atualizar um seller inexistente: {entity_id}")
-            raise NotFoundException(message=MSG_SELLER_NAO_ENCONTRADO.format(entity_id=entity_id))
-
+        logger.info("Usuário '%s' iniciando atualização (PATCH) para o seller_id: %s", user_identifier, entity_id)
         update_data = data.model_dump(exclude_unset=True)
 
         if not update_data:
-            logger.info(f"Nenhum campo para atualizar no seller_id: {entity_id}. Nenhuma ação realizada.")
+            current = await self.repository.find_by_id(entity_id)
+            if not current:
+                logger.warning("Usuário '%s' tentou atualizar um seller inexistente: %s", user_identifier, entity_id)
+                raise NotFoundException(message=MSG_SELLER_NAO_ENCONTRADO.format(entity_id=entity_id))
+            logger.info("Nenhum campo para atualizar no seller_id: %s. Nenhuma ação realizada.", entity_id)
             return current
 
-        if "trade_name" in update_data:
-            existing = await self.repository.find_by_trade_name(update_data["trade_name"])
-            if existing and existing.seller_id != entity_id:
-                logger.warning(f"Tentativa de atualizar seller '{entity_id}' com trade_name que já está em uso.")
-                raise BadRequestException(message=MSG_NOME_FANTASIA_JA_CADASTRADO)
-
         now = utcnow()
 
         update_data["updated_at"] = now
         update_data["updated_by"] = user_identifier
         update_data["audit_updated_at"] = now
 
-        updated_seller = await self.repository.patch(entity_id, update_data)
-        logger.info(f"Seller '{entity_id}' atualizado com sucesso pelo usuário '{user_identifier}'.")
-
-        # Enviar notificação webhook
+        changes_made = {
+            key: value
+            for key, value in update_data.items()
+            if key not in ['updated_at', 'updated_by', 'audit_updated_at']
+        }
+        webhook_event = self._webhook_event(
+            message=f"Seller '{entity_id}' foi atualizado",
+            changes={"operation": "updated", "seller_id": entity_id, "fields_changed": changes_made},
+        )
+        # O patch só grava (e só registra o evento) se o seller existir: dispensa a leitura prévia.
+        # Um trade_name em uso é recusado pelo índice único.
         try:
-            changes_made = {key: value for key, value in update_data.items() if key not in ['updated_at', 'updated_by', 'audit_updated_at']}
-            await self.webhook_service.send_update_message(
-                message=f"Seller '{entity_id}' foi atualizado",
-                changes={"operation": "updated", "seller_id": entity_id, "fields_changed": changes_made}
-            )
-        except Exception as e:
-            logger.error(f"Falha ao enviar notificação webhook para seller atualizado '{entity_id}': {str(e)}")
-            # Não falha a operação principal, apenas loga o erro
+            updated_seller = await self.repository.patch(entity_id, update_data, outbox_events=[webhook_event])
+        except DuplicateKeyException as e:
+            logger.warning("Tentativa de atualizar seller '%s' com %s que já está em uso.", entity_id, e.field)
+            raise self._conflict_exception(e) from e
+        if not updated_seller:
+            logger.warning("Usuário '%s' tentou atualizar um seller inexistente: %s", user_identifier, entity_id)
+            raise NotFoundException(message=MSG_SELLER_NAO_ENCONTRADO.format(entity_id=entity_id))
+        logger.info("Seller '%s' atualizado com sucesso pelo usuário '%s'.", entity_id, user_identifier)
 
         return updated_seller
 
+    @traced()
     async def replace(self, entity_id: str, data: Seller, auth_info: UserAuthInfo) -> Seller:
         user_identifier = f"{auth_info.user.server}:{auth_info.user.name}"
-        logger.info(f"Usuário '{user_identifier}' iniciando substituição (PUT) para o seller_id: {entity_id}")
+        logger.info("Usuário '%s' iniciando substituição (PUT) para o seller_id: %s", user_identifier, entity_id)
         existing = await self.repository.find_by_id(entity_id)
         if not existing:
-            logger.warning(f"Usuário '{user_identifier}' tentou substituir um seller inexistente: {entity_id}")
+            logger.warning("Usuário '%s' tentou substituir um seller inexistente: %s", user_identifier, entity_id)
             raise NotFoundException(message=MSG_SELLER_NAO_ENCONTRADO.format(entity_id=entity_id))
 
-        if await self.repository.find_by_trade_name(data.trade_name):
-            if data.trade_name != existing.trade_name:
-                logger.warning(
-                    f"Conflito de nome fantasia ao tentar substituir o seller '{entity_id}'. "
-                    f"O nome '{data.trade_name}' já está em uso."
-                )
-                raise BadRequestException(message=MSG_NOME_FANTASIA_JA_CADASTRADO)
-
         now = utcnow()
 
-        logger.debug(f"Montando objeto de substituição para o seller '{entity_id}'.")
+        logger.debug("Montando objeto de substituição para o seller '%s'.", entity_id)
         updated_seller = Seller(
             seller_id=entity_id,
             company_name=data.company_name,
@@ -274,24 +305,35 @@ class SellerService(CrudService[Seller, str]):
             audit_updated_at=now,
         )
 
-        result = await self.repository.update(entity_id, updated_seller)
-
-        logger.info(f"Seller '{entity_id}' substituído com sucesso pelo usuário '{user_identifier}'.")
-
-        # Enviar notificação webhook
+        webhook_event = self._webhook_event(
+            message=f"Seller '{entity_id}' foi substituído completamente",
+            changes={"operation": "replaced", "seller_id": entity_id},
+        )
         try:
-            await self.webhook_service.send_update_message(
-                message=f"Seller '{entity_id}' foi substituído completamente",
-                changes={"operation": "replaced", "seller_id": entity_id}
-            )
-        except Exception as e:
-            logger.error(f"Falha ao enviar notificação webhook para seller substituído '{entity_id}': {str(e)}")
-            # Não falha a operação principal, apenas loga o erro
+            result = await self.repository.update(entity_id, updated_seller, outbox_events=[webhook_event])
+        except DuplicateKeyException as e:
+            logger.warning("Conflito de %s ao tentar substituir o seller '%s'.", e.field, entity_id)
+            raise self._conflict_exception(e) from e
+
+        logger.info("Seller '%s' substituído com sucesso pelo usuário '%s'.", entity_id, user_identifier)
 
         return result
 
+    @traced()
     async def find_by_id(self, seller_id: str) -> Seller | None:
         seller = await self.repository.find_by_id(seller_id)
         if not seller or seller.status != "Ativo":
             return None
         return seller
+
+    @staticmethod
+    def _webhook_event(message: str, changes: dict) -> OutboxEvent:
+        return OutboxEvent(
+            destination=OutboxDestination.WEBHOOK,
+            payload={"message": message, "changes": jsonable_encoder(changes)},
+        )
+
+    @staticmethod
+    def _conflict_exception(error: DuplicateKeyException) -> BadRequestException:
+        """Erro 400 para um valor já usado por outro seller, com a mensagem específica do campo, se houver."""
+        return BadRequestException(message=CONFLICT_MESSAGES.get(error.field or "", MSG_SELLER_JA_CADASTRADO))
@@ -0,0 +1,200 @@
+import asyncio
+import logging
+from typing import Any, Dict, Hashable, List, Tuple
+
+from app.services.webhook_service import MAX_ATTACHMENTS_PER_MESSAGE, WebhookService
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_QUEUE_MAX_SIZE = 1_000
+DEFAULT_COALESCE_WINDOW_SECONDS = 2.0
+DEFAULT_MAX_BATCH_SIZE = 20
+DRAIN_TIMEOUT_SECONDS = 5.0
+
+Notification = Tuple[str, Dict[str, Any]]
+# Notificação enfileirada com o futuro que recebe o resultado do envio
+QueuedNotification = Tuple[str, Dict[str, Any], "asyncio.Future[bool]"]
+
+
+class WebhookDispatcher:
+    """
+    Envia as notificações de webhook em segundo plano, a partir de uma fila em memória limitada.
+
+    As notificações recebidas dentro de `coalesce_window_seconds` são agrupadas: alterações de um mesmo
+    seller viram uma única notificação e o lote é enviado em uma única mensagem do Slack (um anexo por
+    seller, até `max_batch_size`). Deve ser iniciado e encerrado no lifespan da aplicação.
+
+    Cada notificação enfileirada tem um futuro resolvido com o resultado do envio da mensagem que a contém.
+    Não há novas tentativas aqui: uma mensagem não enviada resolve os futuros com False, e quem enfileirou
+    (o OutboxRelay) reagenda a entrega.
+    """
+
+    def __init__(
+        self,
+        webhook_service: WebhookService,
+        queue_max_size: int = DEFAULT_QUEUE_MAX_SIZE,
+        coalesce_window_seconds: float = DEFAULT_COALESCE_WINDOW_SECONDS,
+        max_batch_size: int = DEFAULT_MAX_BATCH_SIZE,
+    ):
+        self.webhook_service = webhook_service
+        self.queue_max_size = queue_max_size
+        self.coalesce_window_seconds = coalesce_window_seconds
+        self.max_batch_size = min(max_batch_size, MAX_ATTACHMENTS_PER_MESSAGE)
+
+        self.queue: asyncio.Queue[QueuedNotification] = asyncio.Queue(maxsize=queue_max_size)
+        self._task: asyncio.Task | None = None
+
+        # Métricas
+        self.enqueued = 0
+        self.dropped = 0
+        self.coalesced = 0
+        self.sent_messages = 0
+        self.failed_messages = 0
+
+    @property
+    def started(self) -> bool:
+        return self._task is not None
+
+    @property
+    def queue_depth(self) -> int:
+        return self.queue.qsize()
+
+    def stats(self) -> Dict[str, int]:
+        return {
+            "queue_depth": self.queue_depth,
+            "queue_max_size": self.queue_max_size,
+            "enqueued": self.enqueued,
+            "dropped": self.dropped,
+            "coalesced": self.coalesced,
+            "sent_messages": self.sent_messages,
+            "failed_messages": self.failed_messages,
+        }
+
+    def start(self):
+        if self.started:
+            return
+        self._task = asyncio.create_task(self._dispatch_loop())
+
+    async def stop(self, timeout: float = DRAIN_TIMEOUT_SECONDS):
+        """
+        Aguarda (até `timeout` segundos) o envio das notificações pendentes e encerra a tarefa de envio.
+        """
+        if self._task is None:
+            return
+        try:
+            await asyncio.wait_for(self.queue.join(), timeout=timeout)
+        except asyncio.TimeoutError:
+            logger.warning("Encerrando o dispatcher de webhook com %d notificações não enviadas", self.queue_depth)
+
+        task, self._task = self._task, None
+        task.cancel()
+        try:
+            await task
+        except asyncio.CancelledError:
+            pass
+
+        # Notificações que ficaram na fila não foram enviadas
+        while not self.queue.empty():
+            _, _, future = self.queue.get_nowait()
+            if not future.done():
+                future.set_result(False)
+
+    def dispatch_nowait(self, message: str, changes: Dict[str, Any]) -> "asyncio.Future[bool]":
+        """
+        Enfileira a notificação sem bloquear e retorna o futuro resolvido com o resultado do envio.
+        Se a fila estiver cheia, contabiliza o descarte e o futuro já vem resolvido com False.
+        """
+        if not self.started:
+            raise RuntimeError("O dispatcher de webhook não foi iniciado")
+        future: asyncio.Future[bool] = asyncio.get_running_loop().create_future()
+        try:
+            self.queue.put_nowait((message, changes, future))
+        except asyncio.QueueFull:
+            self.dropped += 1
+            logger.warning("Fila do webhook cheia (%d); notificação descartada: %s", self.queue_max_size, message)
+            future.set_result(False)
+            return future
+        self.enqueued += 1
+        return future
+
+    async def _dispatch_loop(self):
+        while True:
+            batch: List[QueuedNotification] = []
+            # Resultado do envio por chave de agrupamento (ver _coalesce_key)
+            sent: Dict[Hashable, bool] = {}
+            try:
+                await self._collect_batch(batch)
+                notifications = self._coalesce([(message, changes) for message, changes, _ in batch])
+                self.coalesced += len(batch) - len(notifications)
+                # _coalesce mantém a ordem da primeira ocorrência de cada chave
+                keys = list(
+                    dict.fromkeys(self._coalesce_key(index, changes) for index, (_, changes, _) in enumerate(batch))
+                )
+                for start in range(0, len(notifications), self.max_batch_size):
+                    delivered = await self._send(notifications[start : start + self.max_batch_size])
+                    sent.update(dict.fromkeys(keys[start : start + self.max_batch_size], delivered))
+            except Exception:
+                logger.exception("Falha ao enviar o lote de notificações de webhook")
+            finally:
+                # Também em cancelamento: notificações sem resultado são dadas como não enviadas
+                for index, (_, changes, future) in enumerate(batch):
+                    if not future.done():
+                        future.set_result(sent.get(self._coalesce_key(index, changes), False))
+                    self.queue.task_done()
+
+    async def _collect_batch(self, batch: List[QueuedNotification]):
+        """
+        Aguarda a primeira notificação e agrupa em `batch` as que chegarem dentro da janela de agrupamento.
+        A lista é do chamador para que as notificações já retiradas da fila não se percam em um cancelamento.
+        """
+        batch.append(await self.queue.get())
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + self.coalesce_window_seconds
+        while len(batch) < self.queue_max_size:
+            remaining = deadline - loop.time()
+            if remaining <= 0:
+                break
+            try:
+                batch.append(await asyncio.wait_for(self.queue.get(), timeout=remaining))
+            except asyncio.TimeoutError:
+                break
+
+    async def _send(self, notifications: List[Notification]) -> bool:
+        if await self.webhook_service.send_batch_message(notifications):
+            self.sent_messages += 1
+            return True
+        self.failed_messages += 1
+        logger.error("Falha ao enviar %d notificações de webhook", len(notifications))
+        return False
+
+    @staticmethod
+    def _coalesce_key(index: int, changes: Dict[str, Any]) -> Hashable:
+        return changes.get("seller_id") or ("__sem_seller__", index)
+
+    @staticmethod
+    def _coalesce(batch: List[Notification]) -> List[Notification]:
+        """
+        Agrupa as notificações de um mesmo seller, mantendo a ordem da primeira ocorrência.
+
+        Os campos alterados são mesclados (o valor mais recente prevalece). A operação resultante é a
+        mais recente, exceto uma criação seguida de alterações, que continua sendo notificada como criação.
+        """
+        coalesced: Dict[Any, Notification] = {}
+        for index, (message, changes) in enumerate(batch):
+            key = WebhookDispatcher._coalesce_key(index, changes)
+            previous = coalesced.get(key)
+            if previous is None:
+                coalesced[key] = (message, changes)
+                continue
+
+            previous_message, previous_changes = previous
+            fields_changed = {**previous_changes.get("fields_changed", {}), **changes.get("fields_changed", {})}
+            keep_creation = previous_changes.get("operation") == "created" and changes.get("operation") != "deleted"
+            merged_message, merged_changes = (
+                (previous_message, previous_changes) if keep_creation else (message, changes)
+            )
+            merged_changes = {**merged_changes}
+            if fields_changed:
+                merged_changes["fields_changed"] = fields_changed
+            coalesced[key] = (merged_message, merged_changes)
+        return list(coalesced.values())
@@ -1,18 +1,94 @@
 import httpx
 import logging
-from typing import Dict, Any
+from contextlib import asynccontextmanager
+from typing import TYPE_CHECKING, Dict, Any, List, Tuple
 
+from app.common.metrics import InstrumentedTransport
+from app.integrations.resilience import CircuitBreaker, TokenBucketRateLimiter
 from app.settings.app import settings
 from app.common.datetime import utcnow
 
+if TYPE_CHECKING:
+    from app.integrations.kv_db.redis_asyncio_adapter import RedisAsyncioAdapter
+
 logger = logging.getLogger(__name__)
 
 JSON = "application/json"
 
+# Cores baseadas no tipo de operação
+OPERATION_COLORS = {
+    "created": "good",      # Verde
+    "updated": "warning",   # Amarelo
+    "deleted": "danger",    # Vermelho
+    "replaced": "#439FE0"   # Azul
+}
+
+# Limite de anexos por mensagem recomendado pelo Slack
+MAX_ATTACHMENTS_PER_MESSAGE = 100
+
+HTTP_POOL_LIMITS = httpx.Limits(max_connections=10, max_keepalive_connections=5)
+
+# O Slack aceita cerca de 1 mensagem por segundo por webhook, com pequenas rajadas
+DEFAULT_RATE_LIMIT_PER_SECOND = 1.0
+DEFAULT_RATE_LIMIT_BURST = 3
+DEFAULT_RATE_LIMIT_MAX_WAIT_SECONDS = 10.0
+DEFAULT_CIRCUIT_FAILURE_THRESHOLD = 5
+DEFAULT_CIRCUIT_RECOVERY_TIMEOUT_SECONDS = 30.0
+
+
 class WebhookService:
-    def __init__(self):
+    def __init__(
+        self,
+        inmemory_adapter: "RedisAsyncioAdapter | None" = None,
+        rate_limit_per_second: float = DEFAULT_RATE_LIMIT_PER_SECOND,
+        rate_limit_burst: int = DEFAULT_RATE_LIMIT_BURST,
+        rate_limit_max_wait_seconds: float = DEFAULT_RATE_LIMIT_MAX_WAIT_SECONDS,
+        circuit_failure_threshold: int = DEFAULT_CIRCUIT_FAILURE_THRESHOLD,
+        circuit_recovery_timeout_seconds: float = DEFAULT_CIRCUIT_RECOVERY_TIMEOUT_SECONDS,
+    ):
         self.webhook_url = settings.WEBHOOK_URL
         self.timeout = 30.0
+        self._client: httpx.AsyncClient | None = None
+        # Com o Redis, o limite de taxa é compartilhado entre todos os workers que usam o mesmo webhook
+        self.rate_limiter = TokenBucketRateLimiter(
+            "webhook",
+            rate_per_second=rate_limit_per_second,
+            capacity=rate_limit_burst,
+            inmemory_adapter=inmemory_adapter,
+        )
+        self.rate_limit_max_wait_seconds = rate_limit_max_wait_seconds
+        self.circuit_breaker = CircuitBreaker(
+            "webhook",
+            failure_threshold=circuit_failure_threshold,
+            recovery_timeout_seconds=circuit_recovery_timeout_seconds,
+        )
+
+    async def open(self):
+        """
+        Abre o cliente HTTP compartilhado (conexões reaproveitadas entre os envios).
+        Deve ser chamado no lifespan da aplicação.
+        """
+        if self._client is None:
+            self._client = httpx.AsyncClient(
+                timeout=self.timeout,
+                transport=InstrumentedTransport("webhook", httpx.AsyncHTTPTransport(limits=HTTP_POOL_LIMITS)),
+            )
+
+    async def aclose(self):
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+
+    @asynccontextmanager
+    async def _http_client(self):
+        """
+        Usa o cliente HTTP compartilhado quando aberto; caso contrário (ex.: scripts), um cliente temporário.
+        """
+        if self._client is not None:
+            yield self._client
+            return
+        async with httpx.AsyncClient(timeout=self.timeout, transport=InstrumentedTransport("webhook")) as client:
+            yield client
 
     async def send_update_message(self, message: str, changes: Dict[str, Any]) -> bool:
         """
@@ -25,69 +101,129 @@ class WebhookService:
         Returns:
             bool: True se a mensagem foi enviada com sucesso, False caso contrário
         """
-        logger.warning(f"🚀 WEBHOOK: Iniciando envio - {message}")
-        
+        logger.debug("🚀 WEBHOOK: Iniciando envio - %s", message)
+
+        # Formato bonito e organizado para Slack
+        slack_payload = {
+            "text": f"🔔 *{message}*",
+            "attachments": [self._build_attachment(changes)]
+        }
+        return await self._post(slack_payload)
+
+    async def send_batch_message(self, notifications: List[Tuple[str, Dict[str, Any]]]) -> bool:
+        """
+        Envia várias notificações em uma única mensagem do Slack, com um anexo por notificação.
+
+        Args:
+            notifications: Lista de tuplas (mensagem, alterações), no máximo `MAX_ATTACHMENTS_PER_MESSAGE`
+
+        Returns:
+            bool: True se a mensagem foi enviada com sucesso, False caso contrário
+        """
+        if len(notifications) == 1:
+            message, changes = notifications[0]
+            return await self.send_update_message(message, changes)
+
+        logger.debug("🚀 WEBHOOK: Iniciando envio em lote - %d notificações", len(notifications))
+
+        slack_payload = {
+            "text": f"🔔 *{len(notifications)} alterações em sellers*",
+            "attachments": [
+                self._build_attachment(changes, title=message)
+                for message, changes in notifications[:MAX_ATTACHMENTS_PER_MESSAGE]
+            ]
+        }
+        return await self._post(slack_payload)
+
+    def _build_attachment(self, changes: Dict[str, Any], title: str | None = None) -> Dict[str, Any]:
+        operation = changes.get("operation", "updated")
+        attachment = {
+            "color": OPERATION_COLORS.get(operation, "good"),
+            "fields": [
+                {
+                    "title": "📋 Detalhes",
+                    "value": self._format_changes(changes),
+                    "short": False
+                }
+            ],
+            "footer": "PC Identidade",
+            "ts": int(utcnow().timestamp())
+        }
+        if title is not None:
+            attachment["title"] = title
+        return attachment
+
+    async def _post(self, slack_payload: Dict[str, Any]) -> bool:
+        # O circuito é consultado antes do limitador, para que uma mensagem recusada não gaste uma ficha nem espere
+        if not self.circuit_breaker.allow_request():
+            # A abertura do circuito já é logada pelo CircuitBreaker; aqui seria um log por mensagem
+            logger.debug("⛔ WEBHOOK: Circuito aberto; mensagem não enviada")
+            return False
+        outcome_recorded = False
         try:
-            # Formato bonito e organizado para Slack
-            changes_text = self._format_changes(changes)
-            
-            # Cores baseadas no tipo de operação
-            color_map = {
-                "created": "good",      # Verde
-                "updated": "warning",   # Amarelo
-                "deleted": "danger",    # Vermelho
-                "replaced": "#439FE0"   # Azul
-            }
-            
-            operation = changes.get("operation", "updated")
-            color = color_map.get(operation, "good")
-            
-            slack_payload = {
-                "text": f"🔔 *{message}*",
-                "attachments": [
-                    {
-                        "color": color,
-                        "fields": [
-                            {
-                                "title": "📋 Detalhes",
-                                "value": changes_text,
-                                "short": False
-                            }
-                        ],
-                        "footer": "PC Identidade",
-                        "ts": int(utcnow().timestamp())
-                    }
-                ]
-            }
-            
-            logger.warning(f"🔗 WEBHOOK: URL = {self.webhook_url}")
-            logger.warning(f"📦 WEBHOOK: Payload = {slack_payload}")
+            if not await self.rate_limiter.acquire(max_wait_seconds=self.rate_limit_max_wait_seconds):
+                logger.warning("⏳ WEBHOOK: Limite de envios atingido; mensagem não enviada")
+                return False
+
+            # O payload só é renderizado quando o nível DEBUG está habilitado
+            debug_enabled = logger.isEnabledFor(logging.DEBUG)
+            if debug_enabled:
+                logger.debug("🔗 WEBHOOK: URL = %s", self.webhook_url)
+                logger.debug("📦 WEBHOOK: Payload = %s", slack_payload)
             
-            async with httpx.AsyncClient(timeout=self.timeout) as client:
+            async with self._http_client() as client:
                 response = await client.post(
                     self.webhook_url,
                     json=slack_payload,
                     headers={"Content-Type": JSON}
                 )
                 
-                logger.warning(f"📈 WEBHOOK: Status = {response.status_code}")
-                logger.warning(f"📄 WEBHOOK: Resposta = {response.text}")
+                if debug_enabled:
+                    logger.debug("📈 WEBHOOK: Status = %s", response.status_code)
+                    logger.debug("📄 WEBHOOK: Resposta = %s", response.text)
                 
                 response.raise_for_status()
-                logger.warning("✅ WEBHOOK: Mensagem enviada com sucesso!")
+                logger.info("✅ WEBHOOK: Mensagem enviada com sucesso!")
+                self.circuit_breaker.record_success()
+                outcome_recorded = True
                 return True
                 
         except httpx.TimeoutException:
             logger.error("❌ WEBHOOK: Timeout ao enviar mensagem")
+            self.circuit_breaker.record_failure()
+            outcome_recorded = True
             return False
         except httpx.HTTPStatusError as e:
-            logger.error(f"❌ WEBHOOK: Erro HTTP {e.response.status_code}")
-            logger.error(f"❌ WEBHOOK: Resposta do servidor: {e.response.text}")
+            logger.error("❌ WEBHOOK: Erro HTTP %s - Resposta do servidor: %s", e.response.status_code, e.response.text)
+            self._record_http_error(e.response)
+            outcome_recorded = True
             return False
         except Exception as e:
-            logger.error(f"❌ WEBHOOK: Erro inesperado: {str(e)}")
-            logger.error(f"❌ WEBHOOK: URL: {self.webhook_url}")
+            logger.error("❌ WEBHOOK: Erro inesperado ao enviar para %s: %s", self.webhook_url, e)
+            self.circuit_breaker.record_failure()
+            outcome_recorded = True
             return False
+        finally:
+            # Sem sucesso nem falha registrados (limitador sem ficha ou envio cancelado), a chamada de teste
+            # liberada pelo circuito meio-aberto é devolvida
+            if not outcome_recorded:
+                self.circuit_breaker.release_probe()
+
+    def _record_http_error(self, response: httpx.Response):
+        """
+        429 pausa os envios pelo `Retry-After` informado; 5xx conta como falha do serviço. Os demais erros
+        (ex.: payload inválido) não indicam indisponibilidade e não abrem o circuito.
+        """
+        if response.status_code == httpx.codes.TOO_MANY_REQUESTS:
+            try:
+                retry_after = float(response.headers.get("Retry-After"))
+            except (TypeError, ValueError):
+                retry_after = self.circuit_breaker.recovery_timeout_seconds
+            self.circuit_breaker.trip(retry_after)
+        elif response.status_code >= 500:
+            self.circuit_breaker.record_failure()
+        else:
+            self.circuit_breaker.record_success()
 
     def _format_changes(self, changes: Dict[str, Any]) -> str:
         """Formata as alterações de forma mais legível para o Slack"""
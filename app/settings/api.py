@@ -32,6 +32,11 @@ class ApiSettings(AppSettings):
         title="Caminho para o health check. A partir dele haverão dois recursos: ping e health",
     )
 
+    startup_warmup_timeout_seconds: float = Field(
+        default=5.0,
+        title="Tempo máximo, em segundos, para aquecer as integrações antes de servir a primeira requisição",
+    )
+
     cors_origins: list[str] = Field(default=["*"], title="Origens permitidas para CORS")
 
     access_log_ignored_urls: set[str] | None = Field(
@@ -51,6 +56,23 @@ class ApiSettings(AppSettings):
 
     pagination: PaginationConfig = Field(default=PaginationConfig(), description="Configurações de paginação")
 
+    pagination_cursor_secret: str = Field(
+        ...,
+        description=(
+            "Chave de assinatura dos tokens de `_cursor`. Obrigatória e a mesma em todas as instâncias, "
+            "para que um cursor emitido por uma instância seja aceito pelas demais"
+        ),
+    )
+
+    seller_trusted_reads: bool = Field(
+        default=False,
+        description=(
+            "Serializa os sellers lidos do banco direto na resposta das consultas, sem revalidá-los no "
+            "`SellerResponse`. Cobre apenas a serialização: o repositório continua validando cada documento "
+            "lido no modelo `Seller`. Habilite apenas se a coleção não recebe escritas por fora da API"
+        ),
+    )
+
     filter_config: FilterConfig = Field(default=FilterConfig(), description="Configurações de filtros")
 
     enable_seller_resources: bool = Field(default=True, description="Habilita Recursos de APIs do contexto de Seller")
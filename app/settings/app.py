@@ -24,16 +24,118 @@ class AppSettings(BaseSettings):
     KEYCLOAK_ADMIN_PASSWORD: str = Field(..., description="Senha do usuário admin do Keycloak")
     KEYCLOAK_ADMIN_CLIENT_ID: str = Field(..., description="Client ID para operações de admin")
 
+    KEYCLOAK_TOKEN_CACHE_MAX_SIZE: int = Field(
+        default=10_000, description="Quantidade máxima de tokens validados mantidos em memória por processo"
+    )
+
     pc_logging_level: str = Field("INFO", description="Nível do logging")
     pc_logging_env: str = Field("prod", description="Ambiente do logging (dev ou prod)")
+    LOG_SAMPLING_EVERY_N: int = Field(
+        default=1, description="Emite 1 a cada N logs (abaixo de WARNING) dos loggers amostrados; 1 desativa"
+    )
+    LOG_SAMPLED_LOGGERS: list[str] = Field(
+        default=["app.services.seller_service", "app.services.webhook_service", "app.services.webhook_dispatcher"],
+        description="Loggers de alta frequência aos quais a amostragem é aplicada",
+    )
+
+    # Rastreamento (OpenTelemetry, opcional: requirements/tracing.txt)
+    TRACING_ENABLED: bool = Field(default=False, description="Habilita o rastreamento distribuído com OpenTelemetry")
+    TRACING_SERVICE_NAME: str = Field(default="seller-api", description="Nome do serviço informado nos spans")
+    TRACING_EXPORTER: str = Field(
+        default="otlp", description="Destino dos spans: otlp (OTLP/HTTP, ver OTEL_EXPORTER_OTLP_*), file ou console"
+    )
+    TRACING_FILE_PATH: str = Field(
+        default="traces.jsonl", description="Arquivo OTLP/JSON em que os spans são gravados com o exportador file"
+    )
+    TRACING_SAMPLE_RATIO: float = Field(
+        default=1.0, description="Fração dos traces iniciados pela aplicação que são amostrados (0 a 1)"
+    )
     
     # Gemini AI
     API_KEY_GEMINI: str = Field(..., description="API Key do Google Gemini")
     
     # Webhook Configuration
     WEBHOOK_URL: str = Field(..., description="URL do webhook para envio de notificações")
+    WEBHOOK_QUEUE_MAX_SIZE: int = Field(
+        default=1_000, description="Quantidade máxima de notificações aguardando envio ao webhook em memória"
+    )
+    WEBHOOK_COALESCE_WINDOW_SECONDS: float = Field(
+        default=2.0, description="Janela, em segundos, em que as notificações ao webhook são agrupadas em um envio"
+    )
+    WEBHOOK_MAX_BATCH_SIZE: int = Field(
+        default=20, description="Quantidade máxima de notificações por mensagem do webhook"
+    )
+    WEBHOOK_RATE_LIMIT_PER_SECOND: float = Field(
+        default=1.0, description="Quantidade de mensagens por segundo enviadas ao webhook (compartilhada via Redis)"
+    )
+    WEBHOOK_RATE_LIMIT_BURST: int = Field(default=3, description="Rajada máxima de mensagens enviadas ao webhook")
+    WEBHOOK_CIRCUIT_FAILURE_THRESHOLD: int = Field(
+        default=5, description="Falhas consecutivas do webhook para abrir o circuito"
+    )
+    WEBHOOK_CIRCUIT_RECOVERY_TIMEOUT_SECONDS: float = Field(
+        default=30.0, description="Tempo, em segundos, com o circuito do webhook aberto antes de uma nova tentativa"
+    )
 
     REDIS_URL: RedisDsn = Field(..., title="URI para o Redis")
+    REDIS_MAX_CONNECTIONS: int | None = Field(
+        default=100, description="Quantidade máxima de conexões do pool do Redis por processo; vazio para sem limite"
+    )
+    REDIS_POOL_TIMEOUT_SECONDS: float = Field(
+        default=5.0, description="Tempo máximo, em segundos, de espera por uma conexão livre com o pool cheio"
+    )
+    REDIS_SOCKET_TIMEOUT_SECONDS: float | None = Field(
+        default=5.0, description="Tempo máximo, em segundos, de espera pela resposta de um comando no Redis"
+    )
+    REDIS_SOCKET_CONNECT_TIMEOUT_SECONDS: float | None = Field(
+        default=5.0, description="Tempo máximo, em segundos, para abrir uma conexão com o Redis"
+    )
+    REDIS_SERIALIZER: str = Field(
+        default="json", description="Serializador dos valores JSON no Redis: json, orjson ou msgpack (opcionais)"
+    )
+    # Cache do lado do cliente: chaves lidas muito mais do que alteradas, servidas da memória de cada processo
+    REDIS_CLIENT_CACHE_ENABLED: bool = Field(
+        default=False, description="Habilita o cache do lado do cliente (memória do processo) para chaves do Redis"
+    )
+    REDIS_CLIENT_CACHE_PREFIXES: list[str] = Field(
+        default=["keycloak:public_keys:", "seller_cache:"],
+        description="Prefixos das chaves do Redis servidas pelo cache do lado do cliente",
+    )
+    REDIS_CLIENT_CACHE_MODE: str = Field(
+        default="tracking",
+        description="Invalidação do cache do lado do cliente: tracking (CLIENT TRACKING do Redis 6+) ou polling",
+    )
+    REDIS_CLIENT_CACHE_MAX_SIZE: int = Field(
+        default=10_000, description="Quantidade máxima de chaves no cache do lado do cliente de cada processo"
+    )
+    REDIS_CLIENT_CACHE_POLL_INTERVAL_SECONDS: float = Field(
+        default=1.0, description="Intervalo, em segundos, da conferência das chaves no modo polling"
+    )
+
+    # Cache de leitura dos sellers (por id e por CNPJ) no Redis, com um LRU em memória por processo
+    SELLER_CACHE_ENABLED: bool = Field(
+        default=False, description="Habilita o cache das buscas de seller por id e por CNPJ (Redis + memória)"
+    )
+    SELLER_CACHE_TTL_SECONDS: int = Field(default=60, description="Tempo, em segundos, dos sellers no cache Redis")
+    SELLER_CACHE_LOCAL_TTL_SECONDS: float = Field(
+        default=5.0,
+        description="Tempo, em segundos, dos sellers no cache em memória de cada processo; 0 usa apenas o Redis",
+    )
+    SELLER_CACHE_LOCAL_MAX_SIZE: int = Field(
+        default=1_000, description="Quantidade máxima de sellers no cache em memória de cada processo"
+    )
+
+    # RabbitMQ (publisher)
+    RABBITMQ_CHANNEL_POOL_SIZE: int = Field(
+        default=10, description="Quantidade máxima de canais abertos pelo publisher"
+    )
+
+    # Outbox
+    OUTBOX_BATCH_SIZE: int = Field(
+        default=100, description="Quantidade máxima de documentos drenados do outbox por ciclo"
+    )
+    OUTBOX_POLL_INTERVAL_SECONDS: float = Field(
+        default=1.0, description="Intervalo, em segundos, entre as verificações de eventos pendentes no outbox"
+    )
 
 
 settings = AppSettings()
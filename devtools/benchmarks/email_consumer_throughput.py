@@ -0,0 +1,115 @@
+"""
+Benchmark de vazão do consumer de emails de boas-vindas (mensagens/segundo por quantidade de workers).
+
+Sobe um servidor SMTP local de teste (aiosmtpd) e entrega N mensagens ao `SellerEmailConsumer`
+sem passar pelo RabbitMQ. O custo do STARTTLS + login de um servidor real é simulado por
+`--handshake-ms`, aplicado a cada nova sessão SMTP. Com `--no-pool`, cada email abre a sua própria
+sessão (comportamento anterior ao pool).
+
+Uso:
+    python devtools/benchmarks/email_consumer_throughput.py --messages 500 --workers 1 2 4 8
+"""
+
+import argparse
+import json
+import logging
+import os
+import smtplib
+import sys
+import time
+from unittest.mock import MagicMock
+
+sys.path.append(os.getcwd())
+
+from aiosmtpd.controller import Controller  # noqa: E402
+
+from app.services.email_service import EmailService  # noqa: E402
+from app.services.seller_email_consumer import SellerEmailConsumer  # noqa: E402
+
+SMTP_HOST = "127.0.0.1"
+SMTP_PORT = 8025
+
+
+class DiscardHandler:
+    async def handle_DATA(self, server, session, envelope):
+        return "250 OK"
+
+
+class BenchEmailService(EmailService):
+    def __init__(self, pool_size: int, handshake_seconds: float, use_pool: bool):
+        super().__init__(pool_size=pool_size)
+        self.handshake_seconds = handshake_seconds
+        self.use_pool = use_pool
+
+    def _open_smtp_session(self) -> smtplib.SMTP:
+        server = smtplib.SMTP(SMTP_HOST, SMTP_PORT)
+        server.ehlo()
+        time.sleep(self.handshake_seconds)  # simula STARTTLS + login
+        return server
+
+    def _sendmail(self, to_email: str, message: str):
+        if self.use_pool:
+            return super()._sendmail(to_email, message)
+        server = self._open_smtp_session()
+        try:
+            server.sendmail(self.sender_email, to_email, message)
+        finally:
+            server.quit()
+
+
+def build_body(index: int) -> bytes:
+    return json.dumps(
+        {
+            "seller_id": f"bench{index}",
+            "company_name": f"Empresa Benchmark {index}",
+            "trade_name": f"Loja Benchmark {index}",
+            "contact_email": f"seller{index}@example.com",
+            "business_description": "Seller criado pelo benchmark",
+            "product_categories": ["Automotivo", "Áudio"],
+        }
+    ).encode("utf-8")
+
+
+def run(messages: int, workers: int, handshake_seconds: float, use_pool: bool) -> float:
+    consumer = SellerEmailConsumer(workers=workers)
+    consumer.email_service = BenchEmailService(workers, handshake_seconds, use_pool)
+    consumer.email_service.sender_email = "bench@example.com"
+    consumer._connection = MagicMock()  # os acks são apenas agendados
+    channel = MagicMock()
+    dispatch = consumer._SellerEmailConsumer__dispatch_message
+
+    started_at = time.perf_counter()
+    for index in range(messages):
+        dispatch(channel, MagicMock(delivery_tag=index), MagicMock(), build_body(index))
+    consumer._executor.shutdown(wait=True)
+    elapsed = time.perf_counter() - started_at
+
+    consumer.email_service.close()
+    return messages / elapsed
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--messages", type=int, default=300)
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 2, 4, 8])
+    parser.add_argument("--handshake-ms", type=float, default=50.0)
+    parser.add_argument("--no-pool", action="store_true", help="Abre uma sessão SMTP por email")
+    args = parser.parse_args()
+
+    # O consumer loga cada mensagem; os logs distorceriam a medição
+    logging.disable(logging.CRITICAL)
+
+    controller = Controller(DiscardHandler(), hostname=SMTP_HOST, port=SMTP_PORT)
+    controller.start()
+    try:
+        mode = "sessão por email" if args.no_pool else "pool de sessões"
+        print(f"mensagens: {args.messages} | handshake simulado: {args.handshake_ms}ms | modo: {mode}")
+        for workers in args.workers:
+            rate = run(args.messages, workers, args.handshake_ms / 1000, not args.no_pool)
+            print(f"workers={workers:>2}: {rate:8.1f} msg/s")
+    finally:
+        controller.stop()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,98 @@
+"""
+Benchmark de vazão (requisições/segundo) do `GET /api/ping`.
+
+Monta a aplicação com `create_app` e dispara as requisições em processo (httpx + ASGITransport), sem rede,
+para isolar o custo da pilha de middlewares. Com `--legacy`, o log de acesso atual (`AccessLogMiddleware`)
+é substituído pelo middleware anterior, baseado em `BaseHTTPMiddleware`. Os logs são gravados em `os.devnull`.
+
+Uso:
+    python devtools/benchmarks/ping_throughput.py --requests 20000 --concurrency 50
+    python devtools/benchmarks/ping_throughput.py --requests 20000 --concurrency 50 --legacy
+"""
+
+import argparse
+import asyncio
+import logging
+import os
+import sys
+import time
+
+sys.path.append(os.getcwd())
+
+import httpx  # noqa: E402
+from fastapi import APIRouter, Request  # noqa: E402
+from starlette.middleware import Middleware  # noqa: E402
+from starlette.middleware.base import BaseHTTPMiddleware  # noqa: E402
+
+from app.api.api_application import create_app  # noqa: E402
+from app.api.middlewares.access_log_middleware import AccessLogMiddleware  # noqa: E402
+from app.settings import api_settings  # noqa: E402
+
+legacy_logger = logging.getLogger("app.api_main")
+
+
+async def legacy_log_requests_middleware(request: Request, call_next):
+    """Middleware de log de acesso anterior ao `AccessLogMiddleware`."""
+    start_time = time.time()
+    safe_path = request.url.path.replace('\n', '').replace('\r', '')
+    legacy_logger.info(f"Requisição recebida: {request.method} {safe_path}")
+    response = await call_next(request)
+    process_time = (time.time() - start_time) * 1000
+    formatted_process_time = f"{process_time:.2f}ms"
+    legacy_logger.info(
+        f"Requisição finalizada: {request.method} {safe_path} - Status: {response.status_code} - Duração: {formatted_process_time}"
+    )
+    return response
+
+
+def build_app(legacy: bool):
+    app = create_app(api_settings, APIRouter())
+    if legacy:
+        app.user_middleware = [m for m in app.user_middleware if m.cls is not AccessLogMiddleware]
+        app.user_middleware.insert(0, Middleware(BaseHTTPMiddleware, dispatch=legacy_log_requests_middleware))
+    return app
+
+
+async def run(total: int, concurrency: int, legacy: bool) -> float:
+    app = build_app(legacy)
+    path = f"{api_settings.health_check_base_path}/ping"
+    transport = httpx.ASGITransport(app=app)
+    remaining = iter(range(total))
+
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+
+        async def worker():
+            for _ in remaining:
+                response = await client.get(path)
+                assert response.status_code == 204
+
+        started_at = time.perf_counter()
+        await asyncio.gather(*(worker() for _ in range(concurrency)))
+        return total / (time.perf_counter() - started_at)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--requests", type=int, default=10000)
+    parser.add_argument("--concurrency", type=int, default=50)
+    parser.add_argument("--legacy", action="store_true", help="Usa o log de acesso baseado em BaseHTTPMiddleware")
+    args = parser.parse_args()
+
+    with open(os.devnull, "w") as devnull:
+        handler = logging.StreamHandler(devnull)
+        handler.setFormatter(logging.Formatter("%(asctime)s - %(name)s - %(levelname)s - %(message)s"))
+        root = logging.getLogger()
+        root.handlers = [handler]
+        root.setLevel(logging.INFO)
+
+        # Aquecimento
+        asyncio.run(run(min(500, args.requests), args.concurrency, args.legacy))
+        rate = asyncio.run(run(args.requests, args.concurrency, args.legacy))
+
+    mode = "BaseHTTPMiddleware (anterior)" if args.legacy else "AccessLogMiddleware (ASGI puro)"
+    print(f"requisições: {args.requests} | concorrência: {args.concurrency} | log de acesso: {mode}")
+    print(f"vazão: {rate:.0f} req/s")
+
+
+if __name__ == "__main__":
+    main()
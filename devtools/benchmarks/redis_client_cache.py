@@ -0,0 +1,103 @@
+"""
+Benchmark do cache do lado do cliente do `RedisAsyncioAdapter`: leitura de uma chave "quente" (como o JWKS em
+`keycloak:public_keys:*`) direto do Redis x da memória do processo, e o tempo até uma gravação feita por outro
+cliente invalidar a cópia local.
+
+Requer um Redis local; no modo `tracking`, Redis 6 ou superior (com CLIENT TRACKING). No modo `polling`, a
+invalidação ocorre em até `--poll-interval` segundos.
+
+Uso:
+    python devtools/benchmarks/redis_client_cache.py --redis-url redis://localhost:6379/0 \
+        --reads 20000 --mode tracking
+"""
+
+import argparse
+import asyncio
+import os
+import statistics
+import sys
+import time
+
+sys.path.append(os.getcwd())
+
+from app.integrations.kv_db.redis_asyncio_adapter import RedisAsyncioAdapter  # noqa: E402
+
+PREFIX = "benchmark:client_cache:"
+KEY = f"{PREFIX}jwks"
+JWKS = {
+    "keys": [{"kid": f"kid-{index}", "kty": "RSA", "use": "sig", "n": "x" * 342, "e": "AQAB"} for index in range(2)]
+}
+
+
+def summarize(samples: list[float]) -> str:
+    ordered = sorted(samples)
+    p99 = ordered[min(len(ordered) - 1, round(0.99 * len(ordered)) - 1)]
+    return f"p50 {statistics.median(ordered) * 1000:8.1f}µs | p99 {p99 * 1000:8.1f}µs"
+
+
+async def measure_reads(adapter: RedisAsyncioAdapter, reads: int) -> list[float]:
+    samples = []
+    for _ in range(reads):
+        started_at = time.perf_counter()
+        value = await adapter.get_json(KEY)
+        samples.append((time.perf_counter() - started_at) * 1000)
+        assert value is not None, "chave do benchmark não encontrada"
+    return samples
+
+
+async def measure_invalidation(reader: RedisAsyncioAdapter, writer: RedisAsyncioAdapter, rounds: int) -> list[float]:
+    """Tempo entre a gravação por outro cliente e a leitura do novo valor pelo processo com cache."""
+    samples = []
+    for version in range(rounds):
+        await reader.get_json(KEY)  # garante a cópia local
+        value = {**JWKS, "version": version}
+        started_at = time.perf_counter()
+        await writer.set_json(KEY, value, expires_in_seconds=600)
+        while (await reader.get_json(KEY)) != value:
+            await asyncio.sleep(0)
+        samples.append((time.perf_counter() - started_at) * 1000)
+    return samples
+
+
+async def run(redis_url: str, reads: int, rounds: int, mode: str, poll_interval: float) -> None:
+    plain = RedisAsyncioAdapter(redis_url)
+    cached = RedisAsyncioAdapter(
+        redis_url,
+        client_cache_prefixes=[PREFIX],
+        client_cache_mode=mode,
+        client_cache_poll_interval_seconds=poll_interval,
+    )
+    try:
+        await plain.set_json(KEY, JWKS, expires_in_seconds=600)
+        cached.start_client_cache()
+        while not cached.client_cache.active:
+            await asyncio.sleep(0.01)
+
+        print(f"{reads} leituras de uma chave quente (modo {cached.client_cache.mode})")
+        for name, adapter in (("redis", plain), ("memória", cached)):
+            await measure_reads(adapter, 100)  # aquecimento
+            print(f"  {name:8s}: {summarize(await measure_reads(adapter, reads))}")
+
+        samples = await measure_invalidation(cached, plain, rounds)
+        print(f"  invalidação após gravação de outro cliente: {summarize(samples)}")
+        print(f"  estatísticas: {cached.client_cache.stats}")
+    finally:
+        await plain.delete(KEY)
+        await cached.aclose()
+        await plain.aclose()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--redis-url", default="redis://localhost:6379/0")
+    parser.add_argument("--reads", type=int, default=20_000)
+    parser.add_argument("--rounds", type=int, default=50, help="Gravações medidas no teste de invalidação")
+    parser.add_argument("--mode", default="tracking", choices=["tracking", "polling"])
+    parser.add_argument("--poll-interval", type=float, default=1.0)
+    args = parser.parse_args()
+
+    asyncio.run(run(args.redis_url, args.reads, args.rounds, args.mode, args.poll_interval))
+
+
+if __name__ == "__main__":
+    main()
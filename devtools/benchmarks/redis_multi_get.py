@@ -0,0 +1,92 @@
+"""
+Benchmark da leitura de várias chaves no Redis: uma ida por chave (`get_json`) x pipeline x `mget_json`.
+
+Grava N chaves JSON em um Redis local (com `mset_json`) e mede, pelo `RedisAsyncioAdapter`, o tempo para ler
+todas elas em sequência, em um único pipeline e em um único MGET. Com `--serializer`, compara o custo dos
+serializadores (json, orjson ou msgpack, se instalados).
+
+Uso:
+    python devtools/benchmarks/redis_multi_get.py --redis-url redis://localhost:6379/0 \
+        --keys 1000 --rounds 20 --serializer json
+"""
+
+import argparse
+import asyncio
+import os
+import statistics
+import sys
+import time
+
+sys.path.append(os.getcwd())
+
+from app.integrations.kv_db.redis_asyncio_adapter import RedisAsyncioAdapter  # noqa: E402
+
+KEY_PREFIX = "benchmark:multi_get"
+
+
+def build_value(index: int) -> dict:
+    return {"seller_id": f"bench{index:07d}", "trade_name": f"Benchmark {index}", "categories": ["Automotivo"]}
+
+
+async def read_sequential(adapter: RedisAsyncioAdapter, keys: list[str]) -> list:
+    return [await adapter.get_json(key) for key in keys]
+
+
+async def read_pipelined(adapter: RedisAsyncioAdapter, keys: list[str]) -> list:
+    async with adapter.pipeline() as pipeline:
+        for key in keys:
+            pipeline.get_json(key)
+    return pipeline.results
+
+
+async def read_mget(adapter: RedisAsyncioAdapter, keys: list[str]) -> list:
+    return await adapter.mget_json(keys)
+
+
+async def measure(read, adapter: RedisAsyncioAdapter, keys: list[str], rounds: int) -> list[float]:
+    expected = await read(adapter, keys)  # aquecimento
+    assert expected == [build_value(index) for index in range(len(keys))], "valores diferentes dos gravados"
+    samples = []
+    for _ in range(rounds):
+        started_at = time.perf_counter()
+        await read(adapter, keys)
+        samples.append((time.perf_counter() - started_at) * 1000)
+    return samples
+
+
+async def run(redis_url: str, total: int, rounds: int, serializer: str) -> None:
+    adapter = RedisAsyncioAdapter(redis_url, serializer=serializer)
+    keys = [f"{KEY_PREFIX}:{serializer}:{index}" for index in range(total)]
+    try:
+        await adapter.mset_json({key: build_value(index) for index, key in enumerate(keys)}, expires_in_seconds=600)
+
+        print(f"{total} chaves ({serializer}), {rounds} rodadas")
+        results = {}
+        for mode, read in (("sequencial", read_sequential), ("pipeline", read_pipelined), ("mget", read_mget)):
+            samples = await measure(read, adapter, keys, rounds)
+            results[mode] = statistics.median(samples)
+            print(f"  {mode:10s}: mediana {results[mode]:8.2f}ms | melhor {min(samples):8.2f}ms")
+        print(
+            f"  ganho sobre o sequencial: pipeline {results['sequencial'] / results['pipeline']:.1f}x | "
+            f"mget {results['sequencial'] / results['mget']:.1f}x"
+        )
+    finally:
+        async with adapter.pipeline() as pipeline:
+            for key in keys:
+                pipeline.delete(key)
+        await adapter.aclose()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--redis-url", default="redis://localhost:6379/0")
+    parser.add_argument("--keys", type=int, default=1000)
+    parser.add_argument("--rounds", type=int, default=20)
+    parser.add_argument("--serializer", default="json", choices=["json", "orjson", "msgpack"])
+    args = parser.parse_args()
+
+    asyncio.run(run(args.redis_url, args.keys, args.rounds, args.serializer))
+
+
+if __name__ == "__main__":
+    main()
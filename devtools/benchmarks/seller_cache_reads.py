@@ -0,0 +1,115 @@
+"""
+Benchmark das buscas de seller por id: Mongo direto x cache Redis x cache Redis + LRU do processo.
+
+Popula uma coleção em um `mongod` local com N sellers (uma única vez; use `--reseed` para recriar) e mede,
+pelo `SellerRepository` e pelo `CachedSellerRepository`, a latência (p50/p99) de buscas por ids sorteados.
+Nos modos com cache, as chaves são aquecidas antes da medição; a taxa de acerto medida é impressa ao final.
+
+Uso:
+    python devtools/benchmarks/seller_cache_reads.py --mongo-url mongodb://localhost:27017 \
+        --redis-url redis://localhost:6379/0 --documents 10000 --keys 1000 --reads 20000
+"""
+
+import argparse
+import asyncio
+import os
+import random
+import statistics
+import sys
+import time
+
+sys.path.append(os.getcwd())
+
+import pymongo  # noqa: E402
+
+from app.integrations.database.mongo_client import MongoClient  # noqa: E402
+from app.integrations.kv_db.redis_asyncio_adapter import RedisAsyncioAdapter  # noqa: E402
+from app.repositories import CachedSellerRepository, SellerRepository  # noqa: E402
+from devtools.benchmarks.seller_pagination_mongo import build_document  # noqa: E402
+
+DB_NAME = "benchmark_seller_cache"
+SEED_BATCH_SIZE = 10_000
+
+
+def seed(collection, total: int, reseed: bool) -> None:
+    if reseed:
+        collection.drop()
+    existing = collection.estimated_document_count()
+    if existing >= total:
+        print(f"coleção já populada: {existing} documentos")
+    else:
+        print(f"populando {total - existing} documentos...")
+        for start in range(existing, total, SEED_BATCH_SIZE):
+            stop = min(start + SEED_BATCH_SIZE, total)
+            collection.insert_many([build_document(index) for index in range(start, stop)], ordered=False)
+    collection.create_index("seller_id", unique=True)
+
+
+def summarize(samples: list[float]) -> str:
+    ordered = sorted(samples)
+    p99 = ordered[min(len(ordered) - 1, round(0.99 * len(ordered)) - 1)]
+    return f"p50 {statistics.median(ordered) * 1000:8.1f}µs | p99 {p99 * 1000:8.1f}µs"
+
+
+async def measure(repository, seller_ids: list[str]) -> list[float]:
+    samples = []
+    for seller_id in seller_ids:
+        started_at = time.perf_counter()
+        seller = await repository.find_by_id(seller_id)
+        samples.append((time.perf_counter() - started_at) * 1000)
+        assert seller is not None, f"seller {seller_id} não encontrado"
+    return samples
+
+
+async def run(mongo_url: str, redis_url: str, documents: int, keys: int, reads: int) -> None:
+    rng = random.Random(42)
+    hot_ids = [f"bench{index:07d}" for index in rng.sample(range(documents), keys)]
+    seller_ids = [rng.choice(hot_ids) for _ in range(reads)]
+
+    repository = SellerRepository(MongoClient(mongo_url), DB_NAME)
+    redis_adapter = RedisAsyncioAdapter(redis_url)
+    modes = {
+        "mongo": repository,
+        "redis": CachedSellerRepository(repository, redis_adapter, local_ttl_seconds=0),
+        "redis + local": CachedSellerRepository(repository, redis_adapter, local_max_size=keys),
+    }
+
+    print(f"{reads} buscas por id entre {keys} sellers ({documents} na coleção)")
+    try:
+        for mode, reader in modes.items():
+            if isinstance(reader, CachedSellerRepository):
+                for seller_id in hot_ids:
+                    await reader.invalidate(seller_id)
+            await measure(reader, hot_ids)  # aquecimento
+            hits_before = reader.stats if isinstance(reader, CachedSellerRepository) else None
+            samples = await measure(reader, seller_ids)
+            line = f"  {mode:13s}: {summarize(samples)}"
+            if hits_before is not None:
+                stats = reader.stats
+                hits = stats["local_hits"] + stats["redis_hits"] - hits_before["local_hits"] - hits_before["redis_hits"]
+                line += f" | acertos {hits / reads:6.1%}"
+            print(line)
+    finally:
+        await redis_adapter.aclose()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--mongo-url", default="mongodb://localhost:27017")
+    parser.add_argument("--redis-url", default="redis://localhost:6379/0")
+    parser.add_argument("--documents", type=int, default=10_000)
+    parser.add_argument("--keys", type=int, default=1_000, help="Quantidade de sellers distintos buscados")
+    parser.add_argument("--reads", type=int, default=20_000)
+    parser.add_argument("--reseed", action="store_true", help="Recria a coleção do benchmark")
+    args = parser.parse_args()
+
+    if args.keys > args.documents:
+        parser.error("--keys não pode ser maior que --documents")
+
+    with pymongo.MongoClient(args.mongo_url) as sync_client:
+        seed(sync_client[DB_NAME][SellerRepository.COLLECTION_NAME], args.documents, args.reseed)
+    asyncio.run(run(args.mongo_url, args.redis_url, args.documents, args.keys, args.reads))
+
+
+if __name__ == "__main__":
+    main()
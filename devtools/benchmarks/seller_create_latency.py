@@ -0,0 +1,99 @@
+"""
+Benchmark de latência do `POST /seller/v1/sellers`.
+
+Dispara N criações de seller (com concorrência configurável) contra uma API em execução e imprime
+p50/p95/p99. Para comparar antes/depois, rode o script contra cada versão da aplicação.
+
+Uso:
+    python devtools/benchmarks/seller_create_latency.py --base-url http://localhost:8000 \
+        --token "$ACCESS_TOKEN" --requests 500 --concurrency 20
+"""
+
+import argparse
+import asyncio
+import os
+import statistics
+import time
+import uuid
+
+import httpx
+
+SELLERS_PATH = "/seller/v1/sellers"
+
+
+def build_payload(index: int, run_id: str) -> dict:
+    suffix = f"{run_id}{index:06d}"
+    return {
+        "seller_id": f"bench{suffix}",
+        "company_name": f"Benchmark {suffix} LTDA",
+        "trade_name": f"Benchmark {suffix}",
+        "cnpj": f"{index:014d}",
+        "state_municipal_registration": "123456789",
+        "commercial_address": "Rua do Benchmark, 123",
+        "contact_phone": "11999999999",
+        "contact_email": "benchmark@example.com",
+        "legal_rep_full_name": "Representante Benchmark",
+        "legal_rep_cpf": "12345678901",
+        "legal_rep_rg_number": "123456789",
+        "legal_rep_rg_state": "SP",
+        "legal_rep_birth_date": "1980-01-01",
+        "legal_rep_phone": "11999999999",
+        "legal_rep_email": "representante@example.com",
+        "bank_name": "banco benchmark",
+        "agency_account": "0001-1",
+        "account_type": "Corrente",
+        "account_holder_name": "Representante Benchmark",
+        "product_categories": ["Automotivo"],
+        "business_description": "Seller criado pelo benchmark de latência",
+    }
+
+
+def percentile(samples: list[float], pct: float) -> float:
+    ordered = sorted(samples)
+    index = min(len(ordered) - 1, max(0, round(pct / 100 * len(ordered)) - 1))
+    return ordered[index]
+
+
+async def run(base_url: str, token: str, total: int, concurrency: int) -> None:
+    run_id = uuid.uuid4().hex[:6]
+    semaphore = asyncio.Semaphore(concurrency)
+    latencies_ms: list[float] = []
+    status_codes: dict[int, int] = {}
+    headers = {"Authorization": f"Bearer {token}"}
+
+    async with httpx.AsyncClient(base_url=base_url, headers=headers, timeout=30) as client:
+
+        async def create_one(index: int):
+            async with semaphore:
+                started_at = time.perf_counter()
+                response = await client.post(SELLERS_PATH, json=build_payload(index, run_id))
+                latencies_ms.append((time.perf_counter() - started_at) * 1000)
+                status_codes[response.status_code] = status_codes.get(response.status_code, 0) + 1
+
+        started_at = time.perf_counter()
+        await asyncio.gather(*(create_one(i) for i in range(total)))
+        elapsed = time.perf_counter() - started_at
+
+    print(f"requisições: {total} | concorrência: {concurrency} | tempo total: {elapsed:.2f}s")
+    print(f"status: {status_codes}")
+    print(f"média: {statistics.mean(latencies_ms):.2f}ms")
+    for pct in (50, 95, 99):
+        print(f"p{pct}: {percentile(latencies_ms, pct):.2f}ms")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--base-url", default=os.getenv("BENCH_BASE_URL", "http://localhost:8000"))
+    parser.add_argument("--token", default=os.getenv("BENCH_ACCESS_TOKEN"), help="Access token do Keycloak")
+    parser.add_argument("--requests", type=int, default=200)
+    parser.add_argument("--concurrency", type=int, default=10)
+    args = parser.parse_args()
+
+    if not args.token:
+        parser.error("informe --token ou a variável BENCH_ACCESS_TOKEN")
+
+    asyncio.run(run(args.base_url, args.token, args.requests, args.concurrency))
+
+
+if __name__ == "__main__":
+    main()
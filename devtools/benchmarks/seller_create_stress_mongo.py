@@ -0,0 +1,121 @@
+"""
+Teste de estresse da criação de sellers (`SellerService.create`) com criações concorrentes e duplicadas.
+
+Recria uma coleção em um `mongod` local com os índices únicos das migrations (`seller_id` e `trade_name`) e
+dispara, em paralelo, várias tentativas de criação para cada seller: metade com o mesmo `seller_id` e metade
+com outro `seller_id`, mas o mesmo `trade_name`. Sem verificação prévia, a unicidade depende só dos índices:
+o script confere que exatamente uma tentativa por seller foi aceita, que as demais foram recusadas com as
+mensagens de conflito e que a coleção terminou com um documento por seller. Também mede a vazão.
+
+O Keycloak é substituído por um cliente que apenas registra as associações, para conferir que nenhum
+seller recusado foi associado ao usuário.
+
+Uso:
+    python devtools/benchmarks/seller_create_stress_mongo.py --mongo-url mongodb://localhost:27017 \
+        --sellers 2000 --attempts 4 --concurrency 200
+"""
+
+import argparse
+import asyncio
+import os
+import sys
+import time
+from collections import Counter
+
+sys.path.append(os.getcwd())
+
+import pymongo  # noqa: E402
+
+from app.api.common.auth_handler import UserAuthInfo  # noqa: E402
+from app.common.exceptions import BadRequestException  # noqa: E402
+from app.integrations.database.mongo_client import MongoClient  # noqa: E402
+from app.messages import MSG_NOME_FANTASIA_JA_CADASTRADO, MSG_SELLER_ID_JA_CADASTRADO  # noqa: E402
+from app.models.base import UserModel  # noqa: E402
+from app.models.seller_model import Seller  # noqa: E402
+from app.repositories.seller_repository import SellerRepository  # noqa: E402
+from app.services.seller_service import SellerService  # noqa: E402
+from devtools.benchmarks.seller_pagination_mongo import build_document  # noqa: E402
+
+DB_NAME = "benchmark_create_stress"
+AUTH_INFO = UserAuthInfo(user=UserModel(name="benchmark", server="benchmark"), trace_id=None, sellers=[], info_token={})
+
+
+class RecordingKeycloakClient:
+    """Registra as associações de seller ao usuário, sem chamar o Keycloak."""
+
+    def __init__(self):
+        self.added: Counter = Counter()
+
+    async def add_seller_to_user(self, user_id: str, seller_to_add: str):
+        self.added[seller_to_add] += 1
+
+
+def build_attempt(index: int, attempt: int) -> Seller:
+    """Tentativas pares repetem o `seller_id`; as ímpares usam outro `seller_id` com o mesmo `trade_name`."""
+    document = build_document(index)
+    document["seller_id"] = f"stress{index:07d}" if attempt % 2 == 0 else f"stress{index:07d}x{attempt}"
+    return Seller.model_validate(document)
+
+
+def prepare(mongo_url: str) -> None:
+    with pymongo.MongoClient(mongo_url) as sync_client:
+        collection = sync_client[DB_NAME][SellerRepository.COLLECTION_NAME]
+        collection.drop()
+        collection.create_index("seller_id", unique=True)
+        collection.create_index("trade_name", unique=True)
+
+
+async def run(mongo_url: str, sellers: int, attempts: int, concurrency: int) -> None:
+    keycloak_client = RecordingKeycloakClient()
+    repository = SellerRepository(MongoClient(mongo_url), DB_NAME)
+    service = SellerService(repository=repository, keycloak_client=keycloak_client)
+    semaphore = asyncio.Semaphore(concurrency)
+    outcomes: Counter = Counter()
+    accepted: Counter = Counter()
+
+    async def create(index: int, attempt: int) -> None:
+        seller = build_attempt(index, attempt)
+        async with semaphore:
+            try:
+                await service.create(seller, AUTH_INFO)
+            except BadRequestException as e:
+                outcomes[e.message] += 1
+            else:
+                outcomes["criado"] += 1
+                accepted[seller.trade_name] += 1
+
+    # Tentativas intercaladas, para que as duplicadas de um mesmo seller disputem o índice ao mesmo tempo
+    tasks = [create(index, attempt) for attempt in range(attempts) for index in range(sellers)]
+    started_at = time.perf_counter()
+    await asyncio.gather(*tasks)
+    elapsed = time.perf_counter() - started_at
+
+    stored = await repository.collection.count_documents({})
+    print(f"{sellers} sellers x {attempts} tentativas ({len(tasks)} criações, concorrência {concurrency})")
+    print(f"  vazão: {len(tasks) / elapsed:8.1f} criações/s em {elapsed:.2f}s")
+    print(f"  aceitas: {outcomes['criado']} | documentos na coleção: {stored}")
+    print(f"  recusadas por seller_id: {outcomes[MSG_SELLER_ID_JA_CADASTRADO]}")
+    print(f"  recusadas por trade_name: {outcomes[MSG_NOME_FANTASIA_JA_CADASTRADO]}")
+
+    assert outcomes["criado"] == stored == sellers, "deveria haver exatamente um seller criado por trade_name"
+    assert all(count == 1 for count in accepted.values()), "trade_name aceito mais de uma vez"
+    assert sum(keycloak_client.added.values()) == sellers, "seller recusado associado ao usuário no Keycloak"
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--mongo-url", default="mongodb://localhost:27017")
+    parser.add_argument("--sellers", type=int, default=2000)
+    parser.add_argument("--attempts", type=int, default=4, help="Tentativas de criação por seller")
+    parser.add_argument("--concurrency", type=int, default=200)
+    args = parser.parse_args()
+
+    if args.attempts < 2:
+        parser.error("use ao menos 2 tentativas por seller para haver conflitos")
+
+    prepare(args.mongo_url)
+    asyncio.run(run(args.mongo_url, args.sellers, args.attempts, args.concurrency))
+
+
+if __name__ == "__main__":
+    main()
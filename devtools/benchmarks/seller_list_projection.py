@@ -0,0 +1,159 @@
+"""
+Benchmark da listagem de sellers (`GET /seller/v1/sellers`) completa x com projeção `_fields`.
+
+Sobe o router de sellers em processo, com o `SellerService` e o `SellerRepository` reais sobre uma coleção
+em memória que aplica a projeção como o Mongo (devolve apenas os campos pedidos), e mede vazão e tamanho
+da resposta de uma página. Isola o custo de CPU da aplicação (validação dos modelos e serialização),
+sem rede nem banco.
+
+Uso:
+    python devtools/benchmarks/seller_list_projection.py --limit 50 --requests 2000 \
+        --fields seller_id,trade_name
+"""
+
+import argparse
+import asyncio
+import os
+import sys
+import time
+from datetime import datetime, timedelta, timezone
+
+sys.path.append(os.getcwd())
+
+import httpx  # noqa: E402
+from dependency_injector import providers  # noqa: E402
+from fastapi import FastAPI  # noqa: E402
+from fastapi.responses import JSONResponse  # noqa: E402
+
+from app.api.v1.routers import seller_router  # noqa: E402
+from app.container import Container  # noqa: E402
+from app.repositories.seller_repository import SellerRepository  # noqa: E402
+from app.services.seller_service import SellerService  # noqa: E402
+
+SELLERS_PATH = "/seller/v1/sellers"
+BASE_CREATED_AT = datetime(2025, 1, 1, tzinfo=timezone.utc)
+
+
+def build_document(index: int) -> dict:
+    return {
+        "_id": f"{index:024x}",
+        "seller_id": f"bench{index:07d}",
+        "status": "Ativo",
+        "company_name": f"Benchmark {index} LTDA",
+        "trade_name": f"Benchmark {index}",
+        "cnpj": f"{index:014d}",
+        "state_municipal_registration": "123456789",
+        "commercial_address": "Rua do Benchmark, 123",
+        "contact_phone": "11999999999",
+        "contact_email": "benchmark@example.com",
+        "legal_rep_full_name": "Representante Benchmark",
+        "legal_rep_cpf": "12345678901",
+        "legal_rep_rg_number": "123456789",
+        "legal_rep_rg_state": "SP",
+        "legal_rep_birth_date": datetime(1980, 1, 1),
+        "legal_rep_phone": "11999999999",
+        "legal_rep_email": "representante@example.com",
+        "bank_name": "banco benchmark",
+        "agency_account": "0001-1",
+        "account_type": "Corrente",
+        "account_holder_name": "Representante Benchmark",
+        "product_categories": ["Automotivo"],
+        "business_description": "Seller criado pelo benchmark de projeção",
+        "created_at": BASE_CREATED_AT + timedelta(seconds=index),
+        "created_by": "benchmark",
+    }
+
+
+class InMemoryCursor:
+    def __init__(self, documents: list[dict]):
+        self._documents = documents
+
+    def sort(self, *_args, **_kwargs):
+        return self
+
+    def skip(self, offset: int):
+        self._documents = self._documents[offset:]
+        return self
+
+    def limit(self, limit: int):
+        self._documents = self._documents[:limit]
+        return self
+
+    async def __aiter__(self):
+        for document in self._documents:
+            yield document
+
+
+class InMemoryCollection:
+    """Coleção que ignora os filtros da listagem e aplica a projeção de inclusão, como o servidor faria."""
+
+    def __init__(self, documents: list[dict]):
+        self._documents = documents
+
+    def find(self, _filters: dict, projection: dict | None = None) -> InMemoryCursor:
+        documents = self._documents
+        if projection:
+            fields = [field for field, included in projection.items() if included]
+            documents = [{field: doc[field] for field in fields if field in doc} for doc in documents]
+        return InMemoryCursor(documents)
+
+    async def find_one(self, filters: dict) -> dict | None:
+        return next(
+            (doc for doc in self._documents if all(doc.get(field) == value for field, value in filters.items())), None
+        )
+
+
+class InMemoryClient:
+    def __init__(self, collection: InMemoryCollection):
+        self._collection = collection
+
+    def get_database(self, _name: str) -> dict:
+        return {SellerRepository.COLLECTION_NAME: self._collection}
+
+
+def build_app(documents: list[dict], response_class: type[JSONResponse] = JSONResponse) -> FastAPI:
+    repository = SellerRepository(InMemoryClient(InMemoryCollection(documents)), "benchmark")
+    container = Container()
+    container.seller_service.override(providers.Object(SellerService(repository=repository, keycloak_client=None)))
+    container.wire(modules=[seller_router])
+
+    app = FastAPI()
+    app.include_router(seller_router.router, prefix=SELLERS_PATH, default_response_class=response_class)
+    return app
+
+
+async def measure(client: httpx.AsyncClient, params: dict, total: int) -> tuple[float, int]:
+    response = await client.get(SELLERS_PATH, params=params)  # aquecimento
+    response.raise_for_status()
+    started_at = time.perf_counter()
+    for _ in range(total):
+        await client.get(SELLERS_PATH, params=params)
+    elapsed = time.perf_counter() - started_at
+    return total / elapsed, len(response.content)
+
+
+async def run(limit: int, total: int, fields: str) -> None:
+    app = build_app([build_document(index) for index in range(limit)])
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://benchmark") as client:
+        full_rps, full_size = await measure(client, {"_limit": limit}, total)
+        projected_rps, projected_size = await measure(client, {"_limit": limit, "_fields": fields}, total)
+
+    print(f"página com {limit} sellers, {total} requisições por modo")
+    print(f"  completa: {full_rps:8.1f} req/s | {full_size:7d} bytes")
+    print(f"  _fields:  {projected_rps:8.1f} req/s | {projected_size:7d} bytes ({fields})")
+    print(f"  ganho de vazão: {projected_rps / full_rps:.2f}x | resposta {full_size / projected_size:.1f}x menor")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--limit", type=int, default=50)
+    parser.add_argument("--requests", type=int, default=2000)
+    parser.add_argument("--fields", default="seller_id,trade_name")
+    args = parser.parse_args()
+
+    asyncio.run(run(args.limit, args.requests, args.fields))
+
+
+if __name__ == "__main__":
+    main()
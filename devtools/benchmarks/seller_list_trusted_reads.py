@@ -0,0 +1,68 @@
+"""
+Benchmark de CPU por requisição da listagem de sellers (`GET /seller/v1/sellers`), com e sem leituras confiáveis
+(`seller_trusted_reads`).
+
+Usa a mesma aplicação em processo de `seller_list_projection.py` (router, `SellerService` e `SellerRepository`
+reais sobre uma coleção em memória) e mede o tempo de CPU de cada requisição de uma página com N sellers:
+revalidando os sellers no `SellerResponse` (padrão) e serializando-os direto na resposta.
+
+Uso:
+    python devtools/benchmarks/seller_list_trusted_reads.py --limit 100 --requests 300
+"""
+
+import argparse
+import asyncio
+import os
+import statistics
+import sys
+import time
+
+sys.path.append(os.getcwd())
+
+import httpx  # noqa: E402
+
+from app.settings import api_settings  # noqa: E402
+from devtools.benchmarks.seller_list_projection import SELLERS_PATH, build_app, build_document  # noqa: E402
+
+
+async def measure(client: httpx.AsyncClient, limit: int, total: int) -> tuple[list[float], bytes]:
+    response = await client.get(SELLERS_PATH, params={"_limit": limit})  # aquecimento
+    response.raise_for_status()
+    samples = []
+    for _ in range(total):
+        started_at = time.process_time()
+        await client.get(SELLERS_PATH, params={"_limit": limit})
+        samples.append((time.process_time() - started_at) * 1000)
+    return samples, response.content
+
+
+def summarize(samples: list[float]) -> str:
+    return f"CPU média {statistics.mean(samples):7.2f}ms | p50 {statistics.median(samples):7.2f}ms por requisição"
+
+
+async def run(limit: int, total: int) -> None:
+    app = build_app([build_document(index) for index in range(limit)])
+    async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://benchmark") as client:
+        api_settings.seller_trusted_reads = False
+        validated_samples, validated_body = await measure(client, limit, total)
+        api_settings.seller_trusted_reads = True
+        trusted_samples, trusted_body = await measure(client, limit, total)
+
+    assert httpx.Response(200, content=validated_body).json() == httpx.Response(200, content=trusted_body).json()
+    print(f"página com {limit} sellers, {total} requisições por modo")
+    print(f"  revalidando no SellerResponse: {summarize(validated_samples)}")
+    print(f"  leituras confiáveis:           {summarize(trusted_samples)}")
+    print(f"  redução de CPU: {statistics.mean(validated_samples) / statistics.mean(trusted_samples):.1f}x")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--limit", type=int, default=100)
+    parser.add_argument("--requests", type=int, default=300)
+    args = parser.parse_args()
+
+    asyncio.run(run(args.limit, args.requests))
+
+
+if __name__ == "__main__":
+    main()
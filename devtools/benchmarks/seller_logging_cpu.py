@@ -0,0 +1,159 @@
+"""
+Benchmark do custo de CPU do logging por requisição de criação de seller.
+
+Cada "requisição" executa o `SellerService.create` (repositório e Keycloak falsos, sem I/O) e o envio
+da notificação pelo `WebhookService` (cliente HTTP falso), com os logs da aplicação gravados em
+`os.devnull` no nível escolhido. Imprime o tempo de CPU médio por requisição e a quantidade de linhas
+de log emitidas. Para comparar antes/depois, rode o script em cada versão da aplicação.
+
+Uso:
+    python devtools/benchmarks/seller_logging_cpu.py --requests 5000 --levels INFO DEBUG --sample-every 1 10
+"""
+
+import argparse
+import asyncio
+import logging
+import os
+import sys
+import time
+from datetime import date
+
+sys.path.append(os.getcwd())
+
+from app.api.common.auth_handler import UserAuthInfo  # noqa: E402
+from app.api.v1.schemas.seller_schema import SellerCreate  # noqa: E402
+from app.models.base import UserModel  # noqa: E402
+from app.models.enums import AccountType, BrazilianState, ProductCategory  # noqa: E402
+from app.services.seller_service import SellerService  # noqa: E402
+from app.services.webhook_service import WebhookService  # noqa: E402
+
+try:
+    from app.common.log_sampling import configure_log_sampling  # noqa: E402
+except ImportError:  # versões anteriores à amostragem de logs
+    configure_log_sampling = None
+
+HOT_PATH_LOGGERS = ["app.services.seller_service", "app.services.webhook_service"]
+
+
+class FakeRepository:
+    async def find_by_id(self, seller_id):
+        return None
+
+    async def find_by_trade_name(self, trade_name):
+        return None
+
+    async def create(self, seller, outbox_events=None):
+        return seller
+
+
+class FakeKeycloakClient:
+    async def add_seller_to_user(self, user_id, seller_to_add):
+        return None
+
+
+class FakeResponse:
+    status_code = 200
+    text = "ok"
+
+    def raise_for_status(self):
+        return None
+
+
+class FakeHttpClient:
+    async def post(self, url, json, headers):
+        return FakeResponse()
+
+
+class CountingHandler(logging.StreamHandler):
+    def __init__(self, stream):
+        super().__init__(stream)
+        self.count = 0
+
+    def emit(self, record):
+        self.count += 1
+        super().emit(record)
+
+
+def build_seller(index: int) -> SellerCreate:
+    return SellerCreate(
+        seller_id=f"bench{index}",
+        company_name="Empresa Benchmark Ltda",
+        trade_name=f"Loja Benchmark {index}",
+        cnpj=f"{index:014d}",
+        state_municipal_registration="123456789",
+        commercial_address="Rua do Benchmark, 123",
+        contact_phone="11999999999",
+        contact_email="contato@example.com",
+        legal_rep_full_name="Representante Benchmark",
+        legal_rep_cpf="12345678901",
+        legal_rep_rg_number="123456789",
+        legal_rep_rg_state=BrazilianState.SP,
+        legal_rep_birth_date=date(1980, 1, 1),
+        legal_rep_phone="11999999999",
+        legal_rep_email="representante@example.com",
+        bank_name="banco benchmark",
+        agency_account="0001-1",
+        account_type=AccountType.CURRENT,
+        account_holder_name="Representante Benchmark",
+        product_categories=[ProductCategory.COMPUTING],
+        business_description="Seller criado pelo benchmark de logging",
+    )
+
+
+async def run(total: int) -> float:
+    service = SellerService(FakeRepository(), FakeKeycloakClient())
+    webhook_service = WebhookService(rate_limit_per_second=1e9, rate_limit_burst=10**9)
+    webhook_service._client = FakeHttpClient()
+    auth_info = UserAuthInfo(
+        user=UserModel(name="bench-user", server="https://keycloak/realms/bench"),
+        trace_id=None,
+        sellers=[],
+        info_token={},
+    )
+    sellers = [build_seller(index) for index in range(total)]
+
+    started_at = time.process_time()
+    for seller in sellers:
+        await service.create(seller, auth_info)
+        await webhook_service.send_update_message(
+            f"Seller '{seller.seller_id}' foi criado", {"operation": "created", "seller_id": seller.seller_id}
+        )
+    return (time.process_time() - started_at) / total
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--requests", type=int, default=5000)
+    parser.add_argument("--levels", nargs="+", default=["INFO"])
+    parser.add_argument("--sample-every", type=int, nargs="+", default=[1], help="Amostragem dos logs (1 desativa)")
+    args = parser.parse_args()
+
+    with open(os.devnull, "w") as devnull:
+        handler = CountingHandler(devnull)
+        handler.setFormatter(logging.Formatter("%(asctime)s - %(name)s - %(levelname)s - %(message)s"))
+        root = logging.getLogger()
+        root.handlers = [handler]
+
+        print(f"requisições: {args.requests}")
+        for level in args.levels:
+            for every_n in args.sample_every:
+                root.setLevel(level)
+                sampling_filter = None
+                if every_n > 1 and configure_log_sampling is not None:
+                    sampling_filter = configure_log_sampling(every_n, HOT_PATH_LOGGERS)
+                handler.count = 0
+
+                cpu_per_request = asyncio.run(run(args.requests))
+
+                print(
+                    f"nível={level:<7} amostragem=1/{every_n:<3} "
+                    f"CPU por requisição: {cpu_per_request * 1e6:8.1f}µs | "
+                    f"linhas de log por requisição: {handler.count / args.requests:.1f}"
+                )
+                if sampling_filter is not None:
+                    for name in HOT_PATH_LOGGERS:
+                        logging.getLogger(name).removeFilter(sampling_filter)
+
+
+if __name__ == "__main__":
+    main()
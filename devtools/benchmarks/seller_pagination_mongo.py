@@ -0,0 +1,153 @@
+"""
+Benchmark da listagem de sellers em páginas distantes: paginação por `_offset` (skip) x por `_cursor` (keyset).
+
+Popula uma coleção em um `mongod` local com N sellers ativos (uma única vez; use `--reseed` para recriar),
+cria os índices das migrations e mede, pelo `SellerRepository`, a latência da página escolhida nos dois modos.
+Também imprime, via `explain`, quantas entradas de índice e documentos cada consulta examina.
+
+Uso:
+    python devtools/benchmarks/seller_pagination_mongo.py --mongo-url mongodb://localhost:27017 \
+        --documents 1000000 --page 1000 --limit 50 --repeat 30
+"""
+
+import argparse
+import asyncio
+import os
+import statistics
+import sys
+import time
+from datetime import datetime, timedelta, timezone
+
+sys.path.append(os.getcwd())
+
+import pymongo  # noqa: E402
+
+from app.integrations.database.mongo_client import MongoClient  # noqa: E402
+from app.models.enums import SellerStatus  # noqa: E402
+from app.repositories.seller_repository import SellerRepository  # noqa: E402
+
+DB_NAME = "benchmark_pagination"
+COLLECTION = "sellers"
+SEED_BATCH_SIZE = 10_000
+KEYSET_SORT = [("created_at", -1), ("seller_id", -1)]
+FILTERS = {"status": SellerStatus.ACTIVE.value}
+BASE_CREATED_AT = datetime(2025, 1, 1, tzinfo=timezone.utc)
+
+
+def build_document(index: int) -> dict:
+    return {
+        "seller_id": f"bench{index:07d}",
+        "status": SellerStatus.ACTIVE.value,
+        "company_name": f"Benchmark {index} LTDA",
+        "trade_name": f"Benchmark {index}",
+        "cnpj": f"{index:014d}",
+        "state_municipal_registration": "123456789",
+        "commercial_address": "Rua do Benchmark, 123",
+        "contact_phone": "11999999999",
+        "contact_email": "benchmark@example.com",
+        "legal_rep_full_name": "Representante Benchmark",
+        "legal_rep_cpf": "12345678901",
+        "legal_rep_rg_number": "123456789",
+        "legal_rep_rg_state": "SP",
+        "legal_rep_birth_date": datetime(1980, 1, 1),
+        "legal_rep_phone": "11999999999",
+        "legal_rep_email": "representante@example.com",
+        "bank_name": "banco benchmark",
+        "agency_account": "0001-1",
+        "account_type": "Corrente",
+        "account_holder_name": "Representante Benchmark",
+        "product_categories": ["Automotivo"],
+        "business_description": "Seller criado pelo benchmark de paginação",
+        # Alguns sellers com o mesmo created_at, para exercitar o desempate por seller_id
+        "created_at": BASE_CREATED_AT + timedelta(seconds=index // 3),
+        "created_by": "benchmark",
+    }
+
+
+def seed(collection, total: int, reseed: bool) -> None:
+    if reseed:
+        collection.drop()
+    existing = collection.estimated_document_count()
+    if existing >= total:
+        print(f"coleção já populada: {existing} documentos")
+    else:
+        print(f"populando {total - existing} documentos...")
+        for start in range(existing, total, SEED_BATCH_SIZE):
+            stop = min(start + SEED_BATCH_SIZE, total)
+            collection.insert_many([build_document(index) for index in range(start, stop)], ordered=False)
+    collection.create_index("seller_id", unique=True)
+    collection.create_index(
+        [("status", pymongo.ASCENDING), ("created_at", pymongo.DESCENDING), ("seller_id", pymongo.DESCENDING)]
+    )
+
+
+def explain_stats(collection, query: dict, skip: int, limit: int) -> str:
+    cursor = collection.find(query).sort(KEYSET_SORT).skip(skip).limit(limit)
+    stats = cursor.explain()["executionStats"]
+    return f"chaves examinadas: {stats['totalKeysExamined']} | documentos examinados: {stats['totalDocsExamined']}"
+
+
+def summarize(samples: list[float]) -> str:
+    ordered = sorted(samples)
+    p95 = ordered[min(len(ordered) - 1, round(0.95 * len(ordered)) - 1)]
+    return f"p50 {statistics.median(ordered):8.2f}ms | p95 {p95:8.2f}ms"
+
+
+async def measure(call, repeat: int) -> list[float]:
+    await call()  # aquecimento
+    samples = []
+    for _ in range(repeat):
+        started_at = time.perf_counter()
+        await call()
+        samples.append((time.perf_counter() - started_at) * 1000)
+    return samples
+
+
+async def run(mongo_url: str, page: int, limit: int, repeat: int, sync_collection) -> None:
+    offset = (page - 1) * limit
+    # Chave do último seller da página anterior: é o que o token de `_cursor` carregaria
+    [previous] = (
+        sync_collection.find(FILTERS, {"created_at": 1, "seller_id": 1}).sort(KEYSET_SORT).skip(offset - 1).limit(1)
+    )
+    after = [previous["created_at"], previous["seller_id"]]
+
+    repository = SellerRepository(MongoClient(mongo_url), DB_NAME)
+    offset_page = await repository.find(FILTERS, limit=limit, offset=offset, sort=dict(KEYSET_SORT))
+    cursor_page = await repository.find_after(FILTERS, sort=KEYSET_SORT, after=after, limit=limit)
+    assert [s.seller_id for s in offset_page] == [s.seller_id for s in cursor_page], "páginas diferentes"
+
+    offset_samples = await measure(
+        lambda: repository.find(FILTERS, limit=limit, offset=offset, sort=dict(KEYSET_SORT)), repeat
+    )
+    cursor_samples = await measure(
+        lambda: repository.find_after(FILTERS, sort=KEYSET_SORT, after=after, limit=limit), repeat
+    )
+    keyset_query = {"$and": [FILTERS, repository._keyset_filter(KEYSET_SORT, after)]}
+
+    print(f"página {page} (limit {limit}, offset {offset}), {repeat} repetições")
+    print(f"  _offset: {summarize(offset_samples)} | {explain_stats(sync_collection, FILTERS, offset, limit)}")
+    print(f"  _cursor: {summarize(cursor_samples)} | {explain_stats(sync_collection, keyset_query, 0, limit)}")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--mongo-url", default="mongodb://localhost:27017")
+    parser.add_argument("--documents", type=int, default=1_000_000)
+    parser.add_argument("--page", type=int, default=1000)
+    parser.add_argument("--limit", type=int, default=50)
+    parser.add_argument("--repeat", type=int, default=30)
+    parser.add_argument("--reseed", action="store_true", help="Recria a coleção do benchmark")
+    args = parser.parse_args()
+
+    if args.page < 2 or (args.page - 1) * args.limit >= args.documents:
+        parser.error("a página deve ser maior que 1 e existir na coleção")
+
+    sync_client = pymongo.MongoClient(args.mongo_url, tz_aware=True)
+    collection = sync_client[DB_NAME][COLLECTION]
+    seed(collection, args.documents, args.reseed)
+    asyncio.run(run(args.mongo_url, args.page, args.limit, args.repeat, collection))
+    sync_client.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,88 @@
+"""
+Benchmark de vazão da listagem e da consulta de sellers por classe de resposta: `JSONResponse` (padrão do FastAPI),
+`PydanticJSONResponse` e `ORJSONResponse` (`app.api.common.responses`).
+
+Usa a aplicação em processo de `seller_list_projection.py` (router, `SellerService` e `SellerRepository` reais
+sobre uma coleção em memória), com o `GZipMiddleware` como na API. Com `--trusted-reads`, mede também com
+`seller_trusted_reads` habilitado.
+
+Uso:
+    python devtools/benchmarks/seller_response_classes.py --limit 100 --requests 300 --rounds 3
+"""
+
+import argparse
+import asyncio
+import os
+import sys
+import time
+
+sys.path.append(os.getcwd())
+
+import httpx  # noqa: E402
+from fastapi.middleware.gzip import GZipMiddleware  # noqa: E402
+from fastapi.responses import JSONResponse  # noqa: E402
+
+from app.api.common.auth_handler import get_current_user_info  # noqa: E402
+from app.api.common.responses import ORJSONResponse, PydanticJSONResponse  # noqa: E402
+from app.settings import api_settings  # noqa: E402
+from devtools.benchmarks.seller_list_projection import SELLERS_PATH, build_app, build_document  # noqa: E402
+
+RESPONSE_CLASSES = (JSONResponse, PydanticJSONResponse, ORJSONResponse)
+
+
+class BenchmarkUser:
+    sellers = ["bench0000000"]
+
+
+async def measure(client: httpx.AsyncClient, path: str, params: dict, total: int) -> float:
+    (await client.get(path, params=params)).raise_for_status()  # aquecimento
+    started_at = time.perf_counter()
+    for _ in range(total):
+        await client.get(path, params=params)
+    return total / (time.perf_counter() - started_at)
+
+
+async def run_round(documents: list[dict], response_class, limit: int, total: int) -> dict[str, float]:
+    app = build_app(documents, response_class)
+    app.add_middleware(GZipMiddleware, minimum_size=1000)
+    app.dependency_overrides[get_current_user_info] = BenchmarkUser
+    async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://benchmark") as client:
+        return {
+            "listagem": await measure(client, SELLERS_PATH, {"_limit": limit}, total),
+            "consulta": await measure(client, f"{SELLERS_PATH}/buscar", {"seller_id": "bench0000000"}, total),
+        }
+
+
+async def run(limit: int, total: int, rounds: int) -> None:
+    documents = [build_document(index) for index in range(limit)]
+    best: dict[type, dict[str, float]] = {response_class: {} for response_class in RESPONSE_CLASSES}
+    # Rodadas intercaladas entre as classes; vale a melhor vazão de cada uma, para reduzir o ruído
+    for _ in range(rounds):
+        for response_class in RESPONSE_CLASSES:
+            for name, rps in (await run_round(documents, response_class, limit, total)).items():
+                best[response_class][name] = max(rps, best[response_class].get(name, 0.0))
+
+    print(
+        f"{rounds} rodadas de {total} requisições | listagem com {limit} sellers | "
+        f"trusted reads: {api_settings.seller_trusted_reads}"
+    )
+    baseline = best[JSONResponse]
+    for response_class, results in best.items():
+        line = " | ".join(f"{name} {rps:8.1f} req/s ({rps / baseline[name]:.2f}x)" for name, rps in results.items())
+        print(f"  {response_class.__name__:<21} {line}")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--limit", type=int, default=100)
+    parser.add_argument("--requests", type=int, default=300)
+    parser.add_argument("--rounds", type=int, default=3)
+    parser.add_argument("--trusted-reads", action="store_true", help="Habilita `seller_trusted_reads`")
+    args = parser.parse_args()
+
+    api_settings.seller_trusted_reads = args.trusted_reads
+    asyncio.run(run(args.limit, args.requests, args.rounds))
+
+
+if __name__ == "__main__":
+    main()
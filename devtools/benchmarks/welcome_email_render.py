@@ -0,0 +1,81 @@
+"""
+Micro-benchmark do custo de CPU por mensagem do email de boas-vindas.
+
+Renderiza N emails (padrão: 10k) com dados de sellers variados e mede o tempo por mensagem
+do template e do template + montagem da mensagem MIME (o que o consumer faz antes do envio SMTP).
+
+Uso:
+    python devtools/benchmarks/welcome_email_render.py --emails 10000
+"""
+
+import argparse
+import os
+import sys
+import time
+from email.mime.text import MIMEText
+
+sys.path.append(os.getcwd())
+
+from app.services.email_service import EmailService  # noqa: E402
+
+CATEGORIES = ["Automotivo", "Áudio", "brinquedos", "cama, mesa e banho", "ferramentas"]
+
+
+def build_sellers(total: int) -> list[dict]:
+    return [
+        {
+            "company_name": f"Empresa Benchmark {index} LTDA",
+            "trade_name": f"Loja Benchmark {index}",
+            "business_description": f"Descrição do negócio número {index} <com> caracteres & especiais",
+            "product_categories": CATEGORIES[: index % len(CATEGORIES) + 1],
+            "contact_email": f"seller{index}@example.com",
+        }
+        for index in range(total)
+    ]
+
+
+def measure(label: str, total: int, func) -> None:
+    started_at = time.process_time()
+    func()
+    elapsed = time.process_time() - started_at
+    print(f"{label:<22} total: {elapsed * 1000:8.1f}ms CPU | por email: {elapsed / total * 1_000_000:7.1f}µs")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--emails", type=int, default=10_000)
+    args = parser.parse_args()
+
+    service = EmailService()
+    sellers = build_sellers(args.emails)
+
+    def render_only():
+        for seller in sellers:
+            service._create_welcome_email_body(
+                seller["company_name"],
+                seller["trade_name"],
+                seller["business_description"],
+                seller["product_categories"],
+            )
+
+    def render_and_mime():
+        for seller in sellers:
+            body = service._create_welcome_email_body(
+                seller["company_name"],
+                seller["trade_name"],
+                seller["business_description"],
+                seller["product_categories"],
+            )
+            message = MIMEText(body, "html", "utf-8")
+            message["From"] = "bench@example.com"
+            message["To"] = seller["contact_email"]
+            message["Subject"] = f"Bem-vindo(a) {seller['company_name']}!"
+            message.as_string()
+
+    print(f"emails: {args.emails}")
+    measure("template", args.emails, render_only)
+    measure("template + MIME", args.emails, render_and_mime)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,21 @@
+from mongodb_migrations.base import BaseMigration
+
+
+class Migration(BaseMigration):
+    def upgrade(self):
+        """
+        Cria índice parcial para localizar rapidamente os sellers com eventos pendentes no outbox
+        """
+        sellers_collection = self.db['sellers']
+        sellers_collection.create_index(
+            "_outbox.event_id",
+            name="outbox_pending",
+            partialFilterExpression={"_outbox.event_id": {"$exists": True}},
+        )
+
+    def downgrade(self):
+        """
+        Remove o índice do outbox (rollback)
+        """
+        sellers_collection = self.db['sellers']
+        sellers_collection.drop_index("outbox_pending")
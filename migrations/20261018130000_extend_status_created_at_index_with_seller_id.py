@@ -0,0 +1,25 @@
+import pymongo
+
+from mongodb_migrations.base import BaseMigration
+
+
+class Migration(BaseMigration):
+    def upgrade(self):
+        """
+        Acrescenta o seller_id ao índice composto de status e created_at, para que a paginação por cursor
+        (ordenação por created_at e seller_id) seja atendida inteiramente pelo índice. O índice anterior é
+        prefixo do novo e deixa de ser necessário.
+        """
+        sellers_collection = self.db['sellers']
+        sellers_collection.create_index(
+            [("status", pymongo.ASCENDING), ("created_at", pymongo.DESCENDING), ("seller_id", pymongo.DESCENDING)]
+        )
+        sellers_collection.drop_index("status_1_created_at_-1")
+
+    def downgrade(self):
+        """
+        Restaura o índice composto de status e created_at (rollback)
+        """
+        sellers_collection = self.db['sellers']
+        sellers_collection.create_index([("status", pymongo.ASCENDING), ("created_at", pymongo.DESCENDING)])
+        sellers_collection.drop_index("status_1_created_at_-1_seller_id_-1")
@@ -0,0 +1,29 @@
+from mongodb_migrations.base import BaseMigration
+
+
+class Migration(BaseMigration):
+    def upgrade(self):
+        """
+        Troca o índice parcial do outbox por um na data de criação dos eventos, para que o relay obtenha os
+        sellers com eventos pendentes já na ordem dos eventos mais antigos. O índice anterior deixa de ser
+        necessário, pois o novo cobre o mesmo filtro.
+        """
+        sellers_collection = self.db['sellers']
+        sellers_collection.create_index(
+            "_outbox.created_at",
+            name="outbox_pending_by_created_at",
+            partialFilterExpression={"_outbox.event_id": {"$exists": True}},
+        )
+        sellers_collection.drop_index("outbox_pending")
+
+    def downgrade(self):
+        """
+        Restaura o índice parcial do outbox por event_id (rollback)
+        """
+        sellers_collection = self.db['sellers']
+        sellers_collection.create_index(
+            "_outbox.event_id",
+            name="outbox_pending",
+            partialFilterExpression={"_outbox.event_id": {"$exists": True}},
+        )
+        sellers_collection.drop_index("outbox_pending_by_created_at")
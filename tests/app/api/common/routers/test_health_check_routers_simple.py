@@ -93,3 +93,32 @@ class TestHealthCheckRouters:
         except Exception:
             # Still tried to execute code
             pass
+
+
+def test_metrics_endpoint_exposes_prometheus_format():
+    """Testa o endpoint /metrics"""
+    from app.api.common.routers.health_check_routers import add_health_check_router
+
+    app = FastAPI()
+    add_health_check_router(app)
+    client = TestClient(app)
+
+    response = client.get("/metrics")
+
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/plain")
+    assert "http_client_requests_in_flight" in response.text
+
+
+def test_metrics_endpoint_supports_openmetrics():
+    """Testa a negociação do formato OpenMetrics"""
+    from app.api.common.routers.health_check_routers import add_health_check_router
+
+    app = FastAPI()
+    add_health_check_router(app)
+    client = TestClient(app)
+
+    response = client.get("/metrics", headers={"Accept": "application/openmetrics-text"})
+
+    assert response.headers["content-type"].startswith("application/openmetrics-text")
+    assert response.text.endswith("# EOF\n")
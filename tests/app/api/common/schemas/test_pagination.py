@@ -1,6 +1,12 @@
+from datetime import datetime
+from unittest.mock import MagicMock
+from urllib.parse import parse_qs, urlparse
+
 import pytest
+from pydantic import BaseModel
 
-from app.api.common.schemas.pagination import Paginator
+from app.api.common.schemas.pagination import Paginator, get_request_pagination
+from app.common.exceptions import BadRequestException
 
 # Valores padrão para evitar repetição nos testes
 DEFAULT_PAGINATION = {"request_path": "/test", "limit": 10, "offset": 0}
@@ -82,3 +88,61 @@ def test_paginator_get_sort_dict_invalid_format():
     result = paginator.get_sort_order()
     # Should default to ascending (1) for invalid order
     assert result == {"name": 1}
+
+
+# --- Paginação por cursor (keyset) ---
+
+
+class _Item(BaseModel):
+    seller_id: str
+    created_at: datetime
+
+
+def _items(count: int) -> list[_Item]:
+    return [_Item(seller_id=f"seller{i:02d}", created_at=datetime(2025, 7, 1, 12, 0, 59 - i)) for i in range(count)]
+
+
+def test_paginator_cursor_mode_first_page():
+    paginator = Paginator(request_path="/sellers", limit=2, cursor="")
+
+    assert paginator.is_cursor_mode
+    assert paginator.get_keyset_after() is None
+    assert paginator.get_keyset_sort() == [("created_at", -1), ("seller_id", -1)]
+
+
+def test_paginator_offset_mode_is_default():
+    assert not Paginator(**DEFAULT_PAGINATION).is_cursor_mode
+
+
+def test_paginate_cursor_mode_links_to_next_page_from_last_result():
+    paginator = Paginator(request_path="/sellers", limit=2, cursor="")
+    items = _items(2)
+
+    response = paginator.paginate(results=items)
+
+    assert response.meta.page.offset is None
+    assert response.meta.links.previous == "/sellers?_cursor=&_limit=2"
+    assert response.meta.links.current == "/sellers?_cursor=&_limit=2"
+    next_cursor = parse_qs(urlparse(response.meta.links.next).query)["_cursor"][0]
+    next_page = Paginator(request_path="/sellers", limit=2, cursor=next_cursor)
+    assert next_page.get_keyset_after() == [items[-1].created_at, items[-1].seller_id]
+
+
+def test_paginate_cursor_mode_last_page_has_no_next():
+    response = Paginator(request_path="/sellers", limit=2, cursor="").paginate(results=_items(1))
+
+    assert response.meta.links.next is None
+
+
+def test_paginator_rejects_tampered_cursor():
+    with pytest.raises(BadRequestException):
+        Paginator(request_path="/sellers", cursor="eyJhIjoxfQ.AAAA").get_keyset_after()
+
+
+@pytest.mark.parametrize("offset, sort", [(10, None), (0, "trade_name")])
+def test_request_pagination_rejects_cursor_with_offset_or_sort(offset, sort):
+    request = MagicMock()
+    request.url.path = "/sellers"
+
+    with pytest.raises(BadRequestException):
+        get_request_pagination(request, limit=10, offset=offset, sort=sort, cursor="")
@@ -0,0 +1,35 @@
+from datetime import datetime, timezone
+
+import pytest
+
+from app.api.common.cursor import InvalidCursorError, decode_cursor, encode_cursor
+
+SECRET = "segredo-de-teste"
+
+
+def test_cursor_roundtrip_keeps_datetimes():
+    values = [datetime(2025, 7, 1, 12, 30, 15, 123000, tzinfo=timezone.utc), "seller01"]
+
+    assert decode_cursor(encode_cursor(values, SECRET), SECRET) == values
+
+
+def test_cursor_is_url_safe():
+    token = encode_cursor([datetime(2025, 7, 1), "seller/01?&"], SECRET)
+
+    assert all(char.isalnum() or char in "-_." for char in token)
+
+
+@pytest.mark.parametrize("token", ["", "semponto", "a.b.c", "!!!.???"])
+def test_malformed_cursor_is_rejected(token):
+    with pytest.raises(InvalidCursorError):
+        decode_cursor(token, SECRET)
+
+
+def test_tampered_cursor_is_rejected():
+    token = encode_cursor(["2025-07-01", "seller01"], SECRET)
+    forged = encode_cursor(["2025-07-01", "seller99"], "outro-segredo")
+
+    with pytest.raises(InvalidCursorError):
+        decode_cursor(f"{forged.split('.')[0]}.{token.split('.')[1]}", SECRET)
+    with pytest.raises(InvalidCursorError):
+        decode_cursor(token, "outro-segredo")
@@ -0,0 +1,85 @@
+from datetime import datetime, timezone
+
+import pytest
+from fastapi import APIRouter, FastAPI, status
+from fastapi.exceptions import ResponseValidationError
+from fastapi.responses import JSONResponse
+from pydantic import BaseModel
+from starlette.testclient import TestClient
+
+from app.api.common.responses import ModelResponseRoute, ORJSONResponse, PydanticJSONResponse
+from app.api.common.schemas import ListResponse, Paginator
+
+
+class Item(BaseModel):
+    item_id: str
+    created_at: datetime
+
+
+class ItemEntity(Item):
+    internal_note: str
+
+
+ITEMS = [
+    ItemEntity(item_id=str(index), created_at=datetime(2025, 1, index, tzinfo=timezone.utc), internal_note="x")
+    for index in range(1, 4)
+]
+
+
+def build_client(response_class) -> TestClient:
+    router = APIRouter(route_class=ModelResponseRoute)
+
+    @router.get("", response_model=ListResponse[Item])
+    async def list_items():
+        return Paginator(request_path="/items", limit=3).paginate(results=ITEMS)
+
+    @router.post("", response_model=Item, status_code=status.HTTP_201_CREATED)
+    async def create_item():
+        return ITEMS[0]
+
+    @router.get("/entity", response_model=Item)
+    async def get_item():
+        return ITEMS[1]
+
+    @router.get("/invalid", response_model=Item)
+    async def invalid_item():
+        return {"item_id": "1"}
+
+    @router.get("/slim", response_model=Item, response_model_include={"item_id"})
+    async def slim_item():
+        return ITEMS[0]
+
+    app = FastAPI()
+    app.include_router(router, prefix="/items", default_response_class=response_class)
+    return TestClient(app)
+
+
+@pytest.mark.parametrize("response_class", [PydanticJSONResponse, ORJSONResponse])
+@pytest.mark.parametrize("path", ["/items", "/items/slim", "/items/entity"])
+def test_model_responses_match_the_default_json_response(response_class, path):
+    expected = build_client(JSONResponse).get(path)
+    response = build_client(response_class).get(path)
+
+    assert response.status_code == status.HTTP_200_OK
+    assert response.headers["content-type"] == "application/json"
+    assert response.json() == expected.json()
+    assert "internal_note" not in response.text
+
+
+@pytest.mark.parametrize("response_class", [PydanticJSONResponse, ORJSONResponse])
+def test_model_responses_keep_status_code_and_validation(response_class):
+    client = build_client(response_class)
+
+    assert client.post("/items").status_code == status.HTTP_201_CREATED
+    with pytest.raises(ResponseValidationError):
+        client.get("/items/invalid")
+
+
+def test_model_response_serializes_models_with_aliases_and_include():
+    paginated = Paginator(request_path="/items", limit=3).paginate(results=ITEMS)
+
+    response = PydanticJSONResponse(paginated, include={"meta": True, "results": {"__all__": {"item_id"}}})
+
+    assert response.body.startswith(b'{"meta":')
+    assert b'"self":"/items?_offset=0&_limit=3"' in response.body
+    assert b"created_at" not in response.body
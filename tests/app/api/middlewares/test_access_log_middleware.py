@@ -0,0 +1,96 @@
+import logging
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from app.api.middlewares.access_log_middleware import OBFUSCATED_VALUE, AccessLogMiddleware
+
+LOGGER_NAME = "app.api.middlewares.access_log_middleware"
+
+
+def _create_app(**kwargs) -> FastAPI:
+    app = FastAPI()
+
+    @app.get("/ping", status_code=204)
+    async def ping():
+        return
+
+    @app.get("/boom")
+    async def boom():
+        raise RuntimeError("falhou")
+
+    app.add_middleware(AccessLogMiddleware, **kwargs)
+    return app
+
+
+def _access_logs(caplog):
+    return [record for record in caplog.records if record.name == LOGGER_NAME]
+
+
+def test_emits_a_single_access_log_line(caplog):
+    client = TestClient(_create_app())
+
+    with caplog.at_level(logging.INFO, logger=LOGGER_NAME):
+        assert client.get("/ping").status_code == 204
+
+    [record] = _access_logs(caplog)
+    assert record.getMessage().startswith("GET /ping - Status: 204 - Duração: ")
+    assert record.http_method == "GET"
+    assert record.http_path == "/ping"
+    assert record.http_status == 204
+    assert record.duration_ms >= 0
+    assert record.http_headers is None
+
+
+def test_ignored_urls_are_not_logged(caplog):
+    client = TestClient(_create_app(ignored_urls={"/ping"}))
+
+    with caplog.at_level(logging.INFO, logger=LOGGER_NAME):
+        client.get("/ping")
+
+    assert _access_logs(caplog) == []
+
+
+def test_logs_only_allowed_headers_and_obfuscates_sensitive_ones(caplog):
+    client = TestClient(
+        _create_app(headers_to_log={"X-Request-ID", "Authorization"}, headers_to_obfuscate={"Authorization"})
+    )
+
+    with caplog.at_level(logging.INFO, logger=LOGGER_NAME):
+        client.get("/ping", headers={"X-Request-ID": "abc", "Authorization": "Bearer segredo", "X-Outro": "1"})
+
+    [record] = _access_logs(caplog)
+    assert record.http_headers == {"x-request-id": "abc", "authorization": OBFUSCATED_VALUE}
+    assert "segredo" not in record.getMessage()
+
+
+def test_unhandled_error_is_logged_as_500(caplog):
+    client = TestClient(_create_app(), raise_server_exceptions=False)
+
+    with caplog.at_level(logging.INFO, logger=LOGGER_NAME):
+        assert client.get("/boom").status_code == 500
+
+    [record] = _access_logs(caplog)
+    assert record.http_status == 500
+
+
+def test_skips_timing_when_info_is_disabled(caplog):
+    client = TestClient(_create_app())
+
+    with caplog.at_level(logging.WARNING, logger=LOGGER_NAME):
+        client.get("/ping")
+
+    assert _access_logs(caplog) == []
+
+
+@pytest.mark.asyncio
+async def test_non_http_scopes_pass_through():
+    calls = []
+
+    async def app(scope, receive, send):
+        calls.append(scope["type"])
+
+    await AccessLogMiddleware(app)({"type": "lifespan"}, None, None)
+
+    assert calls == ["lifespan"]
@@ -0,0 +1,42 @@
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from app.api.middlewares.metrics_middleware import UNMATCHED_ROUTE, MetricsMiddleware
+from app.common.metrics import REGISTRY
+
+METRIC = "http_server_request_duration_seconds_count"
+
+
+def _count(**labels):
+    return REGISTRY.get_sample_value(METRIC, labels) or 0
+
+
+def _create_app() -> FastAPI:
+    app = FastAPI()
+
+    @app.get("/itens/{item_id}")
+    async def get_item(item_id: str):
+        return {"item_id": item_id}
+
+    app.add_middleware(MetricsMiddleware)
+    return app
+
+
+def test_observes_duration_by_route_template():
+    client = TestClient(_create_app())
+    before = _count(method="GET", route="/itens/{item_id}", status="200")
+
+    client.get("/itens/1")
+    client.get("/itens/2")
+
+    assert _count(method="GET", route="/itens/{item_id}", status="200") == before + 2
+
+
+def test_unmatched_paths_share_a_single_series():
+    client = TestClient(_create_app())
+    before = _count(method="GET", route=UNMATCHED_ROUTE, status="404")
+
+    client.get("/nao-existe/1")
+    client.get("/nao-existe/2")
+
+    assert _count(method="GET", route=UNMATCHED_ROUTE, status="404") == before + 2
@@ -0,0 +1,71 @@
+import base64
+import json
+
+import pytest
+from asgi_correlation_id import CorrelationIdMiddleware
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from app.api.middlewares.tracing_middleware import TracingMiddleware
+from app.common.tracing import OTLPJsonFileSpanExporter, configure_tracing, shutdown_tracing
+
+TRACE_ID = "0af7651916cd43dd8448eb211c80319c"
+PARENT_SPAN_ID = "b7ad6b7169203331"
+REQUEST_ID = "3f2c8a1e9b7d4c6e8f0a1b2c3d4e5f60"
+
+
+def _create_app() -> FastAPI:
+    app = FastAPI()
+
+    @app.get("/itens/{item_id}")
+    async def get_item(item_id: str):
+        return {"item_id": item_id}
+
+    app.add_middleware(TracingMiddleware)
+    app.add_middleware(CorrelationIdMiddleware, header_name="X-Request-ID")
+    return app
+
+
+@pytest.fixture
+def exported_spans(tmp_path):
+    path = tmp_path / "traces.jsonl"
+    provider = configure_tracing("seller-api-test", span_exporter=OTLPJsonFileSpanExporter(str(path)))
+
+    def read_spans() -> list[dict]:
+        provider.force_flush()
+        return [
+            span
+            for line in path.read_text(encoding="utf-8").splitlines()
+            for resource_spans in json.loads(line)["resourceSpans"]
+            for scope_spans in resource_spans["scopeSpans"]
+            for span in scope_spans["spans"]
+        ]
+
+    yield read_spans
+    shutdown_tracing()
+
+
+def test_server_span_is_named_by_route_and_continues_incoming_trace(exported_spans):
+    client = TestClient(_create_app())
+
+    response = client.get(
+        "/itens/1",
+        headers={"traceparent": f"00-{TRACE_ID}-{PARENT_SPAN_ID}-01", "X-Request-ID": REQUEST_ID},
+    )
+
+    assert response.status_code == 200
+    [span] = exported_spans()
+    attributes = {attribute["key"]: next(iter(attribute["value"].values())) for attribute in span["attributes"]}
+    assert span["name"] == "GET /itens/{item_id}"
+    assert span["kind"] == "SPAN_KIND_SERVER"
+    assert bytes.fromhex(TRACE_ID) == base64.b64decode(span["traceId"])
+    assert bytes.fromhex(PARENT_SPAN_ID) == base64.b64decode(span["parentSpanId"])
+    assert attributes["http.route"] == "/itens/{item_id}"
+    assert attributes["http.response.status_code"] == "200"
+    assert attributes["app.request_id"] == REQUEST_ID
+
+
+def test_passes_through_when_tracing_is_disabled():
+    client = TestClient(_create_app())
+
+    assert client.get("/itens/1").json() == {"item_id": "1"}
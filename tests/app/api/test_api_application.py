@@ -1,3 +1,5 @@
+from unittest.mock import AsyncMock, MagicMock
+
 from fastapi import APIRouter, FastAPI
 from fastapi.testclient import TestClient
 
@@ -29,3 +31,63 @@ def test_health_check_route(dummy_settings):
     response = client.get(f"{dummy_settings.health_check_base_path}/health")
     assert response.status_code == 200
     assert response.json() == {"version": "0.0.2"}
+
+
+def test_lifespan_warms_up_keycloak_adapter(dummy_settings, dummy_router):
+    app = create_app(dummy_settings, dummy_router)
+    keycloak_adapter = MagicMock()
+    keycloak_adapter.discover = AsyncMock()
+    keycloak_adapter.stop_background_refresh = AsyncMock()
+    keycloak_admin_client = AsyncMock()
+    rabbitmq_publisher = AsyncMock()
+    app.container = MagicMock()
+    app.container.keycloak_adapter.return_value = keycloak_adapter
+    app.container.keycloak_admin_client.return_value = keycloak_admin_client
+    app.container.rabbitmq_publisher.return_value = rabbitmq_publisher
+    webhook_service = AsyncMock()
+    app.container.webhook_service.return_value = webhook_service
+    webhook_dispatcher = MagicMock()
+    webhook_dispatcher.stop = AsyncMock()
+    app.container.webhook_dispatcher.return_value = webhook_dispatcher
+    outbox_relay = MagicMock()
+    outbox_relay.stop = AsyncMock()
+    app.container.outbox_relay.return_value = outbox_relay
+    redis_adapter = MagicMock()
+    redis_adapter.stop_client_cache = AsyncMock()
+    app.container.redis_adapter.return_value = redis_adapter
+
+    with TestClient(app) as client:
+        assert client.get("/dummy").status_code == 200
+
+    keycloak_adapter.discover.assert_awaited_once()
+    keycloak_adapter.start_background_refresh.assert_called_once()
+    keycloak_adapter.stop_background_refresh.assert_awaited_once()
+    keycloak_admin_client.open.assert_awaited_once()
+    keycloak_admin_client.aclose.assert_awaited_once()
+    rabbitmq_publisher.start.assert_awaited_once()
+    rabbitmq_publisher.stop.assert_awaited_once()
+    webhook_service.open.assert_awaited_once()
+    webhook_service.aclose.assert_awaited_once()
+    webhook_dispatcher.start.assert_called_once()
+    webhook_dispatcher.stop.assert_awaited_once()
+    outbox_relay.start.assert_called_once()
+    outbox_relay.stop.assert_awaited_once()
+    redis_adapter.start_client_cache.assert_called_once()
+    redis_adapter.stop_client_cache.assert_awaited_once()
+    assert app.state.startup_duration_ms >= 0
+
+
+def test_lifespan_warmup_failure_does_not_prevent_startup(dummy_settings, dummy_router):
+    app = create_app(dummy_settings, dummy_router)
+    app.container = MagicMock()
+    app.container.keycloak_adapter.return_value.discover = AsyncMock(side_effect=Exception("Keycloak fora"))
+    app.container.keycloak_adapter.return_value.stop_background_refresh = AsyncMock()
+    app.container.keycloak_admin_client.return_value = AsyncMock()
+    app.container.rabbitmq_publisher.return_value = AsyncMock()
+    app.container.webhook_service.return_value = AsyncMock()
+    app.container.webhook_dispatcher.return_value.stop = AsyncMock()
+    app.container.outbox_relay.return_value.stop = AsyncMock()
+    app.container.redis_adapter.return_value.stop_client_cache = AsyncMock()
+
+    with TestClient(app) as client:
+        assert client.get("/dummy").status_code == 200
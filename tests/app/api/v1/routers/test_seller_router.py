@@ -1,9 +1,11 @@
 from unittest.mock import AsyncMock
 
 import pytest
+from pydantic import create_model
 from starlette import status
 from starlette.testclient import TestClient
 
+from app.api.v1.schemas.seller_schema import SellerResponse
 from app.models.seller_model import Seller
 from tests.helpers.test_fixtures import create_full_seller
 
@@ -47,3 +49,66 @@ def test_get_by_id_protected(client: TestClient, mock_seller_service: AsyncMock)
     
     # Estrutura está ok mesmo que falhe na autenticação ou método
     assert response.status_code in [200, 401, 403, 404, 405]
+
+
+def test_get_sellers_with_fields_returns_only_requested_fields(client: TestClient, mock_seller_service: AsyncMock):
+    projection_model = create_model("SellerProjection", seller_id=(str, ...), trade_name=(str, ...))
+    mock_seller_service.find.return_value = [projection_model(seller_id="1", trade_name="Loja")]
+
+    response = client.get(SELLER_BASE, params={"_fields": "seller_id, trade_name,seller_id"})
+
+    assert response.status_code == status.HTTP_200_OK
+    assert response.json()["results"] == [{"seller_id": "1", "trade_name": "Loja"}]
+    assert mock_seller_service.find.await_args.kwargs["fields"] == ["seller_id", "trade_name"]
+    assert "_fields=seller_id%2Ctrade_name" in response.json()["meta"]["links"]["self"]
+
+
+def test_get_sellers_with_unknown_fields_is_rejected(client: TestClient, mock_seller_service: AsyncMock):
+    response = client.get(SELLER_BASE, params={"_fields": "seller_id,senha"})
+
+    assert response.status_code == status.HTTP_400_BAD_REQUEST
+    mock_seller_service.find.assert_not_called()
+
+
+@pytest.fixture
+def trusted_reads(monkeypatch):
+    from app.settings import api_settings
+
+    monkeypatch.setattr(api_settings, "seller_trusted_reads", True)
+
+
+@pytest.mark.parametrize("trusted", [False, True])
+def test_get_sellers_trusted_reads_return_the_same_payload(
+    client: TestClient, mock_seller_service: AsyncMock, monkeypatch, trusted
+):
+    from app.settings import api_settings
+
+    monkeypatch.setattr(api_settings, "seller_trusted_reads", trusted)
+    mock_seller_service.find.return_value = [create_full_seller(seller_id="1"), create_full_seller(seller_id="2")]
+
+    response = client.get(SELLER_BASE, params={"_limit": 2})
+
+    assert response.status_code == status.HTTP_200_OK
+    body = response.json()
+    assert [seller["seller_id"] for seller in body["results"]] == ["1", "2"]
+    assert set(body["results"][0]) == set(SellerResponse.model_fields)
+    assert body["meta"]["links"]["self"] == f"{SELLER_BASE}?_offset=0&_limit=2"
+
+
+def test_get_seller_by_id_with_trusted_reads_skips_response_validation(
+    client: TestClient, mock_seller_service: AsyncMock, trusted_reads
+):
+    # Documento gravado por fora da API: o `SellerResponse` normalizaria o bank_name
+    from app.api.common.auth_handler import UserAuthInfo, get_current_user_info
+    from app.models.base import UserModel
+
+    client.app.dependency_overrides[get_current_user_info] = lambda: UserAuthInfo(
+        user=UserModel(name="user", server="server"), trace_id="trace", sellers=["1"], info_token={}
+    )
+    seller = create_full_seller(seller_id="1", bank_name="BANCO")
+    mock_seller_service.find_by_id.return_value = seller
+
+    response = client.get(f"{SELLER_BASE}/1")
+
+    assert response.status_code == status.HTTP_200_OK
+    assert response.json() == seller.model_dump(mode="json", include=set(SellerResponse.model_fields))
@@ -1,15 +1,16 @@
 """
 Testes para o cliente de administração do Keycloak: keycloak_admin_client.py
 """
-from unittest.mock import MagicMock, patch
+from unittest.mock import AsyncMock, MagicMock, patch
 
+import asyncio
 import secrets
 import string
 import httpx
 import pytest
 from fastapi import HTTPException
 
-from app.clients.keycloak_admin_client import KeycloakAdminClient
+from app.clients.keycloak_admin_client import ADMIN_TOKEN_EXPIRY_MARGIN_SECONDS, KeycloakAdminClient
 from app.common.exceptions.bad_request_exception import BadRequestException
 
 # --- Dicionário de constantes para os testes ---
@@ -68,6 +69,78 @@ async def test_get_admin_token_http_error_raises_http_exception(keycloak_client)
         assert exc_info.value.status_code == 500
         assert "Falha ao autenticar com o Keycloak" in exc_info.value.detail
 
+
+@pytest.mark.asyncio
+async def test_get_admin_token_is_cached_until_expiry(keycloak_client):
+    """Testa se o token de admin é reutilizado até pouco antes do seu expires_in."""
+    mock_response = MagicMock()
+    mock_response.json.return_value = {"access_token": TEST_DATA["admin_token"], "expires_in": 300}
+    mock_response.raise_for_status.return_value = None
+
+    with patch(TEST_DATA["httpx_async_client"]) as mock_client:
+        mock_post = mock_client.return_value.__aenter__.return_value.post
+        mock_post.return_value = mock_response
+
+        tokens = await asyncio.gather(*(keycloak_client._get_admin_token() for _ in range(5)))
+        assert tokens == [TEST_DATA["admin_token"]] * 5
+        mock_post.assert_called_once()
+
+        keycloak_client.invalidate_admin_token()
+        await keycloak_client._get_admin_token()
+        assert mock_post.call_count == 2
+
+
+@pytest.mark.asyncio
+async def test_get_admin_token_renewed_after_expiry(keycloak_client):
+    """Testa se um token expirado (considerando a margem) é renovado."""
+    mock_response = MagicMock()
+    mock_response.json.return_value = {
+        "access_token": TEST_DATA["admin_token"], "expires_in": ADMIN_TOKEN_EXPIRY_MARGIN_SECONDS
+    }
+    mock_response.raise_for_status.return_value = None
+
+    with patch(TEST_DATA["httpx_async_client"]) as mock_client:
+        mock_post = mock_client.return_value.__aenter__.return_value.post
+        mock_post.return_value = mock_response
+
+        await keycloak_client._get_admin_token()
+        await keycloak_client._get_admin_token()
+        assert mock_post.call_count == 2
+
+
+@pytest.mark.asyncio
+async def test_shared_client_is_reused_between_calls(keycloak_client):
+    """Testa se, após open(), as chamadas reutilizam o mesmo cliente HTTP com pool de conexões."""
+    with patch(TEST_DATA["httpx_async_client"]) as mock_client:
+        shared_client = mock_client.return_value
+        shared_client.aclose = AsyncMock()
+        shared_client.get = AsyncMock(return_value=MagicMock(status_code=200, json=MagicMock(return_value={})))
+
+        await keycloak_client.open()
+        await keycloak_client.open()
+        with patch.object(keycloak_client, '_get_admin_token', return_value=TEST_DATA["admin_token"]):
+            await keycloak_client.get_user(TEST_DATA["user_id"])
+            await keycloak_client.get_users()
+
+        mock_client.assert_called_once()
+        assert shared_client.get.await_count == 2
+        shared_client.__aenter__.assert_not_called()
+
+        await keycloak_client.aclose()
+        shared_client.aclose.assert_awaited_once()
+
+
+@pytest.mark.asyncio
+async def test_unauthorized_response_invalidates_admin_token(keycloak_client):
+    """Testa se uma resposta 401 de uma chamada administrativa descarta o token em cache."""
+    keycloak_client._admin_token = TEST_DATA["admin_token"]
+    keycloak_client._admin_token_expires_at = float("inf")
+    request = httpx.Request("GET", f"{keycloak_client.base_url}/users")
+
+    await keycloak_client._invalidate_token_on_unauthorized(httpx.Response(401, request=request))
+
+    assert keycloak_client._admin_token is None
+
 # --- Testes para create_user ---
 
 @pytest.mark.asyncio
@@ -218,3 +291,81 @@ async def test_reset_user_password_success(keycloak_client):
             await keycloak_client.reset_user_password(TEST_DATA["user_id"], "new_secure_password")
 
             mock_client.return_value.__aenter__.return_value.put.assert_called_once()
+
+# --- Testes para add_seller_to_user / remove_seller_from_user ---
+
+
+@pytest.mark.asyncio
+async def test_concurrent_seller_changes_are_batched_in_single_put(keycloak_client):
+    """Alterações concorrentes no mesmo usuário geram uma única leitura e uma única escrita."""
+    user_data = {"id": TEST_DATA["user_id"], "attributes": {"sellers": ["seller_a", "seller_b"]}}
+    with patch.object(keycloak_client, "get_user", AsyncMock(return_value=user_data)) as mock_get_user, \
+            patch.object(keycloak_client, "_update_user_representation", AsyncMock()) as mock_put:
+        await asyncio.gather(
+            keycloak_client.add_seller_to_user(TEST_DATA["user_id"], "seller_c"),
+            keycloak_client.add_seller_to_user(TEST_DATA["user_id"], "seller_d"),
+            keycloak_client.remove_seller_from_user(TEST_DATA["user_id"], "seller_a"),
+        )
+
+    mock_get_user.assert_awaited_once()
+    mock_put.assert_awaited_once()
+    assert mock_put.call_args.args[1]["attributes"]["sellers"] == ["seller_b", "seller_c", "seller_d"]
+
+
+@pytest.mark.asyncio
+async def test_seller_change_without_effect_skips_put(keycloak_client):
+    """Adicionar um seller já existente não faz a escrita no Keycloak."""
+    user_data = {"id": TEST_DATA["user_id"], "attributes": {"sellers": "seller_a"}}
+    with patch.object(keycloak_client, "get_user", AsyncMock(return_value=user_data)), \
+            patch.object(keycloak_client, "_update_user_representation", AsyncMock()) as mock_put:
+        await keycloak_client.add_seller_to_user(TEST_DATA["user_id"], "seller_a")
+
+    mock_put.assert_not_awaited()
+
+
+@pytest.mark.asyncio
+async def test_add_seller_to_missing_user_raises(keycloak_client):
+    with patch.object(keycloak_client, "get_user", AsyncMock(return_value=None)):
+        with pytest.raises(Exception, match="não existe"):
+            await keycloak_client.add_seller_to_user(TEST_DATA["user_id"], "seller_a")
+
+
+@pytest.mark.asyncio
+async def test_remove_seller_from_missing_user_is_ignored(keycloak_client):
+    with patch.object(keycloak_client, "get_user", AsyncMock(return_value=None)), \
+            patch.object(keycloak_client, "_update_user_representation", AsyncMock()) as mock_put:
+        await keycloak_client.remove_seller_from_user(TEST_DATA["user_id"], "seller_a")
+
+    mock_put.assert_not_awaited()
+
+
+@pytest.mark.asyncio
+async def test_seller_change_retries_on_conflict(keycloak_client):
+    """Um 409 na escrita relê o usuário e tenta novamente."""
+    conflict = httpx.HTTPStatusError("Conflict", request=MagicMock(), response=MagicMock(status_code=409))
+
+    def fresh_user_data(_user_id):
+        return {"id": TEST_DATA["user_id"], "attributes": {"sellers": []}}
+
+    update_user = AsyncMock(side_effect=[conflict, None])
+    with patch.object(keycloak_client, "get_user", AsyncMock(side_effect=fresh_user_data)) as mock_get_user, \
+            patch.object(keycloak_client, "_update_user_representation", update_user) as mock_put, \
+            patch("app.clients.keycloak_admin_client.asyncio.sleep", AsyncMock()):
+        await keycloak_client.add_seller_to_user(TEST_DATA["user_id"], "seller_a")
+
+    assert mock_get_user.await_count == 2
+    assert mock_put.await_count == 2
+
+
+@pytest.mark.asyncio
+async def test_seller_change_uses_redis_lock_per_user():
+    inmemory_adapter = MagicMock()
+    client = KeycloakAdminClient(inmemory_adapter=inmemory_adapter)
+    user_data = {"id": TEST_DATA["user_id"], "attributes": {}}
+    with patch.object(client, "get_user", AsyncMock(return_value=user_data)), \
+            patch.object(client, "_update_user_representation", AsyncMock()) as mock_put:
+        await client.add_seller_to_user(TEST_DATA["user_id"], "seller_a")
+
+    inmemory_adapter.locks.assert_called_once()
+    assert inmemory_adapter.locks.call_args.args[0] == f"keycloak:user_sellers:{TEST_DATA['user_id']}"
+    assert mock_put.call_args.args[1]["attributes"]["sellers"] == ["seller_a"]
@@ -0,0 +1,51 @@
+import logging
+
+import pytest
+
+from app.common.log_sampling import SamplingFilter, configure_log_sampling
+
+
+def _record(msg, level=logging.INFO, name="app.teste"):
+    return logging.LogRecord(name, level, __file__, 1, msg, ("arg",), None)
+
+
+def test_emits_one_in_every_n_records_per_template():
+    sampling_filter = SamplingFilter(every_n=3)
+
+    emitted = [sampling_filter.filter(_record("Seller '%s' criado")) for _ in range(7)]
+
+    assert emitted == [True, False, False, True, False, False, True]
+
+
+def test_templates_are_sampled_independently():
+    sampling_filter = SamplingFilter(every_n=2)
+
+    assert sampling_filter.filter(_record("Seller '%s' criado"))
+    assert sampling_filter.filter(_record("Seller '%s' atualizado"))
+    assert sampling_filter.filter(_record("Seller '%s' criado")) is False
+
+
+def test_warnings_and_errors_are_never_dropped():
+    sampling_filter = SamplingFilter(every_n=100)
+
+    assert all(sampling_filter.filter(_record("Falha", level=logging.WARNING)) for _ in range(5))
+    assert all(sampling_filter.filter(_record("Erro", level=logging.ERROR)) for _ in range(5))
+
+
+def test_invalid_every_n():
+    with pytest.raises(ValueError):
+        SamplingFilter(every_n=0)
+
+
+def test_configure_log_sampling_installs_filter_on_loggers():
+    logger = logging.getLogger("app.teste.amostragem")
+
+    sampling_filter = configure_log_sampling(10, ["app.teste.amostragem"])
+    try:
+        assert sampling_filter in logger.filters
+    finally:
+        logger.removeFilter(sampling_filter)
+
+
+def test_configure_log_sampling_disabled():
+    assert configure_log_sampling(1, ["app.teste.amostragem"]) is None
@@ -0,0 +1,109 @@
+from unittest.mock import MagicMock
+
+import httpx
+import pytest
+
+from app.common.metrics import (
+    HTTP_CLIENT_REQUEST_DURATION,
+    INTEGRATION_OPERATION_DURATION,
+    REGISTRY,
+    InstrumentedTransport,
+    OperationTimers,
+    RuntimeMetricsCollector,
+    timed,
+)
+
+
+def _count(name, **labels):
+    return REGISTRY.get_sample_value(f"{name}_count", labels) or 0
+
+
+class FakeComponent:
+    def __init__(self):
+        self._operation_timers = OperationTimers(INTEGRATION_OPERATION_DURATION, "teste", ("ok",))
+
+    @timed("ok")
+    async def ok(self):
+        return "resultado"
+
+    @timed("falha")
+    async def falha(self):
+        raise ValueError("erro")
+
+
+@pytest.mark.asyncio
+async def test_timed_observes_successful_and_failed_calls():
+    component = FakeComponent()
+    ok_before = _count("integration_operation_duration_seconds", integration="teste", operation="ok")
+    falha_before = _count("integration_operation_duration_seconds", integration="teste", operation="falha")
+
+    assert await component.ok() == "resultado"
+    with pytest.raises(ValueError):
+        await component.falha()
+
+    assert _count("integration_operation_duration_seconds", integration="teste", operation="ok") == ok_before + 1
+    assert _count("integration_operation_duration_seconds", integration="teste", operation="falha") == falha_before + 1
+
+
+def test_operation_timers_reuse_preallocated_children():
+    timers = OperationTimers(INTEGRATION_OPERATION_DURATION, "teste", ("ok",))
+
+    assert timers["ok"] is INTEGRATION_OPERATION_DURATION.labels("teste", "ok")
+    assert timers["nova"] is timers["nova"]
+
+
+@pytest.mark.asyncio
+async def test_instrumented_transport_labels_by_integration_and_outcome():
+    transport = InstrumentedTransport(
+        "teste_http", httpx.MockTransport(lambda request: httpx.Response(503 if request.url.path == "/erro" else 200))
+    )
+    before_2xx = _count("http_client_request_duration_seconds", integration="teste_http", outcome="2xx")
+    before_5xx = _count("http_client_request_duration_seconds", integration="teste_http", outcome="5xx")
+
+    async with httpx.AsyncClient(transport=transport, base_url="http://teste") as client:
+        await client.get("/ok")
+        await client.get("/erro")
+
+    assert _count("http_client_request_duration_seconds", integration="teste_http", outcome="2xx") == before_2xx + 1
+    assert _count("http_client_request_duration_seconds", integration="teste_http", outcome="5xx") == before_5xx + 1
+    assert REGISTRY.get_sample_value("http_client_requests_in_flight", {"integration": "teste_http"}) == 0
+
+
+@pytest.mark.asyncio
+async def test_instrumented_transport_counts_transport_errors():
+    def raise_error(request):
+        raise httpx.ConnectError("recusado")
+
+    transport = InstrumentedTransport("teste_erro", httpx.MockTransport(raise_error))
+    before = _count("http_client_request_duration_seconds", integration="teste_erro", outcome="error")
+
+    async with httpx.AsyncClient(transport=transport) as client:
+        with pytest.raises(httpx.ConnectError):
+            await client.get("http://teste/")
+
+    assert _count("http_client_request_duration_seconds", integration="teste_erro", outcome="error") == before + 1
+    assert HTTP_CLIENT_REQUEST_DURATION.labels("teste_erro", "error") is transport._children["error"]
+
+
+def test_runtime_collector_reads_component_stats():
+    collector = RuntimeMetricsCollector()
+    keycloak_adapter = MagicMock(token_cache_stats={"hits": 3, "misses": 1, "size": 2, "max_size": 10})
+    webhook_dispatcher = MagicMock()
+    webhook_dispatcher.stats.return_value = {
+        "queue_depth": 4,
+        "queue_max_size": 100,
+        "enqueued": 10,
+        "dropped": 1,
+        "coalesced": 2,
+        "sent_messages": 3,
+        "failed_messages": 0,
+    }
+    collector.bind(keycloak_adapter=keycloak_adapter, webhook_dispatcher=webhook_dispatcher)
+
+    samples = {sample.name: sample.value for family in collector.collect() for sample in family.samples}
+
+    assert samples["keycloak_token_cache_hits_total"] == 3
+    assert samples["keycloak_token_cache_size"] == 2
+    assert samples["webhook_queue_depth"] == 4
+    assert samples["webhook_notifications_dropped_total"] == 1
+    assert "rabbitmq_publisher_outbox_size" not in samples
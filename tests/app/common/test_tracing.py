@@ -0,0 +1,192 @@
+import base64
+import json
+import os
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import httpx
+import pytest
+from asgi_correlation_id import correlation_id
+
+from app.common import tracing
+from app.common.metrics import InstrumentedTransport
+from app.common.tracing import (
+    HEADER_X_REQUEST_ID,
+    OTLPJsonFileSpanExporter,
+    configure_tracing,
+    current_trace_context,
+    inject_trace_context,
+    shutdown_tracing,
+    start_span,
+    traced,
+)
+from app.models.outbox_event_model import OutboxDestination, OutboxEvent
+from app.services.publisher import AsyncRabbitMQPublisher
+from app.services.seller_email_consumer import SellerEmailConsumer
+
+RABBITMQ_ENV = {
+    "RABBITMQ_HOST": "localhost",
+    "RABBITMQ_PORT": "5672",
+    "RABBITMQ_USERNAME": "guest",
+    "RABBITMQ_PASSWORD": "guest",
+    "RABBITMQ_EXCHANGE": "",
+    "RABBITMQ_ROUTING_KEY": "sellers",
+    "RABBITMQ_QUEUE": "sellers",
+}
+
+
+@pytest.fixture
+def traces_file(tmp_path):
+    path = tmp_path / "traces.jsonl"
+    provider = configure_tracing("seller-api-test", span_exporter=OTLPJsonFileSpanExporter(str(path)))
+
+    def read_spans() -> dict[str, dict]:
+        provider.force_flush()
+        spans = {}
+        for line in path.read_text(encoding="utf-8").splitlines():
+            for resource_spans in json.loads(line)["resourceSpans"]:
+                for scope_spans in resource_spans["scopeSpans"]:
+                    for span in scope_spans["spans"]:
+                        spans[span["name"]] = span
+        return spans
+
+    yield read_spans
+    shutdown_tracing()
+
+
+@pytest.fixture
+def request_id():
+    token = correlation_id.set("req-123")
+    yield "req-123"
+    correlation_id.reset(token)
+
+
+class FakeService:
+    @traced()
+    async def find_by_id(self, seller_id):
+        return await FakeRepository().find_by_id(seller_id)
+
+
+class FakeRepository:
+    def __init__(self):
+        self._span_attributes = {"db.system": "mongodb", "db.collection.name": "sellers"}
+
+    @traced()
+    async def find_by_id(self, seller_id):
+        return {"seller_id": seller_id}
+
+
+def _attributes(span: dict) -> dict:
+    return {attribute["key"]: next(iter(attribute["value"].values())) for attribute in span.get("attributes", [])}
+
+
+def _trace_and_span_ids(traceparent: str) -> tuple[str, str]:
+    _version, trace_id, span_id, _flags = traceparent.split("-")
+    return trace_id, span_id
+
+
+def _ids(span: dict) -> tuple[str, str]:
+    """Ids do span em OTLP/JSON (base64) no formato hexadecimal do `traceparent`."""
+    return base64.b64decode(span["traceId"]).hex(), base64.b64decode(span["spanId"]).hex()
+
+
+def test_disabled_tracing_creates_no_spans():
+    assert not tracing.tracing_enabled()
+    with start_span("ignorado") as span:
+        assert span is None
+    assert current_trace_context() is None
+    assert inject_trace_context({"x-attempts": 1}) == {"x-attempts": 1}
+
+
+def test_request_id_is_propagated_without_tracing(request_id):
+    assert current_trace_context() == {HEADER_X_REQUEST_ID: request_id}
+
+
+@pytest.mark.asyncio
+async def test_traced_methods_are_exported_as_nested_spans(traces_file):
+    assert await FakeService().find_by_id("seller01") == {"seller_id": "seller01"}
+
+    spans = traces_file()
+    service_span = spans["FakeService.find_by_id"]
+    repository_span = spans["FakeRepository.find_by_id"]
+    assert repository_span["traceId"] == service_span["traceId"]
+    assert repository_span["parentSpanId"] == service_span["spanId"]
+    assert _attributes(repository_span) == {"db.system": "mongodb", "db.collection.name": "sellers"}
+
+
+@pytest.mark.asyncio
+async def test_exceptions_are_recorded_in_the_span(traces_file):
+    class Failing:
+        @traced("falha")
+        async def run(self):
+            raise ValueError("erro")
+
+    with pytest.raises(ValueError):
+        await Failing().run()
+
+    span = traces_file()["falha"]
+    assert span["status"]["code"] == "STATUS_CODE_ERROR"
+    assert span["events"][0]["name"] == "exception"
+
+
+@pytest.mark.asyncio
+async def test_outbound_http_requests_carry_trace_context_and_request_id(traces_file, request_id):
+    received = {}
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        received.update(request.headers)
+        return httpx.Response(204)
+
+    transport = InstrumentedTransport("teste_tracing", httpx.MockTransport(handler))
+    async with httpx.AsyncClient(transport=transport) as client:
+        with start_span("requisição"):
+            await client.get("http://keycloak.local/admin/realms/teste/users/1")
+
+    client_span = traces_file()["GET teste_tracing"]
+    assert client_span["kind"] == "SPAN_KIND_CLIENT"
+    assert _trace_and_span_ids(received["traceparent"]) == _ids(client_span)
+    assert received["x-request-id"] == request_id
+    assert _attributes(client_span)["http.response.status_code"] == "204"
+
+
+@pytest.mark.asyncio
+@patch.dict(os.environ, RABBITMQ_ENV)
+async def test_amqp_publish_and_consume_continue_the_request_trace(traces_file, request_id):
+    # Requisição: o evento do outbox guarda o contexto da requisição
+    with start_span("POST /sellers", "server"):
+        event = OutboxEvent(destination=OutboxDestination.RABBITMQ, payload={"seller_id": "seller01"})
+    assert event.trace_context[HEADER_X_REQUEST_ID] == request_id
+
+    # Relay (fora da requisição): a publicação continua o trace guardado no evento
+    publisher = AsyncRabbitMQPublisher()
+    channel = MagicMock()
+    channel.default_exchange.publish = AsyncMock()
+    publisher._channel_pool = MagicMock()
+    publisher._channel_pool.acquire.return_value.__aenter__.return_value = channel
+    token = correlation_id.set(None)
+    try:
+        with start_span("outbox deliver", carrier=event.trace_context):
+            await publisher.publish_message(event.payload, headers=event.trace_context)
+    finally:
+        correlation_id.reset(token)
+    message = channel.default_exchange.publish.await_args.args[0]
+
+    # Consumer: continua o trace a partir dos cabeçalhos da mensagem
+    consumer = SellerEmailConsumer()
+    consumer.email_service = MagicMock()
+    consumer.email_service.send_welcome_email.return_value = True
+    body = json.dumps({"seller_id": "seller01", "company_name": "Empresa", "contact_email": "a@b.com"}).encode()
+    consumer._SellerEmailConsumer__process_seller_message(
+        MagicMock(), MagicMock(), MagicMock(headers=message.headers), body
+    )
+
+    spans = traces_file()
+    request_span = spans["POST /sellers"]
+    producer_span = spans["rabbitmq publish"]
+    consumer_span = spans["sellers process"]
+    assert message.headers[HEADER_X_REQUEST_ID] == request_id
+    assert _trace_and_span_ids(message.headers["traceparent"]) == _ids(producer_span)
+    assert producer_span["kind"] == "SPAN_KIND_PRODUCER"
+    assert consumer_span["kind"] == "SPAN_KIND_CONSUMER"
+    assert request_span["traceId"] == producer_span["traceId"] == consumer_span["traceId"]
+    assert consumer_span["parentSpanId"] == producer_span["spanId"]
+    assert _attributes(consumer_span)["app.request_id"] == request_id
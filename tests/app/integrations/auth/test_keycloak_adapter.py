@@ -2,12 +2,13 @@
 Testes para o KeycloakAdapter
 """
 
-from unittest.mock import MagicMock, patch
+from unittest.mock import AsyncMock, MagicMock, patch
 
 import httpx
 import pytest
 
 from app.integrations.auth.keycloak_adapter import (
+    WELL_KNOWN_CACHE_TTL_SECONDS,
     InvalidTokenException,
     KeycloakAdapter,
     OAuthException,
@@ -18,7 +19,11 @@ from app.integrations.auth.keycloak_adapter import (
 @pytest.fixture
 def mock_inmemory_adapter():
     """Mock do RedisAsyncioAdapter"""
-    return MagicMock()
+    adapter = AsyncMock()
+    adapter.get_json.return_value = None
+    adapter.ttl.return_value = -2
+    adapter.locks = MagicMock()
+    return adapter
 
 
 # Dicionário com constantes para evitar duplicação
@@ -39,42 +44,79 @@ TEST_KEYCLOAK_DATA = {
     "token_expired": "Token expired",
     "invalid_token_msg": "Invalid token",
     # Constantes para patches e módulos
-    "httpx_client": "httpx.Client",
+    "httpx_client": "httpx.AsyncClient",
     "jwt_pyjwk_client": "jwt.PyJWKClient",
     "jwt_get_unverified_header": "jwt.get_unverified_header",
     "jwt_decode": "jwt.decode",
 }
 
 
+def _mock_http_get(mock_client, payload):
+    mock_response = MagicMock()
+    mock_response.json.return_value = payload
+    mock_response.raise_for_status.return_value = None
+    mock_client.return_value.__aenter__.return_value.get = AsyncMock(return_value=mock_response)
+    return mock_client.return_value.__aenter__.return_value.get
+
+
+def test_keycloak_adapter_init_does_not_perform_io(mock_inmemory_adapter):
+    """Testa que a construção do KeycloakAdapter não faz chamadas de rede"""
+    with patch(TEST_KEYCLOAK_DATA["httpx_client"]) as mock_client:
+        adapter = KeycloakAdapter(TEST_KEYCLOAK_DATA["well_known_url"], mock_inmemory_adapter)
+
+        mock_client.assert_not_called()
+        assert adapter.jwks_client is None
+
+
 @pytest.mark.asyncio
-async def test_keycloak_adapter_init_success(mock_inmemory_adapter):
-    """Testa inicialização bem-sucedida do KeycloakAdapter"""
+async def test_keycloak_adapter_discover_success(mock_inmemory_adapter):
+    """Testa a descoberta OIDC via HTTP, persistindo o .well-known no Redis"""
     mock_well_known_data = {"jwks_uri": TEST_KEYCLOAK_DATA["jwks_uri"]}
 
     with patch(TEST_KEYCLOAK_DATA["httpx_client"]) as mock_client:
-        mock_response = MagicMock()
-        mock_response.json.return_value = mock_well_known_data
-        mock_response.raise_for_status.return_value = None
-        mock_client.return_value.__enter__.return_value.get.return_value = mock_response
+        mock_get = _mock_http_get(mock_client, mock_well_known_data)
 
         with patch(TEST_KEYCLOAK_DATA["jwt_pyjwk_client"]) as mock_jwks_client:
             adapter = KeycloakAdapter(TEST_KEYCLOAK_DATA["well_known_url"], mock_inmemory_adapter)
+            await adapter.discover()
+            await adapter.discover()
 
-            # Verifica que PyJWKClient foi inicializado com a URI correta
+            # Verifica que PyJWKClient foi inicializado com a URI correta, uma única vez
             mock_jwks_client.assert_called_once_with(mock_well_known_data["jwks_uri"])
+            mock_get.assert_any_call(TEST_KEYCLOAK_DATA["well_known_url"])
+            mock_inmemory_adapter.set_json.assert_any_call(
+                adapter.well_known_cache_key, mock_well_known_data, expires_in_seconds=WELL_KNOWN_CACHE_TTL_SECONDS
+            )
             assert adapter.jwks_client is not None
 
 
 @pytest.mark.asyncio
-async def test_keycloak_adapter_init_http_error(mock_inmemory_adapter):
-    """Testa erro HTTP durante inicialização"""
+async def test_keycloak_adapter_discover_from_redis(mock_inmemory_adapter):
+    """Testa que a descoberta usa o .well-known e o JWKS do Redis sem contatar o Keycloak"""
+    mock_inmemory_adapter.get_json.side_effect = [{"jwks_uri": TEST_KEYCLOAK_DATA["jwks_uri"]}, {"keys": []}]
+
+    with patch(TEST_KEYCLOAK_DATA["httpx_client"]) as mock_client:
+        adapter = KeycloakAdapter(TEST_KEYCLOAK_DATA["well_known_url"], mock_inmemory_adapter)
+        await adapter.discover()
+
+        mock_client.assert_not_called()
+        assert adapter.jwks_client.uri == TEST_KEYCLOAK_DATA["jwks_uri"]
+
+
+@pytest.mark.asyncio
+async def test_keycloak_adapter_discover_http_error(mock_inmemory_adapter):
+    """Testa erro HTTP durante a descoberta OIDC"""
     with patch(TEST_KEYCLOAK_DATA["httpx_client"]) as mock_client:
-        mock_client.return_value.__enter__.return_value.get.side_effect = httpx.HTTPStatusError(
-            TEST_KEYCLOAK_DATA["http_error"], request=MagicMock(), response=MagicMock()
+        mock_client.return_value.__aenter__.return_value.get = AsyncMock(
+            side_effect=httpx.HTTPStatusError(
+                TEST_KEYCLOAK_DATA["http_error"], request=MagicMock(), response=MagicMock()
+            )
         )
 
+        adapter = KeycloakAdapter(TEST_KEYCLOAK_DATA["well_known_url"], mock_inmemory_adapter)
         with pytest.raises(httpx.HTTPStatusError):
-            KeycloakAdapter(TEST_KEYCLOAK_DATA["well_known_url"], mock_inmemory_adapter)
+            await adapter.discover()
+        assert adapter.jwks_client is None
 
 
 @pytest.mark.asyncio
@@ -89,17 +131,15 @@ async def test_validate_token_success(mock_inmemory_adapter):
     }
 
     with patch(TEST_KEYCLOAK_DATA["httpx_client"]) as mock_client:
-        mock_response = MagicMock()
-        mock_response.json.return_value = mock_well_known_data
-        mock_response.raise_for_status.return_value = None
-        mock_client.return_value.__enter__.return_value.get.return_value = mock_response
+        _mock_http_get(mock_client, mock_well_known_data)
 
-        with patch(TEST_KEYCLOAK_DATA["jwt_pyjwk_client"]) as mock_jwks_client:
-            mock_jwks_instance = MagicMock()
-            mock_jwks_client.return_value = mock_jwks_instance
+        with patch(TEST_KEYCLOAK_DATA["jwt_pyjwk_client"]):
+            adapter = KeycloakAdapter(TEST_KEYCLOAK_DATA["well_known_url"], mock_inmemory_adapter)
+            await adapter.discover()
             mock_signing_key = MagicMock()
             mock_signing_key.key = TEST_KEYCLOAK_DATA["mock_key"]
-            mock_jwks_instance.get_signing_key_from_jwt.return_value = mock_signing_key
+            # Token sem `kid`: aceito com a única chave de assinatura do JWKS
+            adapter.signing_keys = {"kid-1": mock_signing_key}
 
             with patch(TEST_KEYCLOAK_DATA["jwt_get_unverified_header"]) as mock_get_header:
                 mock_get_header.return_value = {"alg": TEST_KEYCLOAK_DATA["algorithm"]}
@@ -107,11 +147,10 @@ async def test_validate_token_success(mock_inmemory_adapter):
                 with patch(TEST_KEYCLOAK_DATA["jwt_decode"]) as mock_jwt_decode:
                     mock_jwt_decode.return_value = mock_token_payload
 
-                    adapter = KeycloakAdapter(TEST_KEYCLOAK_DATA["well_known_url"], mock_inmemory_adapter)
                     result = await adapter.validate_token(TEST_KEYCLOAK_DATA["mock_token"])
 
                     assert result == mock_token_payload
-                    mock_jwt_decode.assert_called_once()
+                    assert mock_jwt_decode.call_args.args[1] == TEST_KEYCLOAK_DATA["mock_key"]
 
 
 @pytest.mark.asyncio
@@ -120,18 +159,9 @@ async def test_validate_token_jwt_error(mock_inmemory_adapter):
     mock_well_known_data = {"jwks_uri": TEST_KEYCLOAK_DATA["jwks_uri"]}
 
     with patch(TEST_KEYCLOAK_DATA["httpx_client"]) as mock_client:
-        mock_response = MagicMock()
-        mock_response.json.return_value = mock_well_known_data
-        mock_response.raise_for_status.return_value = None
-        mock_client.return_value.__enter__.return_value.get.return_value = mock_response
-
-        with patch(TEST_KEYCLOAK_DATA["jwt_pyjwk_client"]) as mock_jwks_client:
-            mock_jwks_instance = MagicMock()
-            mock_jwks_client.return_value = mock_jwks_instance
-            mock_signing_key = MagicMock()
-            mock_signing_key.key = TEST_KEYCLOAK_DATA["mock_key"]
-            mock_jwks_instance.get_signing_key_from_jwt.return_value = mock_signing_key
+        _mock_http_get(mock_client, mock_well_known_data)
 
+        with patch(TEST_KEYCLOAK_DATA["jwt_pyjwk_client"]):
             with patch(TEST_KEYCLOAK_DATA["jwt_decode"]) as mock_jwt_decode:
                 mock_jwt_decode.side_effect = Exception(TEST_KEYCLOAK_DATA["jwt_error"])
 
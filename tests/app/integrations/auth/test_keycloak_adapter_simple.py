@@ -2,11 +2,19 @@
 Testes simples para keycloak_adapter.py focados em cobertura
 """
 
+import asyncio
+import json
+import time
+
 import pytest
-from unittest.mock import AsyncMock, Mock, patch
+from unittest.mock import AsyncMock, MagicMock, Mock, patch
 import httpx
 import jwt
+from cryptography.hazmat.primitives.asymmetric import rsa
+from redis.exceptions import LockError
 from app.integrations.auth.keycloak_adapter import KeycloakAdapter, TokenExpiredException, InvalidTokenException, OAuthException
+from app.integrations.auth.keycloak_adapter import JWKS_CACHE_TTL_SECONDS, JWKS_REFRESH_MARGIN_SECONDS
+from app.integrations.auth.keycloak_adapter import UNKNOWN_KEY_REFRESH_MIN_INTERVAL_SECONDS
 
 KEYCLOAK_EXEMPLO = "https://keycloak.example.com/jwks"
 JWT_GET = 'jwt.get_unverified_header'
@@ -19,21 +27,23 @@ class TestKeycloakAdapterSimple:
     
     @pytest.fixture
     def mock_redis_adapter(self):
-        return AsyncMock()
+        redis_adapter = AsyncMock()
+        redis_adapter.ttl.return_value = -2
+        redis_adapter.locks = MagicMock()
+        return redis_adapter
     
     @pytest.fixture
     def mock_well_known_url(self):
         return "https://keycloak.example.com/.well-known/openid_configuration"
     
     @pytest.fixture
-    def keycloak_adapter(self, mock_well_known_url, mock_redis_adapter):
-        with patch('httpx.Client') as mock_client:
-            mock_response = Mock()
-            mock_response.json.return_value = {"jwks_uri": KEYCLOAK_EXEMPLO}
-            mock_response.raise_for_status.return_value = None
-            mock_client.return_value.__enter__.return_value.get.return_value = mock_response
-            
-            return KeycloakAdapter(mock_well_known_url, mock_redis_adapter)
+    async def keycloak_adapter(self, mock_well_known_url, mock_redis_adapter):
+        mock_redis_adapter.get_json.return_value = {"jwks_uri": KEYCLOAK_EXEMPLO}
+        adapter = KeycloakAdapter(mock_well_known_url, mock_redis_adapter)
+        await adapter.discover()
+        mock_redis_adapter.reset_mock()
+        mock_redis_adapter.get_json.return_value = None
+        return adapter
     
     @pytest.mark.asyncio
     async def test_validate_token_success(self, keycloak_adapter):
@@ -43,13 +53,13 @@ class TestKeycloakAdapterSimple:
         expected_payload = {"sub": "user123", "email": "user@example.com"}
         
         # Mock jwt operations
+        keycloak_adapter.signing_keys = {"kid-1": Mock(key="test_key")}
+
         with patch(JWT_GET) as mock_header, \
-             patch(JWT_CODE) as mock_decode, \
-             patch.object(keycloak_adapter.jwks_client, 'get_signing_key_from_jwt') as mock_signing_key:
+             patch(JWT_CODE) as mock_decode:
             
             mock_header.return_value = {"alg": "RS256"}
             mock_decode.return_value = expected_payload
-            mock_signing_key.return_value = Mock(key="test_key")
             
             # Act
             result = await keycloak_adapter.validate_token(token)
@@ -65,13 +75,13 @@ class TestKeycloakAdapterSimple:
         token = "expired_token"
         
         # Mock jwt operations
+        keycloak_adapter.signing_keys = {"kid-1": Mock(key="test_key")}
+
         with patch(JWT_GET) as mock_header, \
-             patch(JWT_CODE) as mock_decode, \
-             patch.object(keycloak_adapter.jwks_client, 'get_signing_key_from_jwt') as mock_signing_key:
+             patch(JWT_CODE) as mock_decode:
             
             mock_header.return_value = {"alg": "RS256"}
             mock_decode.side_effect = jwt.ExpiredSignatureError(TOKEN_EXPIRED)
-            mock_signing_key.return_value = Mock(key="test_key")
             
             # Act & Assert
             with pytest.raises(TokenExpiredException):
@@ -84,13 +94,13 @@ class TestKeycloakAdapterSimple:
         token = "invalid_token"
         
         # Mock jwt operations
+        keycloak_adapter.signing_keys = {"kid-1": Mock(key="test_key")}
+
         with patch(JWT_GET) as mock_header, \
-             patch(JWT_CODE) as mock_decode, \
-             patch.object(keycloak_adapter.jwks_client, 'get_signing_key_from_jwt') as mock_signing_key:
+             patch(JWT_CODE) as mock_decode:
             
             mock_header.return_value = {"alg": "RS256"}
             mock_decode.side_effect = jwt.InvalidTokenError(INVALID_TOKEN)
-            mock_signing_key.return_value = Mock(key="test_key")
             
             # Act & Assert
             with pytest.raises(InvalidTokenException):
@@ -103,13 +113,13 @@ class TestKeycloakAdapterSimple:
         token = "problematic_token"
         
         # Mock jwt operations
+        keycloak_adapter.signing_keys = {"kid-1": Mock(key="test_key")}
+
         with patch(JWT_GET) as mock_header, \
-             patch(JWT_CODE) as mock_decode, \
-             patch.object(keycloak_adapter.jwks_client, 'get_signing_key_from_jwt') as mock_signing_key:
+             patch(JWT_CODE) as mock_decode:
             
             mock_header.return_value = {"alg": "RS256"}
             mock_decode.side_effect = Exception("Unexpected error")
-            mock_signing_key.return_value = Mock(key="test_key")
             
             # Act & Assert
             with pytest.raises(OAuthException):
@@ -123,10 +133,11 @@ class TestKeycloakAdapterSimple:
         keycloak_adapter.inmemory_adapter.get_json.return_value = cached_keys
         
         # Act
-        await keycloak_adapter._fetch_and_cache_keys()
+        with patch.object(keycloak_adapter, '_load_signing_keys') as mock_load_signing_keys:
+            await keycloak_adapter._fetch_and_cache_keys()
         
         # Assert
-        assert keycloak_adapter.jwks_client.jwk_set == cached_keys
+        mock_load_signing_keys.assert_called_once_with(cached_keys)
         keycloak_adapter.inmemory_adapter.get_json.assert_called_once()
     
     @pytest.mark.asyncio
@@ -136,7 +147,8 @@ class TestKeycloakAdapterSimple:
         keycloak_adapter.inmemory_adapter.get_json.return_value = None
         jwk_set = {"keys": [{"kid": "test", "kty": "RSA"}]}
         
-        with patch('httpx.AsyncClient') as mock_client:
+        with patch('httpx.AsyncClient') as mock_client, \
+             patch.object(keycloak_adapter, '_load_signing_keys') as mock_load_signing_keys:
             mock_response = Mock()
             mock_response.json.return_value = jwk_set
             mock_response.raise_for_status.return_value = None
@@ -146,57 +158,251 @@ class TestKeycloakAdapterSimple:
             await keycloak_adapter._fetch_and_cache_keys()
             
             # Assert
-            assert keycloak_adapter.jwks_client.jwk_set == jwk_set
+            mock_client.return_value.__aenter__.return_value.get.assert_called_once_with(KEYCLOAK_EXEMPLO)
+            mock_load_signing_keys.assert_called_once_with(jwk_set)
             keycloak_adapter.inmemory_adapter.set_json.assert_called_once()
     
     @pytest.mark.asyncio
-    async def test_validate_token_key_not_found_then_refetch(self, keycloak_adapter):
-        """Testa validação quando chave não é encontrada e é necessário refetch"""
-        # Arrange
-        token = "token_with_new_key"
-        keycloak_adapter.inmemory_adapter.get_json.return_value = None
-        
-        # Mock jwt operations
-        with patch(JWT_GET) as mock_header, \
-             patch(JWT_CODE) as mock_decode, \
-             patch.object(keycloak_adapter.jwks_client, 'get_signing_key_from_jwt') as mock_signing_key, \
-             patch('httpx.AsyncClient') as mock_client:
-            
-            # First call fails, second succeeds
-            mock_signing_key.side_effect = [jwt.exceptions.PyJWKClientError("Key not found"), Mock(key="test_key")]
-            mock_header.return_value = {"alg": "RS256"}
-            mock_decode.return_value = {"sub": "user123"}
-            
-            # Mock HTTP response for key fetch
+    async def test_validate_token_without_kid_fetches_keys_when_none_loaded(self, keycloak_adapter):
+        """Testa que um token sem 'kid' busca o JWKS se nenhuma chave foi carregada e usa a única chave"""
+        private_key = rsa.generate_private_key(public_exponent=65537, key_size=2048)
+        jwk_data = json.loads(jwt.algorithms.RSAAlgorithm.to_jwk(private_key.public_key()))
+        jwk_data.update({"kid": "kid-1", "use": "sig"})
+        token = jwt.encode({"sub": "user123"}, private_key, algorithm="RS256")
+
+        with patch('httpx.AsyncClient') as mock_client:
             mock_response = Mock()
-            mock_response.json.return_value = {"keys": []}
+            mock_response.json.return_value = {"keys": [jwk_data]}
             mock_response.raise_for_status.return_value = None
             mock_client.return_value.__aenter__.return_value.get.return_value = mock_response
-            
-            # Act
+
             result = await keycloak_adapter.validate_token(token)
-            
-            # Assert
-            assert result == {"sub": "user123"}
-            assert mock_signing_key.call_count == 2
-    
-    def test_get_jwks_uri_success(self, mock_well_known_url, mock_redis_adapter):
-        """Testa obtenção da URI JWKS"""
-        with patch('httpx.Client') as mock_client:
+
+        assert result == {"sub": "user123"}
+        assert list(keycloak_adapter.signing_keys) == ["kid-1"]
+
+    @pytest.mark.asyncio
+    async def test_validate_token_without_kid_is_rejected_with_several_keys(self, keycloak_adapter):
+        """Testa que um token sem 'kid' é recusado quando o JWKS tem mais de uma chave"""
+        keycloak_adapter.signing_keys = {"kid-1": Mock(key="key-1"), "kid-2": Mock(key="key-2")}
+
+        with patch(JWT_GET, return_value={"alg": "RS256"}), \
+             patch(JWT_CODE) as mock_decode, \
+             patch.object(keycloak_adapter, '_fetch_and_cache_keys', new_callable=AsyncMock) as mock_fetch:
+            with pytest.raises(InvalidTokenException):
+                await keycloak_adapter.validate_token("token_without_kid")
+
+            mock_decode.assert_not_called()
+            mock_fetch.assert_not_awaited()
+
+    @pytest.mark.asyncio
+    async def test_discover_fetches_well_known_when_not_cached(self, mock_well_known_url, mock_redis_adapter):
+        """Testa a descoberta do .well-known via HTTP quando não está no Redis"""
+        mock_redis_adapter.get_json.return_value = None
+        with patch('httpx.AsyncClient') as mock_client:
             mock_response = Mock()
-            mock_response.json.return_value = {"jwks_uri": KEYCLOAK_EXEMPLO}
+            mock_response.json.return_value = {"jwks_uri": KEYCLOAK_EXEMPLO, "keys": []}
             mock_response.raise_for_status.return_value = None
-            mock_client.return_value.__enter__.return_value.get.return_value = mock_response
-            
+            mock_get = AsyncMock(return_value=mock_response)
+            mock_client.return_value.__aenter__.return_value.get = mock_get
+
             adapter = KeycloakAdapter(mock_well_known_url, mock_redis_adapter)
-            
+
             # Act
-            jwks_uri = adapter._get_jwks_uri()
-            
+            await adapter.discover()
+
             # Assert
-            assert jwks_uri == KEYCLOAK_EXEMPLO
-            mock_client.return_value.__enter__.return_value.get.assert_called_with(mock_well_known_url)
-    
+            assert adapter.jwks_client.uri == KEYCLOAK_EXEMPLO
+            mock_get.assert_any_call(mock_well_known_url)
+            mock_get.assert_any_call(KEYCLOAK_EXEMPLO)
+
+    @pytest.mark.asyncio
+    async def test_discover_tolerates_jwks_failure(self, mock_well_known_url, mock_redis_adapter):
+        """Testa que falhas ao carregar o JWKS não impedem a descoberta (chaves buscadas sob demanda)"""
+        mock_redis_adapter.get_json.side_effect = [{"jwks_uri": KEYCLOAK_EXEMPLO}, Exception("Redis fora")]
+        adapter = KeycloakAdapter(mock_well_known_url, mock_redis_adapter)
+
+        await adapter.discover()
+
+        assert adapter.jwks_client is not None
+        assert adapter.signing_keys == {}
+
+    @pytest.mark.asyncio
+    async def test_validate_token_uses_cache_on_repeated_token(self, keycloak_adapter):
+        """Testa que um token repetido não passa novamente pela verificação de assinatura"""
+        token = "cached_token"
+        payload = {"sub": "user123", "exp": time.time() + 300}
+
+        keycloak_adapter.signing_keys = {"kid-1": Mock(key="test_key")}
+
+        with patch(JWT_GET) as mock_header, \
+             patch(JWT_CODE) as mock_decode:
+
+            mock_header.return_value = {"alg": "RS256"}
+            mock_decode.return_value = payload
+
+            first = await keycloak_adapter.validate_token(token)
+            second = await keycloak_adapter.validate_token(token)
+
+            assert first == second == payload
+            mock_decode.assert_called_once()
+            assert keycloak_adapter.token_cache_stats["hits"] == 1
+            assert keycloak_adapter.token_cache_stats["misses"] == 1
+
+    @pytest.mark.asyncio
+    async def test_validate_token_without_exp_is_not_cached(self, keycloak_adapter):
+        """Testa que tokens sem 'exp' não são mantidos no cache"""
+        keycloak_adapter.signing_keys = {"kid-1": Mock(key="test_key")}
+
+        with patch(JWT_GET) as mock_header, \
+             patch(JWT_CODE) as mock_decode:
+
+            mock_header.return_value = {"alg": "RS256"}
+            mock_decode.return_value = {"sub": "user123"}
+
+            await keycloak_adapter.validate_token("no_exp_token")
+            await keycloak_adapter.validate_token("no_exp_token")
+
+            assert mock_decode.call_count == 2
+            assert len(keycloak_adapter.token_cache) == 0
+
+    @pytest.mark.asyncio
+    async def test_validate_token_resolves_key_by_kid(self, keycloak_adapter):
+        """Testa que a chave é resolvida pelo mapa de 'kid' montado a partir do JWKS"""
+        private_key = rsa.generate_private_key(public_exponent=65537, key_size=2048)
+        jwk_data = json.loads(jwt.algorithms.RSAAlgorithm.to_jwk(private_key.public_key()))
+        jwk_data.update({"kid": "kid-1", "use": "sig", "alg": "RS256"})
+        keycloak_adapter.inmemory_adapter.get_json.return_value = {"keys": [jwk_data, {"kid": "bad", "kty": "RSA"}]}
+        await keycloak_adapter._fetch_and_cache_keys()
+
+        token = jwt.encode(
+            {"sub": "user123", "exp": int(time.time()) + 300},
+            private_key,
+            algorithm="RS256",
+            headers={"kid": "kid-1"},
+        )
+
+        result = await keycloak_adapter.validate_token(token)
+
+        assert result["sub"] == "user123"
+        assert list(keycloak_adapter.signing_keys) == ["kid-1"]
+
+    @pytest.mark.asyncio
+    async def test_concurrent_unknown_kid_triggers_single_fetch(self, keycloak_adapter):
+        """Testa que misses concorrentes de `kid` compartilham uma única busca do JWKS"""
+        fetch_started = asyncio.Event()
+        release_fetch = asyncio.Event()
+        calls = 0
+
+        async def slow_fetch(force_refresh=False):
+            nonlocal calls
+            calls += 1
+            fetch_started.set()
+            await release_fetch.wait()
+
+        with patch(JWT_GET, return_value={"alg": "RS256", "kid": "unknown"}), \
+             patch.object(keycloak_adapter, '_fetch_and_cache_keys', side_effect=slow_fetch):
+            tasks = [asyncio.create_task(keycloak_adapter.validate_token(f"token{i}")) for i in range(5)]
+            await fetch_started.wait()
+            release_fetch.set()
+            results = await asyncio.gather(*tasks, return_exceptions=True)
+
+        assert calls == 1
+        assert all(isinstance(result, InvalidTokenException) for result in results)
+
+    @pytest.mark.asyncio
+    async def test_unknown_kid_is_negatively_cached(self, keycloak_adapter):
+        """Testa que um `kid` inexistente não dispara novas buscas do JWKS"""
+        with patch(JWT_GET, return_value={"alg": "RS256", "kid": "garbage"}), \
+             patch.object(keycloak_adapter, '_fetch_and_cache_keys', new_callable=AsyncMock) as mock_fetch:
+            for _ in range(3):
+                with pytest.raises(InvalidTokenException):
+                    await keycloak_adapter.validate_token("garbage_token")
+
+            mock_fetch.assert_awaited_once_with(force_refresh=True)
+            assert "garbage" in keycloak_adapter.unknown_kids
+
+    @pytest.mark.asyncio
+    async def test_alternating_unknown_kids_refresh_at_most_once_per_interval(self, keycloak_adapter):
+        """Testa que `kid` inventados e alternados não disparam uma renovação do JWKS a cada token"""
+        with patch.object(keycloak_adapter, '_fetch_and_cache_keys', new_callable=AsyncMock) as mock_fetch:
+            for index in range(6):
+                kid = "fake-a" if index % 2 == 0 else "fake-b"
+                with patch(JWT_GET, return_value={"alg": "RS256", "kid": kid}), pytest.raises(InvalidTokenException):
+                    await keycloak_adapter.validate_token(f"token{index}")
+
+            mock_fetch.assert_awaited_once_with(force_refresh=True)
+            assert "fake-a" in keycloak_adapter.unknown_kids
+            # Suprimido pelo intervalo mínimo: não é marcado como inexistente
+            assert "fake-b" not in keycloak_adapter.unknown_kids
+
+            keycloak_adapter._last_unknown_key_refresh -= UNKNOWN_KEY_REFRESH_MIN_INTERVAL_SECONDS
+            with patch(JWT_GET, return_value={"alg": "RS256", "kid": "fake-b"}), pytest.raises(InvalidTokenException):
+                await keycloak_adapter.validate_token("token-b")
+            assert mock_fetch.await_count == 2
+
+    def test_loading_keys_keeps_negative_entries_for_kids_still_missing(self, keycloak_adapter):
+        """Testa que a recarga do JWKS só remove do cache negativo os `kid` que passaram a existir"""
+        private_key = rsa.generate_private_key(public_exponent=65537, key_size=2048)
+        jwk = json.loads(jwt.algorithms.RSAAlgorithm.to_jwk(private_key.public_key()))
+        keycloak_adapter.unknown_kids.set("rotated", True)
+        keycloak_adapter.unknown_kids.set("garbage", True)
+
+        keycloak_adapter._load_signing_keys({"keys": [{**jwk, "kid": "rotated", "use": "sig"}]})
+
+        assert "rotated" in keycloak_adapter.signing_keys
+        assert "rotated" not in keycloak_adapter.unknown_kids
+        assert "garbage" in keycloak_adapter.unknown_kids
+
+    @pytest.mark.asyncio
+    async def test_forced_refresh_skips_keycloak_when_recently_refreshed(self, keycloak_adapter):
+        """Testa que a busca no Keycloak é evitada quando outro processo acabou de renovar as chaves"""
+        keycloak_adapter.inmemory_adapter.ttl.return_value = JWKS_CACHE_TTL_SECONDS - 1
+        keycloak_adapter.inmemory_adapter.get_json.return_value = {"keys": []}
+
+        with patch('httpx.AsyncClient') as mock_client:
+            await keycloak_adapter._fetch_and_cache_keys(force_refresh=True)
+
+            mock_client.assert_not_called()
+            keycloak_adapter.inmemory_adapter.locks.assert_called_once()
+
+    @pytest.mark.asyncio
+    async def test_forced_refresh_lock_not_acquired_uses_redis(self, keycloak_adapter):
+        """Testa que, sem obter o lock, as chaves disponíveis no Redis são usadas"""
+        keycloak_adapter.inmemory_adapter.locks.return_value.__aenter__.side_effect = LockError("ocupado")
+        keycloak_adapter.inmemory_adapter.get_json.return_value = {"keys": []}
+
+        with patch('httpx.AsyncClient') as mock_client:
+            await keycloak_adapter._fetch_and_cache_keys(force_refresh=True)
+
+            mock_client.assert_not_called()
+            keycloak_adapter.inmemory_adapter.get_json.assert_awaited_once()
+
+    @pytest.mark.asyncio
+    async def test_refresh_keys_before_expiry(self, keycloak_adapter):
+        """Testa que a renovação em segundo plano só busca no Keycloak perto da expiração no Redis"""
+        with patch.object(keycloak_adapter, '_fetch_and_cache_keys', new_callable=AsyncMock) as mock_fetch:
+            keycloak_adapter.inmemory_adapter.ttl.return_value = JWKS_REFRESH_MARGIN_SECONDS + 1
+            await keycloak_adapter.refresh_keys()
+            mock_fetch.assert_awaited_once_with()
+
+            mock_fetch.reset_mock()
+            keycloak_adapter.inmemory_adapter.ttl.return_value = JWKS_REFRESH_MARGIN_SECONDS
+            await keycloak_adapter.refresh_keys()
+            mock_fetch.assert_awaited_once_with(force_refresh=True)
+
+    @pytest.mark.asyncio
+    async def test_background_refresh_start_and_stop(self, keycloak_adapter):
+        """Testa o ciclo de vida da renovação em segundo plano"""
+        keycloak_adapter.start_background_refresh()
+        task = keycloak_adapter._background_refresh
+        keycloak_adapter.start_background_refresh()
+
+        assert keycloak_adapter._background_refresh is task
+        await keycloak_adapter.stop_background_refresh()
+        assert task.cancelled()
+        assert keycloak_adapter._background_refresh is None
+
     def test_exceptions_instantiation(self):
         """Testa instanciação das exceções"""
         # Act & Assert
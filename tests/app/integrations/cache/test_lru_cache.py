@@ -0,0 +1,71 @@
+"""
+Testes para o TTLLRUCache
+"""
+
+import pytest
+
+from app.integrations.cache import TTLLRUCache
+
+
+class FakeClock:
+    def __init__(self, now: float = 1000.0):
+        self.now = now
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def test_get_set_counts_hits_and_misses():
+    cache = TTLLRUCache(max_size=2)
+
+    assert cache.get("a") is None
+    cache.set("a", 1)
+
+    assert cache.get("a") == 1
+    assert cache.hits == 1
+    assert cache.misses == 1
+    assert cache.stats["hit_ratio"] == 0.5
+
+
+def test_evicts_least_recently_used():
+    cache = TTLLRUCache(max_size=2)
+    cache.set("a", 1)
+    cache.set("b", 2)
+    cache.get("a")
+    cache.set("c", 3)
+
+    assert "a" in cache
+    assert "b" not in cache
+    assert "c" in cache
+    assert len(cache) == 2
+
+
+def test_entry_expires_at_its_own_deadline():
+    clock = FakeClock()
+    cache = TTLLRUCache(max_size=10, clock=clock)
+    cache.set("short", "x", expires_at=clock.now + 10)
+    cache.set("forever", "y")
+
+    clock.now += 11
+
+    assert cache.get("short") is None
+    assert cache.get("forever") == "y"
+    assert len(cache) == 1
+
+
+def test_delete_and_clear():
+    cache = TTLLRUCache(max_size=10)
+    cache.set("a", 1)
+    cache.set("b", 2)
+
+    cache.delete("a")
+    cache.delete("missing")
+    assert "a" not in cache
+
+    cache.clear()
+    assert len(cache) == 0
+
+
+def test_invalid_max_size():
+    with pytest.raises(ValueError):
+        TTLLRUCache(max_size=0)
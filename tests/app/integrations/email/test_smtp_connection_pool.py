@@ -0,0 +1,100 @@
+import smtplib
+import threading
+from unittest.mock import MagicMock
+
+import pytest
+
+from app.integrations.email import SMTPConnectionPool
+
+
+def test_session_is_reused():
+    factory = MagicMock(side_effect=lambda: MagicMock())
+    pool = SMTPConnectionPool(factory, max_size=2)
+
+    with pool.session() as first:
+        pass
+    with pool.session() as second:
+        pass
+
+    assert first is second
+    factory.assert_called_once()
+
+
+def test_opens_up_to_max_size_sessions():
+    factory = MagicMock(side_effect=lambda: MagicMock())
+    pool = SMTPConnectionPool(factory, max_size=2)
+
+    with pool.session() as first, pool.session() as second:
+        assert first is not second
+
+    assert pool.opened == 2
+
+
+def test_waits_for_released_session_when_exhausted():
+    pool = SMTPConnectionPool(lambda: MagicMock(), max_size=1, acquire_timeout_seconds=0.01)
+
+    with pool.session():
+        with pytest.raises(TimeoutError):
+            with pool.session():
+                pass
+
+
+def test_session_released_by_other_thread_is_handed_over():
+    pool = SMTPConnectionPool(lambda: MagicMock(), max_size=1, acquire_timeout_seconds=5)
+    acquired = []
+
+    with pool.session() as first:
+        worker = threading.Thread(target=lambda: acquired.append(pool.session().__enter__()))
+        worker.start()
+    worker.join()
+
+    assert acquired == [first]
+
+
+def test_broken_session_is_discarded():
+    broken = MagicMock()
+    pool = SMTPConnectionPool(MagicMock(side_effect=[broken, MagicMock()]), max_size=1)
+
+    with pytest.raises(smtplib.SMTPServerDisconnected):
+        with pool.session():
+            raise smtplib.SMTPServerDisconnected("conexão encerrada")
+
+    broken.quit.assert_called_once()
+    assert pool.opened == 0
+    with pool.session() as session:
+        assert session is not broken
+
+
+def test_session_survives_recipient_refused():
+    pool = SMTPConnectionPool(lambda: MagicMock(), max_size=1)
+
+    with pytest.raises(smtplib.SMTPRecipientsRefused):
+        with pool.session() as first:
+            raise smtplib.SMTPRecipientsRefused({"x@y": (550, b"unknown")})
+
+    with pool.session() as second:
+        assert second is first
+
+
+def test_failed_factory_does_not_leak_slot():
+    pool = SMTPConnectionPool(MagicMock(side_effect=[OSError("recusado"), MagicMock()]), max_size=1)
+
+    with pytest.raises(OSError):
+        with pool.session():
+            pass
+
+    assert pool.opened == 0
+    with pool.session():
+        assert pool.opened == 1
+
+
+def test_close_quits_idle_sessions():
+    session = MagicMock()
+    pool = SMTPConnectionPool(lambda: session, max_size=1)
+    with pool.session():
+        pass
+
+    pool.close()
+
+    session.quit.assert_called_once()
+    assert pool.opened == 0
@@ -0,0 +1,222 @@
+import asyncio
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+from redis.exceptions import ResponseError
+
+from app.common.metrics import RuntimeMetricsCollector
+from app.integrations.kv_db import client_side_cache
+from app.integrations.kv_db.client_side_cache import ClientSideCache
+from app.integrations.kv_db.redis_asyncio_adapter import RedisAsyncioAdapter
+
+REDIS_URL = "redis://localhost:6379"
+PREFIX = "keycloak:public_keys:"
+KEY = f"{PREFIX}realm"
+
+
+class FakePubSub:
+    """PubSub do redis-py com as mensagens de invalidação entregues por uma fila."""
+
+    def __init__(self, client_id: int = 42):
+        self.execute_command = AsyncMock()
+        self.parse_response = AsyncMock(return_value=client_id)
+        self.subscribe = AsyncMock()
+        self.aclose = AsyncMock()
+        self.messages: asyncio.Queue = asyncio.Queue()
+
+    async def get_message(self, timeout=None):
+        try:
+            return await asyncio.wait_for(self.messages.get(), timeout)
+        except asyncio.TimeoutError:
+            return None
+
+    def invalidate(self, keys):
+        self.messages.put_nowait({"type": "message", "channel": b"__redis__:invalidate", "data": keys})
+
+
+@pytest.fixture
+def mock_redis():
+    mock_redis = AsyncMock()
+    mock_redis.pubsub = MagicMock(return_value=FakePubSub())
+    return mock_redis
+
+
+@pytest.fixture
+def tracking_client():
+    tracking_client = AsyncMock()
+    tracking_client.client_trackinginfo.return_value = {"flags": ["on", "bcast"], "redirect": 42}
+    return tracking_client
+
+
+@pytest.fixture
+def adapter(mock_redis, tracking_client):
+    with patch("app.integrations.kv_db.redis_asyncio_adapter.Redis.from_url", return_value=mock_redis):
+        adapter = RedisAsyncioAdapter(REDIS_URL, client_cache_prefixes=[PREFIX])
+    adapter.client_cache._connect_tracking_client = lambda: tracking_client
+    yield adapter
+
+
+async def _wait_until(condition):
+    for _ in range(100):
+        if condition():
+            return
+        await asyncio.sleep(0.01)
+    raise AssertionError("condição não atendida")
+
+
+@pytest.mark.asyncio
+async def test_reads_go_to_redis_until_the_cache_is_started(adapter, mock_redis):
+    mock_redis.get.return_value = b'{"keys": []}'
+
+    await adapter.get_json(KEY)
+    await adapter.get_json(KEY)
+
+    assert mock_redis.get.await_count == 2
+    assert len(adapter.client_cache.local_cache) == 0
+
+
+@pytest.mark.asyncio
+async def test_tracking_serves_hot_keys_from_memory_until_invalidated(adapter, mock_redis, tracking_client):
+    mock_redis.get.return_value = b'{"keys": []}'
+    adapter.start_client_cache()
+    await _wait_until(lambda: adapter.client_cache.active)
+
+    tracking_client.client_tracking_on.assert_awaited_once_with(clientid=42, prefix=[PREFIX], bcast=True)
+    assert await adapter.get_json(KEY) == {"keys": []}
+    assert await adapter.get_json(KEY) == {"keys": []}
+    assert await adapter.get_str("outra:chave") == '{"keys": []}'
+    assert mock_redis.get.await_count == 2
+
+    mock_redis.pubsub.return_value.invalidate([KEY.encode()])
+    await _wait_until(lambda: KEY not in adapter.client_cache.local_cache)
+    mock_redis.get.return_value = b'{"keys": [1]}'
+    assert await adapter.get_json(KEY) == {"keys": [1]}
+    assert adapter.client_cache.stats["hits"] == 1
+
+    await adapter.aclose()
+    assert not adapter.client_cache.active
+
+
+@pytest.mark.asyncio
+async def test_flush_notification_clears_the_whole_cache(adapter, mock_redis):
+    mock_redis.get.return_value = b"1"
+    adapter.start_client_cache()
+    await _wait_until(lambda: adapter.client_cache.active)
+    await adapter.get_str(KEY)
+
+    mock_redis.pubsub.return_value.invalidate(None)
+    await _wait_until(lambda: len(adapter.client_cache.local_cache) == 0)
+
+    await adapter.stop_client_cache()
+
+
+@pytest.mark.asyncio
+async def test_own_writes_invalidate_the_local_entry(adapter, mock_redis):
+    mock_redis.get.return_value = b"1"
+    adapter.client_cache.active = True
+    await adapter.get_str(KEY)
+
+    await adapter.set_str(KEY, "2")
+    assert KEY not in adapter.client_cache.local_cache
+
+    await adapter.get_str(KEY)
+    await adapter.delete(KEY)
+    assert KEY not in adapter.client_cache.local_cache
+
+
+@pytest.mark.asyncio
+async def test_read_in_flight_during_invalidation_is_not_cached(adapter, mock_redis):
+    started, release = asyncio.Event(), asyncio.Event()
+
+    async def blocked_get(key):
+        started.set()
+        await release.wait()
+        return b"antigo"
+
+    mock_redis.get.side_effect = blocked_get
+    adapter.client_cache.active = True
+    read = asyncio.create_task(adapter.get_str(KEY))
+    await started.wait()
+
+    adapter.client_cache.invalidate([KEY])
+    release.set()
+
+    assert await read == "antigo"
+    assert KEY not in adapter.client_cache.local_cache
+
+
+@pytest.mark.asyncio
+async def test_mget_reads_only_the_keys_missing_from_memory(adapter, mock_redis):
+    adapter.client_cache.active = True
+    adapter.client_cache.local_cache.set(KEY, b"1")
+    mock_redis.mget.return_value = [b"2", None]
+
+    assert await adapter.mget_json([KEY, f"{PREFIX}outro", "outra:chave"]) == [1, 2, None]
+
+    mock_redis.mget.assert_awaited_once_with([f"{PREFIX}outro", "outra:chave"])
+    assert adapter.client_cache.local_cache.get(f"{PREFIX}outro") == b"2"
+    assert "outra:chave" not in adapter.client_cache.local_cache
+
+
+@pytest.mark.asyncio
+async def test_server_without_tracking_falls_back_to_polling(adapter, mock_redis, tracking_client):
+    tracking_client.client_tracking_on.side_effect = ResponseError("unknown command 'CLIENT|TRACKING'")
+    adapter.client_cache.poll_interval_seconds = 0.01
+    mock_redis.get.return_value = b"1"
+    mock_redis.mget.return_value = [b"2"]
+
+    adapter.start_client_cache()
+    await _wait_until(lambda: adapter.client_cache.mode == "polling" and adapter.client_cache.active)
+    assert await adapter.get_str(KEY) == "1"
+    await _wait_until(lambda: adapter.client_cache.local_cache.get(KEY) == b"2")
+
+    mock_redis.mget.return_value = [None]
+    await _wait_until(lambda: KEY not in adapter.client_cache.local_cache)
+    await adapter.stop_client_cache()
+
+
+@pytest.mark.asyncio
+async def test_broken_redirect_clears_the_cache_and_reconnects(adapter, mock_redis, tracking_client):
+    tracking_client.client_trackinginfo.return_value = {"flags": ["on", "bcast", "broken_redirect"]}
+    mock_redis.get.return_value = b"1"
+
+    with (
+        patch.object(client_side_cache, "TRACKING_KEEPALIVE_SECONDS", 0.05),
+        patch.object(client_side_cache, "TRACKING_RECONNECT_DELAY_SECONDS", 0.01),
+    ):
+        adapter.start_client_cache()
+        await _wait_until(lambda: adapter.client_cache.active)
+        await adapter.get_str(KEY)
+        await _wait_until(lambda: tracking_client.client_tracking_on.await_count >= 2)
+
+    assert KEY not in adapter.client_cache.local_cache
+    await adapter.stop_client_cache()
+
+
+def test_requires_prefixes_and_a_known_mode():
+    with pytest.raises(ValueError):
+        ClientSideCache(AsyncMock(), AsyncMock, prefixes=[])
+    with pytest.raises(ValueError):
+        ClientSideCache(AsyncMock(), AsyncMock, prefixes=[PREFIX], mode="resp4")
+
+
+def test_adapter_without_prefixes_has_no_client_cache():
+    adapter = RedisAsyncioAdapter(REDIS_URL)
+
+    assert adapter.client_cache is None
+
+
+def test_runtime_collector_exports_client_cache_stats():
+    cache = ClientSideCache(AsyncMock(), AsyncMock, prefixes=[PREFIX])
+    cache.local_cache.set(KEY, b"1")
+    cache.get(KEY)
+    cache.get(f"{PREFIX}outro")
+    collector = RuntimeMetricsCollector()
+    collector.bind(redis_client_cache=cache)
+
+    samples = {sample.name: sample.value for family in collector.collect() for sample in family.samples}
+
+    assert samples["redis_client_cache_hits_total"] == 1
+    assert samples["redis_client_cache_misses_total"] == 1
+    assert samples["redis_client_cache_size"] == 1
+    assert samples["redis_client_cache_active"] == 0
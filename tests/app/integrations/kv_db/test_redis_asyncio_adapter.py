@@ -1,7 +1,9 @@
 import pytest
 import json
 from unittest.mock import AsyncMock, MagicMock, patch
+from redis.asyncio import BlockingConnectionPool
 from app.integrations.kv_db.redis_asyncio_adapter import RedisAsyncioAdapter
+from app.integrations.kv_db.serializers import ORJSON_AVAILABLE
 
 REDIS_URL = "redis://localhost:6379"
 
@@ -164,3 +166,116 @@ class TestRedisAsyncioAdapter:
         await redis_adapter.delete("test_key")
         
         mock_redis.delete.assert_called_once_with("test_key")
+
+    @pytest.mark.asyncio
+    async def test_ttl(self, redis_adapter, mock_redis):
+        """Test ttl method."""
+        mock_redis.ttl.return_value = 42
+
+        result = await redis_adapter.ttl("test_key")
+
+        assert result == 42
+        mock_redis.ttl.assert_called_once_with("test_key")
+
+    @pytest.mark.asyncio
+    async def test_eval_script_registers_script_once(self, redis_adapter, mock_redis):
+        """Test eval_script registers the script on first use and reuses it."""
+        registered = AsyncMock(return_value=b"0")
+        mock_redis.register_script = MagicMock(return_value=registered)
+
+        await redis_adapter.eval_script("return 0", keys=["k"], args=[1])
+        result = await redis_adapter.eval_script("return 0", keys=["k"], args=[2])
+
+        assert result == b"0"
+        mock_redis.register_script.assert_called_once_with("return 0")
+        registered.assert_awaited_with(keys=["k"], args=[2])
+
+    @pytest.mark.asyncio
+    async def test_mget_json_reads_all_keys_in_one_command(self, redis_adapter, mock_redis):
+        """Test mget_json decodes each value and keeps None for missing keys."""
+        mock_redis.mget.return_value = [b'{"a": 1}', None, b"[1, 2]"]
+
+        result = await redis_adapter.mget_json(["k1", "k2", "k3"])
+
+        assert result == [{"a": 1}, None, [1, 2]]
+        mock_redis.mget.assert_awaited_once_with(["k1", "k2", "k3"])
+
+    @pytest.mark.asyncio
+    async def test_mget_json_without_keys(self, redis_adapter, mock_redis):
+        """Test mget_json does not call Redis for an empty key list."""
+        assert await redis_adapter.mget_json([]) == []
+        mock_redis.mget.assert_not_called()
+
+    @pytest.mark.asyncio
+    async def test_mset_json_sets_all_keys_with_ttl_in_one_pipeline(self, redis_adapter, mock_redis):
+        """Test mset_json queues one SET per key (with TTL) and executes the pipeline once."""
+        pipe = _mock_pipeline(mock_redis, [True, 1])
+
+        await redis_adapter.mset_json({"k1": {"a": 1}, "k2": None}, expires_in_seconds=30)
+
+        mock_redis.pipeline.assert_called_once_with(transaction=False)
+        pipe.set.assert_called_once_with("k1", json.dumps({"a": 1}), 30)
+        pipe.delete.assert_called_once_with("k2")
+        pipe.execute.assert_awaited_once()
+
+    @pytest.mark.asyncio
+    async def test_pipeline_decodes_results_in_command_order(self, redis_adapter, mock_redis):
+        """Test the pipeline context manager executes on exit and decodes the responses."""
+        _mock_pipeline(mock_redis, [b'{"a": 1}', b"valor", True])
+
+        async with redis_adapter.pipeline() as pipeline:
+            pipeline.get_json("k1")
+            pipeline.get_str("k2")
+            pipeline.set_str("k3", "v", 10)
+
+        assert pipeline.results == [{"a": 1}, "valor", True]
+
+    @pytest.mark.asyncio
+    async def test_pipeline_is_not_executed_when_the_block_fails(self, redis_adapter, mock_redis):
+        """Test queued commands are discarded if the block raises."""
+        pipe = _mock_pipeline(mock_redis, [])
+
+        with pytest.raises(ValueError):
+            async with redis_adapter.pipeline() as pipeline:
+                pipeline.get_str("k1")
+                raise ValueError("erro")
+
+        pipe.execute.assert_not_called()
+
+    @pytest.mark.asyncio
+    @pytest.mark.skipif(not ORJSON_AVAILABLE, reason="orjson não instalado")
+    async def test_set_json_with_binary_serializer(self, mock_redis):
+        """Test set_json/get_json with a serializer that produces bytes."""
+        with patch('app.integrations.kv_db.redis_asyncio_adapter.Redis.from_url', return_value=mock_redis):
+            adapter = RedisAsyncioAdapter(REDIS_URL, serializer="orjson")
+
+        await adapter.set_json("test_key", {"a": 1}, 60)
+        mock_redis.set.assert_called_once_with("test_key", b'{"a":1}', 60)
+
+        mock_redis.get.return_value = b'{"a":1}'
+        assert await adapter.get_json("test_key") == {"a": 1}
+
+    def test_bounded_pool_and_timeouts(self):
+        """Test max_connections uses a blocking pool with the configured timeouts."""
+        adapter = RedisAsyncioAdapter(
+            REDIS_URL,
+            max_connections=7,
+            pool_timeout_seconds=1.5,
+            socket_timeout_seconds=2.0,
+            socket_connect_timeout_seconds=3.0,
+        )
+
+        pool = adapter.redis_client.connection_pool
+        assert isinstance(pool, BlockingConnectionPool)
+        assert pool.max_connections == 7
+        assert pool.timeout == 1.5
+        assert pool.connection_kwargs["socket_timeout"] == 2.0
+        assert pool.connection_kwargs["socket_connect_timeout"] == 3.0
+
+
+def _mock_pipeline(mock_redis, responses):
+    pipe = MagicMock()
+    pipe.execute = AsyncMock(return_value=responses)
+    mock_redis.pipeline = MagicMock()
+    mock_redis.pipeline.return_value.__aenter__.return_value = pipe
+    return pipe
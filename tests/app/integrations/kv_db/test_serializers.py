@@ -0,0 +1,43 @@
+import pytest
+
+from app.integrations.kv_db import serializers
+from app.integrations.kv_db.serializers import JsonSerializer, get_serializer
+
+VALUE = {"keys": [{"kid": "abc", "n": "xyz"}], "count": 2, "active": True, "extra": None}
+
+
+def test_json_is_compatible_with_stdlib_json():
+    serializer = get_serializer("json")
+
+    assert isinstance(serializer, JsonSerializer)
+    assert (
+        serializer.dumps(VALUE) == '{"keys": [{"kid": "abc", "n": "xyz"}], "count": 2, "active": true, "extra": null}'
+    )
+    assert serializer.loads(serializer.dumps(VALUE).encode()) == VALUE
+
+
+@pytest.mark.skipif(not serializers.ORJSON_AVAILABLE, reason="orjson não instalado")
+def test_orjson_reads_values_written_by_json():
+    serializer = get_serializer("orjson")
+
+    assert serializer.loads(JsonSerializer().dumps(VALUE)) == VALUE
+    assert JsonSerializer().loads(serializer.dumps(VALUE)) == VALUE
+
+
+@pytest.mark.skipif(not serializers.MSGPACK_AVAILABLE, reason="msgpack não instalado")
+def test_msgpack_round_trip():
+    serializer = get_serializer("msgpack")
+
+    assert serializer.loads(serializer.dumps(VALUE)) == VALUE
+
+
+def test_optional_serializer_without_package(monkeypatch):
+    monkeypatch.setattr(serializers, "MSGPACK_AVAILABLE", False)
+
+    with pytest.raises(RuntimeError):
+        get_serializer("msgpack")
+
+
+def test_unknown_serializer():
+    with pytest.raises(ValueError):
+        get_serializer("pickle")
@@ -0,0 +1,105 @@
+import pytest
+
+from app.integrations.resilience import CircuitBreaker, CircuitState
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+@pytest.fixture
+def clock():
+    return FakeClock()
+
+
+@pytest.fixture
+def breaker(clock):
+    return CircuitBreaker("teste", failure_threshold=3, recovery_timeout_seconds=10, clock=clock)
+
+
+def test_opens_after_consecutive_failures(breaker):
+    for _ in range(2):
+        breaker.record_failure()
+    assert breaker.state == CircuitState.CLOSED
+    assert breaker.allow_request()
+
+    breaker.record_failure()
+
+    assert breaker.state == CircuitState.OPEN
+    assert breaker.allow_request() is False
+    assert breaker.rejected == 1
+
+
+def test_success_resets_failure_count(breaker):
+    breaker.record_failure()
+    breaker.record_failure()
+    breaker.record_success()
+    breaker.record_failure()
+
+    assert breaker.state == CircuitState.CLOSED
+
+
+def test_half_open_allows_a_single_probe(breaker, clock):
+    for _ in range(3):
+        breaker.record_failure()
+    clock.now = 10
+
+    assert breaker.state == CircuitState.HALF_OPEN
+    assert breaker.allow_request() is True
+    assert breaker.allow_request() is False
+
+
+def test_released_probe_can_be_taken_again(breaker, clock):
+    for _ in range(3):
+        breaker.record_failure()
+    clock.now = 10
+    breaker.allow_request()
+
+    breaker.release_probe()
+
+    assert breaker.state == CircuitState.HALF_OPEN
+    assert breaker.allow_request() is True
+
+
+def test_successful_probe_closes_the_circuit(breaker, clock):
+    for _ in range(3):
+        breaker.record_failure()
+    clock.now = 10
+    breaker.allow_request()
+
+    breaker.record_success()
+
+    assert breaker.state == CircuitState.CLOSED
+    assert breaker.allow_request()
+
+
+def test_failed_probe_reopens_the_circuit(breaker, clock):
+    for _ in range(3):
+        breaker.record_failure()
+    clock.now = 10
+    breaker.allow_request()
+
+    breaker.record_failure()
+
+    assert breaker.state == CircuitState.OPEN
+    clock.now = 19
+    assert breaker.allow_request() is False
+    clock.now = 20
+    assert breaker.allow_request() is True
+
+
+def test_trip_opens_for_the_given_duration(breaker, clock):
+    breaker.trip(2)
+
+    assert breaker.allow_request() is False
+    clock.now = 2
+    assert breaker.allow_request() is True
+
+
+def test_invalid_threshold():
+    with pytest.raises(ValueError):
+        CircuitBreaker("teste", failure_threshold=0)
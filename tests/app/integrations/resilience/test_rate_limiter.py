@@ -0,0 +1,93 @@
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+from redis.exceptions import ConnectionError as RedisConnectionError
+
+from app.integrations.resilience import TokenBucketRateLimiter
+from app.integrations.resilience.rate_limiter import TOKEN_BUCKET_SCRIPT
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+@pytest.mark.asyncio
+async def test_allows_burst_up_to_capacity():
+    clock = FakeClock()
+    limiter = TokenBucketRateLimiter("teste", rate_per_second=1, capacity=3, clock=clock)
+
+    results = [await limiter.acquire() for _ in range(4)]
+
+    assert results == [True, True, True, False]
+
+
+@pytest.mark.asyncio
+async def test_refills_tokens_over_time():
+    clock = FakeClock()
+    limiter = TokenBucketRateLimiter("teste", rate_per_second=2, capacity=1, clock=clock)
+    assert await limiter.acquire()
+    assert await limiter.acquire() is False
+
+    clock.now = 0.5
+
+    assert await limiter.acquire()
+
+
+@pytest.mark.asyncio
+async def test_waits_for_a_token_within_max_wait():
+    clock = FakeClock()
+    limiter = TokenBucketRateLimiter("teste", rate_per_second=4, capacity=1, clock=clock)
+    await limiter.acquire()
+
+    async def fake_sleep(seconds):
+        clock.now += seconds
+
+    with patch("app.integrations.resilience.rate_limiter.asyncio.sleep", side_effect=fake_sleep) as mock_sleep:
+        assert await limiter.acquire(max_wait_seconds=1)
+
+    mock_sleep.assert_awaited_once_with(0.25)
+
+
+@pytest.mark.asyncio
+async def test_uses_redis_bucket_when_adapter_is_given():
+    inmemory_adapter = MagicMock()
+    inmemory_adapter.eval_script = AsyncMock(return_value=b"0")
+    limiter = TokenBucketRateLimiter("webhook", rate_per_second=1, capacity=3, inmemory_adapter=inmemory_adapter)
+
+    assert await limiter.acquire()
+
+    inmemory_adapter.eval_script.assert_awaited_once_with(
+        TOKEN_BUCKET_SCRIPT, keys=["rate_limit:webhook"], args=[1, 3, 1]
+    )
+
+
+@pytest.mark.asyncio
+async def test_redis_wait_is_respected():
+    inmemory_adapter = MagicMock()
+    inmemory_adapter.eval_script = AsyncMock(return_value=b"0.5")
+    limiter = TokenBucketRateLimiter("webhook", rate_per_second=1, inmemory_adapter=inmemory_adapter)
+
+    assert await limiter.acquire(max_wait_seconds=0.1) is False
+
+
+@pytest.mark.asyncio
+async def test_falls_back_to_local_bucket_when_redis_fails():
+    inmemory_adapter = MagicMock()
+    inmemory_adapter.eval_script = AsyncMock(side_effect=RedisConnectionError("fora"))
+    limiter = TokenBucketRateLimiter(
+        "webhook", rate_per_second=1, capacity=1, inmemory_adapter=inmemory_adapter, clock=FakeClock()
+    )
+
+    assert await limiter.acquire()
+    assert await limiter.acquire() is False
+
+
+def test_invalid_parameters():
+    with pytest.raises(ValueError):
+        TokenBucketRateLimiter("teste", rate_per_second=0)
+    with pytest.raises(ValueError):
+        TokenBucketRateLimiter("teste", rate_per_second=1, capacity=0)
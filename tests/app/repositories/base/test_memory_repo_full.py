@@ -2,6 +2,7 @@
 Testes para melhorar cobertura do memory_repository.py
 """
 
+from datetime import datetime
 from unittest.mock import AsyncMock, MagicMock, patch
 
 import pytest
@@ -250,3 +251,118 @@ async def test_find_with_empty_result(mock_mongo_client):
     result = await repo.find({})
 
     assert len(result) == 0
+
+
+@pytest.mark.asyncio
+async def test_find_after_without_cursor_uses_only_filters(mock_mongo_client):
+    mock_client, mock_collection = mock_mongo_client
+    mock_cursor = MagicMock()
+    mock_cursor.sort.return_value = mock_cursor
+    mock_cursor.limit.return_value = mock_cursor
+
+    async def mock_async_iter(self):
+        yield create_minimal_seller_dict(seller_id="1", trade_name="Test")
+
+    mock_cursor.__aiter__ = mock_async_iter
+    mock_collection.find.return_value = mock_cursor
+    sort = [("created_at", -1), ("seller_id", -1)]
+
+    repo = AsyncMemoryRepository(mock_client, "test_db", "sellers", Seller)
+    result = await repo.find_after({"status": "Ativo"}, sort=sort, limit=5)
+
+    assert len(result) == 1
+    mock_collection.find.assert_called_once_with({"status": "Ativo"})
+    mock_cursor.sort.assert_called_once_with(sort)
+    mock_cursor.limit.assert_called_once_with(5)
+    mock_cursor.skip.assert_not_called()
+
+
+@pytest.mark.asyncio
+async def test_find_after_cursor_filters_by_keyset(mock_mongo_client):
+    mock_client, mock_collection = mock_mongo_client
+    mock_cursor = MagicMock()
+    mock_cursor.sort.return_value = mock_cursor
+    mock_cursor.limit.return_value = mock_cursor
+
+    async def mock_async_iter(self):
+        return
+        yield
+
+    mock_cursor.__aiter__ = mock_async_iter
+    mock_collection.find.return_value = mock_cursor
+    last_created_at = datetime(2025, 7, 1, 12, 0, 0)
+
+    repo = AsyncMemoryRepository(mock_client, "test_db", "sellers", Seller)
+    await repo.find_after(
+        {"status": "Ativo"}, sort=[("created_at", -1), ("seller_id", -1)], after=[last_created_at, "seller05"]
+    )
+
+    mock_collection.find.assert_called_once_with(
+        {
+            "$and": [
+                {"status": "Ativo"},
+                {
+                    "$or": [
+                        {"created_at": {"$lt": last_created_at}},
+                        {"created_at": last_created_at, "seller_id": {"$lt": "seller05"}},
+                    ]
+                },
+            ]
+        }
+    )
+
+
+@pytest.mark.asyncio
+async def test_find_with_fields_pushes_projection_and_returns_slim_models(mock_mongo_client):
+    mock_client, mock_collection = mock_mongo_client
+    mock_cursor = MagicMock()
+    mock_cursor.skip.return_value = mock_cursor
+    mock_cursor.limit.return_value = mock_cursor
+
+    async def mock_async_iter(self):
+        yield {"seller_id": "1", "trade_name": "Test"}
+
+    mock_cursor.__aiter__ = mock_async_iter
+    mock_collection.find.return_value = mock_cursor
+
+    repo = AsyncMemoryRepository(mock_client, "test_db", "sellers", Seller)
+    result = await repo.find({"status": "Ativo"}, fields=["seller_id", "trade_name"])
+
+    mock_collection.find.assert_called_once_with({"status": "Ativo"}, {"seller_id": 1, "trade_name": 1, "_id": 0})
+    assert result[0].model_dump() == {"seller_id": "1", "trade_name": "Test"}
+    assert not isinstance(result[0], Seller)
+
+
+@pytest.mark.asyncio
+async def test_find_after_with_fields_reads_but_hides_sort_fields(mock_mongo_client):
+    mock_client, mock_collection = mock_mongo_client
+    mock_cursor = MagicMock()
+    mock_cursor.sort.return_value = mock_cursor
+    mock_cursor.limit.return_value = mock_cursor
+    created_at = datetime(2025, 7, 1, 12, 0, 0)
+
+    async def mock_async_iter(self):
+        yield {"seller_id": "1", "trade_name": "Test", "created_at": created_at}
+
+    mock_cursor.__aiter__ = mock_async_iter
+    mock_collection.find.return_value = mock_cursor
+
+    repo = AsyncMemoryRepository(mock_client, "test_db", "sellers", Seller)
+    [result] = await repo.find_after(
+        {"status": "Ativo"}, sort=[("created_at", -1), ("seller_id", -1)], fields=["trade_name"]
+    )
+
+    mock_collection.find.assert_called_once_with(
+        {"status": "Ativo"}, {"trade_name": 1, "created_at": 1, "seller_id": 1, "_id": 0}
+    )
+    assert result.created_at == created_at
+    assert result.model_dump() == {"trade_name": "Test"}
+
+
+def test_projection_model_is_cached_and_rejects_unknown_fields(mock_mongo_client):
+    mock_client, _ = mock_mongo_client
+    repo = AsyncMemoryRepository(mock_client, "test_db", "sellers", Seller)
+
+    assert repo.projection_model(["seller_id"]) is repo.projection_model(["seller_id"])
+    with pytest.raises(ValueError):
+        repo.projection_model(["seller_id", "inexistente"])
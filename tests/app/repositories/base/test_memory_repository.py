@@ -1,84 +1,218 @@
-from unittest import mock
-from uuid import UUID
-
-import pytest
-
-from app.models.seller_model import Seller
-from app.repositories.base.memory_repository import AsyncMemoryRepository
-from tests.helpers.test_fixtures import create_full_seller, create_minimal_seller_dict
-
-
-@pytest.mark.asyncio
-class TestAsyncMemoryRepository:
-    async def test_create(self, mock_mongo_client):
-        client, collection = mock_mongo_client
-        model = create_full_seller(seller_id="seller01", trade_name="Loja Exemplo")
-        collection.insert_one.return_value = mock.MagicMock()
-
-        repo = AsyncMemoryRepository(client, "test_db", "test_collection", Seller)
-        result = await repo.create(model)
-
-        collection.insert_one.assert_called_once()
-        assert result.seller_id == model.seller_id
-
-    async def test_find_by_id(self, mock_mongo_client):
-        client, collection = mock_mongo_client
-        collection.find_one.return_value = create_minimal_seller_dict(
-            seller_id="seller01", trade_name="Loja Exemplo2"
-        )
-
-        repo = AsyncMemoryRepository(client, "test_db", "test_collection", Seller)
-        result = await repo.find_by_id("seller01")
-
-        assert result.seller_id == "seller01"
-
-    async def test_find(self, mock_mongo_client):
-        client, collection = mock_mongo_client
-        doc = create_minimal_seller_dict(seller_id="seller01", trade_name="Loja Exemplo3")
-
-        async def cursor_simulator():
-            yield doc
-
-        collection.find.return_value = mock.MagicMock()
-        collection.find.return_value.skip.return_value = collection.find.return_value
-        collection.find.return_value.limit.return_value = cursor_simulator()
-
-        repo = AsyncMemoryRepository(client, "test_db", "test_collection", Seller)
-        result = await repo.find({"seller_id": "seller01"})
-
-        assert len(result) == 1
-        assert result[0].seller_id == "seller01"
-
-    async def test_update(self, mock_mongo_client):
-        STORE_UPDATE = "Loja Atualizada"
-        client, collection = mock_mongo_client
-        collection.find_one_and_update.return_value = create_minimal_seller_dict(
-            seller_id="seller01", trade_name=STORE_UPDATE
-        )
-
-        model = create_full_seller(seller_id="seller01", trade_name=STORE_UPDATE)
-        repo = AsyncMemoryRepository(client, "test_db", "test_collection", Seller)
-        result = await repo.update("seller01", model)
-
-        assert result.trade_name == STORE_UPDATE
-
-    async def test_delete_by_id(self, mock_mongo_client):
-        client, collection = mock_mongo_client
-        collection.delete_one.return_value = mock.MagicMock(deleted_count=1)
-
-        repo = AsyncMemoryRepository(client, "test_db", "test_collection", Seller)
-        result = await repo.delete_by_id("seller01")
-
-        assert result is True
-
-    async def test_patch(self, mock_mongo_client):
-        STORE_PATCH = "Loja Patch"
-        client, collection = mock_mongo_client
-        collection.find_one_and_update.return_value = create_minimal_seller_dict(
-            seller_id="seller01", trade_name=STORE_PATCH
-        )
-
-        repo = AsyncMemoryRepository(client, "test_db", "test_collection", Seller)
-        result = await repo.patch("seller01", {"trade_name": STORE_PATCH})
-
-        assert result.trade_name == STORE_PATCH
+from datetime import datetime, timezone
+from unittest import mock
+from uuid import UUID
+
+import pytest
+from pymongo.errors import DuplicateKeyError
+
+from app.models.outbox_event_model import OutboxDestination, OutboxEvent
+from app.models.seller_model import Seller
+from app.repositories.base import DuplicateKeyException
+from app.repositories.base.memory_repository import (
+    OUTBOX_ATTEMPTS_FIELD,
+    OUTBOX_FIELD,
+    OUTBOX_NEXT_ATTEMPT_FIELD,
+    AsyncMemoryRepository,
+)
+from tests.helpers.test_fixtures import create_full_seller, create_minimal_seller_dict
+
+
+@pytest.mark.asyncio
+class TestAsyncMemoryRepository:
+    async def test_create(self, mock_mongo_client):
+        client, collection = mock_mongo_client
+        model = create_full_seller(seller_id="seller01", trade_name="Loja Exemplo")
+        collection.insert_one.return_value = mock.MagicMock()
+
+        repo = AsyncMemoryRepository(client, "test_db", "test_collection", Seller)
+        result = await repo.create(model)
+
+        collection.insert_one.assert_called_once()
+        assert result.seller_id == model.seller_id
+
+    async def test_find_by_id(self, mock_mongo_client):
+        client, collection = mock_mongo_client
+        collection.find_one.return_value = create_minimal_seller_dict(
+            seller_id="seller01", trade_name="Loja Exemplo2"
+        )
+
+        repo = AsyncMemoryRepository(client, "test_db", "test_collection", Seller)
+        result = await repo.find_by_id("seller01")
+
+        assert result.seller_id == "seller01"
+
+    async def test_find(self, mock_mongo_client):
+        client, collection = mock_mongo_client
+        doc = create_minimal_seller_dict(seller_id="seller01", trade_name="Loja Exemplo3")
+
+        async def cursor_simulator():
+            yield doc
+
+        collection.find.return_value = mock.MagicMock()
+        collection.find.return_value.skip.return_value = collection.find.return_value
+        collection.find.return_value.limit.return_value = cursor_simulator()
+
+        repo = AsyncMemoryRepository(client, "test_db", "test_collection", Seller)
+        result = await repo.find({"seller_id": "seller01"})
+
+        assert len(result) == 1
+        assert result[0].seller_id == "seller01"
+
+    async def test_update(self, mock_mongo_client):
+        STORE_UPDATE = "Loja Atualizada"
+        client, collection = mock_mongo_client
+        collection.find_one_and_update.return_value = create_minimal_seller_dict(
+            seller_id="seller01", trade_name=STORE_UPDATE
+        )
+
+        model = create_full_seller(seller_id="seller01", trade_name=STORE_UPDATE)
+        repo = AsyncMemoryRepository(client, "test_db", "test_collection", Seller)
+        result = await repo.update("seller01", model)
+
+        assert result.trade_name == STORE_UPDATE
+
+    async def test_delete_by_id(self, mock_mongo_client):
+        client, collection = mock_mongo_client
+        collection.delete_one.return_value = mock.MagicMock(deleted_count=1)
+
+        repo = AsyncMemoryRepository(client, "test_db", "test_collection", Seller)
+        result = await repo.delete_by_id("seller01")
+
+        assert result is True
+
+    async def test_patch(self, mock_mongo_client):
+        STORE_PATCH = "Loja Patch"
+        client, collection = mock_mongo_client
+        collection.find_one_and_update.return_value = create_minimal_seller_dict(
+            seller_id="seller01", trade_name=STORE_PATCH
+        )
+
+        repo = AsyncMemoryRepository(client, "test_db", "test_collection", Seller)
+        result = await repo.patch("seller01", {"trade_name": STORE_PATCH})
+
+        assert result.trade_name == STORE_PATCH
+
+    async def test_create_with_outbox_events(self, mock_mongo_client):
+        client, collection = mock_mongo_client
+        model = create_full_seller(seller_id="seller01", trade_name="Loja Outbox")
+        event = OutboxEvent(destination=OutboxDestination.WEBHOOK, payload={"message": "criado", "changes": {}})
+
+        repo = AsyncMemoryRepository(client, "test_db", "test_collection", Seller)
+        result = await repo.create(model, outbox_events=[event])
+
+        inserted = collection.insert_one.call_args.args[0]
+        assert inserted[OUTBOX_FIELD] == [
+            {
+                "event_id": event.event_id,
+                "destination": "webhook",
+                "payload": {"message": "criado", "changes": {}},
+                "created_at": event.created_at,
+                "trace_context": None,
+            }
+        ]
+        assert OUTBOX_NEXT_ATTEMPT_FIELD not in inserted
+        assert result.seller_id == "seller01"
+
+    async def test_create_with_held_outbox_events(self, mock_mongo_client):
+        client, collection = mock_mongo_client
+        model = create_full_seller(seller_id="seller01", trade_name="Loja Outbox")
+        event = OutboxEvent(destination=OutboxDestination.WEBHOOK, payload={"message": "criado", "changes": {}})
+        hold_until = datetime(2030, 1, 1, tzinfo=timezone.utc)
+
+        repo = AsyncMemoryRepository(client, "test_db", "test_collection", Seller)
+        await repo.create(model, outbox_events=[event], hold_outbox_until=hold_until)
+
+        inserted = collection.insert_one.call_args.args[0]
+        assert inserted[OUTBOX_FIELD][0]["event_id"] == event.event_id
+        assert inserted[OUTBOX_NEXT_ATTEMPT_FIELD] == hold_until
+
+    async def test_patch_with_outbox_events_is_single_operation(self, mock_mongo_client):
+        client, collection = mock_mongo_client
+        collection.find_one_and_update.return_value = create_minimal_seller_dict(seller_id="seller01")
+        event = OutboxEvent(destination=OutboxDestination.WEBHOOK, payload={"message": "atualizado", "changes": {}})
+
+        repo = AsyncMemoryRepository(client, "test_db", "test_collection", Seller)
+        await repo.patch("seller01", {"trade_name": "Loja Patch"}, outbox_events=[event])
+
+        collection.find_one_and_update.assert_awaited_once()
+        update = collection.find_one_and_update.call_args.args[1]
+        assert update["$set"] == {"trade_name": "Loja Patch"}
+        assert update["$push"][OUTBOX_FIELD]["$each"][0]["event_id"] == event.event_id
+
+    async def test_create_duplicate_key_reports_the_conflicting_field(self, mock_mongo_client):
+        client, collection = mock_mongo_client
+        collection.insert_one.side_effect = DuplicateKeyError(
+            "E11000 duplicate key error collection: test_db.test_collection index: trade_name_1 dup key",
+            11000,
+            {"keyPattern": {"trade_name": 1}, "keyValue": {"trade_name": "Loja Exemplo"}},
+        )
+
+        repo = AsyncMemoryRepository(client, "test_db", "test_collection", Seller)
+        with pytest.raises(DuplicateKeyException) as exc_info:
+            await repo.create(create_full_seller(seller_id="seller01", trade_name="Loja Exemplo"))
+
+        assert exc_info.value.field == "trade_name"
+
+    async def test_patch_duplicate_key_without_key_pattern_uses_index_name(self, mock_mongo_client):
+        client, collection = mock_mongo_client
+        collection.find_one_and_update.side_effect = DuplicateKeyError(
+            "E11000 duplicate key error collection: test_db.test_collection index: seller_id_1 dup key", 11000
+        )
+
+        repo = AsyncMemoryRepository(client, "test_db", "test_collection", Seller)
+        with pytest.raises(DuplicateKeyException) as exc_info:
+            await repo.patch("seller01", {"seller_id": "seller02"})
+
+        assert exc_info.value.field == "seller_id"
+
+    async def test_release_outbox(self, mock_mongo_client):
+        client, collection = mock_mongo_client
+        collection.update_one = mock.AsyncMock()
+
+        repo = AsyncMemoryRepository(client, "test_db", "test_collection", Seller)
+        await repo.release_outbox("seller01")
+
+        collection.update_one.assert_awaited_once_with(
+            {"seller_id": "seller01"}, {"$unset": {OUTBOX_ATTEMPTS_FIELD: "", OUTBOX_NEXT_ATTEMPT_FIELD: ""}}
+        )
+
+    async def test_ack_outbox_events(self, mock_mongo_client):
+        client, collection = mock_mongo_client
+        collection.update_one = mock.AsyncMock()
+
+        repo = AsyncMemoryRepository(client, "test_db", "test_collection", Seller)
+        await repo.ack_outbox_events("seller01", ["evt1", "evt2"])
+
+        collection.update_one.assert_awaited_once_with(
+            {"seller_id": "seller01"},
+            {
+                "$pull": {OUTBOX_FIELD: {"event_id": {"$in": ["evt1", "evt2"]}}},
+                "$unset": {OUTBOX_ATTEMPTS_FIELD: "", OUTBOX_NEXT_ATTEMPT_FIELD: ""},
+            },
+        )
+
+    async def test_find_pending_outbox_skips_documents_waiting_for_retry(self, mock_mongo_client):
+        client, collection = mock_mongo_client
+        now = datetime(2026, 10, 18, tzinfo=timezone.utc)
+
+        repo = AsyncMemoryRepository(client, "test_db", "test_collection", Seller)
+        with mock.patch("app.repositories.base.memory_repository.utcnow", return_value=now):
+            assert await repo.find_pending_outbox(limit=10) == []
+
+        filter_ = collection.find.call_args.args[0]
+        assert filter_[f"{OUTBOX_FIELD}.event_id"] == {"$exists": True}
+        assert {OUTBOX_NEXT_ATTEMPT_FIELD: {"$lte": now}} in filter_["$or"]
+        assert collection.find.call_args.kwargs["projection"][OUTBOX_ATTEMPTS_FIELD] == 1
+
+    async def test_schedule_outbox_retry(self, mock_mongo_client):
+        client, collection = mock_mongo_client
+        collection.update_one = mock.AsyncMock()
+        next_attempt_at = datetime(2026, 10, 18, tzinfo=timezone.utc)
+
+        repo = AsyncMemoryRepository(client, "test_db", "test_collection", Seller)
+        await repo.schedule_outbox_retry("seller01", 3, next_attempt_at)
+
+        collection.update_one.assert_awaited_once_with(
+            {"seller_id": "seller01"},
+            {"$set": {OUTBOX_ATTEMPTS_FIELD: 3, OUTBOX_NEXT_ATTEMPT_FIELD: next_attempt_at}},
+        )
@@ -0,0 +1,268 @@
+import asyncio
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+from redis.exceptions import ConnectionError as RedisConnectionError
+
+from app.common.metrics import RuntimeMetricsCollector
+from app.repositories import CachedSellerRepository, SellerRepository
+from app.repositories.cached_seller_repository import INVALIDATE_SCRIPT, STORE_SCRIPT
+from tests.helpers.test_fixtures import create_full_seller
+
+CNPJ = "12345678000190"
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1_000.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+class FakeRedisAdapter:
+    """Subconjunto do RedisAsyncioAdapter usado pelo cache, sobre um dicionário."""
+
+    def __init__(self):
+        self.data: dict[str, str] = {}
+        self.expirations: dict[str, int] = {}
+
+    async def get_str(self, key):
+        return self.data.get(key)
+
+    async def set_str(self, key, value, expires_in_seconds=None):
+        self.data[key] = value
+        self.expirations[key] = expires_in_seconds
+
+    async def delete(self, key):
+        self.data.pop(key, None)
+
+    async def eval_script(self, script, keys, args):
+        """Emula os scripts Lua do cache sobre o dicionário."""
+        if script == INVALIDATE_SCRIPT:
+            self.data.pop(keys[0], None)
+            await self.set_str(keys[1], "1", expires_in_seconds=args[0])
+            return 1
+        assert script == STORE_SCRIPT
+        if keys[1] in self.data:
+            return 0
+        await self.set_str(keys[0], args[0], expires_in_seconds=args[1])
+        if len(keys) > 2:
+            await self.set_str(keys[2], args[2], expires_in_seconds=args[1])
+        return 1
+
+
+@pytest.fixture
+def seller():
+    return create_full_seller(seller_id="seller01", cnpj=CNPJ)
+
+
+@pytest.fixture
+def repository(seller):
+    repository = AsyncMock(spec=SellerRepository)
+    repository.find_by_id.return_value = seller
+    repository.find_by_cnpj.return_value = seller
+    return repository
+
+
+@pytest.fixture
+def redis_adapter():
+    return FakeRedisAdapter()
+
+
+@pytest.fixture
+def clock():
+    return FakeClock()
+
+
+@pytest.fixture
+def cache(repository, redis_adapter, clock):
+    return CachedSellerRepository(repository, redis_adapter, ttl_seconds=60, local_ttl_seconds=5, clock=clock)
+
+
+@pytest.mark.asyncio
+async def test_find_by_id_reads_mongo_once_and_fills_both_layers(cache, repository, redis_adapter, seller):
+    assert await cache.find_by_id("seller01") == seller
+    assert await cache.find_by_id("seller01") is not None
+
+    repository.find_by_id.assert_awaited_once_with("seller01")
+    assert "seller_cache:id:seller01" in redis_adapter.data
+    assert 60 <= redis_adapter.expirations["seller_cache:id:seller01"] <= 66
+    assert cache.stats["local_hits"] == 1
+    assert cache.stats["misses"] == 1
+    assert cache.stats["hit_ratio"] == 0.5
+
+
+@pytest.mark.asyncio
+async def test_find_by_id_reads_redis_after_local_entry_expires(cache, repository, clock, seller):
+    await cache.find_by_id("seller01")
+    clock.now += 6
+
+    result = await cache.find_by_id("seller01")
+
+    assert result == seller
+    repository.find_by_id.assert_awaited_once()
+    assert cache.stats["redis_hits"] == 1
+
+
+@pytest.mark.asyncio
+async def test_missing_sellers_are_not_cached(cache, repository, redis_adapter):
+    repository.find_by_id.return_value = None
+
+    assert await cache.find_by_id("inexistente") is None
+    assert await cache.find_by_id("inexistente") is None
+
+    assert repository.find_by_id.await_count == 2
+    assert redis_adapter.data == {}
+
+
+@pytest.mark.asyncio
+async def test_concurrent_misses_share_a_single_mongo_read(cache, repository, seller):
+    async def slow_find_by_id(seller_id):
+        await asyncio.sleep(0.01)
+        return seller
+
+    repository.find_by_id.side_effect = slow_find_by_id
+
+    results = await asyncio.gather(*(cache.find_by_id("seller01") for _ in range(20)))
+
+    assert all(result == seller for result in results)
+    repository.find_by_id.assert_awaited_once()
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("operation", ["patch", "update", "delete_by_id"])
+async def test_writes_invalidate_the_cached_seller(cache, repository, redis_adapter, operation):
+    await cache.find_by_id("seller01")
+    repository.find_by_id.return_value = create_full_seller(seller_id="seller01", trade_name="Loja Nova")
+
+    args = {"patch": ({"trade_name": "Loja Nova"},), "update": (MagicMock(),), "delete_by_id": ()}[operation]
+    await getattr(cache, operation)("seller01", *args)
+
+    assert "seller_cache:id:seller01" not in redis_adapter.data
+    assert "seller_cache:invalidated:seller01" in redis_adapter.data
+    assert (await cache.find_by_id("seller01")).trade_name == "Loja Nova"
+    assert repository.find_by_id.await_count == 2
+
+
+@pytest.mark.asyncio
+async def test_read_in_flight_during_invalidation_is_not_cached(cache, repository, redis_adapter, seller):
+    started, release = asyncio.Event(), asyncio.Event()
+
+    async def blocked_find_by_id(seller_id):
+        started.set()
+        await release.wait()
+        return seller
+
+    repository.find_by_id.side_effect = blocked_find_by_id
+    read = asyncio.create_task(cache.find_by_id("seller01"))
+    await started.wait()
+
+    await cache.patch("seller01", {"trade_name": "Loja Nova"})
+    release.set()
+
+    assert await read == seller
+    assert "seller_cache:id:seller01" not in redis_adapter.data
+    assert len(cache.local_cache) == 0
+
+
+@pytest.mark.asyncio
+async def test_read_invalidated_by_another_process_is_not_written_back(cache, repository, redis_adapter, seller):
+    started, release = asyncio.Event(), asyncio.Event()
+
+    async def blocked_find_by_id(seller_id):
+        started.set()
+        await release.wait()
+        return seller
+
+    repository.find_by_id.side_effect = blocked_find_by_id
+    other_process = CachedSellerRepository(repository, redis_adapter)
+    read = asyncio.create_task(cache.find_by_id("seller01"))
+    await started.wait()
+
+    # Outro processo atualiza o seller enquanto este ainda lê a versão anterior do Mongo
+    await other_process.invalidate("seller01")
+    release.set()
+
+    assert await read == seller
+    assert "seller_cache:id:seller01" not in redis_adapter.data
+    assert len(cache.local_cache) == 0
+
+
+@pytest.mark.asyncio
+async def test_slow_mongo_read_is_not_cached(cache, repository, redis_adapter, clock, seller):
+    async def slow_find_by_id(seller_id):
+        clock.now += 31
+        return seller
+
+    repository.find_by_id.side_effect = slow_find_by_id
+
+    assert await cache.find_by_id("seller01") == seller
+    assert redis_adapter.data == {}
+    assert len(cache.local_cache) == 0
+
+
+@pytest.mark.asyncio
+async def test_find_by_cnpj_reuses_the_seller_entry(cache, repository, redis_adapter, clock, seller):
+    assert await cache.find_by_cnpj(CNPJ) == seller
+    assert redis_adapter.data[f"seller_cache:cnpj:{CNPJ}"] == "seller01"
+
+    clock.now += 6
+    assert await cache.find_by_cnpj(CNPJ) == seller
+    assert await cache.find_by_id("seller01") == seller
+
+    repository.find_by_cnpj.assert_awaited_once_with(CNPJ)
+    repository.find_by_id.assert_not_called()
+
+
+@pytest.mark.asyncio
+async def test_find_by_cnpj_ignores_reference_to_seller_with_another_cnpj(cache, repository, seller):
+    await cache.find_by_cnpj(CNPJ)
+    changed = create_full_seller(seller_id="seller01", cnpj="99999999000199")
+    repository.find_by_id.return_value = changed
+    await cache.patch("seller01", {"cnpj": "99999999000199"})
+    repository.find_by_cnpj.return_value = None
+
+    assert await cache.find_by_cnpj(CNPJ) is None
+    assert repository.find_by_cnpj.await_count == 2
+
+
+@pytest.mark.asyncio
+async def test_redis_failures_fall_back_to_mongo(repository, seller):
+    redis_adapter = MagicMock()
+    redis_adapter.get_str = AsyncMock(side_effect=RedisConnectionError("fora do ar"))
+    redis_adapter.set_str = AsyncMock(side_effect=RedisConnectionError("fora do ar"))
+    redis_adapter.delete = AsyncMock(side_effect=RedisConnectionError("fora do ar"))
+    redis_adapter.eval_script = AsyncMock(side_effect=RedisConnectionError("fora do ar"))
+    cache = CachedSellerRepository(repository, redis_adapter, local_ttl_seconds=0)
+
+    assert await cache.find_by_id("seller01") == seller
+    await cache.patch("seller01", {"trade_name": "Loja Nova"})
+
+    repository.patch.assert_awaited_once()
+
+
+@pytest.mark.asyncio
+async def test_other_methods_are_delegated(cache, repository):
+    repository.find_by_trade_name.return_value = None
+
+    assert await cache.find_by_trade_name("Loja") is None
+    repository.find_by_trade_name.assert_awaited_once_with("Loja")
+
+
+@pytest.mark.asyncio
+async def test_runtime_collector_exports_hit_ratio(cache):
+    await cache.find_by_id("seller01")
+    await cache.find_by_id("seller01")
+    collector = RuntimeMetricsCollector()
+    collector.bind(seller_cache=cache)
+
+    samples = {
+        (sample.name, tuple(sample.labels.values())): sample.value
+        for family in collector.collect()
+        for sample in family.samples
+    }
+
+    assert samples[("seller_cache_hits_total", ("local",))] == 1
+    assert samples[("seller_cache_misses_total", ())] == 1
+    assert samples[("seller_cache_hit_ratio", ())] == 0.5
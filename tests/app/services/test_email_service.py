@@ -35,9 +35,7 @@ class TestEmailService:
     @patch('app.services.email_service.smtplib.SMTP')
     def test_send_welcome_email_success(self, mock_smtp):
         """Testa envio de email de boas-vindas com sucesso"""
-        mock_server = MagicMock()
-        mock_smtp.return_value.__enter__ = MagicMock(return_value=mock_server)
-        mock_smtp.return_value.__exit__ = MagicMock(return_value=None)
+        mock_server = mock_smtp.return_value
         
         service = EmailService()
         
@@ -205,10 +203,8 @@ class TestEmailService:
     @patch('app.services.email_service.smtplib.SMTP')
     def test_send_welcome_email_connection_error(self, mock_smtp):
         """Testa tratamento de erro de conexão"""
-        mock_server = MagicMock()
+        mock_server = mock_smtp.return_value
         mock_server.starttls.side_effect = Exception("Falha na conexão TLS")
-        mock_smtp.return_value.__enter__ = MagicMock(return_value=mock_server)
-        mock_smtp.return_value.__exit__ = MagicMock(return_value=None)
         
         service = EmailService()
         
@@ -227,3 +223,70 @@ class TestEmailService:
         
         mock_smtp.assert_called_once()
         mock_server.starttls.assert_called_once()
+
+    @patch.dict('os.environ', {
+        'SMTP_SERVER': 'smtp.test.com',
+        'SMTP_PORT': '587',
+        'SENDER_EMAIL': 'test@company.com',
+        'SENDER_PASSWORD': 'test_password'
+    })
+    @patch('app.services.email_service.smtplib.SMTP')
+    def test_send_welcome_email_reuses_smtp_session(self, mock_smtp):
+        """Testa que a sessão SMTP autenticada é reaproveitada entre emails"""
+        mock_server = mock_smtp.return_value
+        service = EmailService()
+        seller_data = {'company_name': EMPRESA_TESTE, 'contact_email': EMAIl_LOJA_TESTE}
+
+        assert service.send_welcome_email(seller_data) is True
+        assert service.send_welcome_email(seller_data) is True
+
+        mock_smtp.assert_called_once()
+        mock_server.login.assert_called_once()
+        assert mock_server.sendmail.call_count == 2
+
+    @patch.dict('os.environ', {
+        'SMTP_SERVER': 'smtp.test.com',
+        'SMTP_PORT': '587',
+        'SENDER_EMAIL': 'test@company.com',
+        'SENDER_PASSWORD': 'test_password'
+    })
+    @patch('app.services.email_service.smtplib.SMTP')
+    def test_send_welcome_email_reconnects_when_session_dropped(self, mock_smtp):
+        """Testa que uma sessão encerrada pelo servidor é descartada e o envio refeito em uma nova"""
+        stale_server = MagicMock()
+        stale_server.sendmail.side_effect = smtplib.SMTPServerDisconnected("conexão encerrada")
+        fresh_server = MagicMock()
+        mock_smtp.side_effect = [stale_server, fresh_server]
+        service = EmailService()
+
+        result = service.send_welcome_email({'company_name': EMPRESA_TESTE, 'contact_email': EMAIl_LOJA_TESTE})
+
+        assert result is True
+        assert mock_smtp.call_count == 2
+        fresh_server.sendmail.assert_called_once()
+        assert service.smtp_pool.opened == 1
+
+    def test_create_welcome_email_body_escapes_seller_fields(self):
+        """Testa que os dados do seller são escapados no HTML"""
+        service = EmailService()
+
+        result = service._create_welcome_email_body(
+            company_name='Empresa <script>alert(1)</script>',
+            trade_name='Loja & Cia',
+            business_description='<b>descrição</b>',
+            product_categories=['<i>categoria</i>']
+        )
+
+        assert '<script>' not in result
+        assert '&lt;script&gt;' in result
+        assert 'Loja &amp; Cia' in result
+        assert '&lt;b&gt;descrição&lt;/b&gt;' in result
+        assert '<li>&lt;i&gt;categoria&lt;/i&gt;</li>' in result
+
+    def test_create_welcome_email_body_without_categories_omits_section(self):
+        """Testa que a seção de categorias não é renderizada sem categorias"""
+        service = EmailService()
+
+        result = service._create_welcome_email_body(EMPRESA_TESTE, '', 'descrição', [])
+
+        assert 'Categorias de Produtos' not in result
@@ -0,0 +1,265 @@
+"""
+Testes para o relay do outbox: outbox_relay.py
+"""
+
+import asyncio
+from datetime import datetime, timedelta, timezone
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+from redis.exceptions import LockError, LockNotOwnedError
+
+from app.repositories.base.memory_repository import OUTBOX_ATTEMPTS_FIELD, OUTBOX_FIELD
+from app.services.outbox_relay import OUTBOX_RETRY_MAX_DELAY_SECONDS, OutboxRelay
+from app.services.webhook_dispatcher import WebhookDispatcher
+
+SELLER_ID = "seller01"
+
+
+def _rabbitmq_event(event_id="evt-rabbit"):
+    return {"event_id": event_id, "destination": "rabbitmq", "payload": {"seller_id": SELLER_ID}}
+
+
+def _webhook_event(event_id="evt-webhook"):
+    return {
+        "event_id": event_id,
+        "destination": "webhook",
+        "payload": {"message": "Seller criado", "changes": {"operation": "created"}},
+    }
+
+
+def _resolved_future(result):
+    future = asyncio.get_running_loop().create_future()
+    future.set_result(result)
+    return future
+
+
+@pytest.fixture
+def repository():
+    repository = AsyncMock()
+    repository.find_pending_outbox.return_value = [
+        {"seller_id": SELLER_ID, OUTBOX_FIELD: [_rabbitmq_event(), _webhook_event()]}
+    ]
+    return repository
+
+
+@pytest.fixture
+def publisher():
+    publisher = MagicMock(started=True)
+    publisher.publish_message = AsyncMock()
+    return publisher
+
+
+@pytest.fixture
+def webhook_service():
+    webhook_service = MagicMock()
+    webhook_service.send_update_message = AsyncMock(return_value=True)
+    return webhook_service
+
+
+@pytest.mark.asyncio
+async def test_drain_once_delivers_and_acks_events(repository, publisher, webhook_service):
+    relay = OutboxRelay(repository, publisher, webhook_service)
+
+    delivered = await relay.drain_once()
+
+    assert delivered == 2
+    publisher.publish_message.assert_awaited_once_with({"seller_id": SELLER_ID}, headers=None)
+    webhook_service.send_update_message.assert_awaited_once_with(
+        message="Seller criado", changes={"operation": "created"}
+    )
+    repository.ack_outbox_events.assert_awaited_once_with(SELLER_ID, ["evt-rabbit", "evt-webhook"])
+
+
+@pytest.mark.asyncio
+async def test_rabbitmq_event_is_published_with_stored_trace_context(repository, publisher, webhook_service):
+    trace_context = {
+        "traceparent": "00-0af7651916cd43dd8448eb211c80319c-b7ad6b7169203331-01",
+        "X-Request-ID": "req-123",
+    }
+    event = {**_rabbitmq_event(), "trace_context": trace_context}
+    repository.find_pending_outbox.return_value = [{"seller_id": SELLER_ID, OUTBOX_FIELD: [event]}]
+    relay = OutboxRelay(repository, publisher, webhook_service)
+
+    await relay.drain_once()
+
+    publisher.publish_message.assert_awaited_once_with({"seller_id": SELLER_ID}, headers=trace_context)
+
+
+@pytest.mark.asyncio
+async def test_failed_event_stays_in_outbox(repository, publisher, webhook_service):
+    publisher.publish_message.side_effect = ConnectionError("broker fora")
+    webhook_service.send_update_message.return_value = False
+    relay = OutboxRelay(repository, publisher, webhook_service)
+
+    delivered = await relay.drain_once()
+
+    assert delivered == 0
+    repository.ack_outbox_events.assert_not_awaited()
+    repository.schedule_outbox_retry.assert_awaited_once()
+
+
+@pytest.mark.asyncio
+async def test_failed_delivery_backs_off_exponentially(repository, publisher, webhook_service):
+    now = datetime(2026, 10, 18, tzinfo=timezone.utc)
+    repository.find_pending_outbox.return_value = [
+        {"seller_id": SELLER_ID, OUTBOX_FIELD: [_rabbitmq_event()], OUTBOX_ATTEMPTS_FIELD: 3}
+    ]
+    publisher.publish_message.side_effect = ConnectionError("broker fora")
+    relay = OutboxRelay(repository, publisher, webhook_service)
+
+    with patch("app.services.outbox_relay.utcnow", return_value=now):
+        await relay.drain_once()
+
+    repository.schedule_outbox_retry.assert_awaited_once_with(SELLER_ID, 4, now + timedelta(seconds=8))
+
+
+@pytest.mark.asyncio
+async def test_retry_delay_is_capped(repository, publisher, webhook_service):
+    now = datetime(2026, 10, 18, tzinfo=timezone.utc)
+    repository.find_pending_outbox.return_value = [
+        {"seller_id": SELLER_ID, OUTBOX_FIELD: [_rabbitmq_event()], OUTBOX_ATTEMPTS_FIELD: 5000}
+    ]
+    publisher.publish_message.side_effect = ConnectionError("broker fora")
+    relay = OutboxRelay(repository, publisher, webhook_service)
+
+    with patch("app.services.outbox_relay.utcnow", return_value=now):
+        await relay.drain_once()
+
+    repository.schedule_outbox_retry.assert_awaited_once_with(
+        SELLER_ID, 5001, now + timedelta(seconds=OUTBOX_RETRY_MAX_DELAY_SECONDS)
+    )
+
+
+@pytest.mark.asyncio
+async def test_rabbitmq_event_falls_back_to_sync_publisher_when_not_started(repository, publisher, webhook_service):
+    publisher.started = False
+    relay = OutboxRelay(repository, publisher, webhook_service)
+
+    with patch("app.services.outbox_relay.publish_seller_message") as mock_publish:
+        await relay.drain_once()
+
+    mock_publish.assert_called_once_with({"seller_id": SELLER_ID}, None)
+    publisher.publish_message.assert_not_awaited()
+
+
+@pytest.mark.asyncio
+async def test_drain_once_skips_when_lock_is_held(repository, publisher, webhook_service):
+    inmemory_adapter = MagicMock()
+    inmemory_adapter.locks.return_value.__aenter__ = AsyncMock(side_effect=LockError("ocupado"))
+    inmemory_adapter.locks.return_value.__aexit__ = AsyncMock(return_value=False)
+    relay = OutboxRelay(repository, publisher, webhook_service, inmemory_adapter=inmemory_adapter)
+
+    delivered = await relay.drain_once()
+
+    assert delivered == 0
+    repository.find_pending_outbox.assert_not_awaited()
+
+
+def _inmemory_adapter(lock):
+    inmemory_adapter = MagicMock()
+    inmemory_adapter.locks.return_value.__aenter__ = AsyncMock(return_value=lock)
+    inmemory_adapter.locks.return_value.__aexit__ = AsyncMock(return_value=False)
+    return inmemory_adapter
+
+
+@pytest.mark.asyncio
+async def test_drain_once_renews_the_lock_for_each_document(repository, publisher, webhook_service):
+    repository.find_pending_outbox.return_value = [
+        {"seller_id": SELLER_ID, OUTBOX_FIELD: [_rabbitmq_event("evt-1")]},
+        {"seller_id": "seller02", OUTBOX_FIELD: [_rabbitmq_event("evt-2")]},
+    ]
+    lock = MagicMock(reacquire=AsyncMock())
+    relay = OutboxRelay(repository, publisher, webhook_service, inmemory_adapter=_inmemory_adapter(lock))
+
+    assert await relay.drain_once() == 2
+    assert lock.reacquire.await_count == 2
+
+
+@pytest.mark.asyncio
+async def test_drain_once_stops_when_the_lock_is_lost(repository, publisher, webhook_service):
+    lock = MagicMock(reacquire=AsyncMock(side_effect=LockNotOwnedError("expirada")))
+    relay = OutboxRelay(repository, publisher, webhook_service, inmemory_adapter=_inmemory_adapter(lock))
+
+    assert await relay.drain_once() == 0
+    publisher.publish_message.assert_not_awaited()
+    repository.ack_outbox_events.assert_not_awaited()
+
+
+@pytest.mark.asyncio
+async def test_start_and_stop_background_loop(repository, publisher, webhook_service):
+    repository.find_pending_outbox.return_value = []
+    relay = OutboxRelay(repository, publisher, webhook_service, poll_interval_seconds=0.01)
+
+    relay.start()
+    assert relay._task is not None
+    await relay.stop()
+
+    assert relay._task is None
+
+
+@pytest.mark.asyncio
+async def test_webhook_event_is_handed_to_dispatcher_when_started(repository, publisher, webhook_service):
+    webhook_dispatcher = MagicMock(started=True)
+    webhook_dispatcher.dispatch_nowait.return_value = _resolved_future(True)
+    relay = OutboxRelay(repository, publisher, webhook_service, webhook_dispatcher=webhook_dispatcher)
+
+    delivered = await relay.drain_once()
+
+    assert delivered == 2
+    webhook_dispatcher.dispatch_nowait.assert_called_once_with(
+        message="Seller criado", changes={"operation": "created"}
+    )
+    webhook_service.send_update_message.assert_not_awaited()
+
+
+@pytest.mark.asyncio
+async def test_webhook_event_stays_in_outbox_when_dispatcher_is_full(repository, publisher, webhook_service):
+    webhook_dispatcher = MagicMock(started=True)
+    webhook_dispatcher.dispatch_nowait.return_value = _resolved_future(False)
+    relay = OutboxRelay(repository, publisher, webhook_service, webhook_dispatcher=webhook_dispatcher)
+
+    await relay.drain_once()
+
+    repository.ack_outbox_events.assert_awaited_once_with(SELLER_ID, ["evt-rabbit"])
+    repository.schedule_outbox_retry.assert_awaited_once()
+
+
+@pytest.mark.asyncio
+async def test_webhook_events_are_acked_only_after_the_dispatcher_sends_them(repository, publisher):
+    repository.find_pending_outbox.return_value = [
+        {"seller_id": "s1", OUTBOX_FIELD: [_webhook_event("evt-1")]},
+        {"seller_id": "s2", OUTBOX_FIELD: [_webhook_event("evt-2")]},
+    ]
+    webhook_service = MagicMock()
+    webhook_service.send_batch_message = AsyncMock(return_value=True)
+    webhook_dispatcher = WebhookDispatcher(webhook_service, coalesce_window_seconds=0.01)
+    webhook_dispatcher.start()
+    relay = OutboxRelay(repository, publisher, webhook_service, webhook_dispatcher=webhook_dispatcher)
+
+    delivered = await relay.drain_once()
+    await webhook_dispatcher.stop()
+
+    assert delivered == 2
+    # Os dois eventos do lote foram enviados em uma única mensagem antes de serem confirmados
+    webhook_service.send_batch_message.assert_awaited_once()
+    repository.ack_outbox_events.assert_any_await("s1", ["evt-1"])
+    repository.ack_outbox_events.assert_any_await("s2", ["evt-2"])
+
+
+@pytest.mark.asyncio
+async def test_webhook_event_is_rescheduled_when_the_dispatcher_fails_to_send(repository, publisher):
+    repository.find_pending_outbox.return_value = [{"seller_id": SELLER_ID, OUTBOX_FIELD: [_webhook_event()]}]
+    webhook_service = MagicMock()
+    webhook_service.send_batch_message = AsyncMock(return_value=False)
+    webhook_dispatcher = WebhookDispatcher(webhook_service, coalesce_window_seconds=0.01)
+    webhook_dispatcher.start()
+    relay = OutboxRelay(repository, publisher, webhook_service, webhook_dispatcher=webhook_dispatcher)
+
+    delivered = await relay.drain_once()
+    await webhook_dispatcher.stop()
+
+    assert delivered == 0
+    repository.ack_outbox_events.assert_not_awaited()
+    seller_id, attempts, _ = repository.schedule_outbox_retry.call_args.args
+    assert (seller_id, attempts) == (SELLER_ID, 1)
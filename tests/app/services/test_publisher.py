@@ -1,12 +1,12 @@
 import secrets
 import string
 import pytest
-from unittest.mock import MagicMock, patch, ANY
+from unittest.mock import AsyncMock, MagicMock, patch, ANY
 
 import json
 import os
 from datetime import datetime, date
-from app.services.publisher import RabbitMQPublisher, publish_seller_message
+from app.services.publisher import AsyncRabbitMQPublisher, RabbitMQPublisher, publish_seller_message
 from app.models.enums import BrazilianState, AccountType, ProductCategory
 
 EMPRESA_TESTE = 'Empresa Teste'
@@ -327,4 +327,48 @@ class TestPublishSellerMessage:
         mock_publisher_class.assert_called_once()
         
         # Verifica se send_message foi chamado com os dados corretos
-        mock_publisher.send_message.assert_called_once_with(seller_data)
+        mock_publisher.send_message.assert_called_once_with(seller_data, headers=None)
+
+
+class TestAsyncRabbitMQPublisher:
+    """Testes para o publisher assíncrono usado pelo relay do outbox"""
+
+    @pytest.mark.asyncio
+    async def test_publish_message_serializes_special_types(self):
+        publisher = AsyncRabbitMQPublisher()
+        mock_publish = AsyncMock()
+
+        with patch.object(publisher, "publish", mock_publish):
+            await publisher.publish_message(
+                {"seller_id": "seller01", "created_at": date(2024, 1, 1), "account_type": AccountType.CURRENT},
+                headers={"X-Request-ID": "req-123"},
+            )
+
+        message_body = mock_publish.await_args.args[0]
+        assert json.loads(message_body) == {
+            "seller_id": "seller01",
+            "created_at": "2024-01-01",
+            "account_type": "Corrente",
+        }
+        assert mock_publish.await_args.kwargs == {"headers": {"X-Request-ID": "req-123"}}
+
+    @pytest.mark.asyncio
+    async def test_start_and_stop_close_the_connection(self):
+        publisher = AsyncRabbitMQPublisher()
+
+        await publisher.start()
+        assert publisher.started
+        connection = MagicMock(is_closed=False, close=AsyncMock())
+        publisher._connection = connection
+        await publisher.stop()
+
+        connection.close.assert_awaited_once()
+        assert not publisher.started
+        await publisher.stop()
+
+    @pytest.mark.asyncio
+    async def test_publish_requires_start(self):
+        publisher = AsyncRabbitMQPublisher()
+
+        with pytest.raises(RuntimeError):
+            await publisher.publish(b"{}")
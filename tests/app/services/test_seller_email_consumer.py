@@ -64,11 +64,22 @@ class TestSellerEmailConsumer:
         mock_connection.assert_called_once()
         
         mock_connection_instance.channel.assert_called_once()
-        mock_channel.queue_declare.assert_called_once_with(queue='test_queue', durable=True)
+        mock_channel.queue_declare.assert_any_call(queue='test_queue', durable=True)
+        mock_channel.queue_declare.assert_any_call(queue='test_queue.dlq', durable=True)
+        mock_channel.queue_declare.assert_any_call(
+            queue='test_queue.retry.1',
+            durable=True,
+            arguments={
+                'x-message-ttl': consumer.retry_delay_seconds(1) * 1000,
+                'x-dead-letter-exchange': '',
+                'x-dead-letter-routing-key': 'test_queue',
+            },
+        )
+        mock_channel.basic_qos.assert_called_once_with(prefetch_count=consumer.prefetch_count)
         mock_channel.basic_consume.assert_called_once_with(
             queue='test_queue',
             auto_ack=False,
-            on_message_callback=consumer._SellerEmailConsumer__process_seller_message
+            on_message_callback=consumer._SellerEmailConsumer__dispatch_message
         )
         
         assert connection == mock_connection_instance
@@ -130,6 +141,8 @@ class TestSellerEmailConsumer:
         
         consumer.email_service.send_welcome_email.assert_not_called()
         
+        ch.basic_publish.assert_called_once()
+        assert ch.basic_publish.call_args.kwargs['routing_key'] == 'test_queue.dlq'
         ch.basic_ack.assert_called_once_with(delivery_tag=method.delivery_tag)
     
     @patch.dict(os.environ, {
@@ -189,7 +202,11 @@ class TestSellerEmailConsumer:
         
         consumer.email_service.send_welcome_email.assert_called_once_with(seller_data)
         
-        ch.basic_nack.assert_called_once_with(delivery_tag=method.delivery_tag, requeue=True)
+        ch.basic_nack.assert_not_called()
+        ch.basic_publish.assert_called_once()
+        assert ch.basic_publish.call_args.kwargs['routing_key'] == 'test_queue.retry.1'
+        assert ch.basic_publish.call_args.kwargs['properties'].headers['x-attempts'] == 1
+        ch.basic_ack.assert_called_once_with(delivery_tag=method.delivery_tag)
     
     @patch.dict(os.environ, {
         'RABBITMQ_HOST': 'localhost',
@@ -220,8 +237,79 @@ class TestSellerEmailConsumer:
         
         consumer.email_service.send_welcome_email.assert_called_once_with(seller_data)
         
-        ch.basic_nack.assert_called_once_with(delivery_tag=method.delivery_tag, requeue=True)
+        ch.basic_nack.assert_not_called()
+        ch.basic_publish.assert_called_once()
+        assert ch.basic_publish.call_args.kwargs['routing_key'] == 'test_queue.retry.1'
+        assert ch.basic_publish.call_args.kwargs['properties'].headers['x-attempts'] == 1
+        ch.basic_ack.assert_called_once_with(delivery_tag=method.delivery_tag)
     
+    @patch.dict(os.environ, {
+        'RABBITMQ_CONSUMER_WORKERS': '3',
+        'RABBITMQ_PREFETCH_COUNT': '12',
+    })
+    def test_init_workers_and_prefetch_from_env(self):
+        """Testa configuração de workers e prefetch pelas variáveis de ambiente"""
+        consumer = SellerEmailConsumer()
+
+        assert consumer.workers == 3
+        assert consumer.prefetch_count == 12
+        assert consumer.email_service.smtp_pool.max_size == 3
+
+    def test_dispatch_message_acks_through_connection_thread(self):
+        """Testa que a mensagem é processada no pool e o ack é agendado na thread da conexão"""
+        consumer = SellerEmailConsumer(workers=2)
+        consumer.email_service = MagicMock()
+        consumer.email_service.send_welcome_email.return_value = True
+        consumer._connection = MagicMock()
+        ch = MagicMock()
+        method = MagicMock()
+        body = json.dumps({
+            'seller_id': '001',
+            'company_name': EMPRESA_TESTE,
+            'contact_email': 'contato@teste.com',
+        }).encode('utf-8')
+
+        consumer._SellerEmailConsumer__dispatch_message(ch, method, MagicMock(), body)
+        consumer._executor.shutdown(wait=True)
+
+        consumer._connection.add_callback_threadsafe.assert_called_once()
+        ch.basic_ack.assert_not_called()
+        ack_callback = consumer._connection.add_callback_threadsafe.call_args.args[0]
+        ack_callback()
+        ch.basic_ack.assert_called_once_with(delivery_tag=method.delivery_tag)
+
+    @patch.dict(os.environ, {
+        'RABBITMQ_QUEUE': 'test_queue',
+        'RABBITMQ_MAX_ATTEMPTS': '3',
+    })
+    def test_failed_message_goes_to_dlq_after_max_attempts(self):
+        """Testa que a mensagem vai para a DLQ ao esgotar as tentativas"""
+        consumer = SellerEmailConsumer()
+        consumer.email_service = MagicMock()
+        consumer.email_service.send_welcome_email.return_value = False
+        ch = MagicMock()
+        method = MagicMock()
+        properties = MagicMock(headers={'x-attempts': 2})
+        body = json.dumps({
+            'seller_id': '001',
+            'company_name': EMPRESA_TESTE,
+            'contact_email': 'contato@teste.com',
+        }).encode('utf-8')
+
+        consumer._SellerEmailConsumer__process_seller_message(ch, method, properties, body)
+
+        assert ch.basic_publish.call_args.kwargs['routing_key'] == 'test_queue.dlq'
+        assert ch.basic_publish.call_args.kwargs['properties'].headers['x-attempts'] == 3
+        ch.basic_ack.assert_called_once_with(delivery_tag=method.delivery_tag)
+
+    @patch.dict(os.environ, {'RABBITMQ_RETRY_BASE_DELAY_SECONDS': '5'})
+    def test_retry_delay_is_exponential_and_capped(self):
+        """Testa o atraso exponencial entre as tentativas"""
+        consumer = SellerEmailConsumer()
+
+        assert [consumer.retry_delay_seconds(attempt) for attempt in (1, 2, 3, 4)] == [5, 10, 20, 40]
+        assert consumer.retry_delay_seconds(20) == 15 * 60
+
     def test_is_valid_seller_message_valid(self):
         """Testa validação de mensagem válida"""
         consumer = SellerEmailConsumer()
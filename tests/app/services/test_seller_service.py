@@ -2,6 +2,8 @@ import pytest
 from unittest.mock import AsyncMock, MagicMock
 from datetime import date
 from app.common.exceptions import BadRequestException, NotFoundException
+from app.messages import MSG_NOME_FANTASIA_JA_CADASTRADO, MSG_SELLER_JA_CADASTRADO
+from app.models.outbox_event_model import OutboxDestination
 from app.models.seller_model import Seller
 from app.models.seller_patch_model import SellerPatch
 from app.api.common.auth_handler import UserAuthInfo
@@ -9,8 +11,9 @@ from app.models.base import UserModel
 from app.api.v1.schemas.seller_schema import SellerCreate
 from app.services.seller_service import SellerService
 from app.clients.keycloak_admin_client import KeycloakAdminClient
-from app.repositories import SellerRepository
-from app.models.enums import BrazilianState, AccountType, ProductCategory
+from app.repositories import DuplicateKeyException, SellerRepository
+from app.models.enums import BrazilianState, AccountType, ProductCategory, SellerStatus
+from app.api.common.schemas import Paginator
 from tests.helpers.test_fixtures import create_full_seller
 
 # --- Mocks e Dados de Teste ---
@@ -99,10 +102,8 @@ def patch_data():
 @pytest.mark.asyncio
 async def test_create_success(mock_repository, mock_keycloak_client, seller_create_data, fake_auth_info):
     # Setup
-    mock_repository.find_by_id.return_value = None
-    mock_repository.find_by_trade_name.return_value = None
     mock_keycloak_client.create_user.return_value = "keycloak:new-user-id"
-    mock_repository.create.side_effect = lambda seller: seller  # O mock de create retorna o que recebeu
+    mock_repository.create.side_effect = lambda seller, **kwargs: seller  # O mock de create retorna o que recebeu
 
     service = SellerService(mock_repository, mock_keycloak_client)
 
@@ -110,7 +111,63 @@ async def test_create_success(mock_repository, mock_keycloak_client, seller_crea
 
     assert result.seller_id == seller_create_data.seller_id
     assert result.created_by == "https://fake-keycloak/realms/test:test-user-sub-123"
+    mock_repository.find_by_id.assert_not_called()
+    mock_repository.find_by_trade_name.assert_not_called()
     mock_repository.create.assert_called_once()
+    mock_keycloak_client.add_seller_to_user.assert_awaited_once_with(
+        user_id="test-user-sub-123", seller_to_add="001"
+    )
+    # Eventos gravados com o seller, retidos até a associação e então liberados
+    outbox_events = mock_repository.create.call_args.kwargs["outbox_events"]
+    assert [event.destination for event in outbox_events] == [OutboxDestination.RABBITMQ, OutboxDestination.WEBHOOK]
+    assert outbox_events[0].payload["seller_id"] == seller_create_data.seller_id
+    assert mock_repository.create.call_args.kwargs["hold_outbox_until"] > result.created_at
+    mock_repository.release_outbox.assert_awaited_once_with("001")
+
+
+@pytest.mark.asyncio
+async def test_create_removes_seller_when_keycloak_association_fails(
+    mock_repository, mock_keycloak_client, seller_create_data, fake_auth_info
+):
+    mock_repository.create.side_effect = lambda seller, **kwargs: seller
+    mock_keycloak_client.add_seller_to_user.side_effect = RuntimeError("keycloak indisponível")
+
+    service = SellerService(mock_repository, mock_keycloak_client)
+
+    with pytest.raises(RuntimeError):
+        await service.create(seller_create_data, fake_auth_info)
+    # A remoção leva junto os eventos retidos, que nunca são liberados
+    mock_repository.delete_by_id.assert_awaited_once_with("001")
+    mock_repository.release_outbox.assert_not_called()
+
+
+@pytest.mark.asyncio
+async def test_create_succeeds_when_releasing_the_outbox_fails(
+    mock_repository, mock_keycloak_client, seller_create_data, fake_auth_info
+):
+    mock_repository.create.side_effect = lambda seller, **kwargs: seller
+    mock_repository.release_outbox.side_effect = RuntimeError("mongo indisponível")
+
+    service = SellerService(mock_repository, mock_keycloak_client)
+
+    result = await service.create(seller_create_data, fake_auth_info)
+
+    assert result.seller_id == "001"
+    mock_repository.delete_by_id.assert_not_called()
+
+
+@pytest.mark.asyncio
+async def test_create_duplicate_on_unmapped_index_is_a_generic_conflict(
+    mock_repository, mock_keycloak_client, seller_create_data, fake_auth_info
+):
+    mock_repository.create.side_effect = DuplicateKeyException("cnpj")
+
+    service = SellerService(mock_repository, mock_keycloak_client)
+
+    with pytest.raises(BadRequestException) as exc_info:
+        await service.create(seller_create_data, fake_auth_info)
+    assert exc_info.value.message == MSG_SELLER_JA_CADASTRADO
+    mock_keycloak_client.add_seller_to_user.assert_not_called()
 
 
 # --- Testes para o Método `update` (PATCH) ---
@@ -118,9 +175,7 @@ async def test_create_success(mock_repository, mock_keycloak_client, seller_crea
 
 @pytest.mark.asyncio
 async def test_update_success(mock_repository, mock_keycloak_client, existing_seller_model, patch_data, fake_auth_info):
-    mock_repository.find_by_id.return_value = existing_seller_model
-    mock_repository.find_by_trade_name.return_value = None
-    mock_repository.patch.side_effect = lambda _, fields: existing_seller_model.model_copy(update=fields)
+    mock_repository.patch.side_effect = lambda _, fields, outbox_events=None: existing_seller_model.model_copy(update=fields)
 
     service = SellerService(mock_repository, mock_keycloak_client)
 
@@ -128,12 +183,13 @@ async def test_update_success(mock_repository, mock_keycloak_client, existing_se
 
     assert result.trade_name == patch_data.trade_name
     assert result.updated_by is not None
+    mock_repository.find_by_id.assert_not_called()
     mock_repository.patch.assert_called_once()
 
 
 @pytest.mark.asyncio
 async def test_update_not_found(mock_repository, mock_keycloak_client, patch_data, fake_auth_info):
-    mock_repository.find_by_id.return_value = None
+    mock_repository.patch.return_value = None
     service = SellerService(mock_repository, mock_keycloak_client)
 
     with pytest.raises(NotFoundException):
@@ -144,35 +200,13 @@ async def test_update_not_found(mock_repository, mock_keycloak_client, patch_dat
 async def test_update_nome_fantasia_conflict(
     mock_repository, mock_keycloak_client, existing_seller_model, patch_data, fake_auth_info
 ):
-    mock_repository.find_by_id.return_value = existing_seller_model
-    mock_repository.find_by_trade_name.return_value = create_full_seller(
-        seller_id="outro_id",
-        company_name='Outra Empresa Ltda',
-        trade_name='Nova Loja',
-        cnpj='98765432109876',
-        state_municipal_registration='987654321',
-        commercial_address='Rua Outra, 456',
-        contact_phone='11777777777',
-        contact_email='contato@outra.com',
-        legal_rep_full_name='Maria Silva',
-        legal_rep_cpf='98765432109',
-        legal_rep_rg_number='987654321',
-        legal_rep_rg_state=BrazilianState.RJ,
-        legal_rep_birth_date=date(1985, 5, 5),
-        legal_rep_phone='11666666666',
-        legal_rep_email='maria@outra.com',
-        bank_name='banco do brasil',
-        agency_account='9876-5/43210-9',
-        account_type=AccountType.SAVINGS,
-        account_holder_name='Outra Empresa Ltda',
-        product_categories=[ProductCategory.FLOWERS_GARDEN],
-        business_description='Venda de produtos para casa e jardim'
-    )
+    mock_repository.patch.side_effect = DuplicateKeyException("trade_name")
 
     service = SellerService(mock_repository, mock_keycloak_client)
 
-    with pytest.raises(BadRequestException):
+    with pytest.raises(BadRequestException) as exc_info:
         await service.update(existing_seller_model.seller_id, patch_data, auth_info=fake_auth_info)
+    assert exc_info.value.message == MSG_NOME_FANTASIA_JA_CADASTRADO
 
 
 # --- Testes para o Método `replace` (PUT) ---
@@ -181,10 +215,9 @@ async def test_update_nome_fantasia_conflict(
 @pytest.mark.asyncio
 async def test_replace_success(mock_repository, mock_keycloak_client, existing_seller_model, fake_auth_info):
     mock_repository.find_by_id.return_value = existing_seller_model
-    mock_repository.find_by_trade_name.return_value = None
     replace_data = create_full_seller(seller_id='001', trade_name='Loja Substituida', cnpj='11111111111111')
 
-    mock_repository.update.side_effect = lambda _, seller_to_update: seller_to_update
+    mock_repository.update.side_effect = lambda _, seller_to_update, outbox_events=None: seller_to_update
 
     service = SellerService(mock_repository, mock_keycloak_client)
 
@@ -198,6 +231,21 @@ async def test_replace_success(mock_repository, mock_keycloak_client, existing_s
     mock_repository.update.assert_called_once()
 
 
+@pytest.mark.asyncio
+async def test_replace_nome_fantasia_conflict(
+    mock_repository, mock_keycloak_client, existing_seller_model, fake_auth_info
+):
+    mock_repository.find_by_id.return_value = existing_seller_model
+    mock_repository.update.side_effect = DuplicateKeyException("trade_name")
+    replace_data = create_full_seller(seller_id='001', trade_name='Loja Existente', cnpj='11111111111111')
+
+    service = SellerService(mock_repository, mock_keycloak_client)
+
+    with pytest.raises(BadRequestException) as exc_info:
+        await service.replace(existing_seller_model.seller_id, replace_data, auth_info=fake_auth_info)
+    assert exc_info.value.message == MSG_NOME_FANTASIA_JA_CADASTRADO
+
+
 @pytest.mark.asyncio
 async def test_replace_not_found(mock_repository, mock_keycloak_client, existing_seller_model, fake_auth_info):
     mock_repository.find_by_id.return_value = None
@@ -205,3 +253,33 @@ async def test_replace_not_found(mock_repository, mock_keycloak_client, existing
 
     with pytest.raises(NotFoundException):
         await service.replace("non-existent-id", existing_seller_model, auth_info=fake_auth_info)
+
+
+@pytest.mark.asyncio
+async def test_find_uses_keyset_pagination_in_cursor_mode(mock_repository, mock_keycloak_client):
+    mock_repository.find_after.return_value = []
+    service = SellerService(mock_repository, mock_keycloak_client)
+
+    await service.find(Paginator(request_path="/sellers", limit=5, cursor=""), filters={})
+
+    mock_repository.find_after.assert_awaited_once_with(
+        filters={"status": SellerStatus.ACTIVE},
+        sort=[("created_at", -1), ("seller_id", -1)],
+        after=None,
+        limit=5,
+        fields=None,
+    )
+    mock_repository.find.assert_not_awaited()
+
+
+@pytest.mark.asyncio
+async def test_find_keeps_offset_pagination_by_default(mock_repository, mock_keycloak_client):
+    mock_repository.find.return_value = []
+    service = SellerService(mock_repository, mock_keycloak_client)
+
+    await service.find(Paginator(request_path="/sellers", limit=5, offset=10), filters={})
+
+    mock_repository.find.assert_awaited_once_with(
+        filters={"status": SellerStatus.ACTIVE}, limit=5, offset=10, sort=None, fields=None
+    )
+    mock_repository.find_after.assert_not_awaited()
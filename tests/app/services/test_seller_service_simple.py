@@ -4,16 +4,19 @@ Testes simples para melhorar cobertura de seller_service.py
 
 import pytest
 from datetime import date
-from unittest.mock import AsyncMock, Mock, patch
+from unittest.mock import AsyncMock, Mock
 from fastapi import HTTPException
 from app.services.seller_service import SellerService
+from app.models.outbox_event_model import OutboxDestination
 from app.models.seller_model import Seller
 from app.api.common.auth_handler import UserAuthInfo
 from app.models.base import UserModel
 from app.api.v1.schemas.seller_schema import SellerCreate, SellerUpdate, SellerReplace
 from app.common.exceptions.bad_request_exception import BadRequestException
 from app.common.exceptions.not_found_exception import NotFoundException
+from app.messages import MSG_NOME_FANTASIA_JA_CADASTRADO, MSG_SELLER_ID_JA_CADASTRADO
 from app.models.enums import BrazilianState, AccountType, ProductCategory
+from app.repositories import DuplicateKeyException
 from unittest.mock import MagicMock
 
 
@@ -25,6 +28,7 @@ class TestSellerServiceSimple:
         repository = AsyncMock()
         repository.find_by_id = AsyncMock(return_value=None)
         repository.find_by_trade_name = AsyncMock(return_value=None)
+        repository.patch = AsyncMock(return_value=None)
         repository.create = AsyncMock(return_value={"_id": "test_id"})
         repository.find = AsyncMock(return_value=[])
         repository.update = AsyncMock(return_value={"_id": "test_id"})
@@ -86,32 +90,43 @@ class TestSellerServiceSimple:
     @pytest.mark.asyncio
     async def test_create_seller_duplicate_id(self, seller_service, user_auth_info, seller_create_data, mock_repository):
         """Testa criar seller com ID duplicado"""
-        # Simula que já existe um seller com esse ID
-        mock_repository.find_by_id.return_value = {"seller_id": "new_seller"}
+        # Simula que o índice único de seller_id recusou a inserção
+        mock_repository.create.side_effect = DuplicateKeyException("seller_id")
         
-        with pytest.raises(BadRequestException):
+        with pytest.raises(BadRequestException) as exc_info:
             await seller_service.create(seller_create_data, user_auth_info)
+        assert exc_info.value.message == MSG_SELLER_ID_JA_CADASTRADO
+        # O seller duplicado não é associado ao usuário no Keycloak
+        seller_service.keycloak_client.add_seller_to_user.assert_not_called()
 
     @pytest.mark.asyncio
     async def test_create_seller_duplicate_trade_name(self, seller_service, user_auth_info, seller_create_data, mock_repository):
         """Testa criar seller com trade_name duplicado"""
-        # Simula que não existe seller com o ID, mas existe com trade_name
-        mock_repository.find_by_id.return_value = None
-        mock_repository.find_by_trade_name.return_value = {"trade_name": "Test Trade"}
+        # Simula que o índice único de trade_name recusou a inserção
+        mock_repository.create.side_effect = DuplicateKeyException("trade_name")
         
-        with pytest.raises(BadRequestException):
+        with pytest.raises(BadRequestException) as exc_info:
             await seller_service.create(seller_create_data, user_auth_info)
+        assert exc_info.value.message == MSG_NOME_FANTASIA_JA_CADASTRADO
 
-    @pytest.mark.asyncio 
-    @patch('app.services.seller_service.publish_seller_message')
-    async def test_create_seller_rabbitmq_failure(self, mock_publish, seller_service, user_auth_info, seller_create_data):
-        """Testa criação de seller com falha no RabbitMQ (não deve interromper operação)"""
-        # Simula falha na publicação do RabbitMQ
-        mock_publish.side_effect = Exception("RabbitMQ error")
-        
-        # Deve criar o seller mesmo com falha no RabbitMQ
+    @pytest.mark.asyncio
+    async def test_create_seller_writes_outbox_events(
+        self, seller_service, user_auth_info, seller_create_data, mock_repository
+    ):
+        """Testa que a mensagem do RabbitMQ e o webhook são gravados com o seller e liberados após a associação"""
         result = await seller_service.create(seller_create_data, user_auth_info)
+
         assert result is not None
+        mock_repository.find_by_id.assert_not_called()
+        mock_repository.find_by_trade_name.assert_not_called()
+        seller_service.keycloak_client.add_seller_to_user.assert_awaited_once()
+        outbox_events = mock_repository.create.call_args.kwargs["outbox_events"]
+        mock_repository.release_outbox.assert_awaited_once_with("newseller123")
+        assert [event.destination for event in outbox_events] == [OutboxDestination.RABBITMQ, OutboxDestination.WEBHOOK]
+        assert outbox_events[1].payload == {
+            "message": "Seller 'newseller123' foi criado",
+            "changes": {"operation": "created", "seller_id": "newseller123"},
+        }
 
     @pytest.mark.asyncio
     async def test_create_seller_webhook_failure(self, seller_service, user_auth_info, seller_create_data):
@@ -137,7 +152,7 @@ class TestSellerServiceSimple:
     @pytest.mark.asyncio
     async def test_update_seller_not_found(self, seller_service, user_auth_info, mock_repository):
         """Testa atualização de seller inexistente"""
-        mock_repository.find_by_id.return_value = None
+        mock_repository.patch.return_value = None
         
         update_data = SellerUpdate(trade_name="Updated Trade")
         
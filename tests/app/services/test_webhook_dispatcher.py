@@ -0,0 +1,158 @@
+"""
+Testes para o dispatcher de webhook: webhook_dispatcher.py
+"""
+
+import asyncio
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+
+from app.services.webhook_dispatcher import WebhookDispatcher
+
+
+def _notification(seller_id, operation, fields_changed=None):
+    changes = {"operation": operation, "seller_id": seller_id}
+    if fields_changed is not None:
+        changes["fields_changed"] = fields_changed
+    return f"Seller '{seller_id}' {operation}", changes
+
+
+@pytest.fixture
+def webhook_service():
+    webhook_service = MagicMock()
+    webhook_service.send_batch_message = AsyncMock(return_value=True)
+    return webhook_service
+
+
+@pytest.mark.asyncio
+async def test_dispatch_batches_notifications_in_a_single_message(webhook_service):
+    dispatcher = WebhookDispatcher(webhook_service, coalesce_window_seconds=0.05)
+    dispatcher.start()
+
+    first = dispatcher.dispatch_nowait(*_notification("s1", "created"))
+    second = dispatcher.dispatch_nowait(*_notification("s2", "deleted"))
+    await dispatcher.stop()
+
+    assert await first is True
+    assert await second is True
+    webhook_service.send_batch_message.assert_awaited_once_with(
+        [_notification("s1", "created"), _notification("s2", "deleted")]
+    )
+    assert dispatcher.stats()["sent_messages"] == 1
+    assert dispatcher.stats()["enqueued"] == 2
+
+
+@pytest.mark.asyncio
+async def test_dispatch_splits_batches_larger_than_max_batch_size(webhook_service):
+    dispatcher = WebhookDispatcher(webhook_service, coalesce_window_seconds=0.05, max_batch_size=2)
+    dispatcher.start()
+
+    for index in range(5):
+        dispatcher.dispatch_nowait(*_notification(f"s{index}", "created"))
+    await dispatcher.stop()
+
+    sizes = [len(call.args[0]) for call in webhook_service.send_batch_message.await_args_list]
+    assert sizes == [2, 2, 1]
+
+
+@pytest.mark.asyncio
+async def test_dispatch_nowait_drops_when_queue_is_full(webhook_service):
+    dispatcher = WebhookDispatcher(webhook_service, queue_max_size=1, coalesce_window_seconds=0.05)
+    dispatcher.start()
+
+    dispatcher.dispatch_nowait(*_notification("s1", "created"))
+    dropped = dispatcher.dispatch_nowait(*_notification("s2", "created"))
+
+    assert dropped.done() and dropped.result() is False
+    assert dispatcher.stats()["dropped"] == 1
+    await dispatcher.stop()
+
+
+def test_dispatch_nowait_requires_start(webhook_service):
+    dispatcher = WebhookDispatcher(webhook_service)
+
+    with pytest.raises(RuntimeError):
+        dispatcher.dispatch_nowait(*_notification("s1", "created"))
+
+
+@pytest.mark.asyncio
+async def test_failed_batch_resolves_the_notifications_as_not_sent(webhook_service):
+    webhook_service.send_batch_message.return_value = False
+    dispatcher = WebhookDispatcher(webhook_service, coalesce_window_seconds=0.01)
+    dispatcher.start()
+
+    first = dispatcher.dispatch_nowait(*_notification("s1", "created"))
+    second = dispatcher.dispatch_nowait(*_notification("s1", "updated", {"trade_name": "B"}))
+    await dispatcher.stop()
+
+    # Sem novas tentativas no dispatcher: quem enfileirou reagenda a entrega
+    assert webhook_service.send_batch_message.await_count == 1
+    assert await first is False
+    assert await second is False
+    assert dispatcher.stats()["failed_messages"] == 1
+
+
+@pytest.mark.asyncio
+async def test_each_notification_gets_the_result_of_its_own_message(webhook_service):
+    webhook_service.send_batch_message.side_effect = [True, False]
+    dispatcher = WebhookDispatcher(webhook_service, coalesce_window_seconds=0.05, max_batch_size=1)
+    dispatcher.start()
+
+    first = dispatcher.dispatch_nowait(*_notification("s1", "created"))
+    second = dispatcher.dispatch_nowait(*_notification("s2", "created"))
+    await dispatcher.stop()
+
+    assert await first is True
+    assert await second is False
+
+
+@pytest.mark.asyncio
+async def test_stop_resolves_notifications_left_in_the_queue(webhook_service):
+    dispatcher = WebhookDispatcher(webhook_service, coalesce_window_seconds=10)
+    dispatcher.start()
+
+    future = dispatcher.dispatch_nowait(*_notification("s1", "created"))
+    await dispatcher.stop(timeout=0.01)
+
+    assert await future is False
+
+
+def test_coalesce_merges_changes_of_the_same_seller():
+    batch = [
+        _notification("s1", "updated", {"trade_name": "A"}),
+        _notification("s2", "created"),
+        _notification("s1", "updated", {"trade_name": "B", "contact_phone": "11"}),
+    ]
+
+    coalesced = WebhookDispatcher._coalesce(batch)
+
+    assert coalesced == [
+        (
+            "Seller 's1' updated",
+            {"operation": "updated", "seller_id": "s1", "fields_changed": {"trade_name": "B", "contact_phone": "11"}},
+        ),
+        _notification("s2", "created"),
+    ]
+
+
+def test_coalesce_keeps_creation_unless_seller_was_deleted():
+    created_then_updated = WebhookDispatcher._coalesce(
+        [_notification("s1", "created"), _notification("s1", "updated", {"trade_name": "B"})]
+    )
+    created_then_deleted = WebhookDispatcher._coalesce([_notification("s1", "created"), _notification("s1", "deleted")])
+
+    assert created_then_updated == [
+        ("Seller 's1' created", {"operation": "created", "seller_id": "s1", "fields_changed": {"trade_name": "B"}})
+    ]
+    assert created_then_deleted == [_notification("s1", "deleted")]
+
+
+@pytest.mark.asyncio
+async def test_queue_depth_reflects_pending_notifications(webhook_service):
+    dispatcher = WebhookDispatcher(webhook_service)
+    assert dispatcher.queue_depth == 0
+
+    dispatcher.queue = asyncio.Queue()
+    dispatcher.queue.put_nowait(_notification("s1", "created"))
+
+    assert dispatcher.stats()["queue_depth"] == 1
@@ -1,3 +1,5 @@
+import asyncio
+
 import pytest
 from unittest.mock import MagicMock, patch, AsyncMock
 import httpx
@@ -229,6 +231,113 @@ class TestWebhookService:
         
         assert result is False
     
+    @patch('app.services.webhook_service.settings')
+    @patch('app.services.webhook_service.httpx.AsyncClient')
+    @patch('app.services.webhook_service.utcnow')
+    async def test_send_batch_message_uses_one_attachment_per_notification(self, mock_utcnow, mock_client, mock_settings):
+        """Testa envio em lote com um anexo por notificação, usando o cliente compartilhado"""
+        mock_settings.WEBHOOK_URL = URL_WEBHOOK
+        mock_utcnow.return_value.timestamp.return_value = 1640995200
+
+        mock_response = MagicMock()
+        mock_response.status_code = 200
+        mock_response.raise_for_status.return_value = None
+        mock_client.return_value.post = AsyncMock(return_value=mock_response)
+        mock_client.return_value.aclose = AsyncMock()
+
+        service = WebhookService()
+        await service.open()
+
+        result = await service.send_batch_message([
+            ("Seller '001' foi criado", {"operation": "created", "seller_id": "001"}),
+            ("Seller '002' foi marcado como inativo", {"operation": "deleted", "seller_id": "002"}),
+        ])
+        await service.aclose()
+
+        assert result is True
+        mock_client.assert_called_once()
+        payload = mock_client.return_value.post.call_args[1]['json']
+        assert payload['text'] == "🔔 *2 alterações em sellers*"
+        assert [a['title'] for a in payload['attachments']] == [
+            "Seller '001' foi criado", "Seller '002' foi marcado como inativo"
+        ]
+        assert [a['color'] for a in payload['attachments']] == ["good", "danger"]
+        mock_client.return_value.aclose.assert_awaited_once()
+
+    @patch('app.services.webhook_service.settings')
+    @patch('app.services.webhook_service.httpx.AsyncClient')
+    async def test_circuit_opens_and_skips_calls_after_consecutive_failures(self, mock_client, mock_settings):
+        """Testa que o circuito aberto evita novas chamadas ao webhook"""
+        mock_settings.WEBHOOK_URL = URL_WEBHOOK
+        mock_client.return_value.post = AsyncMock(side_effect=httpx.ConnectError("recusado"))
+
+        service = WebhookService(circuit_failure_threshold=2, rate_limit_burst=10)
+        await service.open()
+
+        results = [await service.send_update_message(TESTE_MENSAGEM, {}) for _ in range(3)]
+
+        assert results == [False, False, False]
+        assert mock_client.return_value.post.await_count == 2
+        assert service.circuit_breaker.rejected == 1
+
+    @patch('app.services.webhook_service.settings')
+    @patch('app.services.webhook_service.httpx.AsyncClient')
+    async def test_rate_limited_response_pauses_sending(self, mock_client, mock_settings):
+        """Testa que o 429 abre o circuito pelo Retry-After informado"""
+        mock_settings.WEBHOOK_URL = URL_WEBHOOK
+        mock_response = MagicMock()
+        mock_response.status_code = 429
+        mock_response.headers = {"Retry-After": "7"}
+        mock_response.raise_for_status.side_effect = httpx.HTTPStatusError(
+            "Too Many Requests", request=MagicMock(), response=mock_response
+        )
+        mock_client.return_value.post = AsyncMock(return_value=mock_response)
+
+        service = WebhookService()
+        await service.open()
+
+        with patch.object(service.circuit_breaker, 'trip') as mock_trip:
+            assert await service.send_update_message(TESTE_MENSAGEM, {}) is False
+
+        mock_trip.assert_called_once_with(7.0)
+
+    @patch('app.services.webhook_service.settings')
+    async def test_send_is_skipped_when_rate_limit_is_exhausted(self, mock_settings):
+        """Testa que o envio não é feito sem ficha disponível no limitador"""
+        mock_settings.WEBHOOK_URL = URL_WEBHOOK
+        service = WebhookService()
+        service.rate_limiter.acquire = AsyncMock(return_value=False)
+        service._http_client = MagicMock()
+
+        assert await service.send_update_message(TESTE_MENSAGEM, {}) is False
+        service._http_client.assert_not_called()
+
+    @patch('app.services.webhook_service.settings')
+    async def test_open_circuit_does_not_consume_rate_limit(self, mock_settings):
+        """Testa que, com o circuito aberto, a mensagem é recusada sem gastar (ou esperar) uma ficha"""
+        mock_settings.WEBHOOK_URL = URL_WEBHOOK
+        service = WebhookService()
+        service.circuit_breaker.trip(60)
+        service.rate_limiter.acquire = AsyncMock(return_value=True)
+
+        assert await service.send_update_message(TESTE_MENSAGEM, {}) is False
+        service.rate_limiter.acquire.assert_not_awaited()
+
+    @patch('app.services.webhook_service.settings')
+    @patch('app.services.webhook_service.httpx.AsyncClient')
+    async def test_cancelled_probe_is_released(self, mock_client, mock_settings):
+        """Testa que a chamada de teste do circuito meio-aberto é devolvida se o envio for cancelado"""
+        mock_settings.WEBHOOK_URL = URL_WEBHOOK
+        mock_client.return_value.post = AsyncMock(side_effect=asyncio.CancelledError())
+        service = WebhookService()
+        await service.open()
+        service.circuit_breaker.trip(0)
+
+        with pytest.raises(asyncio.CancelledError):
+            await service.send_update_message(TESTE_MENSAGEM, {})
+
+        assert service.circuit_breaker.allow_request() is True
+
     def test_format_changes_with_operation(self):
         """Testa formatação de mudanças com operação"""
         service = WebhookService()
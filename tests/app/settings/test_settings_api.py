@@ -0,0 +1,20 @@
+import pytest
+from pydantic import ValidationError
+
+from app.settings.api import ApiSettings
+
+
+def test_pagination_cursor_secret_is_required(monkeypatch):
+    """Sem a chave a aplicação não sobe, em vez de gerar uma por processo"""
+    monkeypatch.delenv("PAGINATION_CURSOR_SECRET", raising=False)
+
+    with pytest.raises(ValidationError) as exc_info:
+        ApiSettings(_env_file=None)
+
+    assert ("pagination_cursor_secret",) in [error["loc"] for error in exc_info.value.errors()]
+
+
+def test_pagination_cursor_secret_from_environment(monkeypatch):
+    monkeypatch.setenv("PAGINATION_CURSOR_SECRET", "segredo-compartilhado")
+
+    assert ApiSettings().pagination_cursor_secret == "segredo-compartilhado"